@@ -0,0 +1 @@
+"""Benchmarks for easyDeploy, run with `python -m benchmarks`."""
@@ -0,0 +1,203 @@
+"""Run the easyDeploy benchmarks and compare them with the committed baseline.
+
+Usage (from the repository root)::
+
+    python -m benchmarks                  # run everything, compare with baseline.json
+    python -m benchmarks --save           # run everything and rewrite baseline.json
+    python -m benchmarks -k deploy        # only cases whose name contains "deploy"
+"""
+
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import click
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+# Slowdown over the baseline median reported as a regression
+DEFAULT_TOLERANCE = 0.25
+
+# Differences smaller than this are noise, whatever the ratio
+NOISE_FLOOR = 0.02
+
+
+def _time(run, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def _snapshot(directories: list[Path]) -> dict:
+    """Size and modification time of every file under some directories."""
+    files = {}
+    for directory in directories:
+        for path in directory.rglob("*") if directory.exists() else ():
+            if path.is_file():
+                stat = path.stat()
+                files[str(path)] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Describe every case slower than its baseline by more than the tolerance.
+
+    Args:
+        results: Case results of this run
+        baseline: Case results of the baseline
+        tolerance: Allowed relative slowdown of the median
+
+    Returns:
+        One message per regression
+    """
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        limit = max(before["median"] * (1 + tolerance), before["median"] + NOISE_FLOOR)
+        if result["median"] > limit:
+            regressions.append(
+                f"{name}: {result['median']:.3f}s vs baseline {before['median']:.3f}s "
+                f"(+{result['median'] / before['median'] - 1:.0%})"
+            )
+    return regressions
+
+
+@click.command()
+@click.option("-k", "selector", help="Only run cases whose name contains this text")
+@click.option("--repeat", type=click.IntRange(min=1), default=5, show_default=True)
+@click.option(
+    "--api-latency", type=float, default=0.05, show_default=True, help="Seconds per API call"
+)
+@click.option(
+    "--operation-latency",
+    type=float,
+    default=1.0,
+    show_default=True,
+    help="Seconds from starting a Compute operation until it is done",
+)
+@click.option(
+    "--gcloud-latency",
+    type=float,
+    default=0.3,
+    show_default=True,
+    help="Seconds per stub gcloud invocation",
+)
+@click.option(
+    "--baseline",
+    "baseline_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=BASELINE_PATH,
+    show_default=True,
+)
+@click.option("--save", is_flag=True, help="Write the results as the new baseline")
+@click.option(
+    "--tolerance",
+    type=float,
+    default=DEFAULT_TOLERANCE,
+    show_default=True,
+    help="Allowed slowdown of a median over the baseline",
+)
+def main(
+    selector,
+    repeat,
+    api_latency,
+    operation_latency,
+    gcloud_latency,
+    baseline_path,
+    save,
+    tolerance,
+):
+    """Run the benchmarks against a stub gcloud and a fake Compute API."""
+    home = Path(tempfile.mkdtemp(prefix="easydeploy-bench-"))
+    # Where easyDeploy keeps state outside the isolated home; no case may touch it
+    outside = [Path.cwd() / "state", Path.home() / ".easydeploy"]
+    before = _snapshot(outside)
+    # In-process cases read settings and state from the isolated home too
+    os.environ["HOME"] = str(home)
+    os.environ["CLOUDSDK_CONFIG"] = str(home / "gcloud")
+    os.environ.pop("EASYDEPLOY_TRACE", None)
+
+    from benchmarks.cases import CASES, Bench
+    from easydeploy.config.settings import get_settings
+
+    get_settings().state_dir = home / "state"
+
+    bench = Bench(home, api_latency, operation_latency, gcloud_latency)
+    results = {}
+    try:
+        for name, case in CASES.items():
+            if selector and selector not in name:
+                continue
+            run = case["setup"](bench)
+            if case["in_process"]:
+                run()
+            timings = _time(run, repeat)
+            results[name] = {
+                "median": round(statistics.median(timings), 4),
+                "min": round(min(timings), 4),
+                "max": round(max(timings), 4),
+                "repeat": repeat,
+                "description": case["description"],
+            }
+            click.echo(
+                f"{name:<30} median {results[name]['median']:8.3f}s  "
+                f"min {results[name]['min']:8.3f}s"
+            )
+    finally:
+        shutil.rmtree(home, ignore_errors=True)
+    changed = sorted(set(before.items()) ^ set(_snapshot(outside).items()))
+    if changed:
+        raise click.ClickException(
+            f"Benchmarks wrote outside their temporary home: {changed[0][0]}"
+        )
+
+    document = {
+        "params": {
+            "api_latency": api_latency,
+            "operation_latency": operation_latency,
+            "gcloud_latency": gcloud_latency,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+    if save:
+        baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+        # Keep the baseline of cases not run this time
+        merged = {**baseline.get("results", {}), **results}
+        baseline_path.write_text(json.dumps({**document, "results": merged}, indent=2) + "\n")
+        click.echo(f"Baseline written to {baseline_path}")
+        return
+
+    if not baseline_path.exists():
+        click.echo(f"No baseline at {baseline_path}; run with --save to create one")
+        return
+    baseline = json.loads(baseline_path.read_text())
+    if baseline.get("params") != document["params"]:
+        click.echo("Latency parameters differ from the baseline's; not comparing")
+        return
+    regressions = compare(results, baseline["results"], tolerance)
+    for message in regressions:
+        click.echo(f"REGRESSION {message}", err=True)
+    if regressions:
+        sys.exit(1)
+    click.echo("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
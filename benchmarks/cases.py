@@ -0,0 +1,167 @@
+"""easyDeploy benchmark cases.
+
+Each case is a setup function registered with ``@case``. It receives the
+``Bench`` environment and returns the callable that is timed; whatever the
+setup does is not. Subprocess cases start a fresh interpreter per run, so
+they include Python and import time. In-process cases run against
+``FakeCompute``, and their first run is a warm-up that is not counted.
+"""
+
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict
+from unittest.mock import patch
+
+BIN_DIR = Path(__file__).resolve().parent / "bin"
+
+CASES: Dict[str, Dict] = {}
+
+
+@dataclass
+class Bench:
+    """Isolated environment shared by the cases of one benchmark run."""
+
+    home: Path
+    api_latency: float
+    operation_latency: float
+    gcloud_latency: float
+    env: Dict[str, str] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.env = {
+            **os.environ,
+            "HOME": str(self.home),
+            "PATH": f"{BIN_DIR}{os.pathsep}{os.environ.get('PATH', '')}",
+            # No gcloud configuration: credentials come from the stub gcloud
+            "CLOUDSDK_CONFIG": str(self.home / "gcloud"),
+            "FAKE_GCLOUD_LATENCY": str(self.gcloud_latency),
+        }
+        self.env.pop("GOOGLE_APPLICATION_CREDENTIALS", None)
+        self.env.pop("EASYDEPLOY_TRACE", None)
+
+    def cli(self, *args: str, **env: str) -> Callable[[], None]:
+        """A timed run of the CLI in a fresh interpreter."""
+        command = [
+            sys.executable,
+            "-c",
+            "import sys; from easydeploy.cli.main import main; main(sys.argv[1:])",
+            *args,
+        ]
+        run_env = {**self.env, **env}
+
+        def run():
+            # Relative paths such as the state directory resolve inside the home
+            subprocess.run(command, env=run_env, cwd=self.home, check=True, capture_output=True)
+
+        return run
+
+    def fake_compute(self):
+        from benchmarks.fake_compute import FakeCompute
+
+        return FakeCompute(api_latency=self.api_latency, operation_latency=self.operation_latency)
+
+    def invoke(self, fake, *args: str) -> Callable[[], None]:
+        """A timed in-process run of the CLI against a fake Compute project."""
+        from click.testing import CliRunner
+
+        from easydeploy.cli.main import main
+        from easydeploy.cloud.gcp.compute import GCPManager
+
+        def run():
+            manager = fake.install(GCPManager("bench-project"))
+            with (
+                patch("easydeploy.cli.main._gcp_manager", return_value=manager),
+                patch("easydeploy.cli.main._provisioning_bundle", return_value={}),
+            ):
+                result = CliRunner().invoke(main, list(args), catch_exceptions=False)
+            manager.operation_tracker.shutdown()
+            if result.exit_code != 0:
+                raise RuntimeError(f"easydeploy {' '.join(args)} failed:\n{result.output}")
+
+        return run
+
+
+def case(name: str, description: str, in_process: bool = True):
+    """Register a benchmark case."""
+
+    def register(setup):
+        CASES[name] = {"setup": setup, "description": description, "in_process": in_process}
+        return setup
+
+    return register
+
+
+@case("cli_cold_start", "easydeploy --version in a fresh interpreter", in_process=False)
+def cli_cold_start(bench: Bench):
+    return bench.cli("--version")
+
+
+@case("gcp_status_cold", "easydeploy gcp status with no cached session", in_process=False)
+def gcp_status_cold(bench: Bench):
+    run = bench.cli("gcp", "status")
+    session = bench.home / ".easydeploy" / "gcp-token.json"
+
+    def cold():
+        session.unlink(missing_ok=True)
+        run()
+
+    return cold
+
+
+@case("gcp_status_warm", "easydeploy gcp status with a cached session", in_process=False)
+def gcp_status_warm(bench: Bench):
+    run = bench.cli("gcp", "status")
+    run()
+    return run
+
+
+@case(
+    "gcp_list_projects",
+    "easydeploy gcp list-projects --refresh with 2000 projects",
+    in_process=False,
+)
+def gcp_list_projects(bench: Bench):
+    return bench.cli("gcp", "list-projects", "--refresh", FAKE_GCLOUD_PROJECTS="2000")
+
+
+@case("deploy_single", "easydeploy deploy of one instance, waiting until it is running")
+def deploy_single(bench: Bench):
+    return bench.invoke(bench.fake_compute(), "deploy", "bench-single", "--no-wait-ready")
+
+
+@case("deploy_fleet_100", "easydeploy deploy --count 100 (one bulkInsert)")
+def deploy_fleet_100(bench: Bench):
+    return bench.invoke(
+        bench.fake_compute(), "deploy", "bench-fleet", "--count", "100", "--no-wait-ready"
+    )
+
+
+@case("deploy_fleet_100_individual", "100-member fleet created with one insert per member")
+def deploy_fleet_100_individual(bench: Bench):
+    from easydeploy.cloud.gcp.compute import GCPManager
+    from easydeploy.deploy.fleet import FleetDeployer, default_instance_params
+
+    fake = bench.fake_compute()
+    base_params = default_instance_params()
+
+    def run():
+        manager = fake.install(GCPManager("bench-project"))
+        deployer = FleetDeployer(manager, use_bulk_insert=False)
+        results = deployer.deploy({"name": "bench-members", "count": 100}, base_params)
+        deployer.wait(results)
+        manager.operation_tracker.shutdown()
+        failed = [result for result in results if result["status"] != "running"]
+        if failed:
+            raise RuntimeError(f"{len(failed)} members failed: {failed[0]}")
+
+    return run
+
+
+@case("list_live_10k", "easydeploy list --live over 10,000 instances")
+def list_live_10k(bench: Bench):
+    fake = bench.fake_compute()
+    fake.add_instances(10_000)
+    return bench.invoke(fake, "list", "--live")
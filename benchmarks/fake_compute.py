@@ -0,0 +1,269 @@
+"""In-process fake of the Compute Engine API with a latency model.
+
+``FakeCompute`` stands in for the google-cloud-compute clients ``GCPManager``
+uses. Every API call blocks for ``api_latency`` seconds, and every operation
+it starts finishes ``operation_latency`` seconds later; ``wait`` long-polls
+like the real zoneOperations.wait. Instances are kept in memory, so listing,
+creating and deleting behave consistently within a run.
+"""
+
+import itertools
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+# Longest a single wait call blocks, as with the real API
+WAIT_TIMEOUT = 120.0
+
+
+class FakeCompute:
+    """Fake Compute Engine project holding instances and operations."""
+
+    def __init__(
+        self,
+        api_latency: float = 0.05,
+        operation_latency: float = 1.0,
+        zone: str = "us-central1-a",
+    ):
+        """Initialize fake project.
+
+        Args:
+            api_latency: Seconds every API call takes
+            operation_latency: Seconds from starting an operation until it is done
+            zone: Zone instances are listed under when they have none
+        """
+        from google.cloud import compute_v1
+
+        self.compute_v1 = compute_v1
+        self.api_latency = api_latency
+        self.operation_latency = operation_latency
+        self.zone = zone
+        self.instances: Dict[str, object] = {}
+        self.calls = 0
+        self._operations: Dict[str, float] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _call(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.api_latency)
+
+    def _operation(self) -> SimpleNamespace:
+        """Start an operation that finishes after the operation latency."""
+        name = f"operation-{next(self._ids)}"
+        with self._lock:
+            self._operations[name] = time.monotonic() + self.operation_latency
+        return SimpleNamespace(name=name)
+
+    def add_instances(self, count: int, prefix: str = "bench", labels: Optional[dict] = None):
+        """Populate the project with running instances (not timed)."""
+        compute_v1 = self.compute_v1
+        for index in range(count):
+            name = f"{prefix}-{index:05d}"
+            self.instances[name] = compute_v1.Instance(
+                name=name,
+                zone=f"zones/{self.zone}",
+                status="RUNNING",
+                machine_type=f"zones/{self.zone}/machineTypes/n1-standard-4",
+                labels={"easydeploy": "true", "deployment": name, **(labels or {})},
+                network_interfaces=[
+                    compute_v1.NetworkInterface(
+                        network_i_p=f"10.0.{index // 250}.{index % 250 + 2}",
+                        access_configs=[compute_v1.AccessConfig(nat_i_p="34.1.2.3")],
+                    )
+                ],
+            )
+
+    def install(self, manager):
+        """Make a GCPManager talk to this fake instead of Compute Engine."""
+        manager._compute_client = _InstancesClient(self)
+        manager._operations_client = _OperationsClient(self)
+        manager._global_operations_client = _OperationsClient(self)
+        manager._disks_client = _ResourceClient(self)
+        manager._firewalls_client = _ResourceClient(self)
+        manager._images_client = _ImagesClient(self)
+        manager._machine_types_client = _MachineTypesClient(self)
+        manager._accelerator_types_client = _AcceleratorTypesClient(self)
+        manager._regions_client = _RegionsClient(self)
+        return manager
+
+
+class _OperationsClient:
+    """zoneOperations / globalOperations."""
+
+    def __init__(self, fake: FakeCompute):
+        self.fake = fake
+
+    def wait(self, project, operation, zone=None):
+        self.fake._call()
+        done_at = self.fake._operations.get(operation, 0.0)
+        remaining = done_at - time.monotonic()
+        if remaining > WAIT_TIMEOUT:
+            time.sleep(WAIT_TIMEOUT)
+            return SimpleNamespace(status="RUNNING", error=None)
+        time.sleep(max(0.0, remaining))
+        return SimpleNamespace(status="DONE", error=None)
+
+
+class _ResourceClient:
+    """Disks and firewalls: every mutation is an operation."""
+
+    def __init__(self, fake: FakeCompute):
+        self.fake = fake
+
+    def list(self, **kwargs):
+        self.fake._call()
+        return []
+
+    def _mutate(self, **kwargs):
+        self.fake._call()
+        return self.fake._operation()
+
+    insert = patch = delete = _mutate
+
+
+class _ImagesClient(_ResourceClient):
+    """Images: no golden images exist."""
+
+
+class _MachineTypesClient:
+    """machineTypes.aggregatedList: the default machine type in the fake's zone."""
+
+    def __init__(self, fake: FakeCompute):
+        self.fake = fake
+
+    def aggregated_list(self, request):
+        self.fake._call()
+        compute_v1 = self.fake.compute_v1
+        machine_type = compute_v1.MachineType(
+            name="n1-standard-4", zone=self.fake.zone, guest_cpus=4, memory_mb=15360
+        )
+        return [
+            (
+                f"zones/{self.fake.zone}",
+                compute_v1.MachineTypesScopedList(machine_types=[machine_type]),
+            )
+        ]
+
+
+class _AcceleratorTypesClient:
+    """acceleratorTypes.aggregatedList: T4s in the fake's zone."""
+
+    def __init__(self, fake: FakeCompute):
+        self.fake = fake
+
+    def aggregated_list(self, request):
+        self.fake._call()
+        compute_v1 = self.fake.compute_v1
+        accelerator = compute_v1.AcceleratorType(
+            name="nvidia-tesla-t4", zone=self.fake.zone, maximum_cards_per_instance=4
+        )
+        return [
+            (
+                f"zones/{self.fake.zone}",
+                compute_v1.AcceleratorTypesScopedList(accelerator_types=[accelerator]),
+            )
+        ]
+
+
+class _RegionsClient:
+    """regions.list: the fake's region, with ample quota."""
+
+    def __init__(self, fake: FakeCompute):
+        self.fake = fake
+
+    def list(self, project):
+        self.fake._call()
+        compute_v1 = self.fake.compute_v1
+        return [
+            compute_v1.Region(
+                name=self.fake.zone.rsplit("-", 1)[0],
+                zones=[f"zones/{self.fake.zone}"],
+                quotas=[
+                    compute_v1.Quota(metric="CPUS", limit=100_000, usage=0),
+                    compute_v1.Quota(metric="NVIDIA_T4_GPUS", limit=1000, usage=0),
+                ],
+            )
+        ]
+
+
+class _InstancesClient:
+    """Instances, backed by the fake's instance table."""
+
+    def __init__(self, fake: FakeCompute):
+        self.fake = fake
+
+    def insert(self, project, zone, instance_resource):
+        self.fake._call()
+        instance = type(instance_resource)(instance_resource)
+        instance.zone = f"zones/{zone}"
+        instance.status = "RUNNING"
+        self.fake.instances[instance.name] = instance
+        return self.fake._operation()
+
+    def bulk_insert(self, project, zone, bulk_insert_instance_resource_resource):
+        self.fake._call()
+        bulk = bulk_insert_instance_resource_resource
+        digits = bulk.name_pattern.count("#")
+        prefix = bulk.name_pattern.rstrip("#")
+        for index in range(1, bulk.count + 1):
+            name = f"{prefix}{index:0{digits}d}"
+            self.fake.instances[name] = self.fake.compute_v1.Instance(
+                name=name,
+                zone=f"zones/{zone}",
+                status="RUNNING",
+                machine_type=bulk.instance_properties.machine_type,
+                labels=dict(bulk.instance_properties.labels),
+            )
+        return self.fake._operation()
+
+    def delete(self, project, zone, instance):
+        self.fake._call()
+        self.fake.instances.pop(instance, None)
+        return self.fake._operation()
+
+    def _mutate(self, **kwargs):
+        self.fake._call()
+        return self.fake._operation()
+
+    stop = start = set_machine_type = set_labels = _mutate
+
+    def get(self, project, zone, instance):
+        self.fake._call()
+        return self.fake.instances[instance]
+
+    def aggregated_list(self, request):
+        return _AggregatedPager(self.fake, request)
+
+
+class _AggregatedPager:
+    """instances.aggregatedList pager; each page is one API call."""
+
+    def __init__(self, fake: FakeCompute, request):
+        self.fake = fake
+        self.request = request
+
+    @property
+    def pages(self):
+        compute_v1 = self.fake.compute_v1
+        wanted = {}
+        for term in filter(None, self.request.filter.split(") (")):
+            key, _, value = term.strip("()").partition(" = ")
+            wanted[key.removeprefix("labels.")] = value.strip('"')
+        matches = [
+            instance
+            for instance in self.fake.instances.values()
+            if all(instance.labels.get(k) == v for k, v in wanted.items())
+        ]
+        size = self.request.max_results or 500
+        for start in range(0, max(len(matches), 1), size):
+            self.fake._call()
+            yield SimpleNamespace(
+                items={
+                    f"zones/{self.fake.zone}": compute_v1.InstancesScopedList(
+                        instances=matches[start : start + size]
+                    )
+                }
+            )
@@ -5,6 +5,11 @@ A lightweight, Python-driven deployment tool inspired by IsaacAutomator,
 designed for fast deployment of robotics development environments on cloud platforms.
 """
 
+import time
+
+# When the import started, for the import span of `easydeploy --profile`
+IMPORT_STARTED = time.perf_counter()
+
 __version__ = "0.1.0"
 __author__ = "tyu-mit"
 __email__ = "tyu@mit.edu"
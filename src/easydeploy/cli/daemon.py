@@ -0,0 +1,418 @@
+"""Resident daemon that serves easyDeploy commands over a Unix socket.
+
+``easydeploy daemon start`` imports the CLI's heavy dependencies once,
+discovers credentials and builds the Compute API clients of the configured
+project, then listens on ``~/.easydeploy/daemon.sock``. The ``easydeploy``
+entry point (see ``easydeploy.cli.forward``) hands each command to it along
+with its stdin, stdout and stderr.
+
+Every command runs in a child forked from the warm daemon, in the caller's
+working directory and environment, so commands run concurrently and
+settings, state and output stay per-command exactly as in-process. Children
+inherit the imports, credentials and clients but open their own HTTP
+connections; a connection pool shared across forks would interleave
+requests on one socket.
+"""
+
+import importlib
+import json
+import logging
+import os
+import select
+import signal
+import socket
+import subprocess
+import sys
+import time
+import traceback
+from typing import Any, Dict, Optional
+
+import click
+
+from easydeploy import __version__
+from easydeploy.cli.forward import get_socket_path, request
+from easydeploy.utils.console import get_console
+
+logger = logging.getLogger(__name__)
+
+# Imported before serving so no command pays for them
+PRELOAD_MODULES = (
+    "rich.console",
+    "rich.progress",
+    "rich.table",
+    "yaml",
+    "jinja2",
+    "google.cloud.compute_v1",
+    "paramiko",
+    "easydeploy.cli.gcp",
+    "easydeploy.cli.image",
+    "easydeploy.cloud.gcp.catalog",
+    "easydeploy.deploy.fleet",
+    "easydeploy.deploy.images",
+    "easydeploy.deploy.plan",
+    "easydeploy.deploy.state",
+    "easydeploy.deploy.teardown",
+    "easydeploy.deploy.templates",
+    "easydeploy.remote.readiness",
+)
+
+# GCPManager clients built before serving; creating one discovers credentials
+WARM_CLIENTS = ("compute_client", "operations_client", "firewalls_client", "disks_client")
+
+# Exit after this many seconds without commands (0: never)
+DEFAULT_IDLE_TIMEOUT = 3600
+
+# Seconds `daemon start` waits for a detached daemon to listen
+START_TIMEOUT = 60
+
+# Largest command message accepted, environment included
+MAX_MESSAGE = 1 << 20
+
+# Environment deciding whose credentials commands use; a command whose values
+# differ from the daemon's gets none of its warm clients or tokens
+IDENTITY_ENV = (
+    "HOME",
+    "GOOGLE_APPLICATION_CREDENTIALS",
+    "CLOUDSDK_CONFIG",
+    "CLOUDSDK_ACTIVE_CONFIG_NAME",
+    "AZURE_CLIENT_ID",
+    "AZURE_TENANT_ID",
+    "AZURE_CLIENT_SECRET",
+    "AZURE_CLIENT_CERTIFICATE_PATH",
+    "AZURE_FEDERATED_TOKEN_FILE",
+)
+
+
+def identity(env: Dict[str, str]) -> tuple:
+    """The credential-selecting part of an environment."""
+    return tuple(env.get(name) for name in IDENTITY_ENV)
+
+
+def get_log_path() -> str:
+    """Get the log file of a detached daemon, next to its socket."""
+    return os.path.join(os.path.dirname(get_socket_path()), "daemon.log")
+
+
+def warm() -> list[str]:
+    """
+    Import heavy modules and build the configured project's GCP clients.
+
+    Whatever is unavailable (an optional dependency, credentials, a project)
+    is skipped; commands then load it themselves as they would in-process.
+
+    Returns:
+        list: Projects whose GCPManager is warm
+    """
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            logger.debug(f"Not preloading {name}: not installed")
+
+    from easydeploy.cli import main
+
+    try:
+        manager = main._gcp_manager()
+        for client in WARM_CLIENTS:
+            getattr(manager, client)
+        # Children inherit the token; each refreshes it only near expiry
+        manager.token_manager.token()
+    except Exception as e:
+        logger.info(f"GCP clients not warmed: {e}")
+        return []
+    main._warm_managers[(manager.project_id, manager.region, manager.zone)] = manager
+    return [manager.project_id]
+
+
+def _reset_caches(env: Dict[str, str]):
+    """Forget per-process state the daemon built for its own cwd and environment.
+
+    Warm clients and tokens are kept only for a caller with the daemon's
+    credentials; other callers authenticate as themselves.
+
+    Args:
+        env: The caller's environment
+    """
+    import easydeploy
+    from easydeploy.cli import main
+    from easydeploy.config import settings
+    from easydeploy.deploy.templates import get_engine
+
+    settings._settings = None
+    get_console.cache_clear()
+    get_engine.cache_clear()
+    # The daemon's own log handlers write to its log file, not the caller
+    logging.root.handlers.clear()
+    logging.root.setLevel(logging.WARNING)
+    # --profile measures from here, not from when the daemon imported easydeploy
+    easydeploy.IMPORT_STARTED = time.perf_counter()
+
+    if identity(env) != identity(os.environ):
+        main._warm_managers.clear()
+        if "easydeploy.cloud.gcp.tokens" in sys.modules:
+            sys.modules["easydeploy.cloud.gcp.tokens"].get_token_manager.cache_clear()
+        if "easydeploy.cloud.azure.compute" in sys.modules:
+            sys.modules["easydeploy.cloud.azure.compute"].get_credential.cache_clear()
+
+
+def _run_command(message: Dict[str, Any]) -> int:
+    """Run a forwarded command in this (forked) process and return its exit code."""
+    from easydeploy.cli.main import main
+
+    _reset_caches(message["env"])
+    os.chdir(message["cwd"])
+    os.environ.clear()
+    os.environ.update(message["env"])
+    sys.argv = ["easydeploy", *message["args"]]
+    try:
+        main.main(args=message["args"], prog_name="easydeploy")
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    except BaseException:
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+def _serve_child(conn: socket.socket, message: Dict[str, Any], fds: list[int]):
+    """Body of a forked child: adopt the client's stdio, run its command, report and exit."""
+    code = 1
+    try:
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        for fd, target in zip(fds, (0, 1, 2)):
+            os.dup2(fd, target)
+            os.close(fd)
+        for stream in (sys.stdout, sys.stderr):
+            stream.reconfigure(line_buffering=stream.isatty())
+        # Tells the client which process to interrupt on Ctrl-C
+        conn.sendall(json.dumps({"pid": os.getpid()}).encode() + b"\n")
+        code = _run_command(message)
+    finally:
+        try:
+            from easydeploy.utils.logging import shutdown_logging
+
+            shutdown_logging()
+            sys.stdout.flush()
+            sys.stderr.flush()
+            conn.sendall(json.dumps({"exit_code": code}).encode() + b"\n")
+        finally:
+            os._exit(0)
+
+
+class Daemon:
+    """Accepts forwarded commands and runs each in a child forked from warm state."""
+
+    def __init__(self, path: Optional[str] = None, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        """Initialize daemon.
+
+        Args:
+            path: Unix socket to listen on (defaults to ~/.easydeploy/daemon.sock)
+            idle_timeout: Exit after this many seconds without commands (0: never)
+        """
+        self.path = path or get_socket_path()
+        self.idle_timeout = idle_timeout
+        self.started_at = time.time()
+        self.last_active = time.monotonic()
+        self.commands = 0
+        self.projects: list[str] = []
+        self.children: set[int] = set()
+        self._listener: Optional[socket.socket] = None
+        self._stopping = False
+
+    def status(self) -> Dict[str, Any]:
+        """Describe the daemon for `easydeploy daemon status`."""
+        return {
+            "pid": os.getpid(),
+            "version": __version__,
+            "started_at": self.started_at,
+            "commands": self.commands,
+            "running": len(self.children),
+            "projects": self.projects,
+        }
+
+    def bind(self):
+        """Listen on the socket, replacing a stale one left by a dead daemon."""
+        if request({"control": "status"}, self.path) is not None:
+            raise click.ClickException(f"A daemon is already listening on {self.path}")
+        os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            listener.bind(self.path)
+        finally:
+            os.umask(old_umask)
+        listener.listen(128)
+        self._listener = listener
+
+    def _reap(self):
+        """Collect exited children."""
+        for pid in list(self.children):
+            try:
+                done, _ = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                done = pid
+            if done:
+                self.children.discard(pid)
+                self.last_active = time.monotonic()
+
+    def _idle(self) -> bool:
+        """Whether the idle timeout has passed with no command running."""
+        return (
+            self.idle_timeout > 0
+            and not self.children
+            and time.monotonic() - self.last_active > self.idle_timeout
+        )
+
+    def _receive(self, conn: socket.socket) -> tuple[Dict[str, Any], list[int]]:
+        """Read one newline-terminated JSON message and the file descriptors sent with it."""
+        data, fds, _, _ = socket.recv_fds(conn, MAX_MESSAGE, 3)
+        while data and not data.endswith(b"\n") and len(data) < MAX_MESSAGE:
+            chunk = conn.recv(MAX_MESSAGE)
+            if not chunk:
+                break
+            data += chunk
+        return json.loads(data), fds
+
+    def _reply(self, conn: socket.socket, reply: Dict[str, Any]):
+        """Send one JSON reply line."""
+        conn.sendall(json.dumps(reply).encode() + b"\n")
+
+    def handle(self, conn: socket.socket):
+        """Answer a control message, or fork a child to run a command."""
+        fds: list[int] = []
+        try:
+            message, fds = self._receive(conn)
+            if "control" in message:
+                self._reply(conn, self.status())
+                self._stopping = message["control"] == "stop"
+                return
+            if message.get("version") != __version__ or len(fds) != 3:
+                self._reply(conn, {"error": f"daemon runs easyDeploy {__version__}"})
+                return
+
+            pid = os.fork()
+            if pid == 0:
+                self._listener.close()
+                _serve_child(conn, message, fds)
+            self.children.add(pid)
+            self.commands += 1
+            self.last_active = time.monotonic()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropped a malformed daemon request: {e}")
+        finally:
+            for fd in fds:
+                os.close(fd)
+            conn.close()
+
+    def serve(self):
+        """Serve until stopped, terminated or idle for too long."""
+        signal.signal(signal.SIGTERM, lambda signum, frame: setattr(self, "_stopping", True))
+        logger.info(f"easyDeploy daemon {os.getpid()} listening on {self.path}")
+        try:
+            while not (self._stopping or self._idle()):
+                self._reap()
+                readable, _, _ = select.select([self._listener], [], [], 1.0)
+                if readable:
+                    conn, _ = self._listener.accept()
+                    self.handle(conn)
+        finally:
+            self._listener.close()
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            logger.info("easyDeploy daemon stopped")
+
+
+@click.group()
+def daemon():
+    """Keep credentials, clients and imports warm for fast repeated commands."""
+    pass
+
+
+@daemon.command()
+@click.option(
+    "--idle-timeout",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_IDLE_TIMEOUT,
+    show_default=True,
+    help="Exit after this many seconds without commands (0: never)",
+)
+@click.option("--foreground", is_flag=True, help="Serve from this process instead of detaching")
+def start(idle_timeout, foreground):
+    """Start the daemon; `easydeploy` commands are then forwarded to it."""
+    console = get_console()
+    path = get_socket_path()
+    running = request({"control": "status"}, path)
+    if running is not None:
+        console.print(f"✅ Daemon {running['pid']} is already running")
+        return
+
+    if foreground:
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+        server = Daemon(path, idle_timeout)
+        server.projects = warm()
+        server.bind()
+        server.serve()
+        return
+
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    with open(get_log_path(), "a") as log:
+        subprocess.Popen(
+            [sys.executable, "-m", "easydeploy.cli.daemon", "start", "--foreground"]
+            + ["--idle-timeout", str(idle_timeout)],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True,
+        )
+    deadline = time.monotonic() + START_TIMEOUT
+    with console.status("Starting daemon (warming clients)..."):
+        while time.monotonic() < deadline:
+            running = request({"control": "status"}, path)
+            if running is not None:
+                console.print(f"✅ Daemon {running['pid']} listening on {path}")
+                return
+            time.sleep(0.2)
+    raise click.ClickException(f"Daemon did not start; see {get_log_path()}")
+
+
+@daemon.command()
+def stop():
+    """Stop the daemon; commands already running finish first."""
+    console = get_console()
+    stopped = request({"control": "stop"})
+    if stopped is None:
+        console.print("[yellow]No daemon is running[/yellow]")
+        return
+    console.print(f"✅ Stopped daemon {stopped['pid']}")
+
+
+@daemon.command()
+def status():
+    """Show whether the daemon is running and what it keeps warm."""
+    console = get_console()
+    running = request({"control": "status"})
+    if running is None:
+        console.print("[yellow]No daemon is running; commands run in-process[/yellow]")
+        sys.exit(1)
+    uptime = time.time() - running["started_at"]
+    console.print(f"✅ Daemon {running['pid']} (easyDeploy {running['version']})")
+    console.print(f"   Socket:   {get_socket_path()}")
+    console.print(f"   Uptime:   {uptime:.0f}s, {running['commands']} commands served")
+    console.print(f"   Running:  {running['running']} commands")
+    console.print(f"   Projects: {', '.join(running['projects']) or 'none warm'}")
+
+
+if __name__ == "__main__":
+    daemon(prog_name="easydeploy daemon")
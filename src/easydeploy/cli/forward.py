@@ -0,0 +1,132 @@
+"""Console script entry point that forwards commands to ``easydeploy daemon``.
+
+When a daemon is listening on its Unix socket, the command line, working
+directory and environment are sent to it together with this process's
+stdin, stdout and stderr, and the daemon runs the command against its warm
+imports, credentials and clients. Otherwise the command runs in-process as
+usual. Only the standard library is imported here, so a forwarded command
+costs little more than starting Python.
+"""
+
+import json
+import os
+import signal
+import socket
+import sys
+from typing import Optional
+
+# Socket of the daemon, overridable with EASYDEPLOY_DAEMON_SOCKET
+DEFAULT_SOCKET_PATH = os.path.join("~", ".easydeploy", "daemon.sock")
+
+# Set EASYDEPLOY_NO_DAEMON=1 to always run in-process
+NO_DAEMON_ENV = "EASYDEPLOY_NO_DAEMON"
+
+# Top-level options of `easydeploy` that take a value
+VALUE_OPTIONS = ("--set", "--log-json")
+
+
+def get_socket_path() -> str:
+    """Get the path of the daemon's Unix socket."""
+    return os.path.expanduser(os.environ.get("EASYDEPLOY_DAEMON_SOCKET", DEFAULT_SOCKET_PATH))
+
+
+def subcommand(args: list[str]) -> Optional[str]:
+    """First subcommand named on an ``easydeploy`` command line, if any."""
+    skip = False
+    for arg in args:
+        if skip:
+            skip = False
+        elif arg in VALUE_OPTIONS:
+            skip = True
+        elif not arg.startswith("-"):
+            return arg
+    return None
+
+
+def connect(path: Optional[str] = None, timeout: Optional[float] = None) -> Optional[socket.socket]:
+    """Connect to the daemon, or return None if none is listening."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(path or get_socket_path())
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def request(message: dict, path: Optional[str] = None, timeout: float = 5.0) -> Optional[dict]:
+    """
+    Send a control message ("status", "stop") to the daemon.
+
+    Returns:
+        dict: The daemon's reply, or None if no daemon answered
+    """
+    sock = connect(path, timeout)
+    if sock is None:
+        return None
+    with sock, sock.makefile("rb") as replies:
+        try:
+            sock.sendall(json.dumps(message).encode() + b"\n")
+            line = replies.readline()
+        except OSError:
+            return None
+    return json.loads(line) if line else None
+
+
+def forward(args: list[str]) -> Optional[int]:
+    """
+    Run a command in the daemon, if one is running.
+
+    Args:
+        args: Command line arguments, without the program name
+
+    Returns:
+        int: The command's exit code, or None if it should run in-process
+    """
+    if os.environ.get(NO_DAEMON_ENV) or subcommand(args) == "daemon":
+        return None
+    sock = connect()
+    if sock is None:
+        return None
+
+    from easydeploy import __version__
+
+    message = {
+        "args": args,
+        "cwd": os.getcwd(),
+        "env": dict(os.environ),
+        "version": __version__,
+    }
+    with sock, sock.makefile("rb") as replies:
+        try:
+            socket.send_fds(sock, [json.dumps(message).encode() + b"\n"], [0, 1, 2])
+            accepted = json.loads(replies.readline() or "{}")
+        except (OSError, ValueError):
+            return None
+        if "pid" not in accepted:
+            # Refused, e.g. a daemon of another easyDeploy version
+            return None
+
+        # The command now runs in the daemon's child; interrupt it on Ctrl-C
+        while True:
+            try:
+                line = replies.readline()
+                break
+            except KeyboardInterrupt:
+                os.kill(accepted["pid"], signal.SIGINT)
+    if not line:
+        print("easyDeploy daemon exited before the command finished", file=sys.stderr)
+        return 1
+    return json.loads(line)["exit_code"]
+
+
+def run():
+    """Run ``easydeploy``: in the daemon when it is running, else in-process."""
+    code = forward(sys.argv[1:])
+    if code is not None:
+        sys.exit(code)
+
+    from easydeploy.cli.main import main
+
+    main()
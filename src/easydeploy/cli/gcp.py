@@ -1,5 +1,6 @@
 """GCP-specific CLI commands for easyDeploy."""
 
+import asyncio
 import sys
 
 import click
@@ -8,15 +9,22 @@ from rich.console import Console
 from easydeploy.cloud.gcp.auth import (
     authenticate,
     get_current_project,
+    get_current_project_async,
+    invalidate_session,
     is_authenticated,
-    list_projects,
+    is_authenticated_async,
     load_credentials,
+    run_concurrently,
     set_project,
 )
+from easydeploy.cloud.gcp.projects import ProjectCatalog
 from easydeploy.utils.logging import setup_logging
 
 console = Console()
 
+# Maximum number of projects offered in the select-project menu
+SELECT_PROJECT_LIMIT = 50
+
 
 @click.group()
 def gcp():
@@ -42,6 +50,8 @@ def login():
 
     # Perform authentication
     if authenticate():
+        # The new account may see a different set of projects
+        ProjectCatalog().clear()
         console.print("🎉 GCP authentication successful!")
 
         # Show authenticated user info
@@ -73,6 +83,8 @@ def logout():
             text=True,
             check=True,
         )
+        invalidate_session()
+        ProjectCatalog().clear()
         console.print("✅ Successfully logged out from GCP")
     except (subprocess.CalledProcessError, FileNotFoundError):
         console.print("⚠️  Could not revoke credentials automatically")
@@ -102,24 +114,39 @@ def status():
 
 
 @gcp.command("select-project")
-def select_project():
+@click.option("--filter", "query", help="Only offer projects matching this text (prefix or fuzzy)")
+@click.option(
+    "--refresh", is_flag=True, help="Re-fetch the project list instead of using the cache"
+)
+def select_project(query, refresh):
     """Select a GCP project to use."""
-    if not is_authenticated():
+    console.print("🔍 Loading available projects...")
+    # Check auth and search the project catalog at the same time
+    authenticated, projects = run_concurrently(
+        is_authenticated_async(),
+        asyncio.to_thread(
+            ProjectCatalog().lookup, query, limit=SELECT_PROJECT_LIMIT + 1, refresh=refresh
+        ),
+    )
+
+    if not authenticated:
         console.print("❌ Not authenticated with GCP")
         console.print("💡 Please run: easydeploy gcp login")
         sys.exit(1)
 
-    console.print("🔍 Loading available projects...")
-    projects = list_projects()
-
     if not projects:
         console.print("❌ No projects found or unable to list projects")
         console.print("💡 Make sure you have access to at least one GCP project")
         sys.exit(1)
 
+    truncated = len(projects) > SELECT_PROJECT_LIMIT
+    projects = projects[:SELECT_PROJECT_LIMIT]
+
     console.print("📋 Available projects:")
     for i, project in enumerate(projects, 1):
         console.print(f"  {i}. {project['project_id']} ({project['name']})")
+    if truncated:
+        console.print(f"💡 Showing the best {SELECT_PROJECT_LIMIT} matches. Narrow with --filter")
 
     # Get user selection
     while True:
@@ -140,21 +167,29 @@ def select_project():
 
 
 @gcp.command("list-projects")
-def list_projects_cmd():
+@click.option("--filter", "query", help="Only show projects matching this text (prefix or fuzzy)")
+@click.option(
+    "--refresh", is_flag=True, help="Re-fetch the project list instead of using the cache"
+)
+def list_projects_cmd(query, refresh):
     """List available GCP projects."""
-    if not is_authenticated():
+    console.print("🔍 Loading projects...")
+    # The three lookups are independent, so run them concurrently
+    authenticated, projects, current_project = run_concurrently(
+        is_authenticated_async(),
+        asyncio.to_thread(ProjectCatalog().lookup, query, refresh=refresh),
+        get_current_project_async(),
+    )
+
+    if not authenticated:
         console.print("❌ Not authenticated with GCP")
         console.print("💡 Please run: easydeploy gcp login")
         sys.exit(1)
 
-    console.print("🔍 Loading projects...")
-    projects = list_projects()
-
     if not projects:
         console.print("❌ No projects found")
         return
 
-    current_project = get_current_project()
     console.print("📋 Available projects:")
 
     for project in projects:
@@ -0,0 +1,115 @@
+"""Golden image CLI commands for easyDeploy."""
+
+import sys
+
+import click
+
+from easydeploy.cli.main import _gcp_manager, _provisioning_bundle
+from easydeploy.deploy.images import DEFAULT_KEEP, ImageBuilder
+from easydeploy.utils.console import get_console
+
+
+@click.group()
+def image():
+    """Build and manage golden images with the software stack preinstalled."""
+    pass
+
+
+@image.command()
+@click.option("--gpu", is_flag=True, help="Build the GPU variant (with NVIDIA drivers and CUDA)")
+@click.option("--force", is_flag=True, help="Rebuild even if a matching image exists")
+@click.option(
+    "--keep",
+    type=click.IntRange(min=1),
+    default=DEFAULT_KEEP,
+    show_default=True,
+    help="Images of each variant to keep after building",
+)
+def build(gpu, force, keep):
+    """Provision an instance once and save it as a golden image."""
+    from easydeploy.deploy.fleet import default_instance_params
+
+    console = get_console()
+    manager = _gcp_manager()
+    bundle = _provisioning_bundle()
+    if not bundle:
+        raise click.ClickException("Golden images need a published provisioning bundle")
+
+    base_params = default_instance_params()
+    base_params["project_id"] = manager.project_id
+    builder = ImageBuilder(manager)
+    try:
+        result = builder.build(
+            {"sha256": bundle["bundle_sha256"], "url": bundle["bundle_url"]},
+            base_params,
+            gpu=gpu,
+            force=force,
+            progress=lambda step: console.print(f"[dim]{step}...[/dim]"),
+        )
+    except Exception as e:
+        console.print(f"[red]✗ Image build failed: {e}[/red]")
+        sys.exit(1)
+
+    if result["cached"]:
+        console.print(f"✅ Golden image {result['name']} is already up to date")
+        return
+    console.print(f"🎉 Built golden image {result['name']}")
+
+    deleted = builder.gc(keep=keep)
+    for name in deleted:
+        console.print(f"[dim]Deleted superseded image {name}[/dim]")
+
+
+@image.command(name="list")
+def list_images():
+    """List golden images."""
+    from rich.table import Table
+
+    from easydeploy.deploy.images import IMAGE_LABEL, KEY_LABEL
+
+    console = get_console()
+    images = sorted(
+        _gcp_manager().list_images({IMAGE_LABEL: "true"}),
+        key=lambda image: image["created_at"],
+        reverse=True,
+    )
+    if not images:
+        console.print("[dim]No golden images found[/dim]")
+        console.print("💡 Run: easydeploy image build")
+        return
+
+    table = Table(box=None)
+    for column in ("Name", "Variant", "ROS", "CUDA", "Python", "Key", "Created", "Status"):
+        table.add_column(column)
+    for entry in images:
+        labels = entry["labels"]
+        table.add_row(
+            entry["name"],
+            labels.get("variant", ""),
+            labels.get("ros", ""),
+            labels.get("cuda", "").replace("_", "."),
+            labels.get("python", "").replace("_", "."),
+            labels.get(KEY_LABEL, ""),
+            entry["created_at"],
+            entry["status"],
+        )
+    console.print(table)
+
+
+@image.command()
+@click.option(
+    "--keep",
+    type=click.IntRange(min=1),
+    default=DEFAULT_KEEP,
+    show_default=True,
+    help="Images of each variant to keep",
+)
+@click.option("--dry-run", is_flag=True, help="Only show which images would be deleted")
+def gc(keep, dry_run):
+    """Delete superseded golden images."""
+    console = get_console()
+    deleted = ImageBuilder(_gcp_manager()).gc(keep=keep, dry_run=dry_run)
+    if not deleted:
+        console.print("[dim]No superseded images[/dim]")
+    for name in deleted:
+        console.print(f"{'Would delete' if dry_run else 'Deleted'} {name}")
@@ -0,0 +1,39 @@
+"""Lazy-loading Click group for easyDeploy."""
+
+import importlib
+from typing import Optional
+
+import click
+
+
+class LazyGroup(click.Group):
+    """Click group that imports subcommands only when they are resolved by name.
+
+    Subcommands are registered as ``{"name": "module.path:attribute"}``. The
+    module is imported the first time the command is looked up, so invoking one
+    subcommand (or just ``--version``) never pays for the others' imports.
+    """
+
+    def __init__(self, *args, lazy_subcommands: Optional[dict[str, str]] = None, **kwargs):
+        """Initialize lazy group.
+
+        Args:
+            lazy_subcommands: Mapping of command name to "module:attribute" import path
+        """
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = dict(lazy_subcommands or {})
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        """List eager and lazy subcommands without importing the lazy ones."""
+        return sorted({*super().list_commands(ctx), *self.lazy_subcommands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        """Resolve a subcommand, importing it on first use."""
+        if cmd_name in self.lazy_subcommands:
+            import_path = self.lazy_subcommands.pop(cmd_name)
+            module_name, attribute = import_path.split(":")
+            command = getattr(importlib.import_module(module_name), attribute)
+            if not isinstance(command, click.Command):
+                raise TypeError(f"Lazy subcommand {import_path} is not a Click command")
+            self.add_command(command, cmd_name)
+        return super().get_command(ctx, cmd_name)
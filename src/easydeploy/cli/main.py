@@ -1,24 +1,112 @@
 """Main CLI entry point for easyDeploy."""
 
+import os
+import sys
+from pathlib import Path
+
 import click
-from rich.console import Console
 
-from easydeploy.cli.gcp import gcp
+from easydeploy.cli.lazy import LazyGroup
+from easydeploy.utils.console import get_console
 
-console = Console()
+# Subcommand groups are imported only when invoked, keeping startup (and
+# `easydeploy --version`) free of rich, cloud SDKs and credential discovery.
+LAZY_SUBCOMMANDS = {
+    "daemon": "easydeploy.cli.daemon:daemon",
+    "gcp": "easydeploy.cli.gcp:gcp",
+    "image": "easydeploy.cli.image:image",
+}
 
 
-@click.group()
+@click.group(cls=LazyGroup, lazy_subcommands=LAZY_SUBCOMMANDS)
 @click.version_option(version="0.1.0", prog_name="easydeploy")
 @click.option("--verbose", "-v", is_flag=True, help="Enable verbose output")
+@click.option(
+    "--set",
+    "overrides",
+    multiple=True,
+    metavar="KEY=VALUE",
+    help="Override a setting for this run, e.g. --set cloud.gcp.zone=us-east1-b",
+)
+@click.option(
+    "--log-json",
+    type=click.Path(dir_okay=False, path_type=Path),
+    envvar="EASYDEPLOY_LOG_JSON",
+    help="Also write every log record, including debug, to this file as NDJSON",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    is_eager=True,
+    expose_value=False,
+    callback=lambda ctx, param, value: _start_profiling(ctx, value),
+    help="Record a Chrome trace of this run and log its slowest operations "
+    "(or set EASYDEPLOY_TRACE=1 or EASYDEPLOY_TRACE=<file>)",
+)
 @click.pass_context
-def main(ctx, verbose):
+def main(ctx, verbose, overrides, log_json):
     """easyDeploy - Automation deployment toolkit for robotics AI development."""
     ctx.ensure_object(dict)
     ctx.obj["verbose"] = verbose
 
+    if verbose or log_json:
+        from easydeploy.utils.logging import setup_logging
+
+        # Replace a setup made by the deploy-gcp / deploy-azure entry points
+        setup_logging(verbose, json_path=log_json, force=log_json is not None)
+
+    if overrides:
+        from easydeploy.config.settings import get_settings
+
+        settings = get_settings()
+        for key, value in _parse_key_values(overrides, "--set").items():
+            settings.override(key, value)
+
     if verbose:
-        console.print("[dim]Verbose mode enabled[/dim]")
+        get_console().print("[dim]Verbose mode enabled[/dim]")
+
+
+def _start_profiling(ctx, profile):
+    """Start tracing for --profile / EASYDEPLOY_TRACE, finishing when the command exits.
+
+    This runs while options are parsed, so the import of lazy subcommands is
+    traced too.
+    """
+    if not (profile or os.environ.get("EASYDEPLOY_TRACE")):
+        return
+
+    from easydeploy.utils import trace
+
+    path = trace.trace_path_from_env()
+    if not (profile or path):
+        return
+
+    import easydeploy
+
+    trace.enable(path, started=easydeploy.IMPORT_STARTED)
+    tracer = trace.get_tracer()
+    started = tracer.now_us()
+
+    def finish():
+        from easydeploy.utils.logging import setup_logging
+
+        command = " ".join(filter(None, ["easydeploy", ctx.invoked_subcommand]))
+        tracer.add(command, "cli", started, tracer.now_us())
+        setup_logging()
+        trace.finish()
+
+    ctx.call_on_close(finish)
+
+
+def _parse_key_values(values, param_hint):
+    """Parse repeated KEY=VALUE options into a dict."""
+    parsed = {}
+    for item in values:
+        key, sep, value = item.partition("=")
+        if not sep or not key:
+            raise click.BadParameter(f"expected KEY=VALUE, got {item!r}", param_hint=param_hint)
+        parsed[key] = value
+    return parsed
 
 
 @main.command()
@@ -30,42 +118,1053 @@ def main(ctx, verbose):
 )
 @click.option("--instance-type", help="Instance type for the VM")
 @click.option("--gpu", is_flag=True, help="Enable GPU support")
-@click.argument("deployment_name")
+@click.option(
+    "--fleet",
+    "fleet_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Fleet manifest (YAML) describing many instances",
+)
+@click.option(
+    "--count",
+    type=click.IntRange(min=1),
+    help="Deploy N identical instances named <deployment_name>-NNN",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=16,
+    show_default=True,
+    help="Maximum instance creations in flight",
+)
+@click.option(
+    "--wait/--no-wait",
+    default=True,
+    show_default=True,
+    help="Wait for the instances to finish being created",
+)
+@click.option(
+    "--wait-ready/--no-wait-ready",
+    default=True,
+    show_default=True,
+    help="Also wait until each instance accepts SSH and has finished provisioning",
+)
+@click.argument("deployment_name", required=False)
 @click.pass_context
-def deploy(ctx, platform, instance_type, gpu, deployment_name):
+def deploy(
+    ctx,
+    platform,
+    instance_type,
+    gpu,
+    fleet_path,
+    count,
+    concurrency,
+    wait,
+    wait_ready,
+    deployment_name,
+):
     """Deploy a new robotics development environment."""
     verbose = ctx.obj.get("verbose", False)
+    console = get_console()
+    manifest = _build_manifest(deployment_name, fleet_path, count, instance_type, gpu)
 
-    console.print(f"[bold green]Deploying {deployment_name}[/bold green]")
+    console.print(f"[bold green]Deploying {manifest['name']}[/bold green]")
     console.print(f"Platform: {platform}")
-    console.print(f"GPU enabled: {gpu}")
+    console.print(f"GPU enabled: {bool(manifest.get('gpu'))}")
+    if manifest["count"] > 1:
+        console.print(f"Instances: {manifest['count']}")
 
     if verbose:
         console.print(f"Instance type: {instance_type}")
 
-    # TODO: Implement deployment logic
-    console.print("[yellow]Deployment functionality not yet implemented[/yellow]")
+    if platform == "azure":
+        results = _deploy_azure(manifest, concurrency, wait, wait_ready)
+    else:
+        results = _deploy_gcp(manifest, concurrency, wait, wait_ready)
+    failed = [result for result in results if result["status"] in ("failed", "unreachable")]
+    state = ("ready" if wait_ready else "running") if wait else "creating"
+    console.print(f"[bold]{len(results) - len(failed)}/{len(results)} instances {state}[/bold]")
+    for result in failed:
+        console.print(f"[red]✗ {result['name']}: {result['error']}[/red]")
+    if failed:
+        sys.exit(1)
+
+
+def _build_manifest(deployment_name, fleet_path, count, instance_type, gpu):
+    """Build a fleet manifest from a deployment name or manifest file and CLI overrides."""
+    from easydeploy.deploy.fleet import load_fleet_manifest
+
+    if fleet_path:
+        try:
+            manifest = load_fleet_manifest(fleet_path)
+        except (OSError, ValueError) as e:
+            raise click.ClickException(str(e)) from e
+        if deployment_name:
+            manifest["name"] = deployment_name
+        if count:
+            manifest["count"] = count
+    elif deployment_name:
+        manifest = {"name": deployment_name, "count": count or 1}
+    else:
+        raise click.UsageError("Provide a DEPLOYMENT_NAME or --fleet manifest")
+
+    if instance_type:
+        manifest["machine_type"] = instance_type
+    if gpu:
+        manifest["gpu"] = True
+    return manifest
+
+
+# GCPManagers with clients already built by `easydeploy daemon`, by
+# (project, region, zone); commands forked from the daemon reuse them
+_warm_managers: dict = {}
+
+
+def _gcp_manager(project_id=None):
+    """Create a GCPManager for the given (or configured, or current gcloud) project."""
+    from easydeploy.cloud.gcp.compute import GCPManager
+    from easydeploy.config.settings import get_settings
+
+    settings = get_settings()
+    project_id = project_id or settings.get("cloud.gcp.project_id")
+    if not project_id:
+        from easydeploy.cloud.gcp.auth import get_current_project
+
+        project_id = get_current_project()
+    if not project_id:
+        raise click.ClickException("No GCP project configured. Run: easydeploy gcp select-project")
+    region, zone = settings.get("cloud.gcp.region"), settings.get("cloud.gcp.zone")
+    warm = _warm_managers.get((project_id, region, zone or f"{region}-a"))
+    return warm or GCPManager(project_id, region=region, zone=zone)
+
+
+def _azure_manager(subscription_id=None):
+    """Create an AzureManager for the given (or configured) subscription."""
+    from easydeploy.cloud.azure.compute import AzureManager
+    from easydeploy.config.settings import get_settings
+
+    settings = get_settings()
+    subscription_id = subscription_id or settings.get("cloud.azure.subscription_id")
+    if not subscription_id:
+        raise click.ClickException(
+            "No Azure subscription configured. Set AZURE_SUBSCRIPTION_ID or "
+            "cloud.azure.subscription_id"
+        )
+    return AzureManager(
+        subscription_id,
+        resource_group=settings.get("cloud.azure.resource_group"),
+        location=settings.get("cloud.azure.location"),
+        virtual_network=settings.get("cloud.azure.virtual_network"),
+        subnet=settings.get("cloud.azure.subnet"),
+    )
+
+
+def _cloud_manager(platform, project_id):
+    """Create the manager for deployments recorded under a platform and project.
+
+    Goes through the same factories as deploy, so recorded deployments are
+    reached with the configured region and location, and through a daemon's
+    warm manager (with its operation tracker) when there is one.
+    """
+    if platform == "azure":
+        return _azure_manager(project_id)
+    return _gcp_manager(project_id)
+
+
+def _provisioning_bundle(platform="gcp", publish=True):
+    """Publish the provisioning scripts and return the template variables locating them.
+
+    Instances download the bundle themselves. So nothing is published until
+    ``provisioning.bundle_store`` names a store they can read. Without one,
+    instances boot without the provisioning scripts.
+
+    Args:
+        platform: Platform whose instances download the bundle
+        publish: Upload the bundle; otherwise only compute where it would be
+    """
+    import subprocess
+
+    from easydeploy.config.settings import get_settings
+    from easydeploy.deploy.bundle import get_bundle_store, locate_bundle, publish_bundle
+
+    console = get_console()
+    location = get_settings().get("provisioning.bundle_store")
+    if not location:
+        console.print(
+            "[yellow]Deploying without provisioning scripts: set provisioning.bundle_store "
+            "to a gs:// or https:// location the instances can read[/yellow]"
+        )
+        return {}
+    if platform == "azure" and location.startswith("gs://"):
+        raise click.ClickException(
+            "Azure VMs cannot download from a gs:// bundle store; "
+            "set provisioning.bundle_store to an https:// location"
+        )
+    try:
+        if not publish:
+            bundle = locate_bundle(store=get_bundle_store(location))
+            return {"bundle_url": bundle["url"], "bundle_sha256": bundle["sha256"]}
+        bundle = publish_bundle(store=get_bundle_store(location))
+    except FileNotFoundError as e:
+        console.print(f"[yellow]Deploying without provisioning scripts: {e}[/yellow]")
+        return {}
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise click.ClickException(f"Could not publish provisioning bundle: {e}") from e
+
+    action = "Uploaded" if bundle["uploaded"] else "Reusing"
+    console.print(f"[dim]{action} provisioning bundle {bundle['sha256'][:12]}[/dim]")
+    return {"bundle_url": bundle["url"], "bundle_sha256": bundle["sha256"]}
+
+
+def _golden_image(manager, bundle_sha256, gpu):
+    """Return the template variables selecting a matching golden image, if one exists."""
+    from easydeploy.deploy.images import ImageBuilder
+
+    console = get_console()
+    builder = ImageBuilder(manager)
+    try:
+        image = builder.find(builder.key(bundle_sha256, gpu))
+    except Exception as e:
+        console.print(f"[yellow]Could not look up golden images: {e}[/yellow]")
+        return {}
+    if not image:
+        console.print(
+            "[dim]No golden image for this software stack; provisioning from scratch[/dim]"
+        )
+        console.print("💡 Run: easydeploy image build" + (" --gpu" if gpu else ""))
+        return {}
+    console.print(f"[dim]Booting from golden image {image['name']}[/dim]")
+    return {"image": image["self_link"]}
+
+
+def _gcp_base_params(manager, manifest, publish=True):
+    """Template variables shared by every instance of a deployment.
+
+    With ``publish`` false (e.g. for ``plan``) the provisioning bundle is
+    located but neither built nor uploaded.
+    """
+    from easydeploy.deploy.fleet import default_instance_params
+
+    base_params = default_instance_params()
+    base_params["project_id"] = manager.project_id
+    base_params.update(_provisioning_bundle(publish=publish))
+    if base_params.get("bundle_sha256"):
+        base_params.update(
+            _golden_image(manager, base_params["bundle_sha256"], bool(manifest.get("gpu")))
+        )
+    return base_params
+
+
+def _azure_base_params(manager, manifest):
+    """Template variables shared by every VM of an Azure deployment."""
+    from easydeploy.config.settings import get_settings
+    from easydeploy.deploy.fleet import default_instance_params
+
+    settings = get_settings()
+    size = "gpu_instance_type" if manifest.get("gpu") else "instance_type"
+    base_params = default_instance_params(settings)
+    base_params.update(
+        project_id=manager.project_id,
+        zone=manager.location,
+        machine_type=settings.get(f"defaults.{size}.azure"),
+        subnet_id=manager.subnet_id,
+    )
+    base_params.update(_provisioning_bundle(platform="azure"))
+    return base_params
+
+
+def _plan_zones(manager, manifest):
+    """Check the deployment's machine and GPU types offline and pick its zones.
+
+    Uses the cached zone catalog. If the preferred zone cannot take the
+    deployment, the manifest is moved to the first zone that can.
+
+    Returns:
+        Zones to fall back to, in order, if creation runs out of capacity
+    """
+    from easydeploy.cloud.gcp.catalog import DEFAULT_GPU_TYPE, ZoneCatalog
+    from easydeploy.config.settings import get_settings
+    from easydeploy.deploy.fleet import default_instance_params, expand_members
+
+    console = get_console()
+    catalog = ZoneCatalog(manager.project_id).ensure(manager)
+    members = expand_members(manifest, default_instance_params())
+    shapes = {
+        (
+            member["machine_type"],
+            member.get("gpu_type") or DEFAULT_GPU_TYPE if member["gpu_enabled"] else None,
+            int(member.get("gpu_count") or 1) if member["gpu_enabled"] else 0,
+        )
+        for member in members
+    }
+    for machine_type, gpu_type, gpu_count in shapes:
+        try:
+            catalog.validate(machine_type, gpu_type, gpu_count)
+        except ValueError as e:
+            raise click.ClickException(str(e)) from e
+
+    zones = {member["zone"] for member in members}
+    if len(shapes) > 1 or len(zones) > 1:
+        return []
+    (zone,), ((machine_type, gpu_type, gpu_count),) = zones, shapes
+    candidates = catalog.candidate_zones(
+        zone,
+        machine_type,
+        gpu_type,
+        gpu_count,
+        count=len(members),
+        fallback_zones=get_settings().get("cloud.gcp.fallback_zones"),
+    )
+    if not candidates:
+        reason = catalog.shortfall(zone, machine_type, gpu_type, gpu_count, len(members))
+        console.print(f"[yellow]{reason}, and no other zone can take it either[/yellow]")
+        return []
+    if candidates[0] != zone:
+        reason = catalog.shortfall(zone, machine_type, gpu_type, gpu_count, len(members))
+        console.print(f"[yellow]{reason}; deploying in {candidates[0]}[/yellow]")
+        manifest["zone"] = candidates[0]
+    return candidates[1:]
+
+
+def _readiness_waiter(base_params):
+    """Create a ReadinessWaiter for new instances, or None if paramiko is missing."""
+    try:
+        from easydeploy.remote.readiness import ReadinessWaiter
+
+        return ReadinessWaiter(
+            username=base_params["deploy_user"],
+            port=base_params["ssh_port"],
+            marker=base_params["ready_marker"],
+        )
+    except RuntimeError as e:
+        get_console().print(f"[yellow]Not waiting for SSH readiness: {e}[/yellow]")
+        return None
+
+
+def _create_firewalls(manager, manifest, base_params):
+    """Start creating the deployment's firewall rules that do not exist yet.
+
+    These are the rules ``plan`` expects (one ``<name>-ssh`` rule, shared by a
+    fleet's members), so a deployed fleet plans clean. Their operations are
+    left running for the caller to track.
+
+    Returns:
+        {rule name: creation result, or {"status": "failed", "error"}}
+    """
+    from easydeploy.deploy.plan import desired_state
+
+    wanted = desired_state(manifest, base_params)["firewalls"]
+    existing = {rule["name"] for rule in manager.list_firewalls(prefix=manifest["name"])}
+    created = {}
+    for name, rule in wanted.items():
+        if name in existing:
+            continue
+        try:
+            created[name] = manager.create_firewall(rule)
+        except Exception as e:
+            created[name] = {"name": name, "status": "failed", "error": str(e)}
+    return created
+
+
+def _deploy_gcp(manifest, concurrency, wait=True, wait_ready=True):
+    """Create a fleet on GCP while showing aggregate progress."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    console = get_console()
+    manager = _gcp_manager()
+    fallback_zones = _plan_zones(manager, manifest)
+    base_params = _gcp_base_params(manager, manifest)
+    # Firewall rules are requested alongside the instances. They only matter
+    # for reaching the instances, so their operations are waited on, long done
+    # by then, only if the instances were waited on to accept SSH.
+    with ThreadPoolExecutor(max_workers=1) as background:
+        firewalls = background.submit(_create_firewalls, manager, manifest, base_params)
+        results = _deploy_fleet(
+            manager, manifest, base_params, concurrency, wait, wait_ready, fallback_zones
+        )
+    try:
+        created = firewalls.result()
+    except Exception as e:
+        console.print(f"[yellow]Could not create firewall rules: {e}[/yellow]")
+        created = {}
+    futures = {
+        name: manager.track(result)
+        for name, result in created.items()
+        if wait and wait_ready and "operation" in result
+    }
+    for name, result in created.items():
+        if name in futures:
+            try:
+                result = {**result, **futures[name].result()}
+            except Exception as e:
+                result = {**result, "status": "failed", "error": str(e)}
+        if result["status"] not in ("creating", "DONE"):
+            console.print(
+                f"[yellow]Could not create firewall rule {name}: {result['error']}[/yellow]"
+            )
+    return results
+
+
+def _deploy_azure(manifest, concurrency, wait=True, wait_ready=True):
+    """Create a fleet on Azure while showing aggregate progress."""
+    manager = _azure_manager()
+    base_params = _azure_base_params(manager, manifest)
+    return _deploy_fleet(manager, manifest, base_params, concurrency, wait, wait_ready)
+
+
+def _deploy_fleet(
+    manager, manifest, base_params, concurrency, wait=True, wait_ready=True, fallback_zones=()
+):
+    """Create a fleet through a cloud manager while showing aggregate progress.
+
+    Args:
+        manager: GCPManager or AzureManager to create the instances with
+        manifest: Parsed fleet manifest
+        base_params: Template variables shared by every instance
+        concurrency: Maximum instance creations in flight
+        wait: Wait for the creation operations to finish
+        wait_ready: Also wait until each instance accepts SSH and is provisioned
+        fallback_zones: Zones to retry instances that ran out of capacity in
+
+    Returns:
+        One result dict per instance
+    """
+    from concurrent.futures import as_completed
+    from functools import partial
+
+    from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn
+
+    from easydeploy.cloud.gcp.catalog import is_capacity_error
+    from easydeploy.deploy.fleet import FleetDeployer, expand_members
+    from easydeploy.deploy.state import StateStore
+
+    store = StateStore()
+    platform = getattr(manager, "platform", "gcp")
+    # Records of members that already exist, restored if their redeploy fails
+    names = {member["deployment_name"] for member in expand_members(manifest, base_params)}
+    previous = {
+        record["name"]: record
+        for record in store.query(platform=platform, project=manager.project_id)
+        if record["name"] in names
+    }
+
+    with Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TextColumn("{task.fields[failed]} failed"),
+        console=get_console(),
+    ) as progress:
+        task = progress.add_task("Creating instances", total=manifest["count"], failed=0)
+        failed = 0
+
+        def on_result(result):
+            nonlocal failed
+            failed += result["status"] == "failed"
+            progress.update(task, advance=1, failed=failed)
+
+        deployer = FleetDeployer(manager, concurrency=concurrency)
+        results = deployer.deploy(manifest, base_params, progress=on_result)
+        _record_deployments(store, manifest, manager.project_id, results, platform, previous)
+        if not wait:
+            return results
+
+        # Operations are tracked concurrently; instances finish in any order
+        creating = sum(result["status"] == "creating" for result in results)
+        wait_task = progress.add_task("Waiting for instances", total=creating, failed=0)
+        failed = 0
+
+        # SSH probing of each instance starts as soon as its operation finishes
+        waiter = _readiness_waiter(base_params) if wait_ready else None
+        probing = {}
+
+        def probe(result):
+            if waiter and result["status"] == "running":
+                address = partial(manager.instance_address, result["name"], result["zone"])
+                host_keys = partial(manager.host_keys, result["name"], result["zone"])
+                probing[waiter.track(result["name"], address, host_keys)] = result
+
+        def on_running(result):
+            nonlocal failed
+            failed += result["status"] == "failed"
+            progress.update(wait_task, advance=1, failed=failed)
+            probe(result)
+
+        deployer.wait(results, progress=on_running)
+
+        # Members that ran out of capacity or quota move on to the next zone
+        members = {
+            member["deployment_name"]: member for member in expand_members(manifest, base_params)
+        }
+        retry_task, retrying = None, 0
+
+        def on_retried(result):
+            nonlocal failed
+            failed += result["status"] == "failed"
+            progress.update(retry_task, advance=1, failed=failed)
+            probe(result)
+
+        for zone in fallback_zones:
+            retry = [
+                result
+                for result in results
+                if result["status"] == "failed" and is_capacity_error(result.get("error"))
+            ]
+            if not retry:
+                break
+            if retry_task is None:
+                retry_task = progress.add_task("Retrying in other zones", total=0, failed=0)
+                failed = 0
+            retrying += len(retry)
+            progress.update(retry_task, total=retrying)
+            progress.console.print(
+                f"[yellow]{len(retry)} instances out of capacity in {retry[0]['zone']}; "
+                f"retrying in {zone}[/yellow]"
+            )
+            retried = deployer.deploy_members(
+                [{**members[result["name"]], "zone": zone} for result in retry]
+            )
+            for result in retried:
+                if result["status"] == "failed":
+                    on_retried(result)
+            deployer.wait(retried, progress=on_retried)
+            by_name = {result["name"]: result for result in retried}
+            results = [by_name.get(result["name"], result) for result in results]
+
+        _record_deployments(store, manifest, manager.project_id, results, platform, previous)
+        if not waiter:
+            return results
+
+        ready_task = progress.add_task("Waiting for SSH", total=len(probing), failed=0)
+        failed = 0
+        for future in as_completed(probing):
+            result, outcome = probing[future], future.result()
+            if outcome["status"] == "ready":
+                result.update(status="ready", host=outcome["host"])
+            else:
+                failed += 1
+                result.update(
+                    status="unreachable",
+                    error=f"not ready at {outcome['stage']} stage: {outcome['error']}",
+                )
+            progress.update(ready_task, advance=1, failed=failed)
+        waiter.shutdown()
+        _record_deployments(store, manifest, manager.project_id, results, platform, previous)
+        return results
+
+
+def _record_deployments(store, manifest, project_id, results, platform="gcp", previous=None):
+    """Save the instances of a deployment to the local state store.
+
+    Instances whose creation failed are dropped from the store, unless they
+    were recorded before this deploy (e.g. a redeploy of a live name failing
+    with "already exists"); those get their earlier record back.
+
+    Args:
+        store: StateStore to write to
+        manifest: Parsed fleet manifest
+        project_id: Project (or subscription) the instances belong to
+        results: Result dict of each instance
+        platform: Cloud platform of the instances
+        previous: Records of the instances from before this deploy, by name
+    """
+    previous = previous or {}
+    failed = [result["name"] for result in results if result["status"] == "failed"]
+    store.upsert_many(
+        {
+            **result,
+            "platform": platform,
+            "project": project_id,
+            "fleet": manifest["name"] if manifest["count"] > 1 else None,
+            "labels": manifest.get("labels") or {},
+        }
+        for result in results
+        if result["status"] != "failed"
+    )
+    store.upsert_many(previous[name] for name in failed if name in previous)
+    store.delete(
+        (name for name in failed if name not in previous), platform=platform, project=project_id
+    )
+
+
+def _manifest_options(func):
+    """Options selecting a deployment's desired state, shared by plan and apply."""
+    func = click.argument("deployment_name", required=False)(func)
+    for option in reversed(
+        [
+            click.option("--instance-type", help="Instance type for the VMs"),
+            click.option("--gpu", is_flag=True, help="Enable GPU support"),
+            click.option(
+                "--fleet",
+                "fleet_path",
+                type=click.Path(exists=True, dir_okay=False, path_type=Path),
+                help="Fleet manifest (YAML) describing many instances",
+            ),
+            click.option(
+                "--count",
+                type=click.IntRange(min=1),
+                help="N identical instances named <deployment_name>-NNN",
+            ),
+        ]
+    ):
+        func = option(func)
+    return func
+
+
+def _plan_gcp(manifest):
+    """Compute the actions converging a deployment, printing them."""
+    from easydeploy.deploy.plan import describe, plan
+
+    console = get_console()
+    manager = _gcp_manager()
+    base_params = _gcp_base_params(manager, manifest, publish=False)
+    actions, desired = plan(manager, manifest, base_params)
+    if not actions:
+        console.print(f"✅ {manifest['name']} is up to date; no changes")
+        return manager, actions, desired
+
+    styles = {"create": "green", "update": "yellow", "replace": "magenta", "delete": "red"}
+    for action in actions:
+        console.print(f"[{styles[action['action']]}]{describe(action)}[/]")
+    counts = {name: 0 for name in styles}
+    for action in actions:
+        counts[action["action"]] += 1
+    summary = ", ".join(f"{count} to {name}" for name, count in counts.items() if count)
+    console.print(f"[bold]Plan: {summary}[/bold]")
+    return manager, actions, desired
+
+
+@main.command(name="plan")
+@_manifest_options
+def plan_(deployment_name, fleet_path, count, instance_type, gpu):
+    """Show what apply would change to converge a deployment."""
+    _plan_gcp(_build_manifest(deployment_name, fleet_path, count, instance_type, gpu))
+
+
+@main.command()
+@_manifest_options
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=16,
+    show_default=True,
+    help="Maximum actions in flight",
+)
+@click.option("--yes", "-y", is_flag=True, help="Apply without asking for confirmation")
+def apply(deployment_name, fleet_path, count, instance_type, gpu, concurrency, yes):
+    """Converge a deployment, changing only what differs from its desired state."""
+    from easydeploy.deploy import plan as planner
+    from easydeploy.deploy.state import StateStore
+
+    console = get_console()
+    manifest = _build_manifest(deployment_name, fleet_path, count, instance_type, gpu)
+    manager, actions, desired = _plan_gcp(manifest)
+    if not actions:
+        return
+    if not yes and not click.confirm("Apply these changes?"):
+        console.print("Cancelled")
+        return
+    if any(
+        action["kind"] == "instance" and action["action"] in ("create", "replace")
+        for action in actions
+    ):
+        # The plan only located the bundle; new instances download it at boot
+        _provisioning_bundle()
+
+    results = planner.apply(
+        manager,
+        actions,
+        desired,
+        concurrency=concurrency,
+        progress=lambda result: console.print(
+            f"{'✓' if result['status'] == 'done' else '[red]✗[/red]'} "
+            f"{result['action']} {result['kind']} {result['name']}"
+        ),
+    )
+
+    # Only instances whose actions succeeded are recorded; failed ones keep their old record
+    store = StateStore()
+    instances = [result for result in results if result["kind"] == "instance"]
+    _record_deployments(
+        store,
+        manifest,
+        manager.project_id,
+        [
+            {
+                "name": result["name"],
+                "zone": result["zone"],
+                "machine_type": desired["instances"][result["name"]]["machine_type"],
+                "gpu_enabled": bool(desired["instances"][result["name"]]["gpu_count"]),
+                "status": "running",
+            }
+            for result in instances
+            if result["status"] == "done" and result["action"] != "delete"
+        ],
+    )
+    store.delete(
+        (
+            result["name"]
+            for result in instances
+            if result["status"] == "done" and result["action"] == "delete"
+        ),
+        platform="gcp",
+        project=manager.project_id,
+    )
+
+    failed = [result for result in results if result["status"] == "failed"]
+    console.print(f"[bold]{len(results) - len(failed)}/{len(results)} changes applied[/bold]")
+    for result in failed:
+        console.print(f"[red]✗ {result['action']} {result['name']}: {result['error']}[/red]")
+    if failed:
+        sys.exit(1)
+
+
+# Seconds per unit of --older-than
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def _parse_duration(ctx, param, value):
+    """Parse a duration such as 90m, 12h or 2d into seconds."""
+    if value is None:
+        return None
+    number, unit = value[:-1], value[-1:].lower()
+    try:
+        seconds = float(number) * DURATION_UNITS[unit]
+    except (KeyError, ValueError):
+        raise click.BadParameter(
+            f"expected a number followed by s, m, h or d (e.g. 12h), got {value!r}"
+        ) from None
+    return seconds
 
 
 @main.command()
-@click.argument("deployment_name")
-def destroy(deployment_name):
-    """Destroy a deployment."""
-    console.print(f"[bold red]Destroying {deployment_name}[/bold red]")
-    # TODO: Implement destroy logic
-    console.print("[yellow]Destroy functionality not yet implemented[/yellow]")
+@click.argument("deployment_name", required=False)
+@click.option("--selector", help="Fleet name, deployment name or KEY=VALUE[,KEY=VALUE] labels")
+@click.option(
+    "--all-matching", is_flag=True, help="Destroy every deployment matching the filters below"
+)
+@click.option("--label", "labels", multiple=True, metavar="KEY=VALUE", help="Filter by label")
+@click.option("--project", help="Only deployments in this project")
+@click.option("--status", help="Only deployments with this status")
+@click.option(
+    "--older-than",
+    metavar="AGE",
+    callback=_parse_duration,
+    help="Only deployments created more than AGE ago, e.g. 12h or 2d",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=16,
+    show_default=True,
+    help="Maximum deletions in flight",
+)
+@click.option("--yes", "-y", is_flag=True, help="Destroy without asking for confirmation")
+def destroy(
+    deployment_name, selector, all_matching, labels, project, status, older_than, concurrency, yes
+):
+    """Destroy deployments and their firewall rules.
+
+    Pass a DEPLOYMENT_NAME (or fleet name), a --selector, or --all-matching
+    with filters, e.g.: easydeploy destroy --all-matching --label sweep=lr --older-than 12h
+    """
+    import time
+
+    from easydeploy.deploy.state import StateStore
+
+    if sum(map(bool, (deployment_name, selector, all_matching))) != 1:
+        raise click.UsageError("Pass exactly one of DEPLOYMENT_NAME, --selector or --all-matching")
+
+    console = get_console()
+    store = StateStore()
+    filters = {"project": project, "status": status, "labels": _parse_key_values(labels, "--label")}
+    if older_than is not None:
+        filters["created_before"] = time.time() - older_than
+    if all_matching:
+        targets = store.query(**filters)
+    else:
+        targets = _select_deployments(store, selector or deployment_name, **filters)
+    if not targets:
+        if deployment_name:
+            console.print(f"[red]No deployment named {deployment_name}[/red]")
+        else:
+            console.print("[red]No deployments match[/red]")
+        console.print("💡 Run: easydeploy list")
+        sys.exit(1)
+
+    # Only a name that is exactly one deployment skips the prompt; a fleet name
+    # or KEY=VALUE labels can match many
+    exact = deployment_name and [record["name"] for record in targets] == [deployment_name]
+    if not exact and not yes:
+        shown = ", ".join(record["name"] for record in targets[:10])
+        more = f" and {len(targets) - 10} more" if len(targets) > 10 else ""
+        console.print(f"Matching deployments: {shown}{more}")
+        if not click.confirm(f"Destroy {len(targets)} deployments?"):
+            console.print("Cancelled")
+            return
+
+    console.print(
+        f"[bold red]Destroying {deployment_name or f'{len(targets)} deployments'}[/bold red]"
+    )
+    from easydeploy.deploy.teardown import teardown
+
+    def progress(result):
+        if result["status"] == "done":
+            console.print(f"[green]✓ {result['kind']} {result['name']} destroyed[/green]")
+        else:
+            console.print(f"[red]✗ {result['kind']} {result['name']}: {result['error']}[/red]")
+
+    by_project = {}
+    for record in targets:
+        by_project.setdefault((record["platform"], record["project"]), []).append(record)
+    for (platform, project_id), records in by_project.items():
+        store.update_status(
+            (record["name"] for record in records),
+            "destroying",
+            platform=platform,
+            project=project_id or "",
+        )
+
+    results, destroyed = [], set()
+    try:
+        for (platform, project_id), records in by_project.items():
+            try:
+                manager = _cloud_manager(platform, project_id)
+                group = teardown(manager, records, concurrency, progress)
+            except Exception as e:
+                console.print(f"[red]✗ {project_id}: {e}[/red]")
+                continue
+            results += group
+            done = [
+                result["name"]
+                for result in group
+                if result["kind"] == "instance" and result["status"] == "done"
+            ]
+            store.delete(done, platform=platform, project=project_id or "")
+            destroyed.update((platform, project_id, name) for name in done)
+    finally:
+        # Deployments that are still there go back to the status they had
+        for (platform, project_id), records in by_project.items():
+            previous = {}
+            for record in records:
+                if (platform, project_id, record["name"]) not in destroyed:
+                    previous.setdefault(record["status"], []).append(record["name"])
+            for status, names in previous.items():
+                store.update_status(names, status, platform=platform, project=project_id or "")
+
+    failed = [result for result in results if result["status"] != "done"]
+    console.print(f"[bold]{len(destroyed)}/{len(targets)} deployments destroyed[/bold]")
+    if failed:
+        console.print(f"[red]{len(failed)} resources could not be deleted:[/red]")
+        for result in failed:
+            console.print(f"[red]✗ {result['kind']} {result['name']}: {result['error']}[/red]")
+    if failed or len(destroyed) < len(targets):
+        sys.exit(1)
 
 
 @main.command()
-def list():
+@click.option("--platform", type=click.Choice(["gcp", "azure"]), help="Only this platform")
+@click.option("--project", help="Only deployments in this project")
+@click.option("--status", help="Only deployments with this status")
+@click.option("--fleet", help="Only members of this fleet")
+@click.option("--label", "labels", multiple=True, metavar="KEY=VALUE", help="Filter by label")
+@click.option(
+    "--live",
+    is_flag=True,
+    help="Query the cloud (GCP, or Azure with --platform azure) instead of local state",
+)
+def list(platform, project, status, fleet, labels, live):
     """List all deployments."""
+    labels = _parse_key_values(labels, "--label")
+    if live:
+        if fleet:
+            labels["fleet"] = fleet
+        manager = _azure_manager(project) if platform == "azure" else _gcp_manager()
+        _list_live(manager, labels, status)
+        return
+
+    from easydeploy.deploy.state import StateStore
+
+    console = get_console()
     console.print("[bold blue]Active deployments:[/bold blue]")
-    # TODO: Implement list logic
-    console.print("[yellow]List functionality not yet implemented[/yellow]")
 
+    records = StateStore().query(
+        platform=platform,
+        project=project,
+        status=status,
+        fleet=fleet,
+        labels=labels,
+    )
+    if not records:
+        console.print("[dim]No deployments found[/dim]")
+        return
+
+    from rich.table import Table
+
+    table = Table(box=None)
+    for column in ("Name", "Platform", "Project", "Zone", "Machine type", "GPU", "Status"):
+        table.add_column(column)
+    for record in records:
+        table.add_row(
+            record["name"],
+            record["platform"],
+            record["project"] or "",
+            record["zone"] or "",
+            record["machine_type"] or "",
+            "yes" if record["gpu_enabled"] else "",
+            record["status"],
+        )
+    console.print(table)
+
+
+# Column widths of the streamed ``list --live`` output
+LIVE_COLUMNS = (
+    ("Name", 32),
+    ("Zone", 16),
+    ("Machine type", 18),
+    ("Status", 12),
+    ("External IP", 15),
+)
+
+
+def _list_live(manager, labels, status=None):
+    """Print a cloud's easyDeploy instances as each result page arrives."""
+    console = get_console()
+    console.print(
+        f"[bold blue]{manager.platform.upper()} instances in {manager.project_id}:[/bold blue]"
+    )
+
+    def line(values):
+        return " ".join(f"{value:<{width}}" for value, (_, width) in zip(values, LIVE_COLUMNS))
+
+    # Rows are printed one by one rather than collected into a table, so the
+    # first page shows up immediately and memory does not grow with the fleet.
+    count = 0
+    for instance in manager.list_instances(labels=labels):
+        if status and instance["status"].lower() != status.lower():
+            continue
+        if count == 0:
+            console.print(line(name for name, _ in LIVE_COLUMNS), style="bold", highlight=False)
+        console.print(
+            line(
+                (
+                    instance["name"],
+                    instance["zone"],
+                    instance["machine_type"],
+                    instance["status"],
+                    instance["external_ip"],
+                )
+            ),
+            highlight=False,
+            markup=False,
+        )
+        count += 1
+
+    if count == 0:
+        console.print("[dim]No instances found[/dim]")
+
+
+def _select_deployments(store, selector, labels=None, **filters):
+    """Resolve a selector to deployment records.
+
+    A selector is a deployment name, a fleet name, or comma-separated
+    KEY=VALUE label pairs that must all match. Extra labels and filters
+    (any ``StateStore.query`` argument) narrow the result.
+    """
+    if "=" in selector:
+        labels = {**(labels or {}), **_parse_key_values(selector.split(","), "SELECTOR")}
+        return store.query(labels=labels, **filters)
+    return store.query(name=selector, labels=labels, **filters) or store.query(
+        fleet=selector, labels=labels, **filters
+    )
+
+
+@main.command(name="exec", context_settings={"ignore_unknown_options": True})
+@click.option("--user", help="SSH user (defaults to the local user)")
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=32,
+    show_default=True,
+    help="Maximum hosts running the command at once",
+)
+@click.option("--timeout", type=float, help="Give up on a host after this many silent seconds")
+@click.argument("selector")
+@click.argument("command", nargs=-1, required=True, type=click.UNPROCESSED)
+def exec_(user, concurrency, timeout, selector, command):
+    """Run COMMAND on every instance matching SELECTOR.
+
+    SELECTOR is a deployment name, a fleet name, or KEY=VALUE[,KEY=VALUE] labels.
+    Use -- before COMMAND, e.g.: easydeploy exec workers -- nvidia-smi. COMMAND's
+    arguments are quoted; run shell syntax with: -- sh -c 'nvidia-smi | head'
+    """
+    import shlex
+    import threading
+
+    from easydeploy.deploy.state import StateStore
+    from easydeploy.remote.ssh import SSHPool
+
+    console = get_console()
+    targets = _select_deployments(StateStore(), selector)
+    if not targets:
+        console.print(f"[red]No deployments match {selector}[/red]")
+        console.print("💡 Run: easydeploy list")
+        sys.exit(1)
+
+    managers = {}
+
+    def manager(platform, project_id):
+        # Built on first use: pinned hosts with a recorded address need no API call
+        if (platform, project_id) not in managers:
+            managers[platform, project_id] = _cloud_manager(platform, project_id)
+        return managers[platform, project_id]
+
+    def lookup(method, record):
+        return lambda: getattr(manager(record["platform"], record["project"]), method)(
+            record["name"], record["zone"]
+        )
+
+    hosts = {}
+    host_keys = {}
+    for record in targets:
+        cloud = record["platform"] in ("gcp", "azure")
+        if record.get("host"):
+            hosts[record["name"]] = record["host"]
+        elif cloud:
+            hosts[record["name"]] = lookup("instance_address", record)
+        else:
+            console.print(f"[yellow]Skipping {record['name']}: no known address[/yellow]")
+            continue
+        if cloud:
+            host_keys[record["name"]] = lookup("host_keys", record)
+
+    width = max(len(name) for name in hosts) if hosts else 0
+    output_lock = threading.Lock()
+
+    def on_output(name, stream, line):
+        with output_lock:
+            click.echo(f"{name:<{width}} | {line}", err=stream == "stderr")
+
+    try:
+        pool = SSHPool(username=user)
+    except RuntimeError as e:
+        raise click.ClickException(str(e)) from e
+    with pool:
+        results = pool.run_many(
+            hosts,
+            shlex.join(command),
+            concurrency=concurrency,
+            on_output=on_output,
+            timeout=timeout,
+            host_keys=host_keys,
+        )
 
-# Register GCP subcommand group
-main.add_command(gcp)
+    failed = [result for result in results if result["exit_code"] != 0]
+    console.print(f"[bold]{len(results) - len(failed)}/{len(targets)} hosts succeeded[/bold]")
+    for result in sorted(failed, key=lambda result: result["name"]):
+        reason = result["error"] or f"exit code {result['exit_code']}"
+        console.print(f"[red]✗ {result['name']}: {reason}[/red]")
+    if failed or len(results) < len(targets):
+        sys.exit(1)
 
 
 if __name__ == "__main__":
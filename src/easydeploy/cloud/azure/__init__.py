@@ -0,0 +1 @@
+"""Microsoft Azure integration."""
@@ -0,0 +1,540 @@
+"""Microsoft Azure virtual machine management."""
+
+import base64
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import Future, InvalidStateError
+from functools import cache
+from typing import Any, Dict, Iterator, Optional
+
+from easydeploy.cloud.provider import CloudProvider
+
+logger = logging.getLogger(__name__)
+
+# Tags azure-instance.yaml.j2 puts on every VM easyDeploy creates
+MANAGED_TAGS = {"easydeploy": "true"}
+
+# Seconds between polls of a long-running operation without a Retry-After header
+POLL_INTERVAL = 5
+
+# HTTP connections kept open to Azure Resource Manager; fleet workers and
+# operation pollers share them
+CONNECTION_POOL_SIZE = 64
+
+# API version of the NICs and public IPs created along with each VM
+NETWORK_API_VERSION = "2023-09-01"
+
+# Longest wait for a network security group to finish provisioning, in seconds
+SECURITY_GROUP_TIMEOUT = 120
+
+
+def _compute_client_class():
+    """Import the Azure SDK, with an install hint if missing."""
+    try:
+        from azure.mgmt.compute import ComputeManagementClient
+    except ImportError as e:
+        raise RuntimeError(
+            "azure-mgmt-compute and azure-identity are required for Azure deployments: "
+            "pip install 'easydeploy[azure]'"
+        ) from e
+    return ComputeManagementClient
+
+
+@cache
+def get_credential():
+    """Get the Azure credential shared by every AzureManager in this process.
+
+    ``DefaultAzureCredential`` caches the tokens it obtains and refreshes them
+    before they expire, so one shared instance means one token for all clients.
+    """
+    _compute_client_class()
+    from azure.identity import DefaultAzureCredential
+
+    return DefaultAzureCredential()
+
+
+def _transport():
+    """HTTP transport with a connection pool large enough for fleet concurrency."""
+    import requests
+    from azure.core.pipeline.transport import RequestsTransport
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=CONNECTION_POOL_SIZE, pool_maxsize=CONNECTION_POOL_SIZE
+    )
+    session.mount("https://", adapter)
+    return RequestsTransport(session=session, session_owner=False)
+
+
+def build_security_group(network: Dict[str, Any], location: str) -> Dict[str, Any]:
+    """Translate a template's network section into a network security group body.
+
+    Args:
+        network: ``instance.network`` of a rendered azure-instance.yaml.j2 document
+        location: Location of the VMs using the group
+
+    Returns:
+        networkSecurityGroups create-or-update request body allowing inbound SSH
+    """
+    return {
+        "location": location,
+        "tags": dict(MANAGED_TAGS),
+        "properties": {
+            "securityRules": [
+                {
+                    "name": "ssh",
+                    "properties": {
+                        "priority": 1000,
+                        "direction": "Inbound",
+                        "access": "Allow",
+                        "protocol": "Tcp",
+                        "sourcePortRange": "*",
+                        "destinationPortRange": str(network.get("ssh_port", 22)),
+                        "sourceAddressPrefixes": sorted(
+                            network.get("allowed_ip_ranges") or ["0.0.0.0/0"]
+                        ),
+                        "destinationAddressPrefix": "*",
+                    },
+                }
+            ]
+        },
+    }
+
+
+def security_group_name(body: Dict[str, Any]) -> str:
+    """Name a security group after its location and rules, so equal ones are shared."""
+    digest = hashlib.sha256(json.dumps(body, sort_keys=True).encode()).hexdigest()
+    return f"easydeploy-ssh-{digest[:10]}"
+
+
+def build_virtual_machine(
+    spec: Dict[str, Any], subnet_id: str, security_group_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """Translate a rendered azure-instance.yaml.j2 document into an ARM VM body.
+
+    The NIC, public IP and OS disk are created with the VM and deleted with it.
+
+    Args:
+        spec: Parsed azure-instance template output
+        subnet_id: Subnet resource ID, if the template names none
+        security_group_id: Network security group of the NIC, e.g. allowing SSH
+
+    Returns:
+        virtualMachines create-or-update request body
+    """
+    instance = spec["instance"]
+    name = instance["name"]
+    image = instance.get("image", {})
+    if image.get("id"):
+        image_reference = {"id": image["id"]}
+    else:
+        image_reference = {key: image[key] for key in ("publisher", "offer", "sku", "version")}
+    os_disk = instance.get("os_disk", {})
+    admin = instance["admin_username"]
+
+    linux = {"disablePasswordAuthentication": True}
+    if instance.get("ssh_public_key"):
+        linux["ssh"] = {
+            "publicKeys": [
+                {
+                    "path": f"/home/{admin}/.ssh/authorized_keys",
+                    "keyData": instance["ssh_public_key"],
+                }
+            ]
+        }
+    os_profile = {"computerName": name, "adminUsername": admin, "linuxConfiguration": linux}
+    if instance.get("custom_data"):
+        os_profile["customData"] = base64.b64encode(instance["custom_data"].encode()).decode()
+
+    network = instance.get("network", {})
+    ip_configuration = {
+        "name": f"{name}-ipconfig",
+        "properties": {"subnet": {"id": network.get("subnet_id") or subnet_id}},
+    }
+    if network.get("public_ip", True):
+        ip_configuration["properties"]["publicIPAddressConfiguration"] = {
+            "name": f"{name}-ip",
+            "sku": {"name": "Standard"},
+            "properties": {"deleteOption": "Delete", "publicIPAllocationMethod": "Static"},
+        }
+    nic = {"primary": True, "deleteOption": "Delete", "ipConfigurations": [ip_configuration]}
+    if security_group_id:
+        nic["networkSecurityGroup"] = {"id": security_group_id}
+
+    return {
+        "location": instance["location"],
+        "tags": {**MANAGED_TAGS, **instance.get("tags", {})},
+        "properties": {
+            "hardwareProfile": {"vmSize": instance["vm_size"]},
+            "storageProfile": {
+                "imageReference": image_reference,
+                "osDisk": {
+                    "createOption": "FromImage",
+                    "deleteOption": "Delete",
+                    "diskSizeGB": int(os_disk.get("size_gb", 100)),
+                    "managedDisk": {"storageAccountType": os_disk.get("type", "StandardSSD_LRS")},
+                },
+            },
+            "osProfile": os_profile,
+            # cloud-init prints the SSH host keys to the serial console, which
+            # boot diagnostics make readable through the API
+            "diagnosticsProfile": {"bootDiagnostics": {"enabled": True}},
+            "networkProfile": {
+                "networkApiVersion": NETWORK_API_VERSION,
+                "networkInterfaceConfigurations": [{"name": f"{name}-nic", "properties": nic}],
+            },
+        },
+    }
+
+
+def vm_info(vm) -> Dict[str, Any]:
+    """Summarize an Azure ``VirtualMachine`` as a plain dict, like GCP's instance_info."""
+    vm_size = vm.hardware_profile.vm_size if vm.hardware_profile else ""
+    return {
+        "name": vm.name,
+        "zone": vm.location,
+        "status": vm.provisioning_state,
+        "machine_type": vm_size,
+        # N-series sizes are the GPU ones
+        "gpu_enabled": vm_size.startswith("Standard_N"),
+        "labels": dict(vm.tags or {}),
+        "external_ip": "",
+    }
+
+
+class AzureManager(CloudProvider):
+    """Manages Microsoft Azure virtual machines for easyDeploy."""
+
+    platform = "azure"
+    instance_template = "azure-instance.yaml.j2"
+
+    def __init__(
+        self,
+        subscription_id: str,
+        resource_group: str = "easydeploy-rg",
+        location: str = "eastus",
+        virtual_network: str = "easydeploy-vnet",
+        subnet: str = "default",
+        credential=None,
+    ):
+        """Initialize Azure manager.
+
+        Args:
+            subscription_id: Azure subscription ID
+            resource_group: Resource group holding the VMs and their network
+            location: Default location for VMs
+            virtual_network: Existing virtual network the VMs join
+            subnet: Subnet of the virtual network
+            credential: Azure credential (defaults to the one shared by the process)
+        """
+        self.subscription_id = subscription_id
+        self.resource_group = resource_group
+        self.location = location
+        self.virtual_network = virtual_network
+        self.subnet = subnet
+        self._credential = credential
+        self._compute_client = None
+        self._pollers: Dict[str, Any] = {}
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        # Security groups known to exist, by name; fleet members share them
+        self._security_groups: Dict[str, str] = {}
+        self._security_group_lock = threading.Lock()
+
+    @property
+    def project_id(self) -> str:
+        """Deployments are recorded under the subscription."""
+        return self.subscription_id
+
+    @property
+    def subnet_id(self) -> str:
+        """Resource ID of the subnet new VMs join."""
+        return (
+            f"/subscriptions/{self.subscription_id}/resourceGroups/{self.resource_group}"
+            f"/providers/Microsoft.Network/virtualNetworks/{self.virtual_network}"
+            f"/subnets/{self.subnet}"
+        )
+
+    @property
+    def compute_client(self):
+        """Lazy-load compute management client."""
+        if self._compute_client is None:
+            logger.info(f"Initializing Azure compute client for {self.subscription_id}")
+            self._compute_client = _compute_client_class()(
+                self._credential or get_credential(),
+                self.subscription_id,
+                transport=_transport(),
+            )
+        return self._compute_client
+
+    def _remember(self, poller, action: str, name: str) -> str:
+        """Keep a long-running operation's poller until it is tracked."""
+        operation = f"{action}-{name}-{uuid.uuid4().hex[:8]}"
+        with self._lock:
+            self._pollers[operation] = poller
+        return operation
+
+    def track(self, result: Dict[str, Any]) -> Future:
+        """Track the operation behind a create/destroy result.
+
+        Each operation is polled by its own SDK poller, so any number of them
+        progress concurrently; the future resolves from the poller's
+        completion callback. Tracking an operation again while it is in
+        flight returns the same future; finished operations are forgotten.
+
+        Args:
+            result: Result of create_instance or destroy_instance
+
+        Returns:
+            Future resolving to {"operation", "zone", "status", "error"}
+        """
+        operation = result["operation"]
+        with self._lock:
+            future = self._futures.get(operation)
+            if future is not None:
+                return future
+            future = self._futures[operation] = Future()
+            poller = self._pollers.pop(operation, None)
+
+        if poller is None:
+            future.set_result(
+                {
+                    "operation": operation,
+                    "zone": result.get("zone"),
+                    "status": "FAILED",
+                    "error": f"Unknown operation {operation}",
+                }
+            )
+            return future
+
+        # The callback runs on the poller's own thread, which result() would
+        # join, so the outcome is collected from a short-lived thread
+        poller.add_done_callback(
+            lambda _: threading.Thread(
+                target=self._finish, args=(result, poller, future), daemon=True
+            ).start()
+        )
+        return future
+
+    def _finish(self, result: Dict[str, Any], poller, future: Future):
+        """Resolve a tracked operation's future from its finished poller."""
+        outcome = {"operation": result["operation"], "zone": result.get("zone")}
+        try:
+            poller.result()
+            outcome.update(status="DONE", error=None)
+        except Exception as e:
+            outcome.update(status="FAILED", error=str(e))
+        # Forgotten before it resolves, so whoever sees the outcome sees no entry
+        with self._lock:
+            if self._futures.get(result["operation"]) is future:
+                del self._futures[result["operation"]]
+        try:
+            future.set_result(outcome)
+        except InvalidStateError:
+            # add_done_callback may fire twice if it races the poller finishing
+            pass
+
+    def _instance_spec(self, name: str, machine_type: str, gpu_enabled: bool, location: str):
+        """Render the default instance template for a single VM."""
+        from easydeploy.deploy.fleet import default_instance_params
+        from easydeploy.deploy.templates import render_yaml
+
+        return render_yaml(
+            self.instance_template,
+            **{
+                **default_instance_params(),
+                "deployment_name": name,
+                "project_id": self.subscription_id,
+                "zone": location,
+                "machine_type": machine_type,
+                "gpu_enabled": gpu_enabled,
+                "subnet_id": self.subnet_id,
+            },
+        )
+
+    def create_instance(
+        self,
+        name: str,
+        machine_type: str = "Standard_D4s_v3",
+        gpu_enabled: bool = False,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Create an Azure virtual machine.
+
+        Args:
+            name: VM name
+            machine_type: Azure VM size
+            gpu_enabled: Whether the VM size has GPUs
+            **kwargs: Additional configuration; ``spec`` is a rendered
+                azure-instance.yaml.j2 document and ``zone`` overrides the location
+
+        Returns:
+            Instance creation result
+        """
+        location = kwargs.get("zone") or self.location
+        spec = kwargs.get("spec") or self._instance_spec(name, machine_type, gpu_enabled, location)
+        location = spec["instance"].get("location") or location
+        spec["instance"]["location"] = location
+        network = spec["instance"].get("network", {})
+        security_group_id = None
+        if network.get("public_ip", True):
+            security_group_id = self.ensure_security_group(network, location)
+        logger.info(f"Creating Azure VM {name} with size {machine_type}", extra={"host": name})
+
+        poller = self.compute_client.virtual_machines.begin_create_or_update(
+            self.resource_group,
+            name,
+            build_virtual_machine(spec, self.subnet_id, security_group_id),
+            polling_interval=POLL_INTERVAL,
+        )
+        return {
+            "name": name,
+            "status": "creating",
+            "machine_type": machine_type,
+            "gpu_enabled": gpu_enabled,
+            "zone": location,
+            "operation": self._remember(poller, "create", name),
+        }
+
+    def destroy_instance(self, name: str, zone: Optional[str] = None) -> Dict[str, Any]:
+        """Destroy an Azure virtual machine with its disk, NIC and public IP.
+
+        Args:
+            name: VM name
+            zone: Location of the VM (VM names are unique per resource group)
+
+        Returns:
+            Destruction result
+        """
+        logger.info(f"Destroying Azure VM {name}", extra={"host": name})
+
+        poller = self.compute_client.virtual_machines.begin_delete(
+            self.resource_group, name, polling_interval=POLL_INTERVAL
+        )
+        return {
+            "name": name,
+            "status": "destroying",
+            "zone": zone or self.location,
+            "operation": self._remember(poller, "delete", name),
+        }
+
+    def get_instance(self, name: str, zone: Optional[str] = None) -> Dict[str, Any]:
+        """Get information about one VM.
+
+        Args:
+            name: VM name
+            zone: Location of the VM (unused; VM names are unique per resource group)
+
+        Returns:
+            Instance information
+        """
+        return vm_info(self.compute_client.virtual_machines.get(self.resource_group, name))
+
+    def _arm_get(self, resource_id: str) -> Dict[str, Any]:
+        """GET a network resource through the compute client's authenticated pipeline."""
+        return self._arm_request("GET", resource_id)
+
+    def _arm_request(
+        self, method: str, resource_id: str, body: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Send a network resource request through the compute client's pipeline."""
+        from azure.core.rest import HttpRequest
+
+        response = self.compute_client.send_request(
+            HttpRequest(method, resource_id, params={"api-version": NETWORK_API_VERSION}, json=body)
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def ensure_security_group(self, network: Dict[str, Any], location: str) -> str:
+        """Create (or reuse) the network security group letting SSH reach VMs.
+
+        Standard public IPs deny all inbound traffic without one. Groups are
+        named after their rules, so every VM with the same SSH port and
+        allowed ranges shares one, and it is kept when the VMs are destroyed.
+
+        Args:
+            network: ``instance.network`` of a rendered azure-instance.yaml.j2 document
+            location: Location of the VM
+
+        Returns:
+            Resource ID of the security group
+
+        Raises:
+            RuntimeError: If the group does not finish provisioning
+        """
+        body = build_security_group(network, location)
+        name = security_group_name(body)
+        resource_id = (
+            f"/subscriptions/{self.subscription_id}/resourceGroups/{self.resource_group}"
+            f"/providers/Microsoft.Network/networkSecurityGroups/{name}"
+        )
+        with self._security_group_lock:
+            if name in self._security_groups:
+                return self._security_groups[name]
+
+            logger.info(f"Creating Azure network security group {name}")
+            group = self._arm_request("PUT", resource_id, body)
+            deadline = time.monotonic() + SECURITY_GROUP_TIMEOUT
+            while group["properties"].get("provisioningState") != "Succeeded":
+                if group["properties"].get("provisioningState") == "Failed":
+                    raise RuntimeError(f"Network security group {name} failed to provision")
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"Network security group {name} is still provisioning")
+                time.sleep(1)
+                group = self._arm_get(resource_id)
+            self._security_groups[name] = resource_id
+            return resource_id
+
+    def instance_address(self, name: str, zone: Optional[str] = None) -> str:
+        """Get the address to reach a VM at: its public IP, else its private IP."""
+        vm = self.compute_client.virtual_machines.get(self.resource_group, name)
+        nic = self._arm_get(vm.network_profile.network_interfaces[0].id)
+        ip_configuration = nic["properties"]["ipConfigurations"][0]["properties"]
+        public_ip = ip_configuration.get("publicIPAddress")
+        if public_ip:
+            address = self._arm_get(public_ip["id"])["properties"].get("ipAddress")
+            if address:
+                return address
+        return ip_configuration.get("privateIPAddress", "")
+
+    def host_keys(self, name: str, zone: Optional[str] = None) -> list[str]:
+        """Get the SSH host keys cloud-init printed to the VM's serial console.
+
+        Args:
+            name: VM name
+            zone: Location of the VM (unused; VM names are unique per resource group)
+
+        Returns:
+            "<key type> <base64>" lines; none until cloud-init has printed them
+        """
+        import urllib.request
+
+        from easydeploy.remote.ssh import parse_host_keys
+
+        data = self.compute_client.virtual_machines.retrieve_boot_diagnostics_data(
+            self.resource_group, name
+        )
+        with urllib.request.urlopen(data.serial_console_log_blob_uri, timeout=30) as response:
+            return parse_host_keys(response.read().decode(errors="replace"))
+
+    def list_instances(self, labels: Optional[Dict[str, str]] = None) -> Iterator[Dict[str, Any]]:
+        """List easyDeploy VMs in the resource group.
+
+        Args:
+            labels: Extra tag key/value pairs VMs must carry
+
+        Yields:
+            Instance information dicts
+        """
+        logger.info(f"Listing Azure VMs in {self.resource_group}")
+
+        wanted = {**MANAGED_TAGS, **(labels or {})}
+        for vm in self.compute_client.virtual_machines.list(self.resource_group):
+            tags = vm.tags or {}
+            if all(tags.get(key) == value for key, value in wanted.items()):
+                yield vm_info(vm)
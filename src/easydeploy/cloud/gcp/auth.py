@@ -8,15 +8,30 @@ Features:
 - Browser-based OAuth2 authentication flow
 - Token storage and management
 - Authentication validation for GCP operations
+- In-process credential resolution, with gcloud as a fallback
 
 Author: Claude (AI Assistant)
 Created: 2025-09-06
 """
 
+import asyncio
 import json
 import os
 import subprocess
-from typing import Optional
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Optional
+
+from easydeploy.cloud.gcp.credentials import CredentialProvider, is_rejected
+from easydeploy.utils import trace
+
+# Treat cached tokens as expired this many seconds early so callers never
+# receive a token that lapses mid-request.
+SESSION_EXPIRY_SKEW = 60
+
+# In-process copy of the on-disk session, keyed by the file's mtime.
+_session_memo: Optional[tuple[float, dict]] = None
 
 
 def get_token_path() -> str:
@@ -30,19 +45,148 @@ def get_token_path() -> str:
     return os.path.join(easydeploy_dir, "gcp-token.json")
 
 
+def _parse_expiry(value: str) -> float:
+    """Convert a gcloud RFC 3339 token expiry into a POSIX timestamp."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def load_session() -> Optional[dict]:
+    """
+    Load the cached GCP session if it is still within the token lifetime.
+
+    Returns:
+        dict: Session with 'access_token', 'expiry', 'account' and 'project',
+        or None if no valid session is cached
+    """
+    global _session_memo
+
+    path = get_token_path()
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        _session_memo = None
+        return None
+
+    if _session_memo is not None and _session_memo[0] == mtime:
+        session = _session_memo[1]
+    else:
+        try:
+            with open(path) as f:
+                session = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        _session_memo = (mtime, session)
+
+    if session.get("expiry", 0) - SESSION_EXPIRY_SKEW <= time.time():
+        return None
+    if is_rejected(session.get("access_token")):
+        return None
+    return session
+
+
+def save_session(
+    access_token: str, expiry: float, account: Optional[str], project: Optional[str] = None
+) -> dict:
+    """
+    Persist a GCP session to the token cache.
+
+    Args:
+        access_token: OAuth2 access token
+        expiry: Token expiry as a POSIX timestamp
+        account: Active gcloud account
+        project: Active gcloud project, if known
+
+    Returns:
+        dict: The session that was written
+    """
+    global _session_memo
+
+    session = {
+        "access_token": access_token,
+        "expiry": expiry,
+        "account": account,
+        "project": project,
+    }
+    path = get_token_path()
+
+    # Write to a private temp file and rename so readers never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".gcp-token-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(session, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        return session
+
+    _session_memo = (os.stat(path).st_mtime, session)
+    return session
+
+
+def invalidate_session() -> None:
+    """Discard the cached GCP session, e.g. after login or logout."""
+    global _session_memo
+
+    _session_memo = None
+    try:
+        os.unlink(get_token_path())
+    except FileNotFoundError:
+        pass
+
+
+def _session_from_helper(output: str) -> dict:
+    """Parse `gcloud config config-helper --format=json` output and cache the session."""
+    helper = json.loads(output)
+    credential = helper["credential"]
+    core = helper.get("configuration", {}).get("properties", {}).get("core", {})
+    return save_session(
+        credential["access_token"],
+        _parse_expiry(credential["token_expiry"]),
+        core.get("account"),
+        core.get("project"),
+    )
+
+
+def _fetch_native_session() -> Optional[dict]:
+    """Resolve and cache a session in-process, without forking gcloud."""
+    session = CredentialProvider().get_session(min_expiry=time.time() + SESSION_EXPIRY_SKEW)
+    return save_session(**session) if session is not None else None
+
+
+def _fetch_session() -> Optional[dict]:
+    """
+    Resolve the current token, expiry, account and project and cache them.
+
+    Credentials are resolved in-process first; gcloud is only forked when the
+    provider cannot answer (e.g. no HTTP transport for a token refresh).
+
+    Returns:
+        dict: Freshly cached session, or None if no valid credentials exist
+    """
+    session = _fetch_native_session()
+    if session is not None:
+        return session
+
+    command = ["gcloud", "config", "config-helper", "--format=json"]
+    try:
+        result = trace.run(command, capture_output=True, text=True, check=True)
+        if is_rejected(json.loads(result.stdout)["credential"]["access_token"]):
+            # gcloud is still serving the token an API just rejected
+            result = trace.run(
+                [*command, "--force-auth-refresh"], capture_output=True, text=True, check=True
+            )
+        return _session_from_helper(result.stdout)
+    except (subprocess.CalledProcessError, FileNotFoundError, KeyError, TypeError, ValueError):
+        # json.JSONDecodeError is a ValueError subclass
+        return None
+
+
 def is_authenticated() -> bool:
     """Check if user is currently authenticated with GCP."""
-    try:
-        # Check if gcloud user credentials exist
-        subprocess.run(
-            ["gcloud", "auth", "print-access-token"],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
+    if load_session() is not None:
         return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
+    return _fetch_session() is not None
 
 
 def authenticate() -> bool:
@@ -56,10 +200,11 @@ def authenticate() -> bool:
         # Use gcloud auth login with --no-launch-browser for WSL compatibility
         print("🌐 Starting GCP authentication...")
         print("💡 Please copy the URL and open it in your browser manually")
-        subprocess.run(
+        trace.run(
             ["gcloud", "auth", "login", "--no-launch-browser"],
             check=True,
         )
+        invalidate_session()
 
         print("✅ GCP authentication successful!")
         return True
@@ -81,6 +226,10 @@ def load_credentials() -> Optional[dict]:
     Returns:
         dict: Credentials dictionary if available, None otherwise
     """
+    adc = CredentialProvider().application_default()
+    if adc is not None:
+        return {"credentials": adc[0], "project": adc[1]}
+
     try:
         from google.auth import default
 
@@ -92,21 +241,28 @@ def load_credentials() -> Optional[dict]:
 
 def refresh_token() -> bool:
     """
-    Refresh the current authentication token.
+    Refresh the access token shared by every GCPManager in this process.
+
+    Concurrent calls share a single refresh (see ``tokens.TokenManager``).
 
     Returns:
         bool: True if refresh successful, False otherwise
     """
+    from easydeploy.cloud.gcp.tokens import get_token_manager
+
     try:
-        subprocess.run(
-            ["gcloud", "auth", "application-default", "print-access-token"],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
+        get_token_manager().refresh().result()
+    except RuntimeError:
         return False
+    return True
+
+
+def _parse_projects(output: str) -> list:
+    """Parse `gcloud projects list --format=json` output."""
+    return [
+        {"project_id": project["projectId"], "name": project.get("name", project["projectId"])}
+        for project in json.loads(output)
+    ]
 
 
 def list_projects() -> list:
@@ -117,18 +273,14 @@ def list_projects() -> list:
         list: List of project dictionaries with 'project_id' and 'name'
     """
     try:
-        result = subprocess.run(
+        result = trace.run(
             ["gcloud", "projects", "list", "--format=json"],
             capture_output=True,
             text=True,
             check=True,
         )
 
-        projects = json.loads(result.stdout)
-        return [
-            {"project_id": project["projectId"], "name": project.get("name", project["projectId"])}
-            for project in projects
-        ]
+        return _parse_projects(result.stdout)
     except (subprocess.CalledProcessError, FileNotFoundError, json.JSONDecodeError):
         return []
 
@@ -144,17 +296,45 @@ def set_project(project_id: str) -> bool:
         bool: True if project set successfully, False otherwise
     """
     try:
-        subprocess.run(
+        trace.run(
             ["gcloud", "config", "set", "project", project_id],
             capture_output=True,
             text=True,
             check=True,
         )
+        # The cached session records the active project, so it is now stale
+        invalidate_session()
         return True
     except (subprocess.CalledProcessError, FileNotFoundError):
         return False
 
 
+def _parse_project_value(output: str) -> Optional[str]:
+    """Parse `gcloud config get-value project` output."""
+    project_id = output.strip()
+    return project_id if project_id and project_id != "(unset)" else None
+
+
+def _local_project() -> tuple[bool, Optional[str]]:
+    """
+    Resolve the current project without forking gcloud.
+
+    Returns:
+        tuple: (resolved, project_id); resolved is False if gcloud must be asked
+    """
+    # gcloud's active configuration wins: the project may have been changed
+    # with `gcloud config set project` since the session was cached
+    provider = CredentialProvider()
+    project_id = provider.get_project() if provider.available else None
+    if project_id:
+        return True, project_id
+
+    session = load_session()
+    if session is not None and session.get("project"):
+        return True, session["project"]
+    return provider.available, None
+
+
 def get_current_project() -> Optional[str]:
     """
     Get the current GCP project ID.
@@ -162,14 +342,103 @@ def get_current_project() -> Optional[str]:
     Returns:
         str: Current project ID if set, None otherwise
     """
+    resolved, project_id = _local_project()
+    if resolved:
+        return project_id
+
     try:
-        result = subprocess.run(
+        result = trace.run(
             ["gcloud", "config", "get-value", "project"],
             capture_output=True,
             text=True,
             check=True,
         )
-        project_id = result.stdout.strip()
-        return project_id if project_id and project_id != "(unset)" else None
+        return _parse_project_value(result.stdout)
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+
+
+# Async API
+#
+# Coroutine counterparts of the lookups above, built on
+# asyncio.create_subprocess_exec so that independent gcloud calls can run at
+# the same time. Use run_concurrently() to drive them from synchronous code.
+
+
+async def _run_gcloud_async(*args: str) -> str:
+    """
+    Run a gcloud command without blocking the event loop.
+
+    Args:
+        *args: Arguments passed to gcloud
+
+    Returns:
+        str: Captured stdout
+
+    Raises:
+        subprocess.CalledProcessError: If gcloud exits non-zero
+        FileNotFoundError: If gcloud is not installed
+    """
+    with trace.span(" ".join(["gcloud", *args[:2]]), "subprocess", argv=" ".join(args)):
+        process = await asyncio.create_subprocess_exec(
+            "gcloud",
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(
+            process.returncode, ["gcloud", *args], stdout.decode(), stderr.decode()
+        )
+    return stdout.decode()
+
+
+async def is_authenticated_async() -> bool:
+    """Async version of is_authenticated()."""
+    if load_session() is not None:
+        return True
+    # The same lookup as the sync check, including its retry past a rejected token
+    return await asyncio.to_thread(_fetch_session) is not None
+
+
+async def list_projects_async() -> list:
+    """Async version of list_projects()."""
+    try:
+        return _parse_projects(await _run_gcloud_async("projects", "list", "--format=json"))
+    except (subprocess.CalledProcessError, FileNotFoundError, json.JSONDecodeError):
+        return []
+
+
+async def get_current_project_async() -> Optional[str]:
+    """Async version of get_current_project()."""
+    resolved, project_id = _local_project()
+    if resolved:
+        return project_id
+
+    try:
+        return _parse_project_value(await _run_gcloud_async("config", "get-value", "project"))
     except (subprocess.CalledProcessError, FileNotFoundError):
         return None
+
+
+def run_concurrently(*coroutines: Awaitable[Any]) -> list:
+    """
+    Run independent coroutines at the same time from synchronous code.
+
+    Args:
+        *coroutines: Coroutines to await together
+
+    Returns:
+        list: Results in the order the coroutines were given
+
+    Example:
+        authenticated, projects = run_concurrently(
+            is_authenticated_async(), list_projects_async()
+        )
+    """
+
+    async def gather():
+        return await asyncio.gather(*coroutines)
+
+    return asyncio.run(gather())
@@ -0,0 +1,356 @@
+"""
+Local catalog of GCP machine types, GPU accelerators and regional quotas.
+
+Keeps what every zone offers in ``~/.easydeploy/gcp-catalog-<project>.json``
+so ``deploy`` can check ``--instance-type`` and choose a zone with capacity
+without an API round-trip. Like the project catalog, it is served
+stale-while-revalidate: once it is older than its TTL the cached entries are
+still used while a detached process refreshes the file.
+
+Run ``python -m easydeploy.cloud.gcp.catalog <project>`` to refresh it by hand.
+"""
+
+import difflib
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+from easydeploy.cloud.gcp.auth import get_token_path
+
+logger = logging.getLogger(__name__)
+
+# Serve the cached catalog without revalidating for this long
+CATALOG_TTL = 24 * 3600
+
+# A refresh lock older than this is assumed to belong to a dead process
+REFRESH_LOCK_TIMEOUT = 600
+
+# Accelerator gcp-instance.yaml.j2 attaches when a GPU deploy names none
+DEFAULT_GPU_TYPE = "nvidia-tesla-t4"
+
+# Machine families whose vCPUs count against the generic CPUS quota
+GENERIC_CPU_FAMILIES = ("n1", "f1", "g1")
+
+# Operation errors meaning the zone, not the request, is the problem
+CAPACITY_ERRORS = (
+    "ZONE_RESOURCE_POOL_EXHAUSTED",
+    "QUOTA_EXCEEDED",
+    "does not have enough resources available",
+    "Quota '",
+)
+
+
+def get_catalog_path(project_id: str) -> str:
+    """Get the path of the on-disk catalog of a project."""
+    return os.path.join(os.path.dirname(get_token_path()), f"gcp-catalog-{project_id}.json")
+
+
+def region_of(zone: str) -> str:
+    """Region of a zone, e.g. "us-central1" for "us-central1-a"."""
+    return zone.rsplit("-", 1)[0]
+
+
+def cpu_quota_metric(machine_type: str) -> str:
+    """Regional quota metric counting the vCPUs of a machine type."""
+    family = machine_type.split("-", 1)[0]
+    return "CPUS" if family in GENERIC_CPU_FAMILIES else f"{family.upper()}_CPUS"
+
+
+def gpu_quota_metric(gpu_type: str) -> str:
+    """Regional quota metric counting GPUs of a type, e.g. NVIDIA_T4_GPUS."""
+    model = gpu_type.removeprefix("nvidia-").removeprefix("tesla-")
+    return f"NVIDIA_{model.upper().replace('-', '_')}_GPUS"
+
+
+def is_capacity_error(error: Optional[str]) -> bool:
+    """Whether an instance creation error means the zone is out of capacity or quota."""
+    return bool(error) and any(marker in error for marker in CAPACITY_ERRORS)
+
+
+class ZoneCatalog:
+    """Disk-backed index, by zone, of machine types, accelerators and quotas."""
+
+    def __init__(self, project_id: str, path: Optional[str] = None, ttl: float = CATALOG_TTL):
+        """Initialize zone catalog.
+
+        Args:
+            project_id: GCP project whose offerings and quotas are cataloged
+            path: Catalog file (defaults to ~/.easydeploy/gcp-catalog-<project>.json)
+            ttl: Seconds before the catalog is revalidated
+        """
+        self.project_id = project_id
+        self.path = path or get_catalog_path(project_id)
+        self.ttl = ttl
+        self._data: Optional[Dict[str, Any]] = None
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the catalog was last refreshed, or None if it does not exist."""
+        try:
+            return time.time() - os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def is_stale(self) -> bool:
+        """Whether the catalog is missing or older than its TTL."""
+        age = self.age
+        return age is None or age > self.ttl
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """The catalog: {"zones": {zone: {...}}, "quotas": {region: {...}}}."""
+        if self._data is None:
+            try:
+                with open(self.path) as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError):
+                self._data = {"zones": {}, "quotas": {}}
+        return self._data
+
+    @property
+    def zones(self) -> Dict[str, Dict[str, Any]]:
+        """Offerings by zone: {"machine_types": {name: [cpus, memory_mb]}, "accelerators": {name: max}}."""
+        return self.data["zones"]
+
+    def refresh(self, manager) -> int:
+        """
+        Re-fetch offerings and quotas from GCP and atomically replace the catalog.
+
+        Args:
+            manager: GCPManager of the project
+
+        Returns:
+            int: Number of zones written, or -1 if the refresh failed
+        """
+        try:
+            zones: Dict[str, Dict[str, Any]] = {}
+
+            def zone(name):
+                return zones.setdefault(name, {"machine_types": {}, "accelerators": {}})
+
+            for machine_type in manager.list_machine_types():
+                zone(machine_type["zone"])["machine_types"][machine_type["name"]] = [
+                    machine_type["cpus"],
+                    machine_type["memory_mb"],
+                ]
+            for accelerator in manager.list_accelerator_types():
+                zone(accelerator["zone"])["accelerators"][accelerator["name"]] = accelerator[
+                    "max_per_instance"
+                ]
+            quotas = {
+                region["name"]: {
+                    metric: [quota["limit"], quota["usage"]]
+                    for metric, quota in region["quotas"].items()
+                }
+                for region in manager.list_regions()
+            }
+        except Exception as e:
+            logger.debug(f"Zone catalog refresh failed: {e}")
+            return -1
+
+        data = {"zones": zones, "quotas": quotas}
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".gcp-catalog-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.debug(f"Could not write zone catalog: {e}")
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return -1
+        self._data = data
+        return len(zones)
+
+    def _acquire_refresh_lock(self) -> bool:
+        """Claim the refresh lock so only one background refresh runs at a time."""
+        lock_path = f"{self.path}.lock"
+        try:
+            if time.time() - os.stat(lock_path).st_mtime > REFRESH_LOCK_TIMEOUT:
+                os.unlink(lock_path)
+        except OSError:
+            pass
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600))
+            return True
+        except FileExistsError:
+            return False
+
+    def refresh_in_background(self) -> bool:
+        """
+        Start a detached process that refreshes the catalog.
+
+        Returns:
+            bool: True if a refresh was started, False if one is already running
+        """
+        if not self._acquire_refresh_lock():
+            return False
+        subprocess.Popen(
+            [sys.executable, "-m", "easydeploy.cloud.gcp.catalog", self.project_id, self.path],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        return True
+
+    def ensure(self, manager, refresh: bool = False) -> "ZoneCatalog":
+        """
+        Make the catalog available, refreshing it stale-while-revalidate.
+
+        A missing catalog (or ``refresh=True``) is fetched synchronously; a
+        stale one is used as-is while a background refresh runs. If fetching
+        fails, the catalog stays empty and nothing is validated.
+
+        Args:
+            manager: GCPManager of the project
+            refresh: Force a synchronous refresh first
+
+        Returns:
+            The catalog itself
+        """
+        if refresh or self.age is None:
+            self.refresh(manager)
+        elif self.is_stale():
+            self.refresh_in_background()
+        return self
+
+    def validate(self, machine_type: str, gpu_type: Optional[str] = None, gpu_count: int = 0):
+        """
+        Check that a machine type (and GPU) exists in some zone.
+
+        An empty catalog accepts everything.
+
+        Args:
+            machine_type: Machine type name, e.g. "n1-standard-4"
+            gpu_type: Accelerator type, if GPUs are attached
+            gpu_count: GPUs per instance
+
+        Raises:
+            ValueError: If no zone offers the machine type or GPU, with suggestions
+        """
+        if not self.zones:
+            return
+        known = {name for offer in self.zones.values() for name in offer["machine_types"]}
+        if machine_type not in known:
+            raise ValueError(_unknown("machine type", machine_type, known))
+        if gpu_type:
+            limits = [
+                offer["accelerators"][gpu_type]
+                for offer in self.zones.values()
+                if gpu_type in offer["accelerators"]
+            ]
+            if not limits:
+                known = {name for offer in self.zones.values() for name in offer["accelerators"]}
+                raise ValueError(_unknown("GPU type", gpu_type, known))
+            if gpu_count > max(limits):
+                raise ValueError(f"{gpu_type} allows at most {max(limits)} GPUs per instance")
+
+    def _quota_left(self, region: str, metric: str) -> Optional[float]:
+        """Unused quota of a metric in a region, or None if unknown."""
+        quota = self.data["quotas"].get(region, {}).get(metric)
+        return quota[0] - quota[1] if quota else None
+
+    def shortfall(
+        self,
+        zone: str,
+        machine_type: str,
+        gpu_type: Optional[str] = None,
+        gpu_count: int = 0,
+        count: int = 1,
+    ) -> Optional[str]:
+        """
+        Explain why a zone cannot take ``count`` instances, if it cannot.
+
+        Only what the catalog knows is checked; unknown zones and quotas pass.
+
+        Returns:
+            Reason, or None if the zone looks able to take the instances
+        """
+        offer = self.zones.get(zone)
+        if offer is None:
+            return None
+        cpus = offer["machine_types"].get(machine_type)
+        if cpus is None:
+            return f"{zone} does not offer {machine_type}"
+        if gpu_type and gpu_type not in offer["accelerators"]:
+            return f"{zone} does not offer {gpu_type}"
+
+        needed = [(cpu_quota_metric(machine_type), cpus[0] * count)]
+        if gpu_type:
+            needed.append((gpu_quota_metric(gpu_type), gpu_count * count))
+        for metric, amount in needed:
+            left = self._quota_left(region_of(zone), metric)
+            if left is not None and left < amount:
+                return f"{region_of(zone)} has {left:g} {metric} quota left, {amount:g} needed"
+        return None
+
+    def candidate_zones(
+        self,
+        zone: str,
+        machine_type: str,
+        gpu_type: Optional[str] = None,
+        gpu_count: int = 0,
+        count: int = 1,
+        fallback_zones: Optional[list[str]] = None,
+    ) -> list[str]:
+        """
+        Zones to try, in order, for instances preferring ``zone``.
+
+        Without explicit fallback zones, the other zones of the same region
+        come first, then zones of the same geography (e.g. every "us-" zone).
+        Zones the catalog shows cannot take the instances are left out.
+
+        Args:
+            zone: Preferred zone
+            machine_type: Machine type of the instances
+            gpu_type: Accelerator type, if GPUs are attached
+            gpu_count: GPUs per instance
+            count: Number of instances
+            fallback_zones: Zones to fall back to, in order, instead of nearby ones
+
+        Returns:
+            Candidate zones, best first
+        """
+        if fallback_zones is None:
+            region, geography = region_of(zone), zone.split("-", 1)[0]
+            others = sorted(self.zones, key=lambda name: (region_of(name) != region, name))
+            fallback_zones = [name for name in others if name.split("-", 1)[0] == geography]
+        candidates = [zone] + [name for name in fallback_zones if name != zone]
+        return [
+            name
+            for name in candidates
+            if self.shortfall(name, machine_type, gpu_type, gpu_count, count) is None
+        ]
+
+
+def _unknown(kind: str, value: str, known: set) -> str:
+    """Error message for an unknown machine or GPU type, with close matches."""
+    message = f"Unknown {kind} {value!r}"
+    matches = difflib.get_close_matches(value, sorted(known), n=3)
+    return f"{message}; did you mean {', '.join(matches)}?" if matches else message
+
+
+def main():
+    """Refresh a project's catalog; used by background revalidation."""
+    from easydeploy.cloud.gcp.compute import GCPManager
+
+    catalog = ZoneCatalog(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+    try:
+        catalog.refresh(GCPManager(catalog.project_id))
+    finally:
+        try:
+            os.unlink(f"{catalog.path}.lock")
+        except FileNotFoundError:
+            pass
+
+
+if __name__ == "__main__":
+    main()
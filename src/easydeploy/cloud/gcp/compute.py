@@ -1,33 +1,416 @@
 """Google Cloud Platform integration."""
 
 import logging
-from typing import Any, Dict
+import re
+from concurrent.futures import Future
+from typing import Any, Dict, Iterator, Optional
+
+from easydeploy.cloud.provider import CloudProvider
+from easydeploy.utils import trace
 
 logger = logging.getLogger(__name__)
 
+# Largest number of instances requested in one bulkInsert call
+BULK_INSERT_MAX = 1000
+
+# Instances requested per aggregatedList page
+LIST_PAGE_SIZE = 500
+
+# Labels gcp-instance.yaml.j2 puts on every instance easyDeploy creates
+MANAGED_LABELS = {"easydeploy": "true"}
+
+# Seconds to wait for a global image operation
+IMAGE_OPERATION_TIMEOUT = 1800
+
+
+def _compute_v1():
+    """Import the Compute Engine client library, with an install hint if missing."""
+    try:
+        from google.cloud import compute_v1
+    except ImportError as e:
+        raise RuntimeError(
+            "google-cloud-compute is required for GCP deployments: pip install 'easydeploy[gcp]'"
+        ) from e
+    return compute_v1
+
+
+def _client(name: str, credentials=None):
+    """Create a Compute API client whose calls show up in ``--profile`` traces."""
+    with trace.span(f"compute_v1.{name}()", "api"):
+        client = getattr(_compute_v1(), name)(credentials=credentials)
+    return trace.traced_client(client, name)
+
+
+def _boot_image(boot_disk: Dict[str, Any]) -> str:
+    """Source image of a template boot disk: a golden image, else the image family."""
+    return boot_disk.get("image") or (
+        f"projects/{boot_disk.get('image_project', 'ubuntu-os-cloud')}"
+        f"/global/images/family/{boot_disk.get('image_family', 'ubuntu-2204-lts')}"
+    )
+
+
+def _instance_fields(spec: Dict[str, Any], zone_qualified: bool) -> Dict[str, Any]:
+    """Translate a rendered gcp-instance.yaml.j2 document into Compute API fields.
+
+    Args:
+        spec: Parsed gcp-instance template output
+        zone_qualified: Use zone-relative resource URLs (instances.insert) rather
+            than bare names (bulkInsert instance properties)
+
+    Returns:
+        Keyword arguments shared by ``Instance`` and ``InstanceProperties``
+    """
+    compute_v1 = _compute_v1()
+    instance = spec["instance"]
+    zone = instance["zone"]
+
+    def zonal(kind: str, name: str) -> str:
+        return f"zones/{zone}/{kind}/{name}" if zone_qualified else name
+
+    boot_disk = instance.get("boot_disk", {})
+    if boot_disk.get("source"):
+        # The boot disk was created beforehand (see create_disk)
+        disk = compute_v1.AttachedDisk(
+            boot=True, auto_delete=True, source=zonal("disks", boot_disk["source"])
+        )
+    else:
+        disk = compute_v1.AttachedDisk(
+            boot=True,
+            auto_delete=True,
+            initialize_params=compute_v1.AttachedDiskInitializeParams(
+                source_image=_boot_image(boot_disk),
+                disk_size_gb=int(boot_disk.get("size_gb", 100)),
+                disk_type=zonal("diskTypes", boot_disk.get("type", "pd-standard")),
+            ),
+        )
+
+    network = instance.get("network", {})
+    interface = compute_v1.NetworkInterface(
+        network=f"global/networks/{network.get('network', 'default')}"
+    )
+    if network.get("external_ip", True):
+        interface.access_configs = [
+            compute_v1.AccessConfig(name="External NAT", type_="ONE_TO_ONE_NAT")
+        ]
+
+    fields = {
+        "machine_type": zonal("machineTypes", instance["machine_type"]),
+        "disks": [disk],
+        "network_interfaces": [interface],
+        "metadata": compute_v1.Metadata(
+            items=[
+                compute_v1.Items(key=key, value=str(value))
+                for key, value in instance.get("metadata", {}).items()
+                if value
+            ]
+        ),
+        "tags": compute_v1.Tags(items=instance.get("tags", [])),
+        "labels": instance.get("labels", {}),
+    }
+
+    service_account = instance.get("service_account")
+    if service_account:
+        fields["service_accounts"] = [
+            compute_v1.ServiceAccount(
+                email=service_account.get("email", "default"),
+                scopes=list(service_account.get("scopes", [])),
+            )
+        ]
+
+    gpu = spec.get("gpu")
+    if gpu:
+        fields["guest_accelerators"] = [
+            compute_v1.AcceleratorConfig(
+                accelerator_type=zonal("acceleratorTypes", gpu["type"]),
+                accelerator_count=int(gpu.get("count", 1)),
+            )
+        ]
+        # GPU instances cannot live-migrate
+        fields["scheduling"] = compute_v1.Scheduling(on_host_maintenance="TERMINATE")
+
+    return fields
+
+
+def build_instance(spec: Dict[str, Any]):
+    """Build a Compute ``Instance`` from a rendered instance template."""
+    compute_v1 = _compute_v1()
+    return compute_v1.Instance(name=spec["instance"]["name"], **_instance_fields(spec, True))
+
+
+def build_disk(spec: Dict[str, Any]):
+    """Build the Compute ``Disk`` for an instance template's boot disk.
+
+    The disk is named after the instance, as an inline boot disk would be.
+    """
+    compute_v1 = _compute_v1()
+    instance = spec["instance"]
+    boot_disk = instance.get("boot_disk", {})
+    return compute_v1.Disk(
+        name=instance["name"],
+        source_image=_boot_image(boot_disk),
+        size_gb=int(boot_disk.get("size_gb", 100)),
+        type_=f"zones/{instance['zone']}/diskTypes/{boot_disk.get('type', 'pd-standard')}",
+        labels=instance.get("labels", {}),
+    )
 
-class GCPManager:
+
+def build_instance_properties(spec: Dict[str, Any]):
+    """Build bulkInsert ``InstanceProperties`` from a rendered instance template."""
+    compute_v1 = _compute_v1()
+    return compute_v1.InstanceProperties(**_instance_fields(spec, False))
+
+
+def _short_name(url: str) -> str:
+    """Reduce a Compute resource URL to its last path segment."""
+    return url.rsplit("/", 1)[-1] if url else ""
+
+
+def label_filter(labels: Dict[str, str]) -> str:
+    """Build a Compute list filter matching every given label."""
+    return " ".join(f'(labels.{key} = "{value}")' for key, value in sorted(labels.items()))
+
+
+def name_prefix_filter(prefix: str) -> str:
+    """Build a Compute list filter matching names that start with a prefix."""
+    # ``eq`` takes an RE2 regular expression that must match the whole name.
+    # Names are lowercase letters, digits and hyphens; a hyphen needs no escape,
+    # and leaving it bare keeps backslashes out of the quoted filter string
+    pattern = re.escape(prefix).replace("\\-", "-")
+    return f'name eq "{pattern}.*"'
+
+
+def instance_info(instance, scope: str = "") -> Dict[str, Any]:
+    """Summarize a Compute ``Instance`` as a plain dict.
+
+    Args:
+        instance: compute_v1.Instance
+        scope: aggregatedList scope ("zones/<zone>"), used when the instance has no zone
+
+    Returns:
+        Instance information
+    """
+    interfaces = list(instance.network_interfaces)
+    access_configs = list(interfaces[0].access_configs) if interfaces else []
+    accelerators = list(instance.guest_accelerators)
+    return {
+        "name": instance.name,
+        "zone": _short_name(instance.zone or scope),
+        "status": instance.status,
+        "machine_type": _short_name(instance.machine_type),
+        "gpu_enabled": bool(accelerators),
+        "gpu_type": _short_name(accelerators[0].accelerator_type) if accelerators else None,
+        "gpu_count": accelerators[0].accelerator_count if accelerators else 0,
+        "labels": dict(instance.labels),
+        "label_fingerprint": instance.label_fingerprint,
+        "tags": list(instance.tags.items),
+        "internal_ip": interfaces[0].network_i_p if interfaces else "",
+        "external_ip": access_configs[0].nat_i_p if access_configs else "",
+        "created_at": instance.creation_timestamp,
+    }
+
+
+def build_firewall(rule: Dict[str, Any]):
+    """Build a Compute ``Firewall`` from a rendered gcp-instance.yaml.j2 firewall rule."""
+    compute_v1 = _compute_v1()
+    return compute_v1.Firewall(
+        name=rule["name"],
+        network=f"global/networks/{rule.get('network', 'default')}",
+        direction=rule.get("direction", "INGRESS"),
+        priority=int(rule.get("priority", 1000)),
+        source_ranges=list(rule.get("source_ranges", [])),
+        target_tags=list(rule.get("target_tags", [])),
+        allowed=[
+            compute_v1.Allowed(
+                I_p_protocol=allowed["ip_protocol"],
+                ports=[str(port) for port in allowed.get("ports", [])],
+            )
+            for allowed in rule.get("allowed", [])
+        ],
+    )
+
+
+def firewall_info(firewall) -> Dict[str, Any]:
+    """Summarize a Compute ``Firewall`` in the shape of a template firewall rule."""
+    return {
+        "name": firewall.name,
+        "direction": firewall.direction,
+        "priority": firewall.priority,
+        "source_ranges": list(firewall.source_ranges),
+        "target_tags": list(firewall.target_tags),
+        "allowed": [
+            {"ip_protocol": allowed.I_p_protocol, "ports": list(allowed.ports)}
+            for allowed in firewall.allowed
+        ],
+    }
+
+
+def image_info(image) -> Dict[str, Any]:
+    """Summarize a Compute ``Image`` as a plain dict."""
+    return {
+        "name": image.name,
+        "family": image.family,
+        "status": image.status,
+        "labels": dict(image.labels),
+        "created_at": image.creation_timestamp,
+        "self_link": image.self_link,
+    }
+
+
+class GCPManager(CloudProvider):
     """Manages Google Cloud Platform resources for easyDeploy."""
 
-    def __init__(self, project_id: str, region: str = "us-central1"):
+    platform = "gcp"
+    instance_template = "gcp-instance.yaml.j2"
+    supports_bulk_insert = True
+
+    def __init__(
+        self,
+        project_id: str,
+        region: str = "us-central1",
+        zone: Optional[str] = None,
+        token_manager=None,
+    ):
         """Initialize GCP manager.
 
         Args:
             project_id: GCP project ID
             region: Default region for resources
+            zone: Default zone for instances (defaults to "<region>-a")
+            token_manager: TokenManager authenticating every client (defaults
+                to the one shared by the whole process)
         """
         self.project_id = project_id
         self.region = region
+        self.zone = zone or f"{region}-a"
+        self._token_manager = token_manager
         self._compute_client = None
+        self._operations_client = None
+        self._operation_tracker = None
+        self._images_client = None
+        self._firewalls_client = None
+        self._disks_client = None
+        self._global_operations_client = None
+        self._machine_types_client = None
+        self._accelerator_types_client = None
+        self._regions_client = None
+
+    @property
+    def token_manager(self):
+        """The TokenManager whose token every client of this manager sends."""
+        if self._token_manager is None:
+            from easydeploy.cloud.gcp.tokens import get_token_manager
+
+            self._token_manager = get_token_manager()
+        return self._token_manager
+
+    def _new_client(self, name: str):
+        """Create a Compute API client authenticated by the shared token."""
+        return _client(name, credentials=self.token_manager.credentials())
 
     @property
     def compute_client(self):
         """Lazy-load compute client."""
         if self._compute_client is None:
-            # TODO: Initialize Google Cloud Compute client
             logger.info(f"Initializing GCP compute client for project {self.project_id}")
+            self._compute_client = self._new_client("InstancesClient")
         return self._compute_client
 
+    @property
+    def operations_client(self):
+        """Lazy-load zonal operations client."""
+        if self._operations_client is None:
+            self._operations_client = self._new_client("ZoneOperationsClient")
+        return self._operations_client
+
+    @property
+    def global_operations_client(self):
+        """Lazy-load global operations client."""
+        if self._global_operations_client is None:
+            self._global_operations_client = self._new_client("GlobalOperationsClient")
+        return self._global_operations_client
+
+    @property
+    def firewalls_client(self):
+        """Lazy-load firewalls client."""
+        if self._firewalls_client is None:
+            self._firewalls_client = self._new_client("FirewallsClient")
+        return self._firewalls_client
+
+    @property
+    def disks_client(self):
+        """Lazy-load disks client."""
+        if self._disks_client is None:
+            self._disks_client = self._new_client("DisksClient")
+        return self._disks_client
+
+    @property
+    def images_client(self):
+        """Lazy-load images client."""
+        if self._images_client is None:
+            self._images_client = self._new_client("ImagesClient")
+        return self._images_client
+
+    @property
+    def machine_types_client(self):
+        """Lazy-load machine types client."""
+        if self._machine_types_client is None:
+            self._machine_types_client = self._new_client("MachineTypesClient")
+        return self._machine_types_client
+
+    @property
+    def accelerator_types_client(self):
+        """Lazy-load accelerator types client."""
+        if self._accelerator_types_client is None:
+            self._accelerator_types_client = self._new_client("AcceleratorTypesClient")
+        return self._accelerator_types_client
+
+    @property
+    def regions_client(self):
+        """Lazy-load regions client."""
+        if self._regions_client is None:
+            self._regions_client = self._new_client("RegionsClient")
+        return self._regions_client
+
+    @property
+    def operation_tracker(self):
+        """Lazy-load the tracker shared by every operation this manager starts."""
+        if self._operation_tracker is None:
+            from easydeploy.cloud.gcp.operations import OperationTracker
+
+            self._operation_tracker = OperationTracker(
+                self.operations_client, global_client=self.global_operations_client
+            )
+        return self._operation_tracker
+
+    def track(self, result: Dict[str, Any]) -> Future:
+        """Track the operation behind a create/destroy result.
+
+        Args:
+            result: Result of an instance or firewall method; a result without a
+                zone refers to a global operation
+
+        Returns:
+            Future resolving when the operation finishes (see OperationTracker.track)
+        """
+        return self.operation_tracker.track(
+            self.project_id, result.get("zone"), result["operation"]
+        )
+
+    def _instance_spec(self, name: str, machine_type: str, gpu_enabled: bool, zone: str):
+        """Render the default instance template for a single instance."""
+        from easydeploy.deploy.templates import render_yaml
+
+        return render_yaml(
+            self.instance_template,
+            deployment_name=name,
+            project_id=self.project_id,
+            zone=zone,
+            machine_type=machine_type,
+            gpu_enabled=gpu_enabled,
+            ssh_port=22,
+            allowed_ip_ranges=["0.0.0.0/0"],
+        )
+
     def create_instance(
         self, name: str, machine_type: str = "n1-standard-4", gpu_enabled: bool = False, **kwargs
     ) -> Dict[str, Any]:
@@ -37,42 +420,429 @@ class GCPManager:
             name: Instance name
             machine_type: GCP machine type
             gpu_enabled: Whether to attach GPU
-            **kwargs: Additional instance configuration
+            **kwargs: Additional instance configuration; ``spec`` is a rendered
+                gcp-instance.yaml.j2 document and ``zone`` overrides the default zone
 
         Returns:
             Instance creation result
         """
-        logger.info(f"Creating GCP instance {name} with type {machine_type}")
+        zone = kwargs.get("zone") or self.zone
+        spec = kwargs.get("spec") or self._instance_spec(name, machine_type, gpu_enabled, zone)
+        zone = spec["instance"].get("zone") or zone
+        logger.info(f"Creating GCP instance {name} with type {machine_type}", extra={"host": name})
 
-        # TODO: Implement instance creation logic
+        operation = self.compute_client.insert(
+            project=self.project_id, zone=zone, instance_resource=build_instance(spec)
+        )
         return {
             "name": name,
             "status": "creating",
             "machine_type": machine_type,
             "gpu_enabled": gpu_enabled,
+            "zone": zone,
+            "operation": operation.name,
+        }
+
+    def create_disk(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """Create the boot disk of an instance template ahead of the instance.
+
+        Args:
+            spec: Rendered gcp-instance.yaml.j2 document
+
+        Returns:
+            Disk creation result
+        """
+        zone = spec["instance"].get("zone") or self.zone
+        disk = build_disk(spec)
+        logger.info(f"Creating GCP disk {disk.name}")
+
+        operation = self.disks_client.insert(project=self.project_id, zone=zone, disk_resource=disk)
+        return {"name": disk.name, "zone": zone, "operation": operation.name}
+
+    def delete_disk(self, name: str, zone: Optional[str] = None) -> Dict[str, Any]:
+        """Delete a disk.
+
+        Args:
+            name: Disk name
+            zone: Zone of the disk (defaults to the manager's zone)
+
+        Returns:
+            Disk deletion result
+        """
+        zone = zone or self.zone
+        logger.info(f"Deleting GCP disk {name}")
+        operation = self.disks_client.delete(project=self.project_id, zone=zone, disk=name)
+        return {"name": name, "zone": zone, "operation": operation.name}
+
+    def bulk_insert_instances(
+        self, spec: Dict[str, Any], count: int, name_pattern: str
+    ) -> Dict[str, Any]:
+        """Create many identical instances with a single bulkInsert request.
+
+        Args:
+            spec: Rendered gcp-instance.yaml.j2 document shared by every instance
+            count: Number of instances to create (at most BULK_INSERT_MAX)
+            name_pattern: Instance name pattern, with ``#`` characters replaced by
+                a zero-padded sequence number (e.g. "workers-###")
+
+        Returns:
+            Bulk creation result
+        """
+        if not 0 < count <= BULK_INSERT_MAX:
+            raise ValueError(f"bulkInsert count must be between 1 and {BULK_INSERT_MAX}")
+
+        compute_v1 = _compute_v1()
+        zone = spec["instance"]["zone"]
+        logger.info(f"Bulk creating {count} GCP instances as {name_pattern} in {zone}")
+
+        operation = self.compute_client.bulk_insert(
+            project=self.project_id,
+            zone=zone,
+            bulk_insert_instance_resource_resource=compute_v1.BulkInsertInstanceResource(
+                count=count,
+                min_count=count,
+                name_pattern=name_pattern,
+                instance_properties=build_instance_properties(spec),
+            ),
+        )
+        return {
+            "name_pattern": name_pattern,
+            "count": count,
+            "status": "creating",
+            "zone": zone,
+            "operation": operation.name,
         }
 
-    def destroy_instance(self, name: str) -> Dict[str, Any]:
+    def destroy_instance(self, name: str, zone: Optional[str] = None) -> Dict[str, Any]:
         """Destroy a GCP compute instance.
 
         Args:
             name: Instance name
+            zone: Zone of the instance (defaults to the manager's zone)
 
         Returns:
             Destruction result
         """
-        logger.info(f"Destroying GCP instance {name}")
+        zone = zone or self.zone
+        logger.info(f"Destroying GCP instance {name}", extra={"host": name})
 
-        # TODO: Implement instance destruction logic
-        return {"name": name, "status": "destroying"}
+        operation = self.compute_client.delete(project=self.project_id, zone=zone, instance=name)
+        return {"name": name, "status": "destroying", "zone": zone, "operation": operation.name}
 
-    def list_instances(self) -> list[Dict[str, Any]]:
-        """List all instances in the project.
+    def stop_instance(self, name: str, zone: Optional[str] = None) -> Dict[str, Any]:
+        """Stop a GCP compute instance, keeping its disks.
+
+        Args:
+            name: Instance name
+            zone: Zone of the instance (defaults to the manager's zone)
+
+        Returns:
+            Stop result
+        """
+        zone = zone or self.zone
+        logger.info(f"Stopping GCP instance {name}", extra={"host": name})
+
+        operation = self.compute_client.stop(project=self.project_id, zone=zone, instance=name)
+        return {"name": name, "status": "stopping", "zone": zone, "operation": operation.name}
+
+    def start_instance(self, name: str, zone: Optional[str] = None) -> Dict[str, Any]:
+        """Start a stopped GCP compute instance.
+
+        Args:
+            name: Instance name
+            zone: Zone of the instance (defaults to the manager's zone)
+
+        Returns:
+            Start result
+        """
+        zone = zone or self.zone
+        logger.info(f"Starting GCP instance {name}", extra={"host": name})
+
+        operation = self.compute_client.start(project=self.project_id, zone=zone, instance=name)
+        return {"name": name, "status": "starting", "zone": zone, "operation": operation.name}
+
+    def set_machine_type(
+        self, name: str, machine_type: str, zone: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Change the machine type of a stopped instance.
+
+        Args:
+            name: Instance name
+            machine_type: New GCP machine type
+            zone: Zone of the instance (defaults to the manager's zone)
 
         Returns:
-            List of instance information
+            Update result
+        """
+        zone = zone or self.zone
+        logger.info(
+            f"Setting machine type of GCP instance {name} to {machine_type}", extra={"host": name}
+        )
+
+        operation = self.compute_client.set_machine_type(
+            project=self.project_id,
+            zone=zone,
+            instance=name,
+            instances_set_machine_type_request_resource=_compute_v1().InstancesSetMachineTypeRequest(
+                machine_type=f"zones/{zone}/machineTypes/{machine_type}"
+            ),
+        )
+        return {"name": name, "status": "updating", "zone": zone, "operation": operation.name}
+
+    def set_labels(
+        self, name: str, labels: Dict[str, str], fingerprint: str, zone: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Replace the labels of an instance.
+
+        Args:
+            name: Instance name
+            labels: Complete new set of labels
+            fingerprint: Label fingerprint from the instance, guarding against
+                concurrent label changes
+            zone: Zone of the instance (defaults to the manager's zone)
+
+        Returns:
+            Update result
+        """
+        zone = zone or self.zone
+        operation = self.compute_client.set_labels(
+            project=self.project_id,
+            zone=zone,
+            instance=name,
+            instances_set_labels_request_resource=_compute_v1().InstancesSetLabelsRequest(
+                labels=labels, label_fingerprint=fingerprint
+            ),
+        )
+        return {"name": name, "status": "updating", "zone": zone, "operation": operation.name}
+
+    def get_instance(self, name: str, zone: Optional[str] = None) -> Dict[str, Any]:
+        """Get information about one instance.
+
+        Args:
+            name: Instance name
+            zone: Zone of the instance (defaults to the manager's zone)
+
+        Returns:
+            Instance information
+        """
+        zone = zone or self.zone
+        return instance_info(
+            self.compute_client.get(project=self.project_id, zone=zone, instance=name)
+        )
+
+    def instance_address(self, name: str, zone: Optional[str] = None) -> str:
+        """Get the address to reach an instance at: its external IP, else its internal IP."""
+        info = self.get_instance(name, zone)
+        return info["external_ip"] or info["internal_ip"]
+
+    def host_keys(self, name: str, zone: Optional[str] = None) -> list[str]:
+        """Get the SSH host keys the instance's guest agent published as guest attributes.
+
+        Args:
+            name: Instance name
+            zone: Zone of the instance (defaults to the manager's zone)
+
+        Returns:
+            "<key type> <base64>" lines
+
+        Raises:
+            google.api_core.exceptions.NotFound: Until the guest agent has published them
+        """
+        attributes = self.compute_client.get_guest_attributes(
+            project=self.project_id, zone=zone or self.zone, instance=name, query_path="hostkeys/"
+        )
+        return [f"{item.key} {item.value}" for item in attributes.query_value.items]
+
+    def list_instances(
+        self, labels: Optional[Dict[str, str]] = None, page_size: int = LIST_PAGE_SIZE
+    ) -> Iterator[Dict[str, Any]]:
+        """List easyDeploy instances in every zone of the project.
+
+        Uses the aggregatedList endpoint with a server-side label filter and
+        yields instances page by page, so the first results arrive after one
+        round-trip and memory stays flat regardless of fleet size.
+
+        Args:
+            labels: Extra label key/value pairs instances must carry
+            page_size: Instances requested per page
+
+        Yields:
+            Instance information dicts
         """
         logger.info("Listing GCP instances")
 
-        # TODO: Implement instance listing logic
-        return []
+        compute_v1 = _compute_v1()
+        request = compute_v1.AggregatedListInstancesRequest(
+            project=self.project_id,
+            filter=label_filter({**MANAGED_LABELS, **(labels or {})}),
+            max_results=page_size,
+        )
+        for page in self.compute_client.aggregated_list(request=request).pages:
+            for scope, scoped_list in page.items.items():
+                for instance in scoped_list.instances:
+                    yield instance_info(instance, scope)
+
+    def list_machine_types(self) -> Iterator[Dict[str, Any]]:
+        """List the machine types offered in every zone.
+
+        Yields:
+            {"name", "zone", "cpus", "memory_mb"} dicts
+        """
+        request = _compute_v1().AggregatedListMachineTypesRequest(project=self.project_id)
+        for scope, scoped_list in self.machine_types_client.aggregated_list(request=request):
+            for machine_type in scoped_list.machine_types:
+                yield {
+                    "name": machine_type.name,
+                    "zone": _short_name(machine_type.zone or scope),
+                    "cpus": machine_type.guest_cpus,
+                    "memory_mb": machine_type.memory_mb,
+                }
+
+    def list_accelerator_types(self) -> Iterator[Dict[str, Any]]:
+        """List the GPU accelerator types offered in every zone.
+
+        Yields:
+            {"name", "zone", "max_per_instance"} dicts
+        """
+        request = _compute_v1().AggregatedListAcceleratorTypesRequest(project=self.project_id)
+        for scope, scoped_list in self.accelerator_types_client.aggregated_list(request=request):
+            for accelerator in scoped_list.accelerator_types:
+                yield {
+                    "name": accelerator.name,
+                    "zone": _short_name(accelerator.zone or scope),
+                    "max_per_instance": accelerator.maximum_cards_per_instance,
+                }
+
+    def list_regions(self) -> Iterator[Dict[str, Any]]:
+        """List the project's regions with their zones and quotas.
+
+        Yields:
+            {"name", "zones", "quotas": {metric: {"limit", "usage"}}} dicts
+        """
+        for region in self.regions_client.list(project=self.project_id):
+            yield {
+                "name": region.name,
+                "zones": [_short_name(zone) for zone in region.zones],
+                "quotas": {
+                    quota.metric: {"limit": quota.limit, "usage": quota.usage}
+                    for quota in region.quotas
+                },
+            }
+
+    def list_images(self, labels: Optional[Dict[str, str]] = None) -> Iterator[Dict[str, Any]]:
+        """List the project's custom images carrying the given labels.
+
+        Args:
+            labels: Label key/value pairs images must carry
+
+        Yields:
+            Image information dicts
+        """
+        request = _compute_v1().ListImagesRequest(
+            project=self.project_id, filter=label_filter(labels or {})
+        )
+        for image in self.images_client.list(request=request):
+            yield image_info(image)
+
+    def create_image(
+        self,
+        name: str,
+        source_disk: str,
+        family: Optional[str] = None,
+        labels: Optional[Dict[str, str]] = None,
+        timeout: float = IMAGE_OPERATION_TIMEOUT,
+    ) -> Dict[str, Any]:
+        """Create a custom image from a disk and wait until it is ready.
+
+        Image operations are global, so they are waited on here rather than
+        through the zonal operation tracker.
+
+        Args:
+            name: Image name
+            source_disk: Disk to image, as "zones/<zone>/disks/<disk>"
+            family: Image family
+            labels: Image labels
+            timeout: Seconds to wait for the image
+
+        Returns:
+            Image information
+        """
+        compute_v1 = _compute_v1()
+        logger.info(f"Creating GCP image {name} from {source_disk}")
+
+        operation = self.images_client.insert(
+            project=self.project_id,
+            image_resource=compute_v1.Image(
+                name=name, source_disk=source_disk, family=family, labels=labels or {}
+            ),
+        )
+        operation.result(timeout=timeout)
+        return image_info(self.images_client.get(project=self.project_id, image=name))
+
+    def delete_image(self, name: str, timeout: float = IMAGE_OPERATION_TIMEOUT):
+        """Delete a custom image and wait for the deletion to finish.
+
+        Args:
+            name: Image name
+            timeout: Seconds to wait
+        """
+        logger.info(f"Deleting GCP image {name}")
+        self.images_client.delete(project=self.project_id, image=name).result(timeout=timeout)
+
+    def list_firewalls(self, prefix: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """List the project's firewall rules.
+
+        Args:
+            prefix: Only rules whose name starts with this prefix (filtered server-side)
+
+        Yields:
+            Firewall rule dicts, in the shape of template firewall rules
+        """
+        request = _compute_v1().ListFirewallsRequest(
+            project=self.project_id, filter=name_prefix_filter(prefix) if prefix else ""
+        )
+        for firewall in self.firewalls_client.list(request=request):
+            yield firewall_info(firewall)
+
+    def create_firewall(self, rule: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a firewall rule.
+
+        Args:
+            rule: Firewall rule from a rendered gcp-instance.yaml.j2 document
+
+        Returns:
+            Creation result (a global operation)
+        """
+        logger.info(f"Creating GCP firewall rule {rule['name']}")
+        operation = self.firewalls_client.insert(
+            project=self.project_id, firewall_resource=build_firewall(rule)
+        )
+        return {"name": rule["name"], "status": "creating", "operation": operation.name}
+
+    def update_firewall(self, rule: Dict[str, Any]) -> Dict[str, Any]:
+        """Update a firewall rule in place to match a template rule.
+
+        Args:
+            rule: Firewall rule from a rendered gcp-instance.yaml.j2 document
+
+        Returns:
+            Update result (a global operation)
+        """
+        logger.info(f"Updating GCP firewall rule {rule['name']}")
+        operation = self.firewalls_client.patch(
+            project=self.project_id, firewall=rule["name"], firewall_resource=build_firewall(rule)
+        )
+        return {"name": rule["name"], "status": "updating", "operation": operation.name}
+
+    def delete_firewall(self, name: str) -> Dict[str, Any]:
+        """Delete a firewall rule.
+
+        Args:
+            name: Firewall rule name
+
+        Returns:
+            Deletion result (a global operation)
+        """
+        logger.info(f"Deleting GCP firewall rule {name}")
+        operation = self.firewalls_client.delete(project=self.project_id, firewall=name)
+        return {"name": name, "status": "destroying", "operation": operation.name}
@@ -0,0 +1,267 @@
+"""
+In-process GCP credential provider for easyDeploy.
+
+Reads the gcloud configuration directory and Application Default Credentials
+(ADC) directly so that authentication checks, token refreshes and project
+resolution do not need to fork the gcloud CLI. Callers in ``auth.py`` fall back
+to gcloud whenever this provider cannot answer.
+"""
+
+import configparser
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOUD_PLATFORM_SCOPE = "https://www.googleapis.com/auth/cloud-platform"
+
+# Access tokens an API rejected in this process; no cache hands them out again
+_rejected_tokens: set[str] = set()
+
+
+def reject_access_token(token: str):
+    """Remember that an API rejected a token before its expiry, e.g. it was revoked."""
+    _rejected_tokens.add(token)
+
+
+def is_rejected(token: str) -> bool:
+    """Whether an API rejected this token in this process."""
+    return token in _rejected_tokens
+
+
+def get_gcloud_config_dir() -> str:
+    """Get the gcloud configuration directory, honouring CLOUDSDK_CONFIG."""
+    if os.environ.get("CLOUDSDK_CONFIG"):
+        return os.environ["CLOUDSDK_CONFIG"]
+    if os.name == "nt":
+        return os.path.join(os.environ.get("APPDATA", "C:\\"), "gcloud")
+    return os.path.join(os.path.expanduser("~"), ".config", "gcloud")
+
+
+def _parse_db_expiry(value: str) -> float:
+    """Convert a gcloud access_tokens.db expiry (naive UTC) into a POSIX timestamp."""
+    expiry = datetime.fromisoformat(value)
+    if expiry.tzinfo is None:
+        expiry = expiry.replace(tzinfo=timezone.utc)
+    return expiry.timestamp()
+
+
+def _auth_request():
+    """Build a google-auth HTTP transport, or None if none is installed."""
+    try:
+        from google.auth.transport.requests import Request
+    except ImportError:
+        return None
+    return Request()
+
+
+class CredentialProvider:
+    """Resolves GCP credentials and configuration without invoking gcloud."""
+
+    def __init__(self, config_dir: Optional[str] = None):
+        """Initialize credential provider.
+
+        Args:
+            config_dir: gcloud configuration directory (defaults to gcloud's own lookup)
+        """
+        self.config_dir = config_dir or get_gcloud_config_dir()
+
+    @property
+    def available(self) -> bool:
+        """Whether a gcloud configuration directory exists to read from."""
+        return os.path.isdir(self.config_dir)
+
+    def active_configuration(self) -> str:
+        """Get the name of the active gcloud configuration."""
+        name = os.environ.get("CLOUDSDK_ACTIVE_CONFIG_NAME")
+        if name:
+            return name
+        try:
+            with open(os.path.join(self.config_dir, "active_config")) as f:
+                return f.read().strip() or "default"
+        except OSError:
+            return "default"
+
+    def _core_property(self, name: str) -> Optional[str]:
+        """Read a ``[core]`` property from the environment or active configuration."""
+        value = os.environ.get(f"CLOUDSDK_CORE_{name.upper()}")
+        if value:
+            return value
+
+        parser = configparser.ConfigParser()
+        path = os.path.join(
+            self.config_dir, "configurations", f"config_{self.active_configuration()}"
+        )
+        try:
+            parser.read(path)
+        except configparser.Error:
+            return None
+        return parser.get("core", name, fallback=None) or None
+
+    def get_account(self) -> Optional[str]:
+        """Get the active gcloud account."""
+        return self._core_property("account")
+
+    def get_project(self) -> Optional[str]:
+        """Get the active gcloud project."""
+        return self._core_property("project")
+
+    def _query(self, database: str, sql: str, account: str) -> Optional[tuple]:
+        """Run a single-row lookup against one of gcloud's SQLite stores."""
+        path = os.path.join(self.config_dir, database)
+        if not os.path.exists(path):
+            return None
+        try:
+            with sqlite3.connect(f"file:{path}?mode=ro", uri=True) as conn:
+                return conn.execute(sql, (account,)).fetchone()
+        except sqlite3.Error as e:
+            logger.debug(f"Could not read {path}: {e}")
+            return None
+
+    def cached_access_token(self, account: str) -> Optional[tuple[str, float]]:
+        """
+        Look up gcloud's own cached access token for an account.
+
+        Args:
+            account: gcloud account
+
+        Returns:
+            tuple: (access_token, expiry timestamp), or None if nothing is cached
+        """
+        row = self._query(
+            "access_tokens.db",
+            "SELECT access_token, token_expiry FROM access_tokens WHERE account_id = ?",
+            account,
+        )
+        if not row or not row[0] or not row[1] or is_rejected(row[0]):
+            return None
+        try:
+            return row[0], _parse_db_expiry(row[1])
+        except ValueError:
+            return None
+
+    def load_account_credentials(self, account: str) -> Optional[Any]:
+        """
+        Load the stored gcloud credentials for an account.
+
+        Args:
+            account: gcloud account
+
+        Returns:
+            google.auth.credentials.Credentials, or None if unavailable
+        """
+        row = self._query(
+            "credentials.db", "SELECT value FROM credentials WHERE account_id = ?", account
+        )
+        if not row:
+            return None
+        try:
+            return _credentials_from_info(json.loads(row[0]))
+        except (ValueError, KeyError):
+            return None
+
+    def application_default(self) -> Optional[tuple[Any, Optional[str]]]:
+        """
+        Load Application Default Credentials from file.
+
+        Returns:
+            tuple: (credentials, project_id), or None if no ADC file exists
+        """
+        path = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS") or os.path.join(
+            self.config_dir, "application_default_credentials.json"
+        )
+        if not os.path.exists(path):
+            return None
+        try:
+            import google.auth
+
+            credentials, project = google.auth.load_credentials_from_file(
+                path, scopes=[CLOUD_PLATFORM_SCOPE]
+            )
+        except Exception as e:
+            logger.debug(f"Could not load ADC from {path}: {e}")
+            return None
+        return credentials, project or self.get_project()
+
+    def refresh(self, credentials: Any) -> Optional[tuple[str, float]]:
+        """
+        Refresh credentials in-process.
+
+        Args:
+            credentials: google-auth credentials to refresh
+
+        Returns:
+            tuple: (access_token, expiry timestamp), or None if refresh failed
+        """
+        request = _auth_request()
+        if request is None:
+            return None
+        try:
+            credentials.refresh(request)
+        except Exception as e:
+            logger.debug(f"In-process token refresh failed: {e}")
+            return None
+        if not credentials.token or credentials.expiry is None:
+            return None
+        # google-auth reports expiry as naive UTC
+        return credentials.token, credentials.expiry.replace(tzinfo=timezone.utc).timestamp()
+
+    def get_session(self, min_expiry: float = 0) -> Optional[dict]:
+        """
+        Resolve a usable access token, account and project in-process.
+
+        Prefers gcloud's cached token for the active account, then refreshes the
+        account's stored credentials, then falls back to ADC.
+
+        Args:
+            min_expiry: Reject tokens expiring at or before this POSIX timestamp
+
+        Returns:
+            dict: Session with 'access_token', 'expiry', 'account' and 'project',
+            or None if no credentials could be resolved in-process
+        """
+        if not self.available and not os.environ.get("GOOGLE_APPLICATION_CREDENTIALS"):
+            return None
+
+        account = self.get_account()
+        project = self.get_project()
+        token = None
+
+        if account:
+            token = self.cached_access_token(account)
+            if token is None or token[1] <= min_expiry:
+                credentials = self.load_account_credentials(account)
+                token = self.refresh(credentials) if credentials is not None else None
+
+        if token is None:
+            adc = self.application_default()
+            if adc is not None:
+                token = self.refresh(adc[0])
+                project = project or adc[1]
+
+        if token is None or token[1] <= min_expiry:
+            return None
+        return {
+            "access_token": token[0],
+            "expiry": token[1],
+            "account": account,
+            "project": project,
+        }
+
+
+def _credentials_from_info(info: dict) -> Any:
+    """Build google-auth credentials from a gcloud credentials.db entry."""
+    if info.get("type") == "service_account":
+        from google.oauth2 import service_account
+
+        return service_account.Credentials.from_service_account_info(
+            info, scopes=[CLOUD_PLATFORM_SCOPE]
+        )
+
+    from google.oauth2 import credentials
+
+    return credentials.Credentials.from_authorized_user_info(info)
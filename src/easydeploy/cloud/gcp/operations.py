@@ -0,0 +1,162 @@
+"""Tracking of long-running Compute Engine zonal and global operations."""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Operations waited on concurrently; each blocks one thread in the server-side wait call
+DEFAULT_MAX_WORKERS = 64
+
+# Adaptive backoff between wait attempts that fail or return early
+POLL_INITIAL_DELAY = 1.0
+POLL_MAX_DELAY = 15.0
+POLL_BACKOFF = 1.5
+
+# Give up on an operation after this many seconds
+DEFAULT_OPERATION_TIMEOUT = 1800.0
+
+
+def _status_name(operation: Any) -> str:
+    """Get an operation's status as a plain string ("DONE", "RUNNING", ...)."""
+    status = getattr(operation, "status", None)
+    return getattr(status, "name", status) or "UNKNOWN"
+
+
+def _error_message(operation: Any) -> Optional[str]:
+    """Collect the error messages of a finished operation, if it failed."""
+    error = getattr(operation, "error", None)
+    errors = getattr(error, "errors", None) or []
+    if not errors:
+        return None
+    return "; ".join(f"{e.code}: {e.message}" for e in errors)
+
+
+class OperationTracker:
+    """Waits on many Compute operations at once.
+
+    Each tracked operation gets a ``concurrent.futures.Future`` (or an awaitable
+    via ``wait_async``) that resolves when the operation finishes. Waiting uses
+    the Compute ``zoneOperations.wait`` (or, for global resources such as
+    firewall rules, ``globalOperations.wait``) endpoint, which blocks server-side until
+    the operation is done or about two minutes pass, so a finished operation is
+    noticed immediately without client-side sleeps. Failed or early-returning
+    waits are retried with jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        client,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout: float = DEFAULT_OPERATION_TIMEOUT,
+        global_client=None,
+    ):
+        """Initialize operation tracker.
+
+        Args:
+            client: Shared ``compute_v1.ZoneOperationsClient``
+            max_workers: Maximum number of operations waited on concurrently
+            timeout: Seconds before an operation is reported as timed out
+            global_client: Shared ``compute_v1.GlobalOperationsClient``, for
+                operations tracked without a zone
+        """
+        self.client = client
+        self.global_client = global_client
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="easydeploy-operation"
+        )
+        self._futures: Dict[tuple[str, Optional[str], str], Future] = {}
+        self._lock = threading.Lock()
+
+    def track(self, project: str, zone: Optional[str], operation: str) -> Future:
+        """Start waiting on an operation.
+
+        Tracking an operation again while it is being waited on returns the
+        same future. Finished operations are forgotten, so a long-lived
+        tracker (e.g. in ``easydeploy daemon``) does not grow.
+
+        Args:
+            project: GCP project ID
+            zone: Zone of the operation, or None for a global operation
+            operation: Operation name
+
+        Returns:
+            Future resolving to {"operation", "zone", "status", "error"}
+        """
+        key = (project, zone, operation)
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None:
+                return future
+            future = self._executor.submit(self._wait, project, zone, operation)
+            self._futures[key] = future
+        # Outside the lock: the callback runs right here if the wait already finished
+        future.add_done_callback(lambda _: self._forget(key, future))
+        return future
+
+    def _forget(self, key: tuple[str, Optional[str], str], future: Future):
+        """Drop a finished operation's future."""
+        with self._lock:
+            if self._futures.get(key) is future:
+                del self._futures[key]
+
+    async def wait_async(self, project: str, zone: Optional[str], operation: str) -> Dict[str, Any]:
+        """Await an operation from asyncio code.
+
+        Args:
+            project: GCP project ID
+            zone: Zone of the operation, or None for a global operation
+            operation: Operation name
+
+        Returns:
+            Operation result, as for ``track``
+        """
+        return await asyncio.wrap_future(self.track(project, zone, operation))
+
+    def _wait(self, project: str, zone: Optional[str], operation: str) -> Dict[str, Any]:
+        """Block until an operation finishes, backing off between failed attempts."""
+        deadline = time.monotonic() + self.timeout
+        delay = POLL_INITIAL_DELAY
+        result = {"operation": operation, "zone": zone, "status": "TIMEOUT", "error": None}
+
+        while time.monotonic() < deadline:
+            started = time.monotonic()
+            try:
+                if zone:
+                    response = self.client.wait(project=project, zone=zone, operation=operation)
+                else:
+                    response = self.global_client.wait(project=project, operation=operation)
+            except Exception as e:
+                logger.debug(f"Waiting on {operation} failed, retrying: {e}")
+                response = None
+
+            if response is not None and _status_name(response) == "DONE":
+                error = _error_message(response)
+                result.update(status="FAILED" if error else "DONE", error=error)
+                return result
+
+            # A wait that returned quickly without finishing means the server is
+            # not long-polling (or errored); fall back to jittered backoff.
+            if time.monotonic() - started < delay:
+                remaining = max(0.0, deadline - time.monotonic())
+                time.sleep(min(delay * random.uniform(0.5, 1.0), remaining))
+                delay = min(delay * POLL_BACKOFF, POLL_MAX_DELAY)
+            else:
+                delay = POLL_INITIAL_DELAY
+
+        result["error"] = f"Operation did not finish within {self.timeout:.0f}s"
+        return result
+
+    def shutdown(self, wait: bool = True):
+        """Stop the tracker's worker threads.
+
+        Args:
+            wait: Block until in-flight waits finish
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
@@ -0,0 +1,257 @@
+"""
+Local GCP project catalog for easyDeploy.
+
+Keeps the list of accessible projects in ``~/.easydeploy/gcp-projects.tsv`` so
+that ``list-projects`` and ``select-project`` answer instantly from disk. The
+catalog is served stale-while-revalidate: once it is older than its TTL the
+cached entries are still returned, and a detached process refreshes the file.
+Refreshes stream gcloud's paged output straight to disk, so the full project
+list is never held in memory.
+
+Run ``python -m easydeploy.cloud.gcp.projects`` to refresh the catalog by hand.
+"""
+
+import heapq
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Iterator, Optional
+
+from easydeploy.cloud.gcp.auth import get_token_path
+from easydeploy.utils import trace
+
+logger = logging.getLogger(__name__)
+
+# Serve cached projects without revalidating for this long
+CATALOG_TTL = 6 * 3600
+
+# Projects requested from the Resource Manager API per page
+PAGE_SIZE = 500
+
+# A refresh lock older than this is assumed to belong to a dead process
+REFRESH_LOCK_TIMEOUT = 600
+
+
+def get_catalog_path() -> str:
+    """Get the path of the on-disk project catalog."""
+    return os.path.join(os.path.dirname(get_token_path()), "gcp-projects.tsv")
+
+
+def _stream_gcloud_projects() -> Iterator[tuple[str, str]]:
+    """
+    Stream (project_id, name) pairs from gcloud, one page at a time.
+
+    Raises:
+        subprocess.CalledProcessError: If gcloud exits non-zero
+        FileNotFoundError: If gcloud is not installed
+    """
+    command = [
+        "gcloud",
+        "projects",
+        "list",
+        f"--page-size={PAGE_SIZE}",
+        "--format=value(projectId,name)",
+    ]
+    with trace.span("gcloud projects list", "subprocess", argv=" ".join(command)):
+        with subprocess.Popen(
+            command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        ) as process:
+            for line in process.stdout:
+                project_id, _, name = line.rstrip("\n").partition("\t")
+                if project_id:
+                    yield project_id, name or project_id
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, command)
+
+
+def _is_subsequence(query: str, text: str) -> bool:
+    """Check whether every character of query appears in text, in order."""
+    chars = iter(text)
+    return all(c in chars for c in query)
+
+
+def _match_rank(query: str, project: dict) -> Optional[tuple]:
+    """
+    Rank a project against a filter; lower is better, None means no match.
+
+    Prefix matches rank above substring matches, which rank above fuzzy
+    (in-order subsequence) matches. Ties prefer shorter project IDs.
+    """
+    project_id = project["project_id"].lower()
+    name = project["name"].lower()
+
+    if project_id.startswith(query) or name.startswith(query):
+        tier = 0
+    elif query in project_id or query in name:
+        tier = 1
+    elif _is_subsequence(query, project_id) or _is_subsequence(query, name):
+        tier = 2
+    else:
+        return None
+    return tier, len(project_id), project_id
+
+
+class ProjectCatalog:
+    """Disk-backed, searchable index of accessible GCP projects."""
+
+    def __init__(self, path: Optional[str] = None, ttl: float = CATALOG_TTL):
+        """Initialize project catalog.
+
+        Args:
+            path: Catalog file (defaults to ~/.easydeploy/gcp-projects.tsv)
+            ttl: Seconds before cached entries are revalidated
+        """
+        self.path = path or get_catalog_path()
+        self.ttl = ttl
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the catalog was last refreshed, or None if it does not exist."""
+        try:
+            return time.time() - os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def is_stale(self) -> bool:
+        """Whether the catalog is missing or older than its TTL."""
+        age = self.age
+        return age is None or age > self.ttl
+
+    def __iter__(self) -> Iterator[dict]:
+        """Stream projects from disk without loading the whole catalog."""
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    project_id, _, name = line.rstrip("\n").partition("\t")
+                    yield {"project_id": project_id, "name": name}
+        except FileNotFoundError:
+            return
+
+    def search(self, query: Optional[str] = None, limit: Optional[int] = None) -> list:
+        """
+        Filter the catalog by prefix, substring or fuzzy match.
+
+        Args:
+            query: Filter text; matches project IDs and names case-insensitively
+            limit: Maximum number of results to return
+
+        Returns:
+            list: Project dictionaries with 'project_id' and 'name', best matches first
+        """
+        if not query:
+            projects = iter(self)
+            if limit is None:
+                return list(projects)
+            return [project for _, project in zip(range(limit), projects)]
+
+        query = query.lower()
+        ranked = (
+            (rank, project) for project in self if (rank := _match_rank(query, project)) is not None
+        )
+        if limit is None:
+            return [project for _, project in sorted(ranked, key=lambda item: item[0])]
+        return [project for _, project in heapq.nsmallest(limit, ranked, key=lambda item: item[0])]
+
+    def refresh(self) -> int:
+        """
+        Re-fetch the project list from GCP and atomically replace the catalog.
+
+        Returns:
+            int: Number of projects written, or -1 if the refresh failed
+        """
+        directory = os.path.dirname(self.path)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".gcp-projects-")
+        count = 0
+        try:
+            with os.fdopen(fd, "w") as f:
+                for project_id, name in _stream_gcloud_projects():
+                    f.write(f"{project_id}\t{name}\n")
+                    count += 1
+            os.replace(tmp_path, self.path)
+        except (subprocess.CalledProcessError, FileNotFoundError, OSError) as e:
+            logger.debug(f"Project catalog refresh failed: {e}")
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return -1
+        return count
+
+    def clear(self) -> None:
+        """Delete the catalog, e.g. when the active account changes."""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _acquire_refresh_lock(self) -> bool:
+        """Claim the refresh lock so only one background refresh runs at a time."""
+        lock_path = f"{self.path}.lock"
+        try:
+            if time.time() - os.stat(lock_path).st_mtime > REFRESH_LOCK_TIMEOUT:
+                os.unlink(lock_path)
+        except OSError:
+            pass
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600))
+            return True
+        except FileExistsError:
+            return False
+
+    def refresh_in_background(self) -> bool:
+        """
+        Start a detached process that refreshes the catalog.
+
+        Returns:
+            bool: True if a refresh was started, False if one is already running
+        """
+        if not self._acquire_refresh_lock():
+            return False
+        subprocess.Popen(
+            [sys.executable, "-m", "easydeploy.cloud.gcp.projects", self.path],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        return True
+
+    def lookup(
+        self, query: Optional[str] = None, limit: Optional[int] = None, refresh: bool = False
+    ) -> list:
+        """
+        Search the catalog, refreshing it stale-while-revalidate.
+
+        A missing catalog (or ``refresh=True``) is fetched synchronously; a
+        stale one is served as-is while a background refresh runs.
+
+        Args:
+            query: Filter text
+            limit: Maximum number of results to return
+            refresh: Force a synchronous refresh first
+
+        Returns:
+            list: Matching project dictionaries
+        """
+        if refresh or self.age is None:
+            self.refresh()
+        elif self.is_stale():
+            self.refresh_in_background()
+        return self.search(query, limit)
+
+
+def main():
+    """Refresh the catalog; used by background revalidation."""
+    catalog = ProjectCatalog(sys.argv[1] if len(sys.argv) > 1 else None)
+    try:
+        catalog.refresh()
+    finally:
+        try:
+            os.unlink(f"{catalog.path}.lock")
+        except FileNotFoundError:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""Shared GCP access token with single-flight, ahead-of-expiry refresh.
+
+Every ``GCPManager`` client authenticates through one ``TokenManager`` per
+process. Callers read the held token without locking. Once it is within
+``REFRESH_MARGIN`` of expiring, the first caller starts a refresh on a
+background thread and every caller keeps using the current token until the
+new one arrives. Only when there is no usable token at all do callers wait,
+and then all of them wait on the same refresh, so a fleet of workers never
+triggers more than one refresh at a time.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from functools import cache
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Refresh in the background once the token expires within this many seconds
+REFRESH_MARGIN = 300
+
+# Treat the token as unusable this many seconds before it actually expires
+EXPIRY_SKEW = 30
+
+# Seconds before retrying a background refresh that failed or gained nothing
+RETRY_INTERVAL = 30
+
+# Managers whose locks must be replaced in a forked child
+_managers: "weakref.WeakSet[TokenManager]" = weakref.WeakSet()
+
+
+def fetch_access_token(min_expiry: float) -> Optional[tuple[str, float]]:
+    """
+    Resolve an access token the way the rest of easyDeploy does.
+
+    Tries the on-disk session cache, then in-process credentials and gcloud
+    (caching the result for other processes), then Application Default
+    Credentials such as the GCE metadata server.
+
+    Args:
+        min_expiry: Prefer tokens expiring after this POSIX timestamp
+
+    Returns:
+        tuple: (access_token, expiry timestamp), or None if no credentials exist
+    """
+    from easydeploy.cloud.gcp import auth
+    from easydeploy.cloud.gcp.credentials import CLOUD_PLATFORM_SCOPE, CredentialProvider
+
+    session = auth.load_session()
+    if session is None or session["expiry"] <= min_expiry:
+        session = auth._fetch_session() or session
+    if session is not None:
+        return session["access_token"], session["expiry"]
+
+    try:
+        import google.auth
+
+        credentials, _ = google.auth.default(scopes=[CLOUD_PLATFORM_SCOPE])
+    except Exception as e:
+        logger.debug(f"No application default credentials: {e}")
+        return None
+    return CredentialProvider().refresh(credentials)
+
+
+def discard_access_token(token: str):
+    """Keep every cache from serving a token the API rejected before its expiry.
+
+    The on-disk session is deleted if it holds the token, and the in-process
+    caches skip it from now on, so the next fetch gets a new token.
+    """
+    from easydeploy.cloud.gcp import auth
+    from easydeploy.cloud.gcp.credentials import reject_access_token
+
+    session = auth.load_session()
+    reject_access_token(token)
+    if session is not None and session["access_token"] == token:
+        auth.invalidate_session()
+
+
+class TokenManager:
+    """Holds one access token and refreshes it at most once at a time."""
+
+    def __init__(
+        self,
+        fetch: Callable[[float], Optional[tuple[str, float]]] = fetch_access_token,
+        refresh_margin: float = REFRESH_MARGIN,
+        discard: Callable[[str], None] = discard_access_token,
+    ):
+        """Initialize token manager.
+
+        Args:
+            fetch: Called with the minimum acceptable expiry; returns
+                (access_token, expiry timestamp), or None without credentials
+            refresh_margin: Seconds before expiry at which to refresh in the background
+            discard: Called with a token the API rejected, so ``fetch`` stops returning it
+        """
+        self.fetch = fetch
+        self.refresh_margin = refresh_margin
+        self.discard = discard
+        # (access_token, expiry), replaced as a whole so readers need no lock
+        self._held: Optional[tuple[str, float]] = None
+        self._next_attempt = 0.0
+        self._refreshing: Optional[Future] = None
+        self._lock = threading.Lock()
+        self._credentials = None
+        _managers.add(self)
+
+    @property
+    def expiry(self) -> float:
+        """Expiry of the held token as a POSIX timestamp (0 if none is held)."""
+        held = self._held
+        return held[1] if held else 0.0
+
+    def _usable(self, held: Optional[tuple[str, float]]) -> bool:
+        """Whether a token can still be sent."""
+        return held is not None and time.time() < held[1] - EXPIRY_SKEW
+
+    def _refresh_due(self, held: tuple[str, float]) -> bool:
+        """Whether a token is close enough to expiry to refresh it ahead."""
+        now = time.time()
+        return now >= held[1] - self.refresh_margin and now >= self._next_attempt
+
+    def refresh(self) -> Future:
+        """Start a refresh, or join the one in progress.
+
+        Returns:
+            Future resolving to the new access token (or raising RuntimeError
+            if no token could be fetched)
+        """
+        with self._lock:
+            if self._refreshing is None:
+                self._refreshing = Future()
+                threading.Thread(
+                    target=self._run_refresh,
+                    args=(self._refreshing,),
+                    name="easydeploy-token-refresh",
+                    daemon=True,
+                ).start()
+            return self._refreshing
+
+    def _run_refresh(self, future: Future):
+        """Fetch a token and publish it to everyone waiting on ``future``."""
+        try:
+            fetched = self.fetch(time.time() + self.refresh_margin)
+        except Exception as e:
+            logger.debug(f"Token refresh failed: {e}")
+            fetched = None
+
+        with self._lock:
+            self._refreshing = None
+            if fetched is not None and fetched[1] > self.expiry:
+                self._held = fetched
+            held = self._held
+            # A refresh that gained nothing (e.g. gcloud still serving the
+            # same cached token) is not repeated on every call
+            if held is None or self._refresh_due(held):
+                self._next_attempt = time.time() + RETRY_INTERVAL
+
+        if not self._usable(held):
+            future.set_exception(
+                RuntimeError("No GCP credentials found. Run: easydeploy gcp login")
+            )
+        else:
+            logger.debug(f"GCP access token valid for {held[1] - time.time():.0f}s")
+            future.set_result(held[0])
+
+    def token(self) -> str:
+        """
+        Get a valid access token, blocking only if none is held.
+
+        Returns:
+            str: OAuth2 access token
+
+        Raises:
+            RuntimeError: If no credentials are available
+        """
+        held = self._held
+        if self._usable(held):
+            if self._refresh_due(held):
+                self.refresh()
+            return held[0]
+        return self.refresh().result()
+
+    async def token_async(self) -> str:
+        """Get a valid access token from asyncio code without blocking the loop."""
+        held = self._held
+        if self._usable(held):
+            if self._refresh_due(held):
+                self.refresh()
+            return held[0]
+        return await asyncio.wrap_future(self.refresh())
+
+    def invalidate(self, token: Optional[str] = None):
+        """Discard a token the API rejected, and drop it if it is still held.
+
+        Args:
+            token: The rejected token (defaults to the held one)
+        """
+        with self._lock:
+            held = self._held
+            token = token or (held[0] if held else None)
+            if held is not None and held[0] == token:
+                self._held, self._next_attempt = None, 0.0
+        if token:
+            self.discard(token)
+
+    def credentials(self):
+        """google-auth credentials that authenticate every request with this token."""
+        if self._credentials is None:
+            self._credentials = _managed_credentials(self)
+        return self._credentials
+
+    def _after_fork(self):
+        """Replace the lock and forget a refresh whose thread did not survive a fork."""
+        self._lock = threading.Lock()
+        self._refreshing = None
+
+
+def _after_fork_in_child():
+    """Make every token manager usable in a forked child, e.g. of `easydeploy daemon`."""
+    for manager in list(_managers):
+        manager._after_fork()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def _managed_credentials(manager: TokenManager) -> Any:
+    """Build google-auth credentials backed by a TokenManager."""
+    from datetime import datetime, timezone
+
+    from google.auth import credentials, exceptions
+
+    class ManagedCredentials(credentials.Credentials):
+        """Credentials whose token comes from a shared TokenManager."""
+
+        def refresh(self, request):
+            # Called by google-auth after the API rejected the token it sent
+            manager.invalidate(self.token)
+            self._update(lambda: manager.refresh().result())
+
+        def before_request(self, request, method, url, headers):
+            self.apply(headers, token=self._update(manager.token))
+
+        def _update(self, get_token: Callable[[], str]) -> str:
+            try:
+                token = get_token()
+            except RuntimeError as e:
+                raise exceptions.RefreshError(str(e)) from e
+            # google-auth expects naive UTC
+            expiry = datetime.fromtimestamp(manager.expiry, timezone.utc).replace(tzinfo=None)
+            self.token, self.expiry = token, expiry
+            return token
+
+    return ManagedCredentials()
+
+
+@cache
+def get_token_manager() -> TokenManager:
+    """Get the process-wide token manager shared by every GCPManager."""
+    return TokenManager()
@@ -0,0 +1,75 @@
+"""Interface shared by the cloud managers (GCPManager, AzureManager)."""
+
+import abc
+import asyncio
+from concurrent.futures import Future
+from typing import Any, Dict, Iterator, Optional
+
+
+class CloudProvider(abc.ABC):
+    """Instance lifecycle that fleet deploys, teardown and readiness checks rely on.
+
+    Every create/destroy method returns a result dict with "name", "status",
+    "zone" and "operation"; ``track`` turns such a result into a future that
+    resolves to {"status": "DONE" | ..., "error"} once the operation finishes.
+    """
+
+    # Platform recorded in the state store ("gcp", "azure")
+    platform: str
+
+    # Template rendered for each fleet member
+    instance_template: str
+
+    # Whether identical fleet members can be created with one bulk request
+    supports_bulk_insert = False
+
+    # Scope deployments are recorded under (GCP project, Azure subscription)
+    project_id: str
+
+    @abc.abstractmethod
+    def create_instance(
+        self, name: str, machine_type: str, gpu_enabled: bool = False, **kwargs
+    ) -> Dict[str, Any]:
+        """Start creating an instance; ``spec`` and ``zone`` may be passed as kwargs."""
+
+    @abc.abstractmethod
+    def destroy_instance(self, name: str, zone: Optional[str] = None) -> Dict[str, Any]:
+        """Start destroying an instance."""
+
+    @abc.abstractmethod
+    def list_instances(self, labels: Optional[Dict[str, str]] = None) -> Iterator[Dict[str, Any]]:
+        """List easyDeploy instances carrying the given labels."""
+
+    @abc.abstractmethod
+    def instance_address(self, name: str, zone: Optional[str] = None) -> str:
+        """Get the address to reach an instance at over SSH."""
+
+    def host_keys(self, name: str, zone: Optional[str] = None) -> list[str]:
+        """Get the SSH host keys an instance published through the cloud's API.
+
+        SSH connections verify a new instance's host key against these, so a
+        provider that cannot publish them only reaches hosts in known_hosts.
+
+        Returns:
+            "<key type> <base64>" lines; none until the instance has published them
+        """
+        return []
+
+    @abc.abstractmethod
+    def track(self, result: Dict[str, Any]) -> Future:
+        """Track the operation behind a create/destroy result."""
+
+    async def wait_async(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Await the operation behind a create/destroy result.
+
+        Args:
+            result: Result of create_instance, bulk_insert_instances or destroy_instance
+
+        Returns:
+            Finished operation result
+        """
+        return await asyncio.wrap_future(self.track(result))
+
+    def list_firewalls(self, prefix: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """List per-deployment firewall rules; providers without any list none."""
+        return iter(())
@@ -1,36 +1,176 @@
-"""Configuration settings for easyDeploy."""
+"""Configuration settings for easyDeploy.
 
+Settings are resolved from layers, lowest precedence first:
+
+1. Built-in defaults (``Settings._default_config``)
+2. User file (``~/.easydeploy/config.yaml``)
+3. Project file (``./easydeploy.yaml``)
+4. Environment variables, e.g. ``EASYDEPLOY_CLOUD__GCP__ZONE=us-east1-b``
+   (``__`` separates nesting levels)
+5. CLI flags (``easydeploy --set cloud.gcp.zone=us-east1-b``)
+
+The merged result is flattened into a dot-key index so ``get()`` is a single
+dict lookup. Files are re-read only when their mtime changes.
+"""
+
+import copy
 import os
+import time
 from pathlib import Path
 from typing import Any, Dict, Optional
 
-import yaml
+ENV_PREFIX = "EASYDEPLOY_"
+PROJECT_CONFIG_NAME = "easydeploy.yaml"
+
+# Minimum seconds between mtime checks of the config files
+RELOAD_CHECK_INTERVAL = 1.0
+
+
+def _read_yaml(path: Path) -> Dict[str, Any]:
+    """Read a YAML mapping, preferring the libyaml C loader when available."""
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path) as f:
+        return yaml.load(f, Loader=loader) or {}
+
+
+def _set_path(config: Dict[str, Any], keys: list[str], value: Any):
+    """Set a value in a nested dict, creating intermediate dicts."""
+    for k in keys[:-1]:
+        if not isinstance(config.get(k), dict):
+            config[k] = {}
+        config = config[k]
+    config[keys[-1]] = value
+
+
+def _deep_merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """Recursively merge override into base (in place) and return base."""
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            _deep_merge(base[key], value)
+        else:
+            base[key] = copy.deepcopy(value)
+    return base
+
+
+def _flatten(config: Dict[str, Any], prefix: str = "", index: Optional[dict] = None) -> dict:
+    """Index every nested value (including intermediate dicts) by its dot key."""
+    if index is None:
+        index = {}
+    for key, value in config.items():
+        dotted = f"{prefix}{key}"
+        index[dotted] = value
+        if isinstance(value, dict):
+            _flatten(value, f"{dotted}.", index)
+    return index
+
+
+def _parse_env_value(value: str, default: Any = None) -> Any:
+    """Convert an environment variable string to the type of the key's default.
+
+    Only keys whose default is a bool, int or float are converted, so versions
+    such as "12.10" stay the strings they were written as.
+
+    Args:
+        value: Environment variable value
+        default: Built-in default of the key, if it has one
+    """
+    if isinstance(default, bool):
+        lowered = value.lower()
+        if lowered in ("true", "false"):
+            return lowered == "true"
+    elif isinstance(default, (int, float)):
+        try:
+            return type(default)(value)
+        except ValueError:
+            pass
+    return value
 
 
 class Settings:
     """Global settings manager for easyDeploy."""
 
-    def __init__(self, config_path: Optional[Path] = None):
+    def __init__(
+        self,
+        config_path: Optional[Path] = None,
+        project_config_path: Optional[Path] = None,
+        overrides: Optional[Dict[str, Any]] = None,
+    ):
         """Initialize settings.
 
         Args:
-            config_path: Path to configuration file
+            config_path: Path to the user configuration file
+            project_config_path: Path to the project configuration file
+            overrides: Dot-key values that take precedence over every other layer
         """
         self.config_path = config_path or Path.home() / ".easydeploy" / "config.yaml"
+        self.project_config_path = project_config_path or Path.cwd() / PROJECT_CONFIG_NAME
         self.state_dir = Path.cwd() / "state"
         self.templates_dir = Path.cwd() / "templates"
         self.scripts_dir = Path.cwd() / "src" / "scripts"
 
-        self._config = {}
+        self._user_config: Dict[str, Any] = {}
+        self._project_config: Dict[str, Any] = {}
+        self._overrides: Dict[str, Any] = {}
+        self._mtimes: Dict[Path, Optional[float]] = {}
+        self._index: Dict[str, Any] = {}
+        self._last_check = 0.0
+
+        for key, value in (overrides or {}).items():
+            _set_path(self._overrides, key.split("."), value)
         self._load_config()
 
     def _load_config(self):
-        """Load configuration from file."""
-        if self.config_path.exists():
-            with open(self.config_path) as f:
-                self._config = yaml.safe_load(f) or {}
-        else:
-            self._config = self._default_config()
+        """Load configuration files and rebuild the key index."""
+        self._user_config = self._load_file(self.config_path)
+        self._project_config = self._load_file(self.project_config_path)
+        self._rebuild()
+
+    def _load_file(self, path: Path) -> Dict[str, Any]:
+        """Load one configuration file and remember its mtime."""
+        try:
+            self._mtimes[path] = path.stat().st_mtime
+        except OSError:
+            self._mtimes[path] = None
+            return {}
+        return _read_yaml(path)
+
+    def _env_config(self) -> Dict[str, Any]:
+        """Collect EASYDEPLOY_SECTION__KEY environment variables into a nested dict."""
+        config: Dict[str, Any] = {}
+        defaults = None
+        for name, value in os.environ.items():
+            if name.startswith(ENV_PREFIX) and "__" in name:
+                if defaults is None:
+                    defaults = _flatten(self._default_config())
+                keys = name[len(ENV_PREFIX) :].lower().split("__")
+                _set_path(config, keys, _parse_env_value(value, defaults.get(".".join(keys))))
+        return config
+
+    def _rebuild(self):
+        """Merge all layers and precompute the flat key index."""
+        merged = self._default_config()
+        for layer in (self._user_config, self._project_config, self._env_config(), self._overrides):
+            _deep_merge(merged, layer)
+        self._index = _flatten(merged)
+        self._last_check = time.monotonic()
+
+    def _reload_if_changed(self):
+        """Re-read configuration files whose mtime changed since they were loaded."""
+        now = time.monotonic()
+        if now - self._last_check < RELOAD_CHECK_INTERVAL:
+            return
+        self._last_check = now
+
+        for path in (self.config_path, self.project_config_path):
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                mtime = None
+            if mtime != self._mtimes.get(path):
+                self._load_config()
+                return
 
     def _default_config(self) -> Dict[str, Any]:
         """Return default configuration."""
@@ -40,11 +180,17 @@ class Settings:
                     "project_id": os.getenv("GOOGLE_CLOUD_PROJECT"),
                     "region": "us-central1",
                     "zone": "us-central1-a",
+                    # Zones deploy falls back to, in order, when the zone is out of
+                    # capacity or quota (default: nearby zones from the catalog)
+                    "fallback_zones": None,
                 },
                 "azure": {
                     "subscription_id": os.getenv("AZURE_SUBSCRIPTION_ID"),
                     "resource_group": "easydeploy-rg",
                     "location": "eastus",
+                    # Existing network new VMs join
+                    "virtual_network": "easydeploy-vnet",
+                    "subnet": "default",
                 },
             },
             "defaults": {
@@ -55,6 +201,7 @@ class Settings:
                 },
             },
             "software": {"ros_version": "humble", "python_version": "3.11", "cuda_version": "12.0"},
+            "provisioning": {"bundle_store": None},
         }
 
     def get(self, key: str, default: Any = None) -> Any:
@@ -67,39 +214,57 @@ class Settings:
         Returns:
             Configuration value
         """
-        keys = key.split(".")
-        value = self._config
-
-        try:
-            for k in keys:
-                value = value[k]
-            return value
-        except (KeyError, TypeError):
-            return default
+        self._reload_if_changed()
+        return self._index.get(key, default)
 
     def set(self, key: str, value: Any):
-        """Set configuration value by dot-notation key.
+        """Set configuration value by dot-notation key in the user layer.
+
+        The value is persisted by ``save()``. Project files, environment
+        variables and overrides still take precedence over it.
 
         Args:
             key: Configuration key
             value: Value to set
         """
-        keys = key.split(".")
-        config = self._config
+        _set_path(self._user_config, key.split("."), value)
+        self._rebuild()
 
-        for k in keys[:-1]:
-            if k not in config:
-                config[k] = {}
-            config = config[k]
+    def override(self, key: str, value: Any):
+        """Override a configuration value for this process only (e.g. from a CLI flag).
 
-        config[keys[-1]] = value
+        Args:
+            key: Configuration key
+            value: Value to set
+        """
+        _set_path(self._overrides, key.split("."), value)
+        self._rebuild()
 
     def save(self):
-        """Save configuration to file."""
+        """Save the user configuration layer to file."""
+        import yaml
+
+        dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
         with open(self.config_path, "w") as f:
-            yaml.dump(self._config, f, default_flow_style=False)
+            yaml.dump(self._user_config, f, Dumper=dumper, default_flow_style=False)
+        self._mtimes[self.config_path] = self.config_path.stat().st_mtime
+
+
+_settings: Optional[Settings] = None
+
+
+def get_settings() -> Settings:
+    """Get the global settings instance, loading it on first use."""
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
 
 
-# Global settings instance
-settings = Settings()
+def __getattr__(name: str) -> Any:
+    # Keep `from easydeploy.config.settings import settings` working without
+    # parsing the config file at import time.
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
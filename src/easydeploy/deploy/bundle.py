@@ -0,0 +1,316 @@
+"""Content-addressed provisioning bundles.
+
+The provisioning scripts (``Settings.scripts_dir``) are packed into a
+reproducible ``.tar.gz`` whose name is the SHA-256 of its bytes. A bundle is
+uploaded to the configured store only if that hash is not there yet, so
+identical fleets share one upload and unchanged redeploys upload nothing.
+Instances download the bundle by hash in their startup script and verify it
+before running anything.
+
+The store is set by ``provisioning.bundle_store``:
+
+- ``gs://bucket/prefix``: Cloud Storage, through the gcloud CLI
+- ``http(s)://host/path``: any server accepting ``HEAD`` and ``PUT``
+- a local path or ``file://`` URL: for instances that mount a shared directory
+
+Instances read gs:// stores with their service account (see
+gcp-instance.yaml.j2). ``deploy`` publishes nothing while no store is set,
+because the default ``~/.easydeploy/bundles`` exists only on this machine.
+"""
+
+import gzip
+import hashlib
+import io
+import logging
+import os
+import shutil
+import tarfile
+import tempfile
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from easydeploy.utils import trace
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_PREFIX = "bundle-"
+BUNDLE_SUFFIX = ".tar.gz"
+
+
+def get_bundle_dir() -> Path:
+    """Get the directory holding locally built bundles."""
+    return Path.home() / ".easydeploy" / "bundles"
+
+
+def bundle_name(digest: str) -> str:
+    """File name of the bundle with the given SHA-256."""
+    return f"{BUNDLE_PREFIX}{digest}{BUNDLE_SUFFIX}"
+
+
+def _normalize(info: tarfile.TarInfo) -> tarfile.TarInfo:
+    """Strip ownership, timestamps and permission noise so archives are reproducible."""
+    info.uid = info.gid = 0
+    info.uname = info.gname = ""
+    info.mtime = 0
+    if info.isdir() or info.mode & 0o100:
+        info.mode = 0o755
+    else:
+        info.mode = 0o644
+    return info
+
+
+def pack(source_dir: Path) -> bytes:
+    """Pack a directory into reproducible ``.tar.gz`` bytes.
+
+    Equal directory contents always produce byte-identical archives, whatever
+    the files' timestamps, owners or on-disk order.
+
+    Args:
+        source_dir: Directory to pack
+
+    Returns:
+        Compressed archive
+    """
+    source_dir = Path(source_dir)
+    paths = sorted(
+        path
+        for path in source_dir.rglob("*")
+        if not any(part.startswith(".") or part == "__pycache__" for part in path.parts)
+    )
+
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb", mtime=0) as compressed:
+        with tarfile.open(fileobj=compressed, mode="w", format=tarfile.PAX_FORMAT) as tar:
+            for path in paths:
+                if not (path.is_file() or path.is_dir()):
+                    continue
+                arcname = path.relative_to(source_dir).as_posix()
+                tar.add(path, arcname=arcname, recursive=False, filter=_normalize)
+    return buffer.getvalue()
+
+
+def build_bundle(source_dir: Path, output_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """Pack a directory into a content-addressed bundle file.
+
+    Args:
+        source_dir: Directory to pack (e.g. Settings.scripts_dir)
+        output_dir: Where to write the bundle (defaults to ~/.easydeploy/bundles)
+
+    Returns:
+        {"sha256", "path", "size"} of the bundle
+
+    Raises:
+        FileNotFoundError: If source_dir does not exist
+    """
+    if not Path(source_dir).is_dir():
+        raise FileNotFoundError(f"Provisioning scripts directory {source_dir} does not exist")
+
+    data = pack(source_dir)
+    digest = hashlib.sha256(data).hexdigest()
+    output_dir = Path(output_dir) if output_dir else get_bundle_dir()
+    path = output_dir / bundle_name(digest)
+    if not path.exists():
+        output_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=output_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    return {"sha256": digest, "path": path, "size": len(data)}
+
+
+class FileBundleStore:
+    """Bundle store in a local (or mounted) directory."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.location = str(self.root)
+
+    def url(self, digest: str) -> str:
+        return (self.root / bundle_name(digest)).resolve().as_uri()
+
+    def exists(self, digest: str) -> bool:
+        return (self.root / bundle_name(digest)).exists()
+
+    def upload(self, path: Path, digest: str):
+        target = self.root / bundle_name(digest)
+        if target.resolve() == Path(path).resolve():
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        os.close(fd)
+        shutil.copyfile(path, tmp_path)
+        os.replace(tmp_path, target)
+
+
+class GCSBundleStore:
+    """Bundle store in a Cloud Storage bucket, accessed through the gcloud CLI."""
+
+    def __init__(self, location: str):
+        self.location = location.rstrip("/")
+
+    def url(self, digest: str) -> str:
+        return f"{self.location}/{bundle_name(digest)}"
+
+    def exists(self, digest: str) -> bool:
+        result = trace.run(
+            ["gcloud", "storage", "objects", "describe", self.url(digest), "--format=value(name)"],
+            capture_output=True,
+            text=True,
+        )
+        return result.returncode == 0
+
+    def upload(self, path: Path, digest: str):
+        trace.run(
+            ["gcloud", "storage", "cp", "--no-clobber", str(path), self.url(digest)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+
+class HTTPBundleStore:
+    """Bundle store on an HTTP server accepting HEAD and PUT."""
+
+    def __init__(self, location: str):
+        self.location = location.rstrip("/")
+
+    def url(self, digest: str) -> str:
+        return f"{self.location}/{bundle_name(digest)}"
+
+    def exists(self, digest: str) -> bool:
+        request = urllib.request.Request(self.url(digest), method="HEAD")
+        try:
+            with urllib.request.urlopen(request, timeout=30):
+                return True
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return False
+            raise
+
+    def upload(self, path: Path, digest: str):
+        data = Path(path).read_bytes()
+        request = urllib.request.Request(
+            self.url(digest),
+            data=data,
+            method="PUT",
+            headers={"Content-Type": "application/gzip", "Content-Length": str(len(data))},
+        )
+        with urllib.request.urlopen(request, timeout=300):
+            pass
+
+
+def bundle_digest(source_dir: Path) -> Dict[str, Any]:
+    """Compute the SHA-256 a bundle of a directory would have, writing nothing.
+
+    Args:
+        source_dir: Directory to pack
+
+    Returns:
+        {"sha256", "size"} of the bundle
+
+    Raises:
+        FileNotFoundError: If source_dir does not exist
+    """
+    if not Path(source_dir).is_dir():
+        raise FileNotFoundError(f"Provisioning scripts directory {source_dir} does not exist")
+    data = pack(source_dir)
+    return {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data)}
+
+
+def get_bundle_store(location: Optional[str] = None):
+    """Get the bundle store for a location.
+
+    Args:
+        location: gs:// or http(s):// URL, file:// URL or local path
+            (defaults to the provisioning.bundle_store setting, then the local
+            ~/.easydeploy/bundles, which only this machine can read)
+
+    Returns:
+        Bundle store with ``url``, ``exists`` and ``upload`` methods
+    """
+    if location is None:
+        from easydeploy.config.settings import get_settings
+
+        location = get_settings().get("provisioning.bundle_store")
+    if not location:
+        return FileBundleStore(get_bundle_dir())
+    if location.startswith("gs://"):
+        return GCSBundleStore(location)
+    if location.startswith(("http://", "https://")):
+        return HTTPBundleStore(location)
+    if location.startswith("file://"):
+        location = urllib.request.url2pathname(location[len("file://") :])
+    return FileBundleStore(Path(location).expanduser())
+
+
+def _published_marker(store, digest: str) -> Path:
+    """Local record that a bundle is known to be in a store."""
+    store_key = hashlib.sha256(store.location.encode()).hexdigest()[:16]
+    return get_bundle_dir() / "published" / store_key / digest
+
+
+def locate_bundle(source_dir: Optional[Path] = None, store=None) -> Dict[str, Any]:
+    """Work out where the provisioning bundle is published, without publishing it.
+
+    Args:
+        source_dir: Directory to pack (defaults to Settings.scripts_dir)
+        store: Bundle store (defaults to ``get_bundle_store()``)
+
+    Returns:
+        {"sha256", "url", "size"}, as ``publish_bundle`` would return them
+    """
+    if source_dir is None:
+        from easydeploy.config.settings import get_settings
+
+        source_dir = get_settings().scripts_dir
+    if store is None:
+        store = get_bundle_store()
+
+    bundle = bundle_digest(source_dir)
+    return {**bundle, "url": store.url(bundle["sha256"])}
+
+
+def publish_bundle(source_dir: Optional[Path] = None, store=None) -> Dict[str, Any]:
+    """Build the provisioning bundle and upload it unless the store already has it.
+
+    Uploads are remembered locally, so republishing an unchanged bundle costs
+    no network round-trip at all.
+
+    Args:
+        source_dir: Directory to pack (defaults to Settings.scripts_dir)
+        store: Bundle store (defaults to ``get_bundle_store()``)
+
+    Returns:
+        {"sha256", "url", "size", "uploaded"}, where "uploaded" tells whether
+        this call transferred the bundle
+    """
+    if source_dir is None:
+        from easydeploy.config.settings import get_settings
+
+        source_dir = get_settings().scripts_dir
+    if store is None:
+        store = get_bundle_store()
+
+    bundle = build_bundle(source_dir)
+    digest = bundle["sha256"]
+    marker = _published_marker(store, digest)
+
+    uploaded = False
+    if not marker.exists():
+        if store.exists(digest):
+            logger.debug(f"Bundle {digest[:12]} already in {store.url(digest)}")
+        else:
+            logger.info(f"Uploading provisioning bundle {digest[:12]} ({bundle['size']} bytes)")
+            store.upload(bundle["path"], digest)
+            uploaded = True
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        marker.touch()
+
+    return {
+        "sha256": digest,
+        "url": store.url(digest),
+        "size": bundle["size"],
+        "uploaded": uploaded,
+    }
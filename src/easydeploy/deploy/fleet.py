@@ -0,0 +1,326 @@
+"""Fleet deployment: bring up many instances from one manifest.
+
+A fleet manifest is a YAML file such as::
+
+    name: isaac-workers
+    count: 100
+    zone: us-central1-a
+    machine_type: n1-standard-8
+    gpu: true
+    gpu_type: nvidia-tesla-t4
+    params:                 # extra gcp-instance.yaml.j2 variables
+      ros_distro: humble
+    members:                # optional per-member overrides, by index
+      - machine_type: n1-standard-16
+
+Members are named ``<name>-001`` ... ``<name>-NNN`` and are labelled and
+tagged as the fleet as a whole, however they are created. Identical members are
+created with a single Compute ``bulkInsert`` request; otherwise each member is
+rendered from the manager's instance template (``gcp-instance.yaml.j2`` or
+``azure-instance.yaml.j2``) and created through the cloud manager with bounded
+concurrency.
+"""
+
+import getpass
+import logging
+import os
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from easydeploy.cloud.gcp.compute import BULK_INSERT_MAX
+from easydeploy.cloud.provider import CloudProvider
+from easydeploy.deploy.templates import get_engine
+from easydeploy.remote.readiness import READY_MARKER
+
+logger = logging.getLogger(__name__)
+
+INSTANCE_TEMPLATE = "gcp-instance.yaml.j2"
+
+# Maximum number of instance creations in flight at once
+DEFAULT_CONCURRENCY = 16
+
+
+def _ssh_public_key(user: str) -> str:
+    """Read the local SSH public key in GCP ``ssh-keys`` metadata format."""
+    for key_name in ("id_ed25519.pub", "id_rsa.pub"):
+        path = Path.home() / ".ssh" / key_name
+        if path.exists():
+            return f"{user}:{path.read_text().strip()}"
+    return ""
+
+
+def default_instance_params(settings=None) -> Dict[str, Any]:
+    """Build default gcp-instance.yaml.j2 variables from settings.
+
+    Args:
+        settings: Settings instance (defaults to the global settings)
+
+    Returns:
+        Template variables shared by every fleet member
+    """
+    if settings is None:
+        from easydeploy.config.settings import get_settings
+
+        settings = get_settings()
+
+    user = getpass.getuser()
+    return {
+        "project_id": settings.get("cloud.gcp.project_id"),
+        "zone": settings.get("cloud.gcp.zone"),
+        "machine_type": settings.get("defaults.instance_type.gcp"),
+        "gpu_enabled": False,
+        "deploy_user": user,
+        "ssh_public_key": _ssh_public_key(user),
+        "ssh_port": 22,
+        "allowed_ip_ranges": ["0.0.0.0/0"],
+        "cuda_version": settings.get("software.cuda_version"),
+        "ros_distro": settings.get("software.ros_version"),
+        "ngc_api_key": os.getenv("NGC_API_KEY", ""),
+        "cpu_only": "false",
+        "ready_marker": READY_MARKER,
+    }
+
+
+def load_fleet_manifest(path: Path) -> Dict[str, Any]:
+    """Load and validate a fleet manifest.
+
+    Args:
+        path: Path to the manifest YAML file
+
+    Returns:
+        Parsed manifest
+
+    Raises:
+        ValueError: If the manifest is missing a name or has an invalid count
+    """
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path) as f:
+        manifest = yaml.load(f, Loader=loader) or {}
+
+    if not manifest.get("name"):
+        raise ValueError(f"Fleet manifest {path} must set 'name'")
+    members = manifest.get("members") or []
+    manifest.setdefault("count", max(len(members), 1))
+    if not isinstance(manifest["count"], int) or manifest["count"] < 1:
+        raise ValueError(f"Fleet manifest {path} has an invalid 'count'")
+    if len(members) > manifest["count"]:
+        raise ValueError(f"Fleet manifest {path} lists more members than 'count'")
+    return manifest
+
+
+def member_name(fleet_name: str, index: int, count: int) -> str:
+    """Name of the index-th (1-based) member of a fleet."""
+    if count == 1:
+        return fleet_name
+    return f"{fleet_name}-{index:0{max(3, len(str(count)))}d}"
+
+
+def expand_members(manifest: Dict[str, Any], base_params: Dict[str, Any]) -> list[Dict[str, Any]]:
+    """Compute the template variables of every fleet member.
+
+    Args:
+        manifest: Parsed fleet manifest
+        base_params: Defaults from ``default_instance_params``
+
+    Returns:
+        One dict of template variables per member
+    """
+    shared = {**base_params, **manifest.get("params", {})}
+    for key in ("zone", "machine_type", "gpu_type", "gpu_count"):
+        if manifest.get(key) is not None:
+            shared[key] = manifest[key]
+    if manifest.get("gpu") is not None:
+        shared["gpu_enabled"] = bool(manifest["gpu"])
+
+    count = manifest["count"]
+    overrides = manifest.get("members") or []
+    members = []
+    for index in range(1, count + 1):
+        params = dict(shared)
+        if index <= len(overrides):
+            params.update(overrides[index - 1] or {})
+        params["deployment_name"] = member_name(manifest["name"], index, count)
+        if count > 1:
+            params["fleet_name"] = manifest["name"]
+        members.append(params)
+    return members
+
+
+class FleetDeployer:
+    """Creates the instances of a fleet concurrently through a cloud manager."""
+
+    def __init__(
+        self, manager, concurrency: int = DEFAULT_CONCURRENCY, use_bulk_insert: bool = True
+    ):
+        """Initialize fleet deployer.
+
+        Args:
+            manager: GCPManager or AzureManager used to create instances
+            concurrency: Maximum number of instance creations in flight
+            use_bulk_insert: Create identical members with one bulkInsert request
+                (only where the manager supports it)
+        """
+        self.manager = manager
+        self.concurrency = max(1, concurrency)
+        self.use_bulk_insert = use_bulk_insert
+        self.template = INSTANCE_TEMPLATE
+        if isinstance(manager, CloudProvider):
+            self.use_bulk_insert = use_bulk_insert and manager.supports_bulk_insert
+            self.template = manager.instance_template
+
+    def _can_bulk_insert(self, manifest: Dict[str, Any]) -> bool:
+        """Whether every member is identical apart from its name."""
+        return (
+            self.use_bulk_insert
+            and 1 < manifest["count"] <= BULK_INSERT_MAX
+            and not manifest.get("members")
+        )
+
+    def _create(self, params: Dict[str, Any], spec: Dict[str, Any]) -> Dict[str, Any]:
+        """Create one fleet member from its rendered spec, capturing failures."""
+        name = params["deployment_name"]
+        try:
+            return self.manager.create_instance(
+                name,
+                machine_type=params["machine_type"],
+                gpu_enabled=params["gpu_enabled"],
+                spec=spec,
+                zone=params["zone"],
+            )
+        except Exception as e:
+            logger.debug(f"Creating {name} failed: {e}", extra={"host": name})
+            return {"name": name, "status": "failed", "error": str(e), "zone": params["zone"]}
+
+    def deploy(
+        self,
+        manifest: Dict[str, Any],
+        base_params: Optional[Dict[str, Any]] = None,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> list[Dict[str, Any]]:
+        """Create every member of a fleet.
+
+        Args:
+            manifest: Parsed fleet manifest
+            base_params: Shared template variables (defaults to ``default_instance_params``)
+            progress: Called with each member's result as soon as it is known
+
+        Returns:
+            One result dict per member, with "status" of "creating" or "failed"
+        """
+        if base_params is None:
+            base_params = default_instance_params()
+        members = expand_members(manifest, base_params)
+
+        if self._can_bulk_insert(manifest):
+            return self._bulk_deploy(manifest, members, progress)
+        return self.deploy_members(members, progress)
+
+    def deploy_members(
+        self,
+        members: list[Dict[str, Any]],
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> list[Dict[str, Any]]:
+        """Create fleet members one request each.
+
+        Args:
+            members: Template variables of each member, as from ``expand_members``
+            progress: Called with each member's result as soon as it is known
+
+        Returns:
+            One result dict per member, with "status" of "creating" or "failed"
+        """
+        # One compiled template renders every member; rendering is lazy so the
+        # first creations start while later members are still being rendered.
+        specs = get_engine().render_many(self.template, members, parse=True)
+        results = []
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(members))) as executor:
+            futures = [
+                executor.submit(self._create, params, spec) for params, spec in zip(members, specs)
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if progress:
+                    progress(result)
+        return results
+
+    def _bulk_deploy(
+        self,
+        manifest: Dict[str, Any],
+        members: list[Dict[str, Any]],
+        progress: Optional[Callable[[Dict[str, Any]], None]],
+    ) -> list[Dict[str, Any]]:
+        """Create an identical fleet with a single bulkInsert request."""
+        # Members are labelled and tagged by fleet, so the first member's spec
+        # is every member's spec apart from the name the pattern gives it
+        digits = max(3, len(str(manifest["count"])))
+        try:
+            bulk = self.manager.bulk_insert_instances(
+                get_engine().render_yaml(self.template, **members[0]),
+                manifest["count"],
+                f"{manifest['name']}-{'#' * digits}",
+            )
+            status, extra = "creating", {"operation": bulk["operation"]}
+        except Exception as e:
+            logger.debug(f"Bulk insert of {manifest['name']} failed: {e}")
+            status, extra = "failed", {"error": str(e)}
+
+        results = []
+        for member in members:
+            result = {
+                "name": member["deployment_name"],
+                "status": status,
+                "machine_type": member["machine_type"],
+                "gpu_enabled": member["gpu_enabled"],
+                "zone": member["zone"],
+                **extra,
+            }
+            results.append(result)
+            if progress:
+                progress(result)
+        return results
+
+    def wait(
+        self,
+        results: list[Dict[str, Any]],
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> list[Dict[str, Any]]:
+        """Wait for the creation operations of deployed members to finish.
+
+        Operations are waited on concurrently through the manager's shared
+        operation tracker; members of one bulkInsert share a single operation.
+
+        Args:
+            results: Results returned by ``deploy``; updated in place
+            progress: Called with each member's result once its operation finishes
+
+        Returns:
+            The same results, with "status" of "running" or "failed"
+        """
+        pending: Dict[Future, list[Dict[str, Any]]] = {}
+        by_operation: Dict[str, Future] = {}
+        for result in results:
+            if result["status"] != "creating" or "operation" not in result:
+                continue
+            future = by_operation.get(result["operation"])
+            if future is None:
+                future = by_operation[result["operation"]] = self.manager.track(result)
+                pending[future] = []
+            pending[future].append(result)
+
+        for future in as_completed(pending):
+            try:
+                outcome = future.result()
+            except Exception as e:
+                outcome = {"status": "FAILED", "error": str(e)}
+            for result in pending[future]:
+                if outcome["status"] == "DONE":
+                    result["status"] = "running"
+                else:
+                    result.update(status="failed", error=outcome["error"])
+                if progress:
+                    progress(result)
+        return results
@@ -0,0 +1,135 @@
+"""Dependency-graph executor for creating cloud resources in parallel.
+
+A deployment is several resources (boot disk, instance, firewall rule), some
+of which depend on others: the instance needs its boot disk, while the
+firewall rule needs nothing. ``ResourceGraph`` runs every node as soon as its
+dependencies have succeeded, on a bounded pool of workers, so the firewall
+rules of 50 deployments are created while their disks are. When a node fails,
+the nodes depending on it (directly or not) are cancelled without running;
+unrelated nodes carry on.
+
+Nodes must be added after their dependencies, which keeps the graph acyclic.
+"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Nodes running at once
+DEFAULT_MAX_WORKERS = 16
+
+
+def _result(
+    status: str, value: Any = None, error: Optional[str] = None, elapsed: Optional[float] = None
+) -> Dict[str, Any]:
+    return {"status": status, "result": value, "error": error, "elapsed": elapsed}
+
+
+class ResourceGraph:
+    """A set of resource operations and the dependencies between them."""
+
+    def __init__(self):
+        """Initialize an empty graph."""
+        self._nodes: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._nodes
+
+    def add(self, key: str, func: Callable[[], Any], deps: Iterable[str] = ()) -> str:
+        """Add a node.
+
+        Args:
+            key: Unique node key, e.g. "disk:w-001"
+            func: Blocking call creating (or changing) the resource; raising marks
+                the node failed
+            deps: Keys of nodes that must succeed first
+
+        Returns:
+            The node key
+
+        Raises:
+            ValueError: If the key is taken or a dependency has not been added
+        """
+        if key in self._nodes:
+            raise ValueError(f"Duplicate graph node {key!r}")
+        deps = tuple(deps)
+        for dep in deps:
+            if dep not in self._nodes:
+                raise ValueError(f"Graph node {key!r} depends on unknown node {dep!r}")
+        self._nodes[key] = {"func": func, "deps": deps}
+        return key
+
+    def run(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        progress: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Run every node, each as soon as its dependencies have succeeded.
+
+        Args:
+            max_workers: Maximum nodes running at once
+            progress: Called with (key, result) as each node finishes or is cancelled
+
+        Returns:
+            {key: {"status": "done" | "failed" | "cancelled", "result", "error", "elapsed"}}
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        if not self._nodes:
+            return results
+
+        waiting = {key: set(node["deps"]) for key, node in self._nodes.items()}
+        children: Dict[str, list[str]] = {key: [] for key in self._nodes}
+        for key, node in self._nodes.items():
+            for dep in node["deps"]:
+                children[dep].append(key)
+
+        def finish(key: str, result: Dict[str, Any]):
+            results[key] = result
+            if progress:
+                progress(key, result)
+
+        def call(key: str) -> tuple[Any, float]:
+            started = time.monotonic()
+            return self._nodes[key]["func"](), time.monotonic() - started
+
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(self._nodes))))
+        running = {}
+
+        def submit_ready():
+            for key in [key for key, deps in waiting.items() if not deps]:
+                del waiting[key]
+                running[executor.submit(call, key)] = key
+
+        try:
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = running.pop(future)
+                    try:
+                        value, elapsed = future.result()
+                    except Exception as e:
+                        logger.debug(f"Graph node {key} failed: {e}")
+                        finish(key, _result("failed", error=str(e)))
+                        cancel = list(children[key])
+                        while cancel:
+                            dependent = cancel.pop()
+                            if waiting.pop(dependent, None) is not None:
+                                finish(dependent, _result("cancelled", error=f"{key} failed"))
+                                cancel.extend(children[dependent])
+                        continue
+                    finish(key, _result("done", value, elapsed=elapsed))
+                    for child in children[key]:
+                        if child in waiting:
+                            waiting[child].discard(key)
+                submit_ready()
+        finally:
+            # On interruption, drop the nodes that have not started yet
+            executor.shutdown(wait=True, cancel_futures=True)
+        return results
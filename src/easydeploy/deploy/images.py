@@ -0,0 +1,286 @@
+"""Golden images: provision once, boot ready.
+
+A golden image is a custom GCP image of an instance that has already run the
+provisioning bundle. Images are keyed by a hash of the software stack
+(``software.ros_version``, ``cuda_version`` and ``python_version``), the
+provisioning bundle and whether GPU drivers are installed, and carry that key
+as a label. ``deploy`` boots from the image matching the current key when one
+exists, so instances skip the ROS/CUDA/Isaac installation entirely.
+
+Building starts a temporary builder instance from the stock Ubuntu image,
+waits for its startup script to finish provisioning, removes its ready marker
+and machine identity, stops it and images its boot disk. Older images of the
+same variant are garbage collected afterwards.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import shlex
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+INSTANCE_TEMPLATE = "gcp-instance.yaml.j2"
+
+# Label marking every golden image, and the label holding its key
+IMAGE_LABEL = "easydeploy-image"
+KEY_LABEL = "easydeploy-key"
+
+# Settings that change what the provisioning scripts install
+KEY_SETTINGS = ("software.ros_version", "software.cuda_version", "software.python_version")
+
+# Images of each variant kept by garbage collection, newest first
+DEFAULT_KEEP = 2
+
+# Seconds a builder instance may spend provisioning
+BUILD_TIMEOUT = 3600.0
+
+# Per-machine state of the builder that instances booted from its image must
+# not share: their SSH host keys, machine ID and cloud-init instance record
+# are regenerated on first boot
+MACHINE_STATE_PATHS = ("/etc/ssh/ssh_host_*", "/var/lib/dbus/machine-id")
+
+
+def scrub_command(marker: str) -> str:
+    """Shell command removing a builder's ready marker and per-machine state.
+
+    Args:
+        marker: Ready marker written by the startup script
+
+    Returns:
+        Command line to run on the builder over SSH
+    """
+    script = "; ".join(
+        [
+            "set -e",
+            f"rm -f {shlex.quote(marker)} {' '.join(MACHINE_STATE_PATHS)}",
+            "truncate -s 0 /etc/machine-id",
+            "if command -v cloud-init >/dev/null; then cloud-init clean --logs; fi",
+            "sync",
+        ]
+    )
+    return f"sudo sh -c {shlex.quote(script)}"
+
+
+def _label_value(value: Any) -> str:
+    """Make a value usable as a GCP label value (lowercase letters, digits, - and _)."""
+    return re.sub(r"[^a-z0-9_-]", "_", str(value).lower())[:63]
+
+
+def image_key(bundle_sha256: str, gpu: bool, settings=None) -> str:
+    """Compute the key identifying a golden image's contents.
+
+    Args:
+        bundle_sha256: Hash of the provisioning bundle
+        gpu: Whether the image includes GPU drivers
+        settings: Settings instance (defaults to the global settings)
+
+    Returns:
+        Short hex key
+    """
+    if settings is None:
+        from easydeploy.config.settings import get_settings
+
+        settings = get_settings()
+    stack = {key: settings.get(key) for key in KEY_SETTINGS}
+    stack.update(bundle=bundle_sha256, gpu=bool(gpu))
+    return hashlib.sha256(json.dumps(stack, sort_keys=True).encode()).hexdigest()[:20]
+
+
+def image_name(key: str) -> str:
+    """Name of the golden image with the given key."""
+    return f"easydeploy-{key}"
+
+
+def image_family(gpu: bool) -> str:
+    """Image family of a golden image variant."""
+    return f"easydeploy-golden-{'gpu' if gpu else 'cpu'}"
+
+
+def image_labels(key: str, gpu: bool, settings=None) -> Dict[str, str]:
+    """Labels describing a golden image."""
+    if settings is None:
+        from easydeploy.config.settings import get_settings
+
+        settings = get_settings()
+    labels = {IMAGE_LABEL: "true", KEY_LABEL: key, "variant": "gpu" if gpu else "cpu"}
+    for setting in KEY_SETTINGS:
+        labels[setting.rsplit(".", 1)[-1].removesuffix("_version")] = _label_value(
+            settings.get(setting)
+        )
+    return labels
+
+
+class ImageBuilder:
+    """Builds, finds and garbage collects golden images through ``GCPManager``."""
+
+    def __init__(self, manager, settings=None):
+        """Initialize image builder.
+
+        Args:
+            manager: GCPManager for the project holding the images
+            settings: Settings instance (defaults to the global settings)
+        """
+        if settings is None:
+            from easydeploy.config.settings import get_settings
+
+            settings = get_settings()
+        self.manager = manager
+        self.settings = settings
+
+    def key(self, bundle_sha256: str, gpu: bool) -> str:
+        """Key of the golden image for a bundle and variant."""
+        return image_key(bundle_sha256, gpu, self.settings)
+
+    def find(self, key: str) -> Optional[Dict[str, Any]]:
+        """Find the ready golden image with a key, if one exists."""
+        for image in self.manager.list_images({KEY_LABEL: key}):
+            if image["status"] == "READY":
+                return image
+        return None
+
+    def build(
+        self,
+        bundle: Dict[str, Any],
+        base_params: Dict[str, Any],
+        gpu: bool = False,
+        force: bool = False,
+        progress: Optional[Callable[[str], None]] = None,
+    ) -> Dict[str, Any]:
+        """Build the golden image for a bundle unless a matching one exists.
+
+        Args:
+            bundle: Published bundle, as returned by ``publish_bundle``
+            base_params: gcp-instance.yaml.j2 variables for the builder instance
+            gpu: Build the GPU variant (installs drivers; the builder gets a GPU)
+            force: Rebuild even if an image with the same key exists
+            progress: Called with a short description of each build step
+
+        Returns:
+            Image information, plus "key" and "cached" (True if no build was needed)
+
+        Raises:
+            RuntimeError: If the builder instance fails to come up or provision
+        """
+        from easydeploy.deploy.templates import render_yaml
+        from easydeploy.remote.readiness import READY_MARKER, ReadinessWaiter
+        from easydeploy.remote.ssh import SSHPool
+
+        def step(message: str):
+            logger.info(message)
+            if progress:
+                progress(message)
+
+        key = self.key(bundle["sha256"], gpu)
+        if not force:
+            existing = self.find(key)
+            if existing:
+                return {**existing, "key": key, "cached": True}
+
+        builder = f"easydeploy-build-{key[:12]}"
+        params = {
+            **base_params,
+            "deployment_name": builder,
+            "gpu_enabled": gpu,
+            "bundle_url": bundle["url"],
+            "bundle_sha256": bundle["sha256"],
+            "image": None,
+        }
+        zone = params["zone"]
+        manager = self.manager
+
+        step(f"Creating builder instance {builder}")
+        created = manager.create_instance(
+            builder,
+            machine_type=params["machine_type"],
+            gpu_enabled=gpu,
+            spec=render_yaml(INSTANCE_TEMPLATE, **params),
+            zone=zone,
+        )
+        try:
+            outcome = manager.track(created).result()
+            if outcome["status"] != "DONE":
+                raise RuntimeError(f"Builder instance failed to start: {outcome['error']}")
+
+            step("Provisioning (this runs the full setup once)")
+            marker = params.get("ready_marker") or READY_MARKER
+            host_keys = partial(manager.host_keys, builder, zone)
+            waiter = ReadinessWaiter(
+                username=params.get("deploy_user"),
+                port=params.get("ssh_port", 22),
+                marker=marker,
+                timeout=BUILD_TIMEOUT,
+                max_workers=1,
+            )
+            try:
+                ready = waiter.track(
+                    builder,
+                    partial(manager.instance_address, builder, zone),
+                    host_keys,
+                ).result()
+            finally:
+                waiter.shutdown(wait=False)
+            if ready["status"] != "ready":
+                raise RuntimeError(
+                    f"Builder never finished provisioning ({ready['stage']}): {ready['error']}"
+                )
+
+            # Instances booted from the image must write their own marker and
+            # generate their own host keys
+            step("Removing the ready marker and machine identity")
+            with SSHPool(
+                username=params.get("deploy_user"), port=params.get("ssh_port", 22)
+            ) as pool:
+                exit_code = pool.run(ready["host"], scrub_command(marker), host_keys=host_keys)
+            if exit_code != 0:
+                raise RuntimeError(f"Cleaning up the builder failed with exit code {exit_code}")
+
+            step("Stopping builder instance")
+            outcome = manager.track(manager.stop_instance(builder, zone)).result()
+            if outcome["status"] != "DONE":
+                raise RuntimeError(f"Builder instance failed to stop: {outcome['error']}")
+
+            step(f"Creating image {image_name(key)}")
+            image = manager.create_image(
+                image_name(key),
+                source_disk=f"zones/{zone}/disks/{builder}",
+                family=image_family(gpu),
+                labels=image_labels(key, gpu, self.settings),
+            )
+        finally:
+            step("Deleting builder instance")
+            try:
+                manager.track(manager.destroy_instance(builder, zone)).result()
+            except Exception as e:
+                logger.warning(f"Could not delete builder instance {builder}: {e}")
+
+        return {**image, "key": key, "cached": False}
+
+    def gc(self, keep: int = DEFAULT_KEEP, dry_run: bool = False) -> list[str]:
+        """Delete superseded golden images.
+
+        The newest ``keep`` images of each variant (CPU/GPU) are kept.
+
+        Args:
+            keep: Images kept per variant
+            dry_run: Only report what would be deleted
+
+        Returns:
+            Names of the deleted (or, with dry_run, deletable) images
+        """
+        by_variant: Dict[str, list[Dict[str, Any]]] = {}
+        for image in self.manager.list_images({IMAGE_LABEL: "true"}):
+            by_variant.setdefault(image["labels"].get("variant", ""), []).append(image)
+
+        superseded = []
+        for images in by_variant.values():
+            images.sort(key=lambda image: image["created_at"], reverse=True)
+            superseded.extend(image["name"] for image in images[max(keep, 0) :])
+
+        if not dry_run:
+            for name in superseded:
+                self.manager.delete_image(name)
+        return superseded
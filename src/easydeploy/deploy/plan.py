@@ -0,0 +1,390 @@
+"""Plan/apply: converge a deployment on its desired state.
+
+The desired state of a deployment is what its fleet manifest renders to
+through gcp-instance.yaml.j2: instances and firewall rules. The actual state
+comes from ``GCPManager.list_instances`` (filtered by the deployment's labels)
+and the project's firewall rules. ``plan`` diffs the two into the minimal set
+of actions and ``apply`` runs only those, so redeploying an unchanged fleet
+makes no mutating API calls and changing one field touches only what differs.
+
+Actions:
+
+- ``create``: the resource does not exist
+- ``update``: it exists with changes that can be made in place (instance
+  machine type or labels, any firewall field)
+- ``replace``: it exists with changes that need a new instance (zone, GPU)
+- ``delete``: it exists but is no longer part of the deployment
+"""
+
+import logging
+import re
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+from easydeploy.deploy.fleet import DEFAULT_CONCURRENCY, INSTANCE_TEMPLATE, expand_members
+from easydeploy.deploy.graph import ResourceGraph
+
+logger = logging.getLogger(__name__)
+
+# Instance fields that can only change by recreating the instance
+REPLACE_FIELDS = ("zone", "gpu_type", "gpu_count")
+
+# Firewall rule fields compared between desired and actual state
+FIREWALL_FIELDS = ("direction", "priority", "source_ranges", "target_tags", "allowed")
+
+# Instance statuses that must be stopped before the machine type can change
+RUNNING_STATUSES = ("PROVISIONING", "STAGING", "RUNNING")
+
+
+def _desired_instance(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the compared fields of an instance from its rendered spec."""
+    instance = spec["instance"]
+    gpu = spec.get("gpu") or {}
+    return {
+        "name": instance["name"],
+        "zone": instance["zone"],
+        "machine_type": instance["machine_type"],
+        "gpu_type": gpu.get("type"),
+        "gpu_count": int(gpu.get("count", 1)) if gpu else 0,
+        "labels": {key: str(value) for key, value in (instance.get("labels") or {}).items()},
+    }
+
+
+def _normalize_firewall(rule: Dict[str, Any]) -> Dict[str, Any]:
+    """Put a firewall rule in a canonical form so equal rules compare equal."""
+    return {
+        "name": rule["name"],
+        "direction": rule.get("direction", "INGRESS"),
+        "priority": int(rule.get("priority", 1000)),
+        "source_ranges": sorted(rule.get("source_ranges") or []),
+        "target_tags": sorted(rule.get("target_tags") or []),
+        "allowed": sorted(
+            (
+                {
+                    "ip_protocol": allowed["ip_protocol"],
+                    "ports": sorted(str(port) for port in allowed.get("ports") or []),
+                }
+                for allowed in rule.get("allowed") or []
+            ),
+            key=lambda allowed: (allowed["ip_protocol"], allowed["ports"]),
+        ),
+    }
+
+
+def desired_state(manifest: Dict[str, Any], base_params: Dict[str, Any]) -> Dict[str, Any]:
+    """Render a deployment's manifest into the resources it should consist of.
+
+    Args:
+        manifest: Fleet manifest (a single deployment is a fleet of one)
+        base_params: Shared template variables
+
+    Returns:
+        {"instances": {name: fields}, "firewalls": {name: rule}, "specs": {name: spec}}
+    """
+    from easydeploy.deploy.templates import get_engine
+
+    members = expand_members(manifest, base_params)
+    specs = get_engine().render_many(INSTANCE_TEMPLATE, members, parse=True)
+    state: Dict[str, Any] = {"instances": {}, "firewalls": {}, "specs": {}}
+    for spec in specs:
+        instance = _desired_instance(spec)
+        state["instances"][instance["name"]] = instance
+        state["specs"][instance["name"]] = spec
+        for rule in spec.get("firewall_rules") or []:
+            state["firewalls"][rule["name"]] = _normalize_firewall(rule)
+    return state
+
+
+def _member_pattern(name: str) -> re.Pattern:
+    """Match a deployment's own resource names: the name itself or <name>-NNN."""
+    return re.compile(rf"^{re.escape(name)}(-\d{{3,}})?$")
+
+
+def actual_state(manager, manifest: Dict[str, Any]) -> Dict[str, Any]:
+    """Look up the resources that currently exist for a deployment.
+
+    Args:
+        manager: GCPManager for the deployment's project
+        manifest: Fleet manifest
+
+    Returns:
+        {"instances": {name: info}, "firewalls": {name: rule}}
+    """
+    name = manifest["name"]
+    members = _member_pattern(name)
+    state: Dict[str, Any] = {"instances": {}, "firewalls": {}}
+
+    # A fleet's members carry its name as the "fleet" label; a single
+    # deployment is found by its "deployment" label.
+    for label in ("fleet", "deployment"):
+        for instance in manager.list_instances(labels={label: name}):
+            if members.match(instance["name"]):
+                state["instances"][instance["name"]] = instance
+
+    for rule in manager.list_firewalls(prefix=name):
+        if rule["name"].endswith("-ssh") and members.match(rule["name"][: -len("-ssh")]):
+            state["firewalls"][rule["name"]] = _normalize_firewall(rule)
+    return state
+
+
+def diff(desired: Dict[str, Any], actual: Dict[str, Any]) -> list[Dict[str, Any]]:
+    """Compute the actions that turn the actual state into the desired state.
+
+    Args:
+        desired: Result of ``desired_state``
+        actual: Result of ``actual_state``
+
+    Returns:
+        Actions ({"action", "kind", "name", "changes", ...}), sorted by kind and name
+    """
+    actions = []
+    for name, want in desired["instances"].items():
+        have = actual["instances"].get(name)
+        if have is None:
+            actions.append(
+                {"action": "create", "kind": "instance", "name": name, "zone": want["zone"]}
+            )
+            continue
+
+        changes = {
+            field: (have.get(field), want[field])
+            for field in ("zone", "machine_type", "gpu_type", "gpu_count")
+            if have.get(field) != want[field]
+        }
+        if any(have["labels"].get(key) != value for key, value in want["labels"].items()):
+            changes["labels"] = (have["labels"], {**have["labels"], **want["labels"]})
+        if not changes:
+            continue
+        action = "replace" if any(field in changes for field in REPLACE_FIELDS) else "update"
+        actions.append(
+            {
+                "action": action,
+                "kind": "instance",
+                "name": name,
+                "zone": want["zone"],
+                "current_zone": have["zone"],
+                "status": have.get("status"),
+                "label_fingerprint": have.get("label_fingerprint"),
+                "changes": changes,
+            }
+        )
+
+    for name, have in actual["instances"].items():
+        if name not in desired["instances"]:
+            actions.append(
+                {"action": "delete", "kind": "instance", "name": name, "zone": have["zone"]}
+            )
+
+    for name, want in desired["firewalls"].items():
+        have = actual["firewalls"].get(name)
+        if have is None:
+            actions.append({"action": "create", "kind": "firewall", "name": name})
+            continue
+        changes = {
+            field: (have[field], want[field])
+            for field in FIREWALL_FIELDS
+            if have[field] != want[field]
+        }
+        if changes:
+            actions.append(
+                {"action": "update", "kind": "firewall", "name": name, "changes": changes}
+            )
+
+    for name in actual["firewalls"]:
+        if name not in desired["firewalls"]:
+            actions.append({"action": "delete", "kind": "firewall", "name": name})
+
+    for action in actions:
+        action.setdefault("changes", {})
+    actions.sort(key=lambda action: (action["kind"], action["name"]))
+    return actions
+
+
+def plan(
+    manager, manifest: Dict[str, Any], base_params: Dict[str, Any]
+) -> tuple[list[Dict[str, Any]], Dict[str, Any]]:
+    """Compute the actions needed to converge a deployment.
+
+    Args:
+        manager: GCPManager for the deployment's project
+        manifest: Fleet manifest
+        base_params: Shared template variables
+
+    Returns:
+        (actions, desired state)
+    """
+    desired = desired_state(manifest, base_params)
+    return diff(desired, actual_state(manager, manifest)), desired
+
+
+def _wait(manager, result: Dict[str, Any]):
+    """Wait for the operation behind a manager result, raising if it failed."""
+    outcome = manager.track(result).result()
+    if outcome["status"] != "DONE":
+        raise RuntimeError(outcome["error"] or f"operation {outcome['status'].lower()}")
+
+
+def _update_instance(manager, action: Dict[str, Any]):
+    """Change an instance in place: resize it and/or relabel it."""
+    name, zone, changes = action["name"], action["zone"], action["changes"]
+    if "machine_type" in changes:
+        running = action.get("status") in RUNNING_STATUSES
+        if running:
+            _wait(manager, manager.stop_instance(name, zone))
+        _wait(manager, manager.set_machine_type(name, changes["machine_type"][1], zone))
+        if running:
+            _wait(manager, manager.start_instance(name, zone))
+    if "labels" in changes:
+        _wait(
+            manager,
+            manager.set_labels(name, changes["labels"][1], action["label_fingerprint"], zone),
+        )
+
+
+def _create_instance(manager, spec: Dict[str, Any]):
+    """Create an instance on its pre-created boot disk, deleting the disk on failure."""
+    instance = spec["instance"]
+    try:
+        _wait(
+            manager,
+            manager.create_instance(
+                instance["name"],
+                machine_type=instance["machine_type"],
+                gpu_enabled=bool(spec.get("gpu")),
+                spec=spec,
+                zone=instance["zone"],
+            ),
+        )
+    except Exception:
+        try:
+            _wait(manager, manager.delete_disk(instance["name"], instance["zone"]))
+        except Exception as e:
+            logger.warning(f"Could not delete boot disk {instance['name']}: {e}")
+        raise
+
+
+def build_graph(
+    manager, actions: list[Dict[str, Any]], desired: Dict[str, Any]
+) -> tuple[ResourceGraph, list[list[str]]]:
+    """Turn planned actions into a resource graph.
+
+    A created instance is two nodes, its boot disk and then the instance
+    (tags and GPUs are part of the instance insert); a replaced instance is
+    deleted first. Every other action is a single node, so firewall rules are
+    created alongside disks.
+
+    Args:
+        manager: GCPManager for the deployment's project
+        actions: Actions returned by ``plan``
+        desired: Desired state returned by ``plan``
+
+    Returns:
+        (graph, node keys of each action in execution order)
+    """
+    graph = ResourceGraph()
+    keys = []
+    for action in actions:
+        name, kind, verb = action["name"], action["kind"], action["action"]
+
+        if kind == "firewall":
+            rule = desired["firewalls"].get(name)
+            func = {
+                "create": partial(manager.create_firewall, rule),
+                "update": partial(manager.update_firewall, rule),
+                "delete": partial(manager.delete_firewall, name),
+            }[verb]
+            keys.append([graph.add(f"firewall:{name}", lambda func=func: _wait(manager, func()))])
+            continue
+
+        if verb == "update":
+            keys.append([graph.add(f"update:{name}", partial(_update_instance, manager, action))])
+            continue
+
+        nodes = []
+        if verb in ("delete", "replace"):
+            zone = action.get("current_zone") or action["zone"]
+            destroy = partial(manager.destroy_instance, name, zone=zone)
+            nodes.append(
+                graph.add(f"delete:{name}", lambda destroy=destroy: _wait(manager, destroy()))
+            )
+        if verb in ("create", "replace"):
+            spec = desired["specs"][name]
+            spec = {
+                **spec,
+                "instance": {
+                    **spec["instance"],
+                    "boot_disk": {**spec["instance"].get("boot_disk", {}), "source": name},
+                },
+            }
+            disk = partial(manager.create_disk, spec)
+            nodes.append(
+                graph.add(f"disk:{name}", lambda disk=disk: _wait(manager, disk()), deps=nodes[-1:])
+            )
+            nodes.append(
+                graph.add(
+                    f"instance:{name}", partial(_create_instance, manager, spec), deps=nodes[-1:]
+                )
+            )
+        keys.append(nodes)
+    return graph, keys
+
+
+def apply(
+    manager,
+    actions: list[Dict[str, Any]],
+    desired: Dict[str, Any],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> list[Dict[str, Any]]:
+    """Carry out planned actions, in parallel wherever they do not depend on each other.
+
+    Args:
+        manager: GCPManager for the deployment's project
+        actions: Actions returned by ``plan``
+        desired: Desired state returned by ``plan``
+        concurrency: Maximum resource operations in progress at once
+        progress: Called with each action's result as soon as it finishes
+
+    Returns:
+        One {**action, "status": "done" | "failed", "error"} dict per action
+    """
+    graph, keys = build_graph(manager, actions, desired)
+    final = {nodes[-1]: index for index, nodes in enumerate(keys)}
+    results: list[Dict[str, Any]] = []
+    outcomes: Dict[str, Dict[str, Any]] = {}
+
+    def on_node(key: str, outcome: Dict[str, Any]):
+        outcomes[key] = outcome
+        if key not in final:
+            return
+        index = final[key]
+        # The first node of the action that did not succeed explains its failure
+        failure = next(
+            (outcomes[node] for node in keys[index] if outcomes[node]["status"] != "done"),
+            None,
+        )
+        result = {
+            **actions[index],
+            "status": "failed" if failure else "done",
+            "error": failure["error"] if failure else None,
+        }
+        results.append(result)
+        if progress:
+            progress(result)
+
+    graph.run(max_workers=concurrency, progress=on_node)
+    return results
+
+
+def describe(action: Dict[str, Any]) -> str:
+    """One-line human-readable description of an action, Terraform style."""
+    symbol = {"create": "+", "update": "~", "replace": "-/+", "delete": "-"}[action["action"]]
+    line = f"{symbol} {action['kind']} {action['name']}"
+    details = []
+    for field, (old, new) in action["changes"].items():
+        if field == "labels":
+            changed = sorted(key for key in new if old.get(key) != new[key])
+            details.append(f"labels: {', '.join(changed)}")
+        else:
+            details.append(f"{field}: {old} → {new}")
+    return f"{line} ({'; '.join(details)})" if details else line
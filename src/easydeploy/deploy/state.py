@@ -0,0 +1,331 @@
+"""Local deployment state store.
+
+Deployments are recorded in a SQLite database under ``Settings.state_dir``
+(``state/deployments.db``) so that ``easydeploy list``, ``destroy`` and status
+lookups are indexed local queries instead of cloud round-trips.
+
+Records are keyed on (platform, project, name), so deployments with the same
+name in two projects are kept apart; a record without a project is stored
+under the empty project.
+
+The database runs in WAL mode so readers never block writers. Every write
+happens in a ``BEGIN IMMEDIATE`` transaction, which takes SQLite's file lock up
+front; concurrent ``easydeploy`` processes therefore serialize their writes
+(waiting up to ``LOCK_TIMEOUT`` seconds) instead of corrupting the store.
+"""
+
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+STATE_DB_NAME = "deployments.db"
+
+# Seconds a writer waits for another process's lock before giving up
+LOCK_TIMEOUT = 30.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS deployments (
+    platform TEXT NOT NULL,
+    project TEXT NOT NULL DEFAULT '',
+    name TEXT NOT NULL,
+    zone TEXT,
+    machine_type TEXT,
+    gpu_enabled INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    fleet TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    data TEXT NOT NULL DEFAULT '{}',
+    PRIMARY KEY (platform, project, name)
+);
+CREATE TABLE IF NOT EXISTS labels (
+    platform TEXT NOT NULL,
+    project TEXT NOT NULL,
+    name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (platform, project, name, key),
+    FOREIGN KEY (platform, project, name)
+        REFERENCES deployments(platform, project, name) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_deployments_name ON deployments(name);
+CREATE INDEX IF NOT EXISTS idx_deployments_platform ON deployments(platform);
+CREATE INDEX IF NOT EXISTS idx_deployments_project ON deployments(project);
+CREATE INDEX IF NOT EXISTS idx_deployments_status ON deployments(status);
+CREATE INDEX IF NOT EXISTS idx_deployments_fleet ON deployments(fleet);
+CREATE INDEX IF NOT EXISTS idx_labels_key_value ON labels(key, value);
+"""
+
+# Columns stored directly; any other record keys go into the JSON "data" column
+COLUMNS = ("name", "platform", "project", "zone", "machine_type", "gpu_enabled", "status", "fleet")
+
+
+class StateStore:
+    """SQLite-backed store of deployment records."""
+
+    def __init__(self, path: Optional[Path] = None):
+        """Initialize state store.
+
+        Args:
+            path: Database file (defaults to <Settings.state_dir>/deployments.db)
+        """
+        if path is None:
+            from easydeploy.config.settings import get_settings
+
+            path = get_settings().state_dir / STATE_DB_NAME
+        self.path = Path(path)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection, creating the database and schema if needed."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=LOCK_TIMEOUT, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.executescript(SCHEMA)
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in one atomic write transaction holding the database lock."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _reader(self) -> Iterator[Optional[sqlite3.Connection]]:
+        """Open a read connection, or yield None if the store does not exist yet."""
+        if not self.path.exists():
+            yield None
+            return
+        conn = self._connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def upsert_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Insert or update deployment records atomically.
+
+        Args:
+            records: Deployment dicts with at least "name", "platform" and "status";
+                an optional "labels" dict is indexed for selector queries.
+                Records are matched on (platform, project, name).
+
+        Returns:
+            Number of records written
+        """
+        now = time.time()
+        count = 0
+        with self.transaction() as conn:
+            for record in records:
+                values = {column: record.get(column) for column in COLUMNS}
+                values["gpu_enabled"] = int(bool(values["gpu_enabled"]))
+                values["project"] = values["project"] or ""
+                extra = {
+                    key: value
+                    for key, value in record.items()
+                    if key not in COLUMNS and key not in ("labels", "created_at", "updated_at")
+                }
+                conn.execute(
+                    """
+                    INSERT INTO deployments
+                        (name, platform, project, zone, machine_type, gpu_enabled, status,
+                         fleet, created_at, updated_at, data)
+                    VALUES (:name, :platform, :project, :zone, :machine_type, :gpu_enabled,
+                            :status, :fleet, :now, :now, :data)
+                    ON CONFLICT(platform, project, name) DO UPDATE SET
+                        zone = excluded.zone,
+                        machine_type = excluded.machine_type,
+                        gpu_enabled = excluded.gpu_enabled,
+                        status = excluded.status,
+                        fleet = excluded.fleet,
+                        updated_at = excluded.updated_at,
+                        data = excluded.data
+                    """,
+                    {**values, "now": now, "data": json.dumps(extra, default=str)},
+                )
+                if "labels" in record:
+                    key = (values["platform"], values["project"], values["name"])
+                    conn.execute(
+                        "DELETE FROM labels WHERE platform = ? AND project = ? AND name = ?", key
+                    )
+                    conn.executemany(
+                        "INSERT INTO labels (platform, project, name, key, value)"
+                        " VALUES (?, ?, ?, ?, ?)",
+                        [
+                            (*key, label, str(value))
+                            for label, value in (record["labels"] or {}).items()
+                        ],
+                    )
+                count += 1
+        return count
+
+    def upsert(self, record: Dict[str, Any]):
+        """Insert or update a single deployment record."""
+        self.upsert_many([record])
+
+    def update_status(
+        self,
+        names: Iterable[str],
+        status: str,
+        platform: Optional[str] = None,
+        project: Optional[str] = None,
+    ) -> int:
+        """Set the status of deployments.
+
+        Args:
+            names: Deployment names
+            status: New status
+            platform: Only deployments on this platform
+            project: Only deployments in this project
+
+        Returns:
+            Number of deployments updated
+        """
+        now = time.time()
+        where, params = _scope(platform, project)
+        with self.transaction() as conn:
+            cursor = conn.executemany(
+                f"UPDATE deployments SET status = ?, updated_at = ? WHERE name = ?{where}",
+                [(status, now, name, *params) for name in names],
+            )
+            return cursor.rowcount
+
+    def delete(
+        self,
+        names: Iterable[str],
+        platform: Optional[str] = None,
+        project: Optional[str] = None,
+    ) -> int:
+        """Remove deployments (and their labels) from the store.
+
+        Args:
+            names: Deployment names
+            platform: Only deployments on this platform
+            project: Only deployments in this project
+
+        Returns:
+            Number of deployments removed
+        """
+        where, params = _scope(platform, project)
+        with self.transaction() as conn:
+            cursor = conn.executemany(
+                f"DELETE FROM deployments WHERE name = ?{where}",
+                [(name, *params) for name in names],
+            )
+            return cursor.rowcount
+
+    def get(
+        self, name: str, platform: Optional[str] = None, project: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Look up one deployment by name."""
+        results = self.query(name=name, platform=platform, project=project)
+        return results[0] if results else None
+
+    def query(
+        self,
+        name: Optional[str] = None,
+        platform: Optional[str] = None,
+        project: Optional[str] = None,
+        status: Optional[str] = None,
+        fleet: Optional[str] = None,
+        labels: Optional[Dict[str, str]] = None,
+        created_before: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> list[Dict[str, Any]]:
+        """Find deployments matching every given filter.
+
+        Args:
+            name: Exact deployment name
+            platform: Cloud platform ("gcp", "azure")
+            project: Cloud project / subscription
+            status: Deployment status
+            fleet: Fleet the deployment belongs to
+            labels: Label key/value pairs that must all match
+            created_before: Only deployments created before this Unix time
+            limit: Maximum number of records
+
+        Returns:
+            Matching deployment records, ordered by name
+        """
+        clauses, params = [], []
+        for column, value in (
+            ("name", name),
+            ("platform", platform),
+            ("project", project),
+            ("status", status),
+            ("fleet", fleet),
+        ):
+            if value is not None:
+                clauses.append(f"d.{column} = ?")
+                params.append(value)
+        for key, value in (labels or {}).items():
+            clauses.append(
+                "EXISTS (SELECT 1 FROM labels l WHERE l.platform = d.platform"
+                " AND l.project = d.project AND l.name = d.name AND l.key = ? AND l.value = ?)"
+            )
+            params.extend([key, str(value)])
+        if created_before is not None:
+            clauses.append("d.created_at < ?")
+            params.append(created_before)
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT d.* FROM deployments d{where} ORDER BY d.name, d.platform, d.project"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+
+        with self._reader() as conn:
+            if conn is None:
+                return []
+            rows = conn.execute(sql, params).fetchall()
+            label_rows = conn.execute(
+                "SELECT l.platform, l.project, l.name, l.key, l.value FROM labels l"
+                " JOIN deployments d ON d.platform = l.platform AND d.project = l.project"
+                f" AND d.name = l.name{where}",
+                params,
+            ).fetchall()
+
+        labels_by_key: Dict[tuple, Dict[str, str]] = {}
+        for row in label_rows:
+            key = (row["platform"], row["project"], row["name"])
+            labels_by_key.setdefault(key, {})[row["key"]] = row["value"]
+        return [
+            _record(row, labels_by_key.get((row["platform"], row["project"], row["name"]), {}))
+            for row in rows
+        ]
+
+
+def _scope(platform: Optional[str], project: Optional[str]) -> tuple[str, list]:
+    """SQL narrowing a by-name statement to a platform and/or project."""
+    where, params = "", []
+    if platform is not None:
+        where += " AND platform = ?"
+        params.append(platform)
+    if project is not None:
+        where += " AND project = ?"
+        params.append(project)
+    return where, params
+
+
+def _record(row: sqlite3.Row, labels: Dict[str, str]) -> Dict[str, Any]:
+    """Convert a deployments row back into a record dict."""
+    record = json.loads(row["data"])
+    record.update({column: row[column] for column in COLUMNS})
+    record["project"] = record["project"] or None
+    record["gpu_enabled"] = bool(record["gpu_enabled"])
+    record["created_at"] = row["created_at"]
+    record["updated_at"] = row["updated_at"]
+    record["labels"] = labels
+    return record
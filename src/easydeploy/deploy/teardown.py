@@ -0,0 +1,123 @@
+"""Teardown: destroy many deployments, and their firewall rules, at once.
+
+Each deployment consists of an instance and the ``<name>-ssh`` firewall rule
+rendered by gcp-instance.yaml.j2; the members of a fleet share one
+``<fleet>-ssh`` rule, which is deleted with the last of them. ``teardown``
+deletes all of them as independent nodes of one resource graph, so hundreds
+of instances are torn down in about the time of the slowest one. The
+project's firewall rules are listed once up front, so only rules that exist
+are deleted, and resources that are already gone count as destroyed.
+"""
+
+import logging
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+from easydeploy.deploy.fleet import DEFAULT_CONCURRENCY
+from easydeploy.deploy.graph import ResourceGraph
+from easydeploy.deploy.plan import _wait
+
+logger = logging.getLogger(__name__)
+
+# Suffix of the per-deployment (or per-fleet) firewall rule in gcp-instance.yaml.j2
+FIREWALL_SUFFIX = "-ssh"
+
+
+def firewall_name(deployment_name: str) -> str:
+    """Name of the firewall rule created with a deployment."""
+    return f"{deployment_name}{FIREWALL_SUFFIX}"
+
+
+def _remaining_members(manager, fleet: str, names: set[str]) -> bool:
+    """Whether a fleet has instances left besides those being destroyed."""
+    return any(
+        instance["name"] not in names
+        for instance in manager.list_instances(labels={"fleet": fleet})
+    )
+
+
+def _is_not_found(error: Exception) -> bool:
+    """Whether an API error means the resource does not exist."""
+    # google.api_core errors carry ``code``, azure.core errors ``status_code``
+    return 404 in (getattr(error, "code", None), getattr(error, "status_code", None))
+
+
+def _delete(manager, start: Callable[[], Dict[str, Any]], name: str):
+    """Start a deletion and wait for it, treating a missing resource as deleted."""
+    try:
+        _wait(manager, start())
+    except Exception as e:
+        if not _is_not_found(e):
+            raise
+        logger.debug(f"{name} was already deleted", extra={"host": name})
+
+
+def build_graph(
+    manager, records: list[Dict[str, Any]]
+) -> tuple[ResourceGraph, Dict[str, Dict[str, Any]]]:
+    """Plan the deletions tearing down deployments.
+
+    Args:
+        manager: Cloud manager for the deployments' platform and project
+        records: Deployment records from the state store
+
+    Returns:
+        (graph, {node key: resource dict with "kind", "name", "deployment"})
+    """
+    existing = {rule["name"] for rule in manager.list_firewalls()}
+    names = {record["name"] for record in records}
+    graph = ResourceGraph()
+    resources = {}
+    rules = {}
+    for record in records:
+        name = record["name"]
+        destroy = partial(manager.destroy_instance, name, zone=record["zone"])
+        key = graph.add(f"instance:{name}", partial(_delete, manager, destroy, name))
+        resources[key] = {"kind": "instance", "name": name, "deployment": name}
+        rules.setdefault(firewall_name(name), name)
+        if record.get("fleet"):
+            rules.setdefault(firewall_name(record["fleet"]), record["fleet"])
+
+    for rule, deployment in rules.items():
+        if rule not in existing:
+            continue
+        # A fleet's rule still serves any member that is not being destroyed
+        if deployment not in names and _remaining_members(manager, deployment, names):
+            continue
+        delete = partial(manager.delete_firewall, rule)
+        key = graph.add(f"firewall:{rule}", partial(_delete, manager, delete, rule))
+        resources[key] = {"kind": "firewall", "name": rule, "deployment": deployment}
+    return graph, resources
+
+
+def teardown(
+    manager,
+    records: list[Dict[str, Any]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> list[Dict[str, Any]]:
+    """Delete the instances and firewall rules of deployments concurrently.
+
+    A failed deletion does not stop the others; it is reported in its result.
+
+    Args:
+        manager: Cloud manager for the deployments' platform and project
+        records: Deployment records from the state store
+        concurrency: Maximum deletions in progress at once
+        progress: Called with each resource's result as soon as it finishes
+
+    Returns:
+        One {"kind", "name", "deployment", "status": "done" | "failed", "error"}
+        dict per resource
+    """
+    graph, resources = build_graph(manager, records)
+    results: list[Dict[str, Any]] = []
+
+    def on_node(key: str, outcome: Dict[str, Any]):
+        result = {**resources[key], "status": outcome["status"], "error": outcome["error"]}
+        results.append(result)
+        if progress:
+            progress(result)
+
+    graph.run(max_workers=concurrency, progress=on_node)
+    return results
@@ -0,0 +1,215 @@
+"""Template rendering for easyDeploy deployment configurations.
+
+``TemplateEngine`` wraps a jinja2 environment that keeps compiled templates in
+an in-memory LRU and persists template bytecode under
+``~/.easydeploy/template-cache`` so later processes skip parsing and compiling.
+``render_many`` renders many parameter sets against one compiled template,
+which is what fleet deploys need.
+"""
+
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from easydeploy.utils import trace
+
+# Compiled templates kept in memory per engine
+TEMPLATE_CACHE_SIZE = 64
+
+# Static {% include %} / {% import %} targets of a template
+_DEPENDENCY_PATTERN = re.compile(r"{%-?\s*(?:include|import|from)\s+[\"']([^\"']+)[\"']")
+
+
+def get_template_cache_dir() -> Path:
+    """Get the directory holding compiled template bytecode."""
+    return Path.home() / ".easydeploy" / "template-cache"
+
+
+def _yaml_loader():
+    """Get the fastest available safe YAML loader."""
+    import yaml
+
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class _ChunkReader:
+    """File-like reader over rendered template chunks, for streaming YAML parsing."""
+
+    def __init__(self, chunks: Iterator[str]):
+        self._chunks = chunks
+        self._buffer = ""
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            data, self._buffer = self._buffer, ""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+class TemplateEngine:
+    """Renders templates from a directory with compiled-template caching."""
+
+    def __init__(
+        self,
+        templates_dir: Optional[Path] = None,
+        cache_dir: Optional[Path] = None,
+        cache_size: int = TEMPLATE_CACHE_SIZE,
+    ):
+        """Initialize template engine.
+
+        Args:
+            templates_dir: Directory to load templates from (defaults to Settings.templates_dir)
+            cache_dir: Bytecode cache directory (defaults to ~/.easydeploy/template-cache)
+            cache_size: Number of compiled templates kept in memory
+        """
+        if templates_dir is None:
+            from easydeploy.config.settings import get_settings
+
+            templates_dir = get_settings().templates_dir
+        self.templates_dir = Path(templates_dir)
+        self.cache_dir = Path(cache_dir) if cache_dir else get_template_cache_dir()
+        self.cache_size = cache_size
+        self._environment = None
+        self._loaded: set[str] = set()
+
+    @property
+    def environment(self):
+        """Lazy-load the jinja2 environment."""
+        if self._environment is None:
+            try:
+                import jinja2
+            except ImportError as e:
+                raise RuntimeError(
+                    "jinja2 is required to render templates: pip install 'easydeploy[templates]'"
+                ) from e
+
+            self.cache_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+            self._environment = jinja2.Environment(
+                loader=jinja2.FileSystemLoader(str(self.templates_dir)),
+                bytecode_cache=jinja2.FileSystemBytecodeCache(str(self.cache_dir)),
+                cache_size=self.cache_size,
+                keep_trailing_newline=True,
+            )
+        return self._environment
+
+    def get_template(self, name: str):
+        """Get a compiled template, from the in-memory LRU when possible.
+
+        Templates it includes are loaded with it the first time, so their
+        bytecode is cached before the first render needs them.
+        """
+        with trace.span(f"load {name}", "template"):
+            template = self.environment.get_template(name)
+        if name not in self._loaded:
+            self._loaded.add(name)
+            for dependency in _DEPENDENCY_PATTERN.findall(Path(template.filename).read_text()):
+                self.get_template(dependency)
+        return template
+
+    def render(self, name: str, **params: Any) -> str:
+        """Render a template to text.
+
+        Args:
+            name: Template file name (e.g., "gcp-instance.yaml.j2")
+            **params: Template variables
+
+        Returns:
+            Rendered template text
+        """
+        template = self.get_template(name)
+        with trace.span(f"render {name}", "template"):
+            return template.render(**params)
+
+    def render_yaml(self, name: str, **params: Any) -> Dict[str, Any]:
+        """Render a YAML template and parse it as it is generated.
+
+        The YAML parser reads directly from the template's output stream, so
+        the rendered document is never assembled into one string first.
+
+        Args:
+            name: Template file name
+            **params: Template variables
+
+        Returns:
+            Parsed YAML document
+        """
+        import yaml
+
+        template = self.get_template(name)
+        with trace.span(f"render {name}", "template"):
+            chunks = template.generate(**params)
+            return yaml.load(_ChunkReader(chunks), Loader=_yaml_loader()) or {}
+
+    def render_many(
+        self, name: str, param_sets: Iterable[Dict[str, Any]], parse: bool = False
+    ) -> Iterator[Any]:
+        """Render many parameter sets against one compiled template.
+
+        Args:
+            name: Template file name
+            param_sets: Template variables for each rendering
+            parse: Yield parsed YAML documents instead of text
+
+        Yields:
+            Rendered text (or parsed dicts), in the order of ``param_sets``
+        """
+        template = self.get_template(name)
+        if not parse:
+            for params in param_sets:
+                with trace.span(f"render {name}", "template"):
+                    text = template.render(**params)
+                yield text
+            return
+
+        import yaml
+
+        loader = _yaml_loader()
+        for params in param_sets:
+            with trace.span(f"render {name}", "template"):
+                document = yaml.load(_ChunkReader(template.generate(**params)), Loader=loader)
+            yield document or {}
+
+
+@lru_cache(maxsize=8)
+def get_engine(templates_dir: Optional[Path] = None) -> TemplateEngine:
+    """Get the shared template engine for a templates directory.
+
+    Args:
+        templates_dir: Directory to load from (defaults to Settings.templates_dir)
+    """
+    return TemplateEngine(templates_dir)
+
+
+def render_template(name: str, templates_dir: Optional[Path] = None, **params: Any) -> str:
+    """Render a template from the templates directory.
+
+    Args:
+        name: Template file name (e.g., "gcp-instance.yaml.j2")
+        templates_dir: Directory to load from (defaults to Settings.templates_dir)
+        **params: Template variables
+
+    Returns:
+        Rendered template text
+    """
+    return get_engine(templates_dir).render(name, **params)
+
+
+def render_yaml(name: str, templates_dir: Optional[Path] = None, **params: Any) -> Dict[str, Any]:
+    """Render a YAML template and parse the result.
+
+    Args:
+        name: Template file name
+        templates_dir: Directory to load from (defaults to Settings.templates_dir)
+        **params: Template variables
+
+    Returns:
+        Parsed YAML document
+    """
+    return get_engine(templates_dir).render_yaml(name, **params)
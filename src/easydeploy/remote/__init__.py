@@ -0,0 +1 @@
+"""Remote access to deployed instances over SSH."""
@@ -0,0 +1,221 @@
+"""Waiting for freshly created instances to become usable over SSH.
+
+An instance counts as ready once three probes succeed in order:
+
+1. ``tcp``: a TCP connection to its SSH port is accepted
+2. ``ssh``: an SSH handshake and public-key login succeed
+3. ``marker``: the startup script's completion marker (``READY_MARKER``,
+   written at the end of the gcp-instance.yaml.j2 startup script) exists
+
+Each host is probed in its own worker with jittered exponential backoff, and
+the SSH connection is kept open while waiting for the marker, so a host is
+reported the moment it is ready instead of after a fixed sleep.
+"""
+
+import getpass
+import logging
+import random
+import shlex
+import socket
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Optional
+
+from easydeploy.remote.ssh import CONNECT_TIMEOUT, Host, HostKeys, _paramiko, connect
+
+logger = logging.getLogger(__name__)
+
+# Written by the instance startup script once provisioning has finished
+READY_MARKER = "/var/lib/easydeploy/ready"
+
+# Hosts probed concurrently
+DEFAULT_MAX_WORKERS = 64
+
+# Jittered exponential backoff between probe attempts
+POLL_INITIAL_DELAY = 1.0
+POLL_MAX_DELAY = 10.0
+POLL_BACKOFF = 1.5
+
+# Give up on a host after this many seconds
+DEFAULT_READY_TIMEOUT = 900.0
+
+
+class ReadinessWaiter:
+    """Probes many hosts concurrently until each one is ready."""
+
+    def __init__(
+        self,
+        username: Optional[str] = None,
+        port: int = 22,
+        pkey=None,
+        key_filename: Optional[str] = None,
+        marker: str = READY_MARKER,
+        timeout: float = DEFAULT_READY_TIMEOUT,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ):
+        """Initialize readiness waiter.
+
+        Args:
+            username: SSH user (defaults to the local user, as in the instance template)
+            port: SSH port
+            pkey: paramiko private key to log in with
+            key_filename: Private key file to log in with; without ``pkey`` or
+                ``key_filename`` the SSH agent and ~/.ssh keys are tried
+            marker: Remote path whose existence means provisioning finished
+            timeout: Seconds before a host is reported as not ready
+            max_workers: Maximum number of hosts probed concurrently
+
+        Raises:
+            RuntimeError: If paramiko is not installed
+        """
+        _paramiko()
+        self.username = username or getpass.getuser()
+        self.port = port
+        self.pkey = pkey
+        self.key_filename = key_filename
+        self.marker = marker
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="easydeploy-ready"
+        )
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def track(self, name: str, host: Host, host_keys: Optional[HostKeys] = None) -> Future:
+        """Start probing a host.
+
+        Tracking the same name twice returns the same future.
+
+        Args:
+            name: Instance name
+            host: Address to probe, or a callable returning it; the callable is
+                retried like any other probe until it returns an address
+            host_keys: Looks up the host keys the instance published, retried
+                like any other probe until they match the key it presents
+
+        Returns:
+            Future resolving to {"name", "host", "status", "stage", "error", "elapsed"},
+            with "status" of "ready" or "timeout"
+        """
+        with self._lock:
+            future = self._futures.get(name)
+            if future is None:
+                future = self._executor.submit(self._wait, name, host, host_keys)
+                self._futures[name] = future
+            return future
+
+    def wait_all(
+        self,
+        hosts: Dict[str, Host],
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+        host_keys: Optional[Dict[str, HostKeys]] = None,
+    ) -> list[Dict[str, Any]]:
+        """Probe hosts concurrently until every one is ready or timed out.
+
+        Args:
+            hosts: Address (or resolver) of each instance, by name
+            progress: Called with each host's result as soon as it is known
+            host_keys: Looks up the host keys each instance published, by name
+
+        Returns:
+            One result per host, in completion order
+        """
+        futures = [
+            self.track(name, host, (host_keys or {}).get(name)) for name, host in hosts.items()
+        ]
+        results = []
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if progress:
+                progress(result)
+        return results
+
+    def _marker_present(self, client) -> bool:
+        """Check for the startup-script completion marker."""
+        _, stdout, _ = client.exec_command(
+            f"test -e {shlex.quote(self.marker)}", timeout=CONNECT_TIMEOUT
+        )
+        return stdout.channel.recv_exit_status() == 0
+
+    def _wait(self, name: str, host: Host, host_keys: Optional[HostKeys]) -> Dict[str, Any]:
+        """Probe a host until it is ready, backing off between attempts."""
+        started = time.monotonic()
+        deadline = started + self.timeout
+        delay = POLL_INITIAL_DELAY
+        address = host if isinstance(host, str) else None
+        client = None
+        stage, error = "tcp", None
+
+        try:
+            while True:
+                try:
+                    if address is None:
+                        address = host() or None
+                        if address is None:
+                            raise ConnectionError("instance has no address yet")
+                    if client is None:
+                        stage = "tcp"
+                        sock = socket.create_connection(
+                            (address, self.port), timeout=CONNECT_TIMEOUT
+                        )
+                        stage = "ssh"
+                        try:
+                            client = connect(
+                                address,
+                                port=self.port,
+                                username=self.username,
+                                pkey=self.pkey,
+                                key_filename=self.key_filename,
+                                sock=sock,
+                                host_keys=host_keys,
+                            )
+                        except BaseException:
+                            sock.close()
+                            raise
+                    stage = "marker"
+                    if self._marker_present(client):
+                        return self._result(name, address, "ready", stage, None, started)
+                    error = "startup script has not finished"
+                except Exception as e:
+                    logger.debug(f"{name} not ready at {stage} stage: {e}", extra={"host": name})
+                    error = str(e) or type(e).__name__
+                    if client is not None:
+                        client.close()
+                        client = None
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return self._result(name, address, "timeout", stage, error, started)
+                time.sleep(min(delay * random.uniform(0.5, 1.0), remaining))
+                delay = min(delay * POLL_BACKOFF, POLL_MAX_DELAY)
+        finally:
+            if client is not None:
+                client.close()
+
+    @staticmethod
+    def _result(
+        name: str,
+        address: Optional[str],
+        status: str,
+        stage: str,
+        error: Optional[str],
+        started: float,
+    ) -> Dict[str, Any]:
+        return {
+            "name": name,
+            "host": address,
+            "status": status,
+            "stage": stage,
+            "error": error,
+            "elapsed": time.monotonic() - started,
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Stop the waiter's worker threads.
+
+        Args:
+            wait: Block until in-flight probes finish
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
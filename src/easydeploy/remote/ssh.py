@@ -0,0 +1,406 @@
+"""Pooled, multiplexed SSH connections to deployed instances.
+
+``SSHPool`` keeps one SSH transport per host and runs every command as a new
+channel over it, so running many commands on a fleet costs one handshake and
+login per host instead of one per command. ``run_many`` fans a command out to
+many hosts with bounded concurrency and streams their output line by line.
+
+Host keys are verified. A key not in ``~/.ssh/known_hosts`` is accepted only
+if it is one the instance published through its cloud's API (see
+``CloudProvider.host_keys``); accepted keys are pinned in
+``~/.easydeploy/known_hosts`` so later connections need no lookup.
+"""
+
+import getpass
+import logging
+import select
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+from easydeploy.utils import trace
+
+logger = logging.getLogger(__name__)
+
+# Per-connection network timeout, in seconds
+CONNECT_TIMEOUT = 5.0
+
+# Channels open at once on one transport; sshd's MaxSessions defaults to 10
+DEFAULT_CHANNELS_PER_HOST = 8
+
+# Hosts running a command at once in run_many
+DEFAULT_CONCURRENCY = 32
+
+# Bytes read from a channel at a time
+READ_SIZE = 32768
+
+# Longest wait for channel activity before re-checking exit status and timeout
+SELECT_INTERVAL = 0.2
+
+# A host address, or a callable resolving it (e.g. from the cloud API)
+Host = Union[str, Callable[[], str]]
+
+# Called with (host name, "stdout" or "stderr", line) for every line of output
+OutputCallback = Callable[[str, str, str], None]
+
+# Returns the host keys an instance published through its cloud's API, as
+# "<key type> <base64>" lines
+HostKeys = Callable[[], Iterable[str]]
+
+# Serializes reads and writes of the pinned known_hosts file
+_known_hosts_lock = threading.Lock()
+
+HOST_KEYS_BEGIN = "-----BEGIN SSH HOST KEY KEYS-----"
+HOST_KEYS_END = "-----END SSH HOST KEY KEYS-----"
+
+
+def _paramiko():
+    """Import paramiko, with an install hint if missing."""
+    try:
+        import paramiko
+    except ImportError as e:
+        raise RuntimeError(
+            "paramiko is required to reach instances over SSH: pip install 'easydeploy[ssh]'"
+        ) from e
+    return paramiko
+
+
+def get_known_hosts_path() -> Path:
+    """Get the known_hosts file pinning the host keys of deployed instances."""
+    return Path.home() / ".easydeploy" / "known_hosts"
+
+
+def parse_host_keys(console_output: str) -> list[str]:
+    """Extract the host keys cloud-init prints to an instance's serial console.
+
+    Args:
+        console_output: Serial console output
+
+    Returns:
+        "<key type> <base64>" lines, from the last boot's key block
+    """
+    begin = console_output.rfind(HOST_KEYS_BEGIN)
+    end = console_output.find(HOST_KEYS_END, begin)
+    if begin < 0 or end < 0:
+        return []
+    block = console_output[begin + len(HOST_KEYS_BEGIN) : end]
+    # Console lines may carry a timestamp or syslog prefix before the key type
+    keys = []
+    for line in block.splitlines():
+        fields = line.split()
+        for index, field in enumerate(fields[:-1]):
+            if field.startswith(("ssh-", "ecdsa-")):
+                keys.append(f"{field} {fields[index + 1]}")
+                break
+    return keys
+
+
+def _host_key_policy(paramiko, host_keys: Optional[HostKeys]):
+    """Policy accepting an unknown host key only if the instance published it."""
+
+    class PinnedHostKeyPolicy(paramiko.MissingHostKeyPolicy):
+        def missing_host_key(self, client, hostname, key):
+            path = get_known_hosts_path()
+            pinned = paramiko.HostKeys()
+            with _known_hosts_lock:
+                if path.exists():
+                    pinned.load(str(path))
+            if pinned.check(hostname, key):
+                return
+            if host_keys is None:
+                raise paramiko.SSHException(f"Host key of {hostname} is not known")
+
+            try:
+                published = {" ".join(line.split()[:2]) for line in host_keys()}
+            except Exception as e:
+                raise paramiko.SSHException(f"Could not look up host keys of {hostname}: {e}")
+            if f"{key.get_name()} {key.get_base64()}" not in published:
+                raise paramiko.SSHException(
+                    f"Host key of {hostname} is not one the instance published"
+                    if published
+                    else f"{hostname} has not published its host keys yet"
+                )
+
+            # Addresses are reused by later instances, so a pin is replaced
+            with _known_hosts_lock:
+                pinned = paramiko.HostKeys()
+                if path.exists():
+                    pinned.load(str(path))
+                pinned.add(hostname, key.get_name(), key)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                pinned.save(str(path))
+
+    return PinnedHostKeyPolicy()
+
+
+def connect(
+    address: str,
+    port: int = 22,
+    username: Optional[str] = None,
+    pkey=None,
+    key_filename: Optional[str] = None,
+    sock=None,
+    timeout: float = CONNECT_TIMEOUT,
+    host_keys: Optional[HostKeys] = None,
+):
+    """Open an SSH connection to an instance.
+
+    Args:
+        address: Host name or IP address
+        port: SSH port
+        username: SSH user (defaults to the local user, as in the instance template)
+        pkey: paramiko private key to log in with
+        key_filename: Private key file to log in with; without ``pkey`` or
+            ``key_filename`` the SSH agent and ~/.ssh keys are tried
+        sock: Already connected socket to run the session over
+        timeout: Connect, banner and authentication timeout in seconds
+        host_keys: Looks up the keys the instance published, to verify a host
+            key that is not known yet; without it unknown keys are rejected
+
+    Returns:
+        Connected ``paramiko.SSHClient``
+
+    Raises:
+        paramiko.SSHException: If the host key cannot be verified
+    """
+    paramiko = _paramiko()
+    client = paramiko.SSHClient()
+    client.load_system_host_keys()
+    client.set_missing_host_key_policy(_host_key_policy(paramiko, host_keys))
+    explicit_key = pkey is not None or key_filename is not None
+    with trace.span(f"ssh connect {address}", "ssh"):
+        client.connect(
+            address,
+            port=port,
+            username=username or getpass.getuser(),
+            pkey=pkey,
+            key_filename=key_filename,
+            sock=sock,
+            timeout=timeout,
+            banner_timeout=timeout,
+            auth_timeout=timeout,
+            allow_agent=not explicit_key,
+            look_for_keys=not explicit_key,
+        )
+    return client
+
+
+class _LineBuffer:
+    """Splits a byte stream into decoded lines for an output callback."""
+
+    def __init__(self, callback: Optional[OutputCallback], name: str, stream: str):
+        self._callback = callback
+        self._name = name
+        self._stream = stream
+        self._pending = b""
+
+    def feed(self, data: bytes):
+        if self._callback is None:
+            return
+        *lines, self._pending = (self._pending + data).split(b"\n")
+        for line in lines:
+            self._callback(self._name, self._stream, line.decode(errors="replace"))
+
+    def flush(self):
+        if self._callback is not None and self._pending:
+            self._callback(self._name, self._stream, self._pending.decode(errors="replace"))
+        self._pending = b""
+
+
+class SSHPool:
+    """One SSH transport per host, shared by every command run on that host."""
+
+    def __init__(
+        self,
+        username: Optional[str] = None,
+        port: int = 22,
+        pkey=None,
+        key_filename: Optional[str] = None,
+        channels_per_host: int = DEFAULT_CHANNELS_PER_HOST,
+    ):
+        """Initialize SSH pool.
+
+        Args:
+            username: SSH user (defaults to the local user)
+            port: SSH port
+            pkey: paramiko private key to log in with
+            key_filename: Private key file to log in with
+            channels_per_host: Maximum commands running at once on one host
+
+        Raises:
+            RuntimeError: If paramiko is not installed
+        """
+        _paramiko()
+        self.username = username
+        self.port = port
+        self.pkey = pkey
+        self.key_filename = key_filename
+        self.channels_per_host = max(1, channels_per_host)
+        self._clients: Dict[str, Any] = {}
+        self._host_locks: Dict[str, threading.Lock] = {}
+        self._channel_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _slots(self, address: str) -> tuple[threading.Lock, threading.BoundedSemaphore]:
+        with self._lock:
+            if address not in self._host_locks:
+                self._host_locks[address] = threading.Lock()
+                self._channel_slots[address] = threading.BoundedSemaphore(self.channels_per_host)
+            return self._host_locks[address], self._channel_slots[address]
+
+    def transport(self, address: str, host_keys: Optional[HostKeys] = None):
+        """Get the host's transport, connecting (or reconnecting) if needed.
+
+        Args:
+            address: Host name or IP address
+            host_keys: Looks up the host keys the instance published
+
+        Returns:
+            Active ``paramiko.Transport``
+        """
+        host_lock, _ = self._slots(address)
+        with host_lock:
+            client = self._clients.get(address)
+            transport = client.get_transport() if client else None
+            if transport is None or not transport.is_active():
+                if client is not None:
+                    client.close()
+                logger.debug(f"Opening SSH connection to {address}", extra={"host": address})
+                client = connect(
+                    address,
+                    port=self.port,
+                    username=self.username,
+                    pkey=self.pkey,
+                    key_filename=self.key_filename,
+                    host_keys=host_keys,
+                )
+                self._clients[address] = client
+                transport = client.get_transport()
+            return transport
+
+    def run(
+        self,
+        address: str,
+        command: str,
+        on_output: Optional[OutputCallback] = None,
+        name: Optional[str] = None,
+        timeout: Optional[float] = None,
+        host_keys: Optional[HostKeys] = None,
+    ) -> int:
+        """Run a command on a host over a new channel of its pooled transport.
+
+        Args:
+            address: Host name or IP address
+            command: Shell command line
+            on_output: Called with every line of stdout and stderr as it arrives
+            name: Host name passed to ``on_output`` (defaults to ``address``)
+            timeout: Seconds without output or exit before giving up
+            host_keys: Looks up the host keys the instance published
+
+        Returns:
+            Remote exit code
+
+        Raises:
+            TimeoutError: If the command stays silent for ``timeout`` seconds
+        """
+        _, slots = self._slots(address)
+        name = name or address
+        with slots, trace.span(f"ssh {name}", "ssh", command=command):
+            channel = self.transport(address, host_keys).open_session()
+            try:
+                channel.exec_command(command)
+                stdout = _LineBuffer(on_output, name, "stdout")
+                stderr = _LineBuffer(on_output, name, "stderr")
+                last_activity = time.monotonic()
+                while True:
+                    if channel.recv_ready():
+                        stdout.feed(channel.recv(READ_SIZE))
+                    elif channel.recv_stderr_ready():
+                        stderr.feed(channel.recv_stderr(READ_SIZE))
+                    elif channel.exit_status_ready():
+                        break
+                    else:
+                        if timeout is not None and time.monotonic() - last_activity > timeout:
+                            raise TimeoutError(f"{command!r} produced nothing for {timeout}s")
+                        select.select([channel], [], [], SELECT_INTERVAL)
+                        continue
+                    last_activity = time.monotonic()
+                stdout.flush()
+                stderr.flush()
+                return channel.recv_exit_status()
+            finally:
+                channel.close()
+
+    def run_many(
+        self,
+        hosts: Dict[str, Host],
+        command: str,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        on_output: Optional[OutputCallback] = None,
+        on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+        timeout: Optional[float] = None,
+        host_keys: Optional[Dict[str, HostKeys]] = None,
+    ) -> list[Dict[str, Any]]:
+        """Run a command on many hosts concurrently.
+
+        Args:
+            hosts: Address (or resolver) of each host, by name
+            command: Shell command line
+            concurrency: Maximum hosts running the command at once
+            on_output: Called with every line of output, prefixed by host name
+            on_result: Called with each host's result as soon as it finishes
+            timeout: Seconds a host's command may stay silent
+            host_keys: Looks up the host keys each instance published, by name
+
+        Returns:
+            One {"name", "host", "exit_code", "error"} dict per host, in completion
+            order; "exit_code" is None when the command could not be run
+        """
+
+        def run_one(name: str, host: Host) -> Dict[str, Any]:
+            result = {"name": name, "host": None, "exit_code": None, "error": None}
+            try:
+                result["host"] = host if isinstance(host, str) else host()
+                if not result["host"]:
+                    raise ConnectionError("instance has no address")
+                result["exit_code"] = self.run(
+                    result["host"],
+                    command,
+                    on_output=on_output,
+                    name=name,
+                    timeout=timeout,
+                    host_keys=(host_keys or {}).get(name),
+                )
+            except Exception as e:
+                logger.debug(f"Running {command!r} on {name} failed: {e}", extra={"host": name})
+                result["error"] = str(e) or type(e).__name__
+            return result
+
+        results = []
+        if not hosts:
+            return results
+        with ThreadPoolExecutor(
+            max_workers=min(max(1, concurrency), len(hosts)), thread_name_prefix="easydeploy-exec"
+        ) as executor:
+            futures = [executor.submit(run_one, name, host) for name, host in hosts.items()]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if on_result:
+                    on_result(result)
+        return results
+
+    def close(self):
+        """Close every pooled connection."""
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
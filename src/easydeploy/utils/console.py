@@ -0,0 +1,11 @@
+"""Shared Rich console for easyDeploy, created on first use."""
+
+from functools import cache
+
+
+@cache
+def get_console():
+    """Get the shared Rich console, importing Rich the first time it is needed."""
+    from rich.console import Console
+
+    return Console()
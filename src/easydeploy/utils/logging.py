@@ -1,27 +1,225 @@
-"""Logging utilities for easyDeploy."""
+"""Logging utilities for easyDeploy.
 
+Log records are put on a queue by the calling thread and handled on a
+background ``QueueListener`` thread, so rendering to the console (and writing
+the optional NDJSON file) never blocks deployment workers.
+
+Per-host records carry the host in ``extra={"host": name}``. The console shows
+at most ``HOST_BURST`` of them per host every ``HOST_INTERVAL`` seconds and
+then one summary of what was suppressed; the NDJSON file keeps every record.
+"""
+
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import queue
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+# Console records shown per host and interval before the rest are summarized
+HOST_BURST = 5
+HOST_INTERVAL = 10.0
+
+# LogRecord attributes that are not user-supplied ``extra`` fields
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message",
+    "asctime",
+    "taskName",
+}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as one JSON object per line (NDJSON)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format a record as a single-line JSON object.
+
+        Args:
+            record: Log record to format
+
+        Returns:
+            JSON with time, level, logger, message, thread and any extra fields
+        """
+        entry = {
+            "time": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class RecordQueueHandler(logging.handlers.QueueHandler):
+    """Queue records for the listener thread with their exception intact.
+
+    The stock ``prepare`` appends the traceback to the message and drops
+    ``exc_info``, which suits queues that cross processes. This queue stays in
+    the process, so each handler formats the exception itself: the console as
+    a Rich traceback, the NDJSON sink as the "exception" field.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Render the message now, while its arguments still hold their values."""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class HostRateLimitHandler(logging.Handler):
+    """Forward records to a handler, summarizing floods from the same host.
+
+    Records without a ``host`` attribute, and warnings and errors, always pass.
+    """
+
+    def __init__(
+        self,
+        target: logging.Handler,
+        burst: int = HOST_BURST,
+        interval: float = HOST_INTERVAL,
+    ):
+        """Initialize rate limiter.
+
+        Args:
+            target: Handler that renders the records let through
+            burst: Records shown per host and interval
+            interval: Seconds after which a host may log ``burst`` records again
+        """
+        super().__init__(level=target.level)
+        self.target = target
+        self.burst = burst
+        self.interval = interval
+        # host -> [window start, records seen, last suppressed record]
+        self._windows: Dict[str, list] = {}
+
+    def emit(self, record: logging.LogRecord):
+        """Forward the record unless its host exceeded its burst."""
+        host = getattr(record, "host", None)
+        if host is None or record.levelno >= logging.WARNING:
+            self.target.handle(record)
+            return
+
+        now = time.monotonic()
+        window = self._windows.get(host)
+        if window is None or now - window[0] >= self.interval:
+            if window is not None:
+                self._summarize(host, window)
+            window = self._windows[host] = [now, 0, None]
+        window[1] += 1
+        if window[1] <= self.burst:
+            self.target.handle(record)
+        else:
+            window[2] = record
 
-from rich.console import Console
-from rich.logging import RichHandler
+    def _summarize(self, host: str, window: list):
+        """Emit one record standing for the records suppressed in a window."""
+        suppressed = window[1] - self.burst
+        last = window[2]
+        if suppressed <= 0 or last is None:
+            return
+        summary = logging.makeLogRecord(
+            {
+                **vars(last),
+                "msg": "%s: %d more messages suppressed (last: %s)",
+                "args": (host, suppressed, last.getMessage()),
+            }
+        )
+        self.target.handle(summary)
 
+    def flush(self):
+        """Summarize every open window and flush the target."""
+        for host, window in self._windows.items():
+            self._summarize(host, window)
+        self._windows.clear()
+        self.target.flush()
 
-def setup_logging(verbose: bool = False) -> logging.Logger:
-    """Set up logging with Rich formatting.
+    def close(self):
+        """Flush pending summaries and close the target."""
+        self.flush()
+        self.target.close()
+        super().close()
+
+
+def setup_logging(
+    verbose: bool = False,
+    json_path: Optional[Path] = None,
+    force: bool = False,
+) -> logging.Logger:
+    """Set up non-blocking logging with Rich formatting.
+
+    Like ``logging.basicConfig``, later calls leave an existing setup alone
+    unless ``force`` is set.
 
     Args:
-        verbose: Enable debug level logging
+        verbose: Enable debug level logging on the console
+        json_path: Also append every easyDeploy record, at debug level, to
+            this file as NDJSON
+        force: Replace an existing setup
 
     Returns:
         Configured logger
     """
+    global _listener, _queue_handler
+
+    logger = logging.getLogger("easydeploy")
+    if _listener is not None and not force:
+        return logger
+    shutdown_logging()
+
+    from rich.logging import RichHandler
+
+    from easydeploy.utils.console import get_console
+
     level = logging.DEBUG if verbose else logging.INFO
+    console = RichHandler(console=get_console(), show_path=False, level=level)
+    console.setFormatter(logging.Formatter("%(message)s", datefmt="[%X]"))
+    handlers = [HostRateLimitHandler(console)]
+
+    if json_path is not None:
+        json_path = Path(json_path).expanduser()
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        sink = logging.FileHandler(json_path, encoding="utf-8")
+        sink.setFormatter(JSONFormatter())
+        handlers.append(sink)
+        logger.setLevel(logging.DEBUG)
+
+    record_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = RecordQueueHandler(record_queue)
+    _listener = logging.handlers.QueueListener(record_queue, *handlers, respect_handler_level=True)
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(_queue_handler)
+    _listener.start()
+
+    return logger
+
+
+def shutdown_logging():
+    """Handle every queued record, then stop the listener and close its handlers."""
+    global _listener, _queue_handler
+
+    if _listener is None:
+        return
+    logging.getLogger().removeHandler(_queue_handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    logging.getLogger("easydeploy").setLevel(logging.NOTSET)
+    _listener = _queue_handler = None
 
-    logging.basicConfig(
-        level=level,
-        format="%(message)s",
-        datefmt="[%X]",
-        handlers=[RichHandler(console=Console(), show_path=False)],
-    )
 
-    return logging.getLogger("easydeploy")
+# Registered after logging's own exit hook, so it runs first and the queue
+# is drained before handlers are shut down
+atexit.register(shutdown_logging)
@@ -0,0 +1,278 @@
+"""Timing spans and Chrome trace export for profiling easyDeploy.
+
+Tracing is off unless ``easydeploy --profile`` is passed or ``EASYDEPLOY_TRACE``
+is set (to "1", or to the path of the trace file). While it is on, imports,
+gcloud subprocesses, Compute API calls, template rendering and SSH commands
+are recorded as spans. When the command finishes, the spans are written as a
+Chrome trace-event JSON file (open it in https://ui.perfetto.dev or
+chrome://tracing) and the slowest operations are logged.
+
+While tracing is off, ``span`` costs one attribute check.
+"""
+
+import functools
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Environment variable enabling tracing ("1" or a trace file path)
+TRACE_ENV = "EASYDEPLOY_TRACE"
+
+# Slowest operations listed in the summary
+SUMMARY_TOP = 10
+
+# Module import spans shorter than this are left out of the trace
+IMPORT_THRESHOLD_US = 1000
+
+
+class Tracer:
+    """Collects complete ("X") trace events from any thread."""
+
+    def __init__(self):
+        """Initialize a disabled tracer."""
+        self.enabled = False
+        self.path: Optional[Path] = None
+        self.events: list[Dict[str, Any]] = []
+        self._epoch = time.perf_counter_ns()
+        self._threads: Dict[int, str] = {}
+
+    def now_us(self) -> float:
+        """Microseconds since the tracer's epoch."""
+        return (time.perf_counter_ns() - self._epoch) / 1000
+
+    def add(self, name: str, category: str, start_us: float, end_us: float, **args: Any):
+        """Record a finished span.
+
+        Args:
+            name: Span name, e.g. "gcloud auth list"
+            category: Span category ("import", "subprocess", "api", "template", "ssh")
+            start_us: Start, in microseconds since the tracer's epoch
+            end_us: End, in microseconds since the tracer's epoch
+            **args: Extra details shown with the span
+        """
+        thread = threading.current_thread()
+        self._threads.setdefault(thread.ident, thread.name)
+        # list.append is atomic, so worker threads need no lock
+        self.events.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": start_us,
+                "dur": end_us - start_us,
+                "pid": os.getpid(),
+                "tid": thread.ident,
+                "args": {key: str(value) for key, value in args.items()},
+            }
+        )
+
+    @contextmanager
+    def span(self, name: str, category: str, **args: Any) -> Iterator[None]:
+        """Time the body of a ``with`` block as a span."""
+        if not self.enabled:
+            yield
+            return
+        start = self.now_us()
+        try:
+            yield
+        except BaseException as e:
+            args["error"] = type(e).__name__
+            raise
+        finally:
+            self.add(name, category, start, self.now_us(), **args)
+
+    def write(self, path: Optional[Path] = None) -> Path:
+        """Write the recorded spans as a Chrome trace-event JSON file.
+
+        Args:
+            path: Output file (defaults to the path given to ``enable``)
+
+        Returns:
+            Path of the written file
+        """
+        import json
+
+        path = Path(path or self.path or default_trace_path())
+        path.parent.mkdir(parents=True, exist_ok=True)
+        metadata = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": os.getpid(),
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in self._threads.items()
+        ]
+        path.write_text(
+            json.dumps({"traceEvents": metadata + self.events, "displayTimeUnit": "ms"})
+        )
+        return path
+
+    def slowest(self, top: int = SUMMARY_TOP) -> list[Dict[str, Any]]:
+        """The longest recorded spans, longest first."""
+        return sorted(self.events, key=lambda event: event["dur"], reverse=True)[:top]
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer."""
+    return _tracer
+
+
+def span(name: str, category: str, **args: Any):
+    """Time the body of a ``with`` block on the process-wide tracer."""
+    return _tracer.span(name, category, **args)
+
+
+def traced(category: str, name: Optional[str] = None) -> Callable:
+    """Decorator timing every call of a function as a span."""
+
+    def decorate(func: Callable) -> Callable:
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _tracer.enabled:
+                return func(*args, **kwargs)
+            with _tracer.span(label, category):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def run(args: list[str], **kwargs: Any) -> subprocess.CompletedProcess:
+    """``subprocess.run`` recorded as a span named after the command."""
+    with _tracer.span(" ".join(args[:3]), "subprocess", argv=" ".join(args)):
+        return subprocess.run(args, **kwargs)
+
+
+class _TracedClient:
+    """Proxy timing every method call of an API client."""
+
+    def __init__(self, client, name: str):
+        self._client = client
+        self._name = name
+
+    def __getattr__(self, attribute: str):
+        value = getattr(self._client, attribute)
+        if not callable(value) or attribute.startswith("_"):
+            return value
+
+        @functools.wraps(value)
+        def call(*args, **kwargs):
+            with _tracer.span(f"{self._name}.{attribute}", "api"):
+                return value(*args, **kwargs)
+
+        return call
+
+
+def traced_client(client, name: str):
+    """Wrap an API client so its calls are traced (returned as-is while tracing is off)."""
+    return _TracedClient(client, name) if _tracer.enabled else client
+
+
+class _TracedLoader:
+    """Loader proxy recording how long a module takes to execute."""
+
+    def __init__(self, loader, name: str):
+        self._loader = loader
+        self._name = name
+
+    def __getattr__(self, attribute: str):
+        return getattr(self._loader, attribute)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        start = _tracer.now_us()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            end = _tracer.now_us()
+            if end - start >= IMPORT_THRESHOLD_US:
+                _tracer.add(f"import {self._name}", "import", start, end)
+
+
+class _ImportTimer:
+    """Meta path finder timing the modules imported while tracing is on."""
+
+    def find_spec(self, name, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TracedLoader(spec.loader, name)
+            return spec
+        return None
+
+
+def default_trace_path() -> Path:
+    """Trace file for this run: ~/.easydeploy/traces/easydeploy-<time>-<pid>.json."""
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return Path.home() / ".easydeploy" / "traces" / f"easydeploy-{stamp}-{os.getpid()}.json"
+
+
+def trace_path_from_env() -> Optional[Path]:
+    """Trace file requested through ``EASYDEPLOY_TRACE``, if tracing is requested."""
+    value = os.environ.get(TRACE_ENV, "").strip()
+    if value.lower() in ("", "0", "false", "no", "off"):
+        return None
+    if value.lower() in ("1", "true", "yes", "on"):
+        return default_trace_path()
+    return Path(value).expanduser()
+
+
+def enable(path: Optional[Path] = None, started: Optional[float] = None):
+    """Start tracing.
+
+    Args:
+        path: Trace file written by ``finish`` (defaults to ``default_trace_path``)
+        started: ``time.perf_counter()`` at which the process started importing
+            easyDeploy, recorded as the CLI import span
+    """
+    if _tracer.enabled:
+        return
+    _tracer.enabled = True
+    _tracer.path = path
+    if started is not None:
+        # Measure everything from the start of the import
+        _tracer._epoch = int(started * 1e9)
+        _tracer.add("import easydeploy.cli", "import", 0.0, _tracer.now_us())
+    sys.meta_path.insert(0, _ImportTimer())
+
+
+def finish(top: int = SUMMARY_TOP) -> Optional[Path]:
+    """Stop tracing, write the trace file and log the slowest operations.
+
+    Returns:
+        Path of the trace file, or None if tracing was not enabled
+    """
+    if not _tracer.enabled:
+        return None
+    _tracer.enabled = False
+    sys.meta_path[:] = [finder for finder in sys.meta_path if not isinstance(finder, _ImportTimer)]
+
+    path = _tracer.write()
+    log = logging.getLogger("easydeploy.trace")
+    log.info(f"Slowest {min(top, len(_tracer.events))} of {len(_tracer.events)} operations:")
+    for event in _tracer.slowest(top):
+        log.info(f"{event['dur'] / 1000:10.1f} ms  {event['cat']:<10} {event['name']}")
+    log.info(f"Trace written to {path} (open in https://ui.perfetto.dev)")
+    return path
@@ -0,0 +1,99 @@
+"""In-process paramiko SSH server for tests.
+
+Commands are run locally with the shell, so tests can exercise real output,
+exit codes and files (such as readiness markers) without an sshd.
+"""
+
+import socket
+import subprocess
+import threading
+import time
+
+import paramiko
+
+HOST_KEY = paramiko.RSAKey.generate(1024)
+CLIENT_KEY = paramiko.RSAKey.generate(1024)
+USERNAME = "robot"
+
+# HOST_KEY as a cloud API publishes it
+PUBLISHED_HOST_KEY = f"{HOST_KEY.get_name()} {HOST_KEY.get_base64()}"
+
+
+def pin_host_key(known_hosts, port):
+    """Trust HOST_KEY for 127.0.0.1:port in a known_hosts file."""
+    keys = paramiko.HostKeys()
+    if known_hosts.exists():
+        keys.load(str(known_hosts))
+    keys.add(f"[127.0.0.1]:{port}", HOST_KEY.get_name(), HOST_KEY)
+    keys.save(str(known_hosts))
+
+
+class FakeSSHD:
+    """SSH server on 127.0.0.1 accepting CLIENT_KEY for USERNAME."""
+
+    def __init__(self):
+        self.logins = 0
+        self.commands = []
+        self._listener = socket.socket()
+        self._listener.bind(("127.0.0.1", 0))
+        self._listener.listen(64)
+        self.port = self._listener.getsockname()[1]
+        self._transports = []
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self._listener.accept()
+            except OSError:
+                return
+            transport = paramiko.Transport(conn)
+            transport.add_server_key(HOST_KEY)
+            self._transports.append(transport)
+            try:
+                transport.start_server(server=_Server(self))
+            except (paramiko.SSHException, OSError):
+                # The client hung up during the handshake, e.g. rejecting HOST_KEY
+                continue
+
+    def close(self):
+        self._listener.close()
+        for transport in self._transports:
+            transport.close()
+
+
+class _Server(paramiko.ServerInterface):
+    def __init__(self, sshd):
+        self.sshd = sshd
+
+    def get_allowed_auths(self, username):
+        return "publickey"
+
+    def check_auth_publickey(self, username, key):
+        if username == USERNAME and key == CLIENT_KEY:
+            self.sshd.logins += 1
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def check_channel_request(self, kind, chanid):
+        return paramiko.OPEN_SUCCEEDED
+
+    def check_channel_exec_request(self, channel, command):
+        self.sshd.commands.append(command.decode())
+        threading.Thread(target=_execute, args=(channel, command.decode()), daemon=True).start()
+        return True
+
+
+def _execute(channel, command):
+    # Let the transport thread acknowledge the exec request before output or
+    # close messages can overtake it
+    time.sleep(0.02)
+    proc = subprocess.run(command, shell=True, capture_output=True)
+    try:
+        channel.sendall(proc.stdout)
+        channel.sendall_stderr(proc.stderr)
+        channel.send_exit_status(proc.returncode)
+        channel.close()
+    except (EOFError, OSError):
+        # The client hung up once it had what it needed
+        pass
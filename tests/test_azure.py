@@ -0,0 +1,206 @@
+"""Tests for the Azure manager and Azure deployments."""
+
+import json
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from click.testing import CliRunner
+
+from easydeploy.cli.main import main
+from easydeploy.cloud.azure import compute
+from easydeploy.cloud.azure.compute import AzureManager
+from easydeploy.config import settings as settings_module
+from easydeploy.deploy.fleet import FleetDeployer, default_instance_params
+from easydeploy.deploy.state import StateStore
+from easydeploy.deploy.teardown import teardown
+
+
+class FakePoller:
+    """LROPoller stand-in finishing after a delay on its own thread."""
+
+    def __init__(self, delay=0.1, error=None):
+        self.error = error
+        self.done = threading.Event()
+        self.callbacks = []
+        self.lock = threading.Lock()
+        threading.Timer(delay, self.finish).start()
+
+    def finish(self):
+        with self.lock:
+            self.done.set()
+            callbacks = list(self.callbacks)
+        for callback in callbacks:
+            callback(self)
+
+    def add_done_callback(self, func):
+        with self.lock:
+            if not self.done.is_set():
+                self.callbacks.append(func)
+                return
+        func(self)
+
+    def result(self):
+        self.done.wait()
+        if self.error:
+            raise self.error
+
+
+def vm(name, tags, size="Standard_NC6s_v3"):
+    """A VirtualMachine-like object as returned by virtual_machines.list."""
+    return SimpleNamespace(
+        name=name,
+        location="eastus",
+        provisioning_state="Succeeded",
+        hardware_profile=SimpleNamespace(vm_size=size),
+        tags=tags,
+    )
+
+
+def fake_manager(delay=0.1, failing=()):
+    """AzureManager over a mocked compute client whose operations take ``delay``."""
+    manager = AzureManager("sub-1234")
+    client = Mock()
+    client.bodies = {}
+
+    def create(resource_group, name, body, polling_interval=None):
+        client.bodies[name] = body
+        error = RuntimeError("SkuNotAvailable") if name in failing else None
+        return FakePoller(delay, error)
+
+    client.virtual_machines.begin_create_or_update.side_effect = create
+    client.virtual_machines.begin_delete.side_effect = lambda *args, **kwargs: FakePoller(delay)
+    # Network resources are sent as raw ARM requests and provision at once
+    client.send_request.return_value.json.return_value = {
+        "properties": {"provisioningState": "Succeeded"}
+    }
+    manager._compute_client = client
+    return manager
+
+
+def base_params(manager):
+    """Template variables for an Azure fleet."""
+    return {
+        **default_instance_params(),
+        "project_id": manager.project_id,
+        "zone": manager.location,
+        "machine_type": "Standard_NC6s_v3",
+        "subnet_id": manager.subnet_id,
+    }
+
+
+class TestAzureManager:
+    """Test cases for AzureManager."""
+
+    def test_fleet_created_and_waited_concurrently(self):
+        """Test fleet members are created in parallel and their pollers awaited together."""
+        manager = fake_manager(delay=0.3)
+        deployer = FleetDeployer(manager, concurrency=8)
+
+        started = time.monotonic()
+        results = deployer.deploy({"name": "w", "count": 8, "gpu": True}, base_params(manager))
+        deployer.wait(results)
+        elapsed = time.monotonic() - started
+
+        assert elapsed < 1.0
+        assert sorted(result["status"] for result in results) == ["running"] * 8
+        body = manager.compute_client.bodies["w-003"]
+        assert body["properties"]["hardwareProfile"]["vmSize"] == "Standard_NC6s_v3"
+        assert body["tags"] == {"easydeploy": "true", "deployment": "w", "fleet": "w"}
+        nic = body["properties"]["networkProfile"]["networkInterfaceConfigurations"][0]
+        ip = nic["properties"]["ipConfigurations"][0]["properties"]
+        assert ip["subnet"]["id"].endswith("/virtualNetworks/easydeploy-vnet/subnets/default")
+
+        # Every member's NIC lets SSH in through one shared security group
+        [request] = [call.args[0] for call in manager.compute_client.send_request.call_args_list]
+        assert request.method == "PUT"
+        assert nic["properties"]["networkSecurityGroup"]["id"] == request.url.split("?")[0]
+        [rule] = json.loads(request.content)["properties"]["securityRules"]
+        assert rule["properties"]["destinationPortRange"] == "22"
+        assert rule["properties"]["sourceAddressPrefixes"] == ["0.0.0.0/0"]
+
+    def test_failed_operation_reported(self):
+        """Test a failed poller fails only its own member, and tracking is deduplicated."""
+        manager = fake_manager(failing={"w-002"})
+        deployer = FleetDeployer(manager)
+        results = deployer.deploy({"name": "w", "count": 2}, base_params(manager))
+
+        assert manager.track(results[0]) is manager.track(results[0])
+        deployer.wait(results)
+
+        by_name = {result["name"]: result for result in results}
+        assert by_name["w-001"]["status"] == "running"
+        assert by_name["w-002"]["status"] == "failed"
+        assert by_name["w-002"]["error"] == "SkuNotAvailable"
+        # Finished operations are not kept around
+        assert manager._futures == {}
+
+    def test_teardown_and_list(self):
+        """Test VMs are deleted through teardown and listed by tag."""
+        manager = fake_manager(delay=0.05)
+        records = [{"name": name, "zone": "eastus"} for name in ("w-001", "w-002")]
+
+        results = teardown(manager, records)
+
+        assert sorted((r["name"], r["status"]) for r in results) == [
+            ("w-001", "done"),
+            ("w-002", "done"),
+        ]
+        manager.compute_client.virtual_machines.list.return_value = [
+            vm("w-001", {"easydeploy": "true", "fleet": "w"}),
+            vm("other", {"easydeploy": "true"}),
+            vm("unmanaged", None, size="Standard_D4s_v3"),
+        ]
+        listed = list(manager.list_instances(labels={"fleet": "w"}))
+        assert [(i["name"], i["gpu_enabled"]) for i in listed] == [("w-001", True)]
+
+    def test_managers_share_one_credential(self):
+        """Test every client built without a credential reuses the process's one."""
+        compute.get_credential.cache_clear()
+        client_class = Mock()
+        try:
+            with (
+                patch.object(compute, "_compute_client_class", return_value=client_class),
+                patch("azure.identity.DefaultAzureCredential") as credential_class,
+            ):
+                AzureManager("sub-a").compute_client
+                AzureManager("sub-b").compute_client
+        finally:
+            compute.get_credential.cache_clear()
+
+        credential_class.assert_called_once_with()
+        first, second = (call.args[0] for call in client_class.call_args_list)
+        assert first is second is credential_class.return_value
+
+
+def test_deploy_and_destroy_command(tmp_path, monkeypatch):
+    """Test deploy --platform azure uses the GPU VM size and destroy deletes the VMs."""
+    monkeypatch.setattr(settings_module, "_settings", None)
+    monkeypatch.setattr(settings_module.get_settings(), "state_dir", tmp_path / "state")
+    manager = fake_manager(delay=0.05)
+    monkeypatch.setattr("easydeploy.cli.main._azure_manager", lambda subscription=None: manager)
+    monkeypatch.setattr("easydeploy.cli.main._provisioning_bundle", lambda platform: {})
+
+    result = CliRunner().invoke(
+        main,
+        ["deploy", "w", "--platform", "azure", "--count", "3", "--gpu", "--no-wait-ready"],
+        catch_exceptions=False,
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "3/3 instances running" in result.output
+    sizes = {
+        body["properties"]["hardwareProfile"]["vmSize"]
+        for body in manager.compute_client.bodies.values()
+    }
+    assert sizes == {"Standard_NC6s_v3"}
+    store = StateStore(tmp_path / "state" / "deployments.db")
+    records = store.query(fleet="w")
+    assert {(r["platform"], r["project"]) for r in records} == {("azure", "sub-1234")}
+
+    result = CliRunner().invoke(main, ["destroy", "w", "-y"], catch_exceptions=False)
+
+    assert result.exit_code == 0, result.output
+    assert manager.compute_client.virtual_machines.begin_delete.call_count == 3
+    assert store.query() == []
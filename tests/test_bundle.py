@@ -0,0 +1,255 @@
+"""Tests for content-addressed provisioning bundles."""
+
+import hashlib
+import io
+import os
+import subprocess
+import tarfile
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+import pytest
+
+from easydeploy.deploy.bundle import (
+    FileBundleStore,
+    GCSBundleStore,
+    HTTPBundleStore,
+    build_bundle,
+    get_bundle_store,
+    pack,
+    publish_bundle,
+)
+from easydeploy.deploy.templates import TemplateEngine
+
+
+@pytest.fixture(autouse=True)
+def home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+
+
+@pytest.fixture
+def scripts(tmp_path):
+    root = tmp_path / "scripts"
+    (root / "system").mkdir(parents=True)
+    (root / "system" / "base_setup.sh").write_text("#!/bin/bash\necho base\n")
+    (root / "system" / "base_setup.sh").chmod(0o755)
+    (root / "utils").mkdir()
+    (root / "utils" / "common.sh").write_text('log_info() { echo "$@"; }\n')
+    return root
+
+
+class CountingStore(FileBundleStore):
+    """File store that counts existence checks and uploads."""
+
+    def __init__(self, root):
+        super().__init__(root)
+        self.checks = self.uploads = 0
+
+    def exists(self, digest):
+        self.checks += 1
+        return super().exists(digest)
+
+    def upload(self, path, digest):
+        self.uploads += 1
+        super().upload(path, digest)
+
+
+class TestBundle:
+    """Test cases for bundle building and publishing."""
+
+    def test_pack_is_reproducible(self, scripts):
+        """Test timestamps and file order do not change the archive bytes."""
+        first = pack(scripts)
+        os.utime(scripts / "utils" / "common.sh", (1, 1))
+
+        assert pack(scripts) == first
+
+        with tarfile.open(fileobj=io.BytesIO(first), mode="r:gz") as tar:
+            members = {member.name: member for member in tar.getmembers()}
+        assert list(members) == ["system", "system/base_setup.sh", "utils", "utils/common.sh"]
+        assert members["system/base_setup.sh"].mode == 0o755
+        assert members["utils/common.sh"].mode == 0o644
+
+    def test_bundle_named_by_hash(self, scripts, tmp_path):
+        """Test the bundle file name is the SHA-256 of its content."""
+        bundle = build_bundle(scripts, tmp_path / "out")
+
+        assert bundle["path"].name == f"bundle-{bundle['sha256']}.tar.gz"
+        assert hashlib.sha256(bundle["path"].read_bytes()).hexdigest() == bundle["sha256"]
+
+    def test_content_change_changes_hash(self, scripts, tmp_path):
+        """Test editing a script produces a new bundle."""
+        before = build_bundle(scripts, tmp_path / "out")["sha256"]
+        (scripts / "utils" / "common.sh").write_text("log_info() { :; }\n")
+
+        assert build_bundle(scripts, tmp_path / "out")["sha256"] != before
+
+    def test_publish_uploads_once_per_hash(self, scripts, tmp_path):
+        """Test republishing an unchanged bundle skips the upload and the store lookup."""
+        store = CountingStore(tmp_path / "store")
+
+        first = publish_bundle(scripts, store)
+        second = publish_bundle(scripts, store)
+
+        assert first["uploaded"] is True
+        assert second["uploaded"] is False
+        assert second["url"] == first["url"]
+        assert (store.checks, store.uploads) == (1, 1)
+        assert first["url"].startswith("file://")
+
+    def test_publish_skips_bundle_already_in_store(self, scripts, tmp_path):
+        """Test a bundle uploaded from another machine is not uploaded again."""
+        store = CountingStore(tmp_path / "store")
+        bundle = build_bundle(scripts, tmp_path / "elsewhere")
+        store.upload(bundle["path"], bundle["sha256"])
+        store.uploads = 0
+
+        assert publish_bundle(scripts, store)["uploaded"] is False
+        assert store.uploads == 0
+
+    def test_missing_scripts_dir(self, tmp_path):
+        """Test a missing scripts directory is reported clearly."""
+        with pytest.raises(FileNotFoundError):
+            build_bundle(tmp_path / "missing")
+
+    def test_store_from_location(self, tmp_path):
+        """Test locations map to the matching store type."""
+        assert isinstance(get_bundle_store("gs://bucket/easydeploy"), GCSBundleStore)
+        assert isinstance(get_bundle_store("https://artifacts.example.com"), HTTPBundleStore)
+        store = get_bundle_store(f"file://{tmp_path}")
+        assert isinstance(store, FileBundleStore)
+        assert store.root == tmp_path
+        assert get_bundle_store("gs://bucket/easydeploy/").url("ab") == (
+            "gs://bucket/easydeploy/bundle-ab.tar.gz"
+        )
+
+    def test_http_store(self, scripts):
+        """Test the HTTP store checks with HEAD and uploads with PUT."""
+        objects = {}
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_HEAD(self):
+                self.send_response(200 if self.path in objects else 404)
+                self.end_headers()
+
+            def do_PUT(self):
+                objects[self.path] = self.rfile.read(int(self.headers["Content-Length"]))
+                self.send_response(201)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            store = HTTPBundleStore(f"http://127.0.0.1:{server.server_port}/bundles")
+            result = publish_bundle(scripts, store)
+        finally:
+            server.shutdown()
+
+        path = f"/bundles/bundle-{result['sha256']}.tar.gz"
+        assert result["uploaded"] is True
+        assert hashlib.sha256(objects[path]).hexdigest() == result["sha256"]
+
+    def test_startup_script_verifies_bundle(self, tmp_path):
+        """Test instances fetch the bundle by URL and check its hash before running it."""
+        engine = TemplateEngine(
+            Path(__file__).resolve().parent.parent / "templates", cache_dir=tmp_path / "cache"
+        )
+        spec = engine.render_yaml(
+            "gcp-instance.yaml.j2",
+            deployment_name="w",
+            zone="us-central1-a",
+            machine_type="n1-standard-4",
+            bundle_url="gs://bucket/bundle-abc.tar.gz",
+            bundle_sha256="abc",
+        )
+        script = spec["instance"]["metadata"]["startup-script"]
+
+        assert 'BUNDLE_URL="gs://bucket/bundle-abc.tar.gz"' in script
+        assert 'echo "${BUNDLE_SHA256}  bundle.tar.gz" | sha256sum -c -' in script
+        assert script.index("sha256sum") < script.index("base_setup.sh")
+
+    def test_deploy_publishes_nothing_without_store(self, monkeypatch):
+        """Test the local default store, which instances cannot read, is never published to."""
+        from click import ClickException
+
+        from easydeploy.cli.main import _provisioning_bundle
+        from easydeploy.config import settings as settings_module
+
+        monkeypatch.setattr(settings_module, "_settings", None)
+        monkeypatch.setattr(
+            "easydeploy.deploy.bundle.publish_bundle", lambda **kwargs: pytest.fail("published")
+        )
+
+        assert _provisioning_bundle() == {}
+        settings_module.get_settings().set("provisioning.bundle_store", "gs://bucket/bundles")
+        with pytest.raises(ClickException, match="https://"):
+            _provisioning_bundle(platform="azure")
+
+
+STUBS = {
+    # gcloud storage cp SRC DST
+    "gcloud": 'echo gcloud >> "$FETCHES"\ncp "$BUNDLE_SOURCE" "${@: -1}"\n',
+    # curl -fsSL --retry 5 -o DST URL
+    "curl": 'echo curl >> "$FETCHES"\n'
+    'while [ $# -gt 0 ]; do [ "$1" = -o ] && out="$2"; shift; done\n'
+    'cp "$BUNDLE_SOURCE" "$out"\n',
+}
+
+
+@pytest.mark.parametrize(
+    "scheme, fetcher",
+    [("gs://bucket/bundles", "gcloud"), ("https://artifacts.example.com", "curl"), ("file", None)],
+)
+def test_startup_script_runs_bundle(scheme, fetcher, tmp_path):
+    """Test the rendered startup script fetches, verifies and runs the bundle from each store."""
+    scripts = tmp_path / "scripts"
+    for script in ("system/base_setup.sh", "ros/install_ros2.sh"):
+        (scripts / script).parent.mkdir(parents=True, exist_ok=True)
+        (scripts / script).write_text(f'echo {script} >> "$RAN"\n')
+    bundle = build_bundle(scripts, tmp_path / "bundles")
+    store = FileBundleStore(tmp_path / "bundles") if scheme == "file" else get_bundle_store(scheme)
+
+    engine = TemplateEngine(
+        Path(__file__).resolve().parent.parent / "templates", cache_dir=tmp_path / "cache"
+    )
+    params = dict(
+        deployment_name="w",
+        deploy_user="ubuntu",
+        ssh_public_key="ubuntu:ssh-ed25519 AAAA",
+        bundle_url=store.url(bundle["sha256"]),
+        bundle_sha256=bundle["sha256"],
+        ready_marker=str(tmp_path / "ready"),
+    )
+    gcp = engine.render_yaml("gcp-instance.yaml.j2", **params)
+    azure = engine.render_yaml("azure-instance.yaml.j2", **params)
+    script = gcp["instance"]["metadata"]["startup-script"]
+    assert azure["instance"]["custom_data"] == script
+
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    for name, body in STUBS.items():
+        (bin_dir / name).write_text(f"#!/bin/bash\n{body}")
+        (bin_dir / name).chmod(0o755)
+    env = {
+        **os.environ,
+        "PATH": f"{bin_dir}:{os.environ['PATH']}",
+        "BUNDLE_SOURCE": str(bundle["path"]),
+        "FETCHES": str(tmp_path / "fetches"),
+        "RAN": str(tmp_path / "ran"),
+        "EASYDEPLOY_BUNDLE_ROOT": str(tmp_path / "opt"),
+    }
+    subprocess.run(["bash", "-c", script], env=env, check=True, capture_output=True)
+
+    fetches = tmp_path / "fetches"
+    assert (fetches.read_text().split() if fetches.exists() else []) == (
+        [fetcher] if fetcher else []
+    )
+    assert (tmp_path / "ran").read_text().split() == [
+        "system/base_setup.sh",
+        "ros/install_ros2.sh",
+    ]
+    assert (tmp_path / "ready").exists()
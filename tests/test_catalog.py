@@ -0,0 +1,171 @@
+"""Tests for the zone catalog and deploy's zone fallback."""
+
+import json
+from concurrent.futures import Future
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from easydeploy.cloud.gcp.catalog import (
+    ZoneCatalog,
+    gpu_quota_metric,
+    is_capacity_error,
+)
+
+ZONES = {
+    "us-central1-a": ["n1-standard-4", "n1-standard-8"],
+    "us-central1-b": ["n1-standard-4"],
+    "us-east1-b": ["n1-standard-4"],
+    "europe-west4-a": ["n1-standard-4"],
+}
+
+
+class FakeManager:
+    """GCPManager stand-in listing offerings and quotas, and creating instances."""
+
+    project_id = "robo-sim"
+
+    def __init__(self, t4_zones=("us-central1-a", "us-central1-b", "us-east1-b"), quotas=None):
+        self.t4_zones = t4_zones
+        self.quotas = quotas or {}
+        self.created = []
+        self.exhausted = set()
+
+    def list_machine_types(self):
+        for zone, names in ZONES.items():
+            for name in names:
+                cpus = int(name.rsplit("-", 1)[1])
+                yield {"name": name, "zone": zone, "cpus": cpus, "memory_mb": cpus * 3840}
+
+    def list_accelerator_types(self):
+        for zone in self.t4_zones:
+            yield {"name": "nvidia-tesla-t4", "zone": zone, "max_per_instance": 4}
+
+    def list_regions(self):
+        for region in ("us-central1", "us-east1", "europe-west4"):
+            yield {"name": region, "zones": [], "quotas": self.quotas.get(region, {})}
+
+    def create_instance(self, name, machine_type, gpu_enabled, spec, zone):
+        self.created.append((name, zone))
+        return {"name": name, "zone": zone, "status": "creating", "operation": f"op-{zone}"}
+
+    def bulk_insert_instances(self, spec, count, name_pattern):
+        zone = spec["instance"]["zone"]
+        self.created += [
+            (name_pattern.replace("###", f"{i:03d}"), zone) for i in range(1, count + 1)
+        ]
+        return {"operation": f"op-{zone}"}
+
+    def track(self, result):
+        future = Future()
+        if result["zone"] in self.exhausted:
+            future.set_result(
+                {"status": "FAILED", "error": "ZONE_RESOURCE_POOL_EXHAUSTED: no T4s left"}
+            )
+        else:
+            future.set_result({"status": "DONE", "error": None})
+        return future
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    """A catalog refreshed from FakeManager, with little T4 quota in us-central1."""
+    catalog = ZoneCatalog("robo-sim", path=str(tmp_path / "catalog.json"))
+    quotas = {"us-central1": {"NVIDIA_T4_GPUS": {"limit": 4, "usage": 3}}}
+    assert catalog.refresh(FakeManager(quotas=quotas)) == len(ZONES)
+    return catalog
+
+
+class TestZoneCatalog:
+    """Test cases for ZoneCatalog."""
+
+    def test_refresh_writes_zone_index(self, catalog):
+        """Test the catalog file indexes machine types and GPUs by zone."""
+        data = json.loads(open(catalog.path).read())
+
+        assert data["zones"]["us-central1-a"]["machine_types"]["n1-standard-8"] == [8, 30720]
+        assert data["zones"]["us-central1-b"]["accelerators"] == {"nvidia-tesla-t4": 4}
+        assert data["quotas"]["us-central1"]["NVIDIA_T4_GPUS"] == [4, 3]
+
+    def test_validate(self, catalog):
+        """Test unknown types are rejected offline, with suggestions."""
+        catalog.validate("n1-standard-8", "nvidia-tesla-t4", 2)
+
+        with pytest.raises(ValueError, match="did you mean n1-standard-4"):
+            catalog.validate("n1-standrd-4")
+        with pytest.raises(ValueError, match="Unknown GPU type"):
+            catalog.validate("n1-standard-4", "nvidia-h100-80gb", 1)
+        with pytest.raises(ValueError, match="at most 4 GPUs"):
+            catalog.validate("n1-standard-4", "nvidia-tesla-t4", 8)
+
+    def test_empty_catalog_accepts_everything(self, tmp_path):
+        """Test an unavailable catalog does not block deploys."""
+        catalog = ZoneCatalog("robo-sim", path=str(tmp_path / "missing.json"))
+
+        catalog.validate("anything")
+        assert catalog.candidate_zones("us-central1-a", "anything") == ["us-central1-a"]
+
+    def test_candidate_zones_skip_zones_without_quota(self, catalog):
+        """Test zones short of quota are skipped, nearby zones first, same geography only."""
+        assert catalog.candidate_zones("us-central1-a", "n1-standard-4") == [
+            "us-central1-a",
+            "us-central1-b",
+            "us-east1-b",
+        ]
+        assert catalog.candidate_zones(
+            "us-central1-a", "n1-standard-4", "nvidia-tesla-t4", 1, count=2
+        ) == ["us-east1-b"]
+        assert "NVIDIA_T4_GPUS quota left" in catalog.shortfall(
+            "us-central1-a", "n1-standard-4", "nvidia-tesla-t4", 1, count=2
+        )
+
+    def test_stale_catalog_refreshes_in_background(self, catalog):
+        """Test a stale catalog is used as-is while a background refresh starts."""
+        catalog.ttl = 0
+        with (
+            patch.object(ZoneCatalog, "refresh_in_background") as background,
+            patch.object(ZoneCatalog, "refresh") as refresh,
+        ):
+            catalog.ensure(FakeManager())
+
+        background.assert_called_once_with()
+        refresh.assert_not_called()
+
+
+def test_quota_metrics_and_capacity_errors():
+    """Test GPU quota names and which creation errors trigger a zone fallback."""
+    assert gpu_quota_metric("nvidia-tesla-t4") == "NVIDIA_T4_GPUS"
+    assert gpu_quota_metric("nvidia-l4") == "NVIDIA_L4_GPUS"
+    assert is_capacity_error("ZONE_RESOURCE_POOL_EXHAUSTED: try later")
+    assert not is_capacity_error("Invalid value for field 'resource.name'")
+    assert not is_capacity_error(None)
+
+
+def test_deploy_falls_back_to_next_zone(tmp_path, monkeypatch):
+    """Test members that hit a stockout are recreated in the next candidate zone."""
+    from easydeploy.cli.main import main
+    from easydeploy.config import settings as settings_module
+    from easydeploy.deploy.fleet import default_instance_params
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(settings_module, "_settings", None)
+    monkeypatch.setattr(settings_module.get_settings(), "state_dir", tmp_path)
+    manager = FakeManager()
+    manager.exhausted = {"us-central1-a"}
+    base_params = {**default_instance_params(), "project_id": "robo-sim"}
+    monkeypatch.setattr("easydeploy.cli.main._gcp_manager", lambda: manager)
+    monkeypatch.setattr("easydeploy.cli.main._gcp_base_params", lambda m, manifest: base_params)
+
+    result = CliRunner().invoke(
+        main, ["deploy", "w", "--count", "2", "--gpu", "--no-wait-ready"], catch_exceptions=False
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "retrying in us-central1-b" in result.output
+    assert sorted(manager.created) == [
+        ("w-001", "us-central1-a"),
+        ("w-001", "us-central1-b"),
+        ("w-002", "us-central1-a"),
+        ("w-002", "us-central1-b"),
+    ]
@@ -0,0 +1,125 @@
+"""Tests for easydeploy daemon and command forwarding."""
+
+import logging
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+from click.testing import CliRunner
+
+from easydeploy.cli import forward as forward_module
+from easydeploy.cli.forward import forward, request, subcommand
+from easydeploy.cli.main import main
+from easydeploy.deploy.state import StateStore
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    """A foreground daemon listening on a socket in tmp_path."""
+    socket_path = str(tmp_path / "daemon.sock")
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("EASYDEPLOY_DAEMON_SOCKET", socket_path)
+    monkeypatch.delenv(forward_module.NO_DAEMON_ENV, raising=False)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "easydeploy.cli.daemon", "start", "--foreground"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while request({"control": "status"}) is None:
+        assert process.poll() is None and time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.1)
+    yield process
+    process.terminate()
+    process.wait(10)
+
+
+def test_subcommand_skips_option_values():
+    """Test the subcommand is found past top-level options and their values."""
+    assert subcommand(["-v", "--set", "daemon=1", "list", "--live"]) == "list"
+    assert subcommand(["--log-json", "run.ndjson", "daemon", "stop"]) == "daemon"
+    assert subcommand(["--version"]) is None
+
+
+def test_runs_in_process_without_daemon(tmp_path, monkeypatch):
+    """Test nothing is forwarded when no daemon listens."""
+    monkeypatch.setenv("EASYDEPLOY_DAEMON_SOCKET", str(tmp_path / "missing.sock"))
+    monkeypatch.delenv(forward_module.NO_DAEMON_ENV, raising=False)
+
+    assert forward(["list"]) is None
+
+
+def test_forwards_commands_with_callers_cwd_and_stdio(daemon, tmp_path, monkeypatch, capfd):
+    """Test a forwarded command writes to the caller's stdout and reports its exit code."""
+    monkeypatch.chdir(tmp_path)
+    StateStore(tmp_path / "state" / "deployments.db").upsert_many(
+        [{"name": "sim-042", "platform": "gcp", "project": "robo-sim", "status": "running"}]
+    )
+
+    assert forward(["--version"]) == 0
+    assert "easydeploy, version 0.1.0" in capfd.readouterr().out
+
+    assert forward(["list"]) == 0
+    assert "sim-042" in capfd.readouterr().out
+
+    assert forward(["destroy"]) == 2
+    assert "exactly one of" in capfd.readouterr().err
+
+    monkeypatch.setenv(forward_module.NO_DAEMON_ENV, "1")
+    assert forward(["--version"]) is None
+
+
+def test_status_and_stop(daemon):
+    """Test the daemon reports what it served and stops on request."""
+    forward(["--version"])
+
+    result = CliRunner().invoke(main, ["daemon", "status"])
+    assert result.exit_code == 0, result.output
+    assert f"Daemon {daemon.pid}" in result.output
+    assert "1 commands served" in result.output
+
+    result = CliRunner().invoke(main, ["daemon", "stop"])
+    assert result.exit_code == 0, result.output
+    assert daemon.wait(10) == 0
+    assert not os.path.exists(os.environ["EASYDEPLOY_DAEMON_SOCKET"])
+    assert forward(["--version"]) is None
+
+
+def test_gcp_manager_reuses_warm_manager(monkeypatch):
+    """Test commands use the GCPManager the daemon warmed for the same project."""
+    from easydeploy.cli import main as main_module
+    from easydeploy.config import settings as settings_module
+
+    monkeypatch.setenv("EASYDEPLOY_CLOUD__GCP__PROJECT_ID", "robo-sim")
+    monkeypatch.setattr(settings_module, "_settings", None)
+    warm = object()
+    monkeypatch.setitem(
+        main_module._warm_managers, ("robo-sim", "us-central1", "us-central1-a"), warm
+    )
+
+    assert main_module._gcp_manager() is warm
+
+
+def test_callers_with_other_credentials_get_no_warm_state(monkeypatch):
+    """Test a forked command keeps warm clients only for the daemon's own identity."""
+    import easydeploy
+    from easydeploy.cli import daemon as daemon_module
+    from easydeploy.cli import main as main_module
+    from easydeploy.cloud.gcp import tokens
+
+    monkeypatch.setattr(logging, "root", logging.RootLogger(logging.WARNING))
+    monkeypatch.setattr(easydeploy, "IMPORT_STARTED", 0.0)
+    monkeypatch.setenv("GOOGLE_APPLICATION_CREDENTIALS", "/keys/daemon.json")
+    monkeypatch.setitem(main_module._warm_managers, ("robo-sim", "us-central1", "us-central1-a"), 1)
+    shared = tokens.get_token_manager()
+
+    daemon_module._reset_caches(dict(os.environ))
+    assert main_module._warm_managers
+    assert tokens.get_token_manager() is shared
+    assert easydeploy.IMPORT_STARTED > 0
+
+    daemon_module._reset_caches({**os.environ, "GOOGLE_APPLICATION_CREDENTIALS": "/keys/ci.json"})
+    assert not main_module._warm_managers
+    assert tokens.get_token_manager() is not shared
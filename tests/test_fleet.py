@@ -0,0 +1,155 @@
+"""Tests for fleet deployment."""
+
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+from click.testing import CliRunner
+
+from easydeploy.cli.main import main
+from easydeploy.cloud.gcp.compute import GCPManager
+from easydeploy.deploy.fleet import FleetDeployer, expand_members, load_fleet_manifest
+
+BASE_PARAMS = {
+    "project_id": "robo-sim",
+    "zone": "us-central1-a",
+    "machine_type": "n1-standard-4",
+    "gpu_enabled": False,
+    "ssh_port": 22,
+    "allowed_ip_ranges": ["0.0.0.0/0"],
+}
+
+
+class SlowManager:
+    """Fake GCPManager whose create_instance takes a fixed time."""
+
+    def __init__(self, delay=0.1, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def create_instance(self, name, machine_type="n1-standard-4", gpu_enabled=False, **kwargs):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        if name in self.fail:
+            raise RuntimeError("ZONE_RESOURCE_POOL_EXHAUSTED")
+        return {"name": name, "status": "creating", "spec": kwargs["spec"]}
+
+
+class TestFleet:
+    """Test cases for fleet manifests and FleetDeployer."""
+
+    def test_load_manifest_and_expand(self, tmp_path):
+        """Test member names, shared settings and per-member overrides."""
+        path = tmp_path / "fleet.yaml"
+        path.write_text(
+            "name: workers\ncount: 3\ngpu: true\nmembers:\n  - machine_type: n1-standard-16\n"
+        )
+
+        members = expand_members(load_fleet_manifest(path), BASE_PARAMS)
+
+        assert [m["deployment_name"] for m in members] == [
+            "workers-001",
+            "workers-002",
+            "workers-003",
+        ]
+        assert members[0]["machine_type"] == "n1-standard-16"
+        assert members[1]["machine_type"] == "n1-standard-4"
+        assert all(m["gpu_enabled"] for m in members)
+
+    def test_manifest_requires_name(self, tmp_path):
+        """Test a manifest without a name is rejected."""
+        path = tmp_path / "fleet.yaml"
+        path.write_text("count: 2\n")
+
+        with pytest.raises(ValueError):
+            load_fleet_manifest(path)
+
+    def test_concurrent_creation_is_bounded(self):
+        """Test members are created in parallel, never above the concurrency limit."""
+        manager = SlowManager(delay=0.1, fail={"workers-005"})
+        deployer = FleetDeployer(manager, concurrency=4, use_bulk_insert=False)
+        seen = []
+
+        start = time.perf_counter()
+        results = deployer.deploy(
+            {"name": "workers", "count": 8}, BASE_PARAMS, progress=seen.append
+        )
+        elapsed = time.perf_counter() - start
+
+        assert len(results) == len(seen) == 8
+        assert manager.peak == 4
+        assert elapsed < 0.5
+        failed = [r for r in results if r["status"] == "failed"]
+        assert [r["name"] for r in failed] == ["workers-005"]
+        rendered = next(r for r in results if r["name"] == "workers-001")["spec"]
+        assert rendered["instance"]["name"] == "workers-001"
+
+    def test_identical_fleet_uses_bulk_insert(self):
+        """Test an identical fleet is created with one bulkInsert call."""
+        manager = Mock()
+        manager.bulk_insert_instances.return_value = {"operation": "op-1"}
+
+        results = FleetDeployer(manager).deploy({"name": "workers", "count": 50}, BASE_PARAMS)
+
+        manager.bulk_insert_instances.assert_called_once()
+        _, count, pattern = manager.bulk_insert_instances.call_args.args
+        assert (count, pattern) == (50, "workers-###")
+        assert {r["status"] for r in results} == {"creating"}
+        manager.create_instance.assert_not_called()
+
+    def test_bulk_members_match_single_creates(self):
+        """Test bulkInsert members get the labels and tags of members created one by one."""
+        from easydeploy.cloud.gcp.compute import build_instance_properties
+
+        bulk = Mock()
+        bulk.bulk_insert_instances.return_value = {"operation": "op-1"}
+        FleetDeployer(bulk).deploy({"name": "workers", "count": 3}, BASE_PARAMS)
+        single = SlowManager(delay=0)
+        results = FleetDeployer(single, use_bulk_insert=False).deploy(
+            {"name": "workers", "count": 3}, BASE_PARAMS
+        )
+
+        bulk_properties = build_instance_properties(bulk.bulk_insert_instances.call_args.args[0])
+        for result in results:
+            properties = build_instance_properties(result["spec"])
+            assert dict(properties.labels) == dict(bulk_properties.labels)
+            assert list(properties.tags.items) == list(bulk_properties.tags.items)
+        assert dict(bulk_properties.labels)["deployment"] == "workers"
+        assert list(bulk_properties.tags.items) == ["easydeploy", "workers"]
+
+    def test_gcp_manager_create_instance(self):
+        """Test create_instance builds a zonal Instance and returns the operation."""
+        manager = GCPManager("robo-sim", zone="us-central1-b")
+        manager._compute_client = Mock()
+        operation = Mock()
+        operation.name = "op-7"
+        manager._compute_client.insert.return_value = operation
+
+        result = manager.create_instance("solo", gpu_enabled=True)
+
+        kwargs = manager._compute_client.insert.call_args.kwargs
+        instance = kwargs["instance_resource"]
+        assert kwargs["zone"] == "us-central1-b"
+        assert instance.machine_type == "zones/us-central1-b/machineTypes/n1-standard-4"
+        assert instance.guest_accelerators[0].accelerator_count == 1
+        assert result["operation"] == "op-7"
+        # The startup script fetches gs:// bundles with the default service account
+        assert instance.service_accounts[0].email == "default"
+        assert "https://www.googleapis.com/auth/devstorage.read_only" in (
+            instance.service_accounts[0].scopes
+        )
+
+    def test_deploy_command_requires_target(self):
+        """Test deploy without a name or manifest is a usage error."""
+        result = CliRunner().invoke(main, ["deploy"])
+
+        assert result.exit_code == 2
+        assert "--fleet" in result.output
@@ -0,0 +1,59 @@
+"""Tests for the async GCP lookup layer."""
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from easydeploy.cloud.gcp import auth
+
+
+@pytest.fixture(autouse=True)
+def isolated_home(tmp_path, monkeypatch):
+    """Keep lookups away from the real token cache and gcloud config."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv("CLOUDSDK_CONFIG", raising=False)
+    monkeypatch.delenv("GOOGLE_APPLICATION_CREDENTIALS", raising=False)
+    monkeypatch.setattr(auth, "_session_memo", None)
+
+
+class TestAsyncLookups:
+    """Test cases for the async gcloud helpers."""
+
+    def test_run_concurrently_overlaps_calls(self):
+        """Test independent coroutines run at the same time, results in order."""
+
+        async def slow(value):
+            await asyncio.sleep(0.2)
+            return value
+
+        start = time.perf_counter()
+        results = auth.run_concurrently(slow(1), slow(2), slow(3))
+
+        assert results == [1, 2, 3]
+        assert time.perf_counter() - start < 0.5
+
+    @patch("easydeploy.cloud.gcp.auth._run_gcloud_async", new_callable=AsyncMock)
+    def test_list_projects_async(self, mock_gcloud):
+        """Test project listing output is parsed."""
+        mock_gcloud.return_value = json.dumps([{"projectId": "robo-1", "name": "Robo"}])
+
+        (projects,) = auth.run_concurrently(auth.list_projects_async())
+
+        assert projects == [{"project_id": "robo-1", "name": "Robo"}]
+
+    @patch("subprocess.run", side_effect=FileNotFoundError)
+    @patch("asyncio.create_subprocess_exec", side_effect=FileNotFoundError)
+    def test_missing_gcloud(self, mock_exec, mock_run):
+        """Test lookups degrade gracefully when gcloud is not installed."""
+        authenticated, projects, project = auth.run_concurrently(
+            auth.is_authenticated_async(),
+            auth.list_projects_async(),
+            auth.get_current_project_async(),
+        )
+
+        assert authenticated is False
+        assert projects == []
+        assert project is None
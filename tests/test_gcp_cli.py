@@ -1,11 +1,18 @@
 """Tests for GCP CLI commands."""
 
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 from click.testing import CliRunner
 
-from easydeploy.cli.gcp import login, logout, require_gcp_auth, status
+from easydeploy.cli.gcp import (
+    list_projects_cmd,
+    login,
+    logout,
+    require_gcp_auth,
+    select_project,
+    status,
+)
 
 
 class TestGCPCLI:
@@ -107,6 +114,41 @@ class TestGCPCLI:
         assert "❌ Not authenticated with GCP" in result.output
         assert "💡 Run: easydeploy gcp login" in result.output
 
+    @patch("easydeploy.cli.gcp.get_current_project_async", new_callable=AsyncMock)
+    @patch("easydeploy.cli.gcp.ProjectCatalog")
+    @patch("easydeploy.cli.gcp.is_authenticated_async", new_callable=AsyncMock)
+    def test_list_projects_command(self, mock_is_auth, mock_catalog, mock_current):
+        """Test list-projects marks the current project."""
+        mock_is_auth.return_value = True
+        mock_catalog.return_value.lookup.return_value = [
+            {"project_id": "robo-1", "name": "Robo One"},
+            {"project_id": "robo-2", "name": "Robo Two"},
+        ]
+        mock_current.return_value = "robo-2"
+
+        result = self.runner.invoke(list_projects_cmd)
+
+        assert result.exit_code == 0
+        assert "→ robo-2 (Robo Two)" in result.output
+        assert "✅ Current project: robo-2" in result.output
+
+    @patch("easydeploy.cli.gcp.set_project")
+    @patch("easydeploy.cli.gcp.ProjectCatalog")
+    @patch("easydeploy.cli.gcp.is_authenticated_async", new_callable=AsyncMock)
+    def test_select_project_with_filter(self, mock_is_auth, mock_catalog, mock_set):
+        """Test select-project passes --filter to the catalog and sets the choice."""
+        mock_is_auth.return_value = True
+        mock_catalog.return_value.lookup.return_value = [
+            {"project_id": "robo-sim", "name": "Robo Sim"},
+        ]
+        mock_set.return_value = True
+
+        result = self.runner.invoke(select_project, ["--filter", "robo"], input="1\n")
+
+        assert result.exit_code == 0
+        assert mock_catalog.return_value.lookup.call_args.args[0] == "robo"
+        mock_set.assert_called_once_with("robo-sim")
+
     @patch("easydeploy.cli.gcp.is_authenticated")
     def test_require_gcp_auth_decorator_authenticated(self, mock_is_auth):
         """Test require_gcp_auth decorator when authenticated."""
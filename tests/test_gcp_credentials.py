@@ -0,0 +1,99 @@
+"""Tests for the in-process GCP credential provider."""
+
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+
+import pytest
+
+from easydeploy.cloud.gcp.credentials import CredentialProvider
+
+
+@pytest.fixture
+def gcloud_dir(tmp_path, monkeypatch):
+    """Create a minimal gcloud configuration directory."""
+    for name in (
+        "CLOUDSDK_CONFIG",
+        "CLOUDSDK_ACTIVE_CONFIG_NAME",
+        "CLOUDSDK_CORE_PROJECT",
+        "CLOUDSDK_CORE_ACCOUNT",
+        "GOOGLE_APPLICATION_CREDENTIALS",
+    ):
+        monkeypatch.delenv(name, raising=False)
+
+    (tmp_path / "configurations").mkdir()
+    (tmp_path / "active_config").write_text("work\n")
+    (tmp_path / "configurations" / "config_work").write_text(
+        "[core]\naccount = dev@example.com\nproject = robo-sim\n"
+    )
+    return tmp_path
+
+
+def write_access_token(config_dir, expiry):
+    """Store an access token the way gcloud does."""
+    with sqlite3.connect(config_dir / "access_tokens.db") as conn:
+        conn.execute(
+            "CREATE TABLE access_tokens (account_id TEXT PRIMARY KEY, access_token TEXT, "
+            "token_expiry TIMESTAMP, rapt_token TEXT, id_token TEXT)"
+        )
+        conn.execute(
+            "INSERT INTO access_tokens VALUES (?, ?, ?, NULL, NULL)",
+            ("dev@example.com", "ya29.cached", expiry.strftime("%Y-%m-%d %H:%M:%S.%f")),
+        )
+
+
+class TestCredentialProvider:
+    """Test cases for CredentialProvider."""
+
+    def test_reads_active_configuration(self, gcloud_dir):
+        """Test account and project come from the active configuration file."""
+        provider = CredentialProvider(str(gcloud_dir))
+
+        assert provider.active_configuration() == "work"
+        assert provider.get_account() == "dev@example.com"
+        assert provider.get_project() == "robo-sim"
+
+    def test_environment_overrides_project(self, gcloud_dir, monkeypatch):
+        """Test CLOUDSDK_CORE_PROJECT wins over the configuration file."""
+        monkeypatch.setenv("CLOUDSDK_CORE_PROJECT", "override")
+
+        assert CredentialProvider(str(gcloud_dir)).get_project() == "override"
+
+    @patch("subprocess.run")
+    def test_session_from_cached_token(self, mock_run, gcloud_dir):
+        """Test a valid gcloud-cached token is used without refreshing."""
+        expiry = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=1)
+        write_access_token(gcloud_dir, expiry)
+
+        session = CredentialProvider(str(gcloud_dir)).get_session(min_expiry=time.time())
+
+        assert session["access_token"] == "ya29.cached"
+        assert session["project"] == "robo-sim"
+        assert session["expiry"] > time.time()
+        mock_run.assert_not_called()
+
+    def test_expired_token_is_refreshed(self, gcloud_dir):
+        """Test stored account credentials are refreshed in-process."""
+        write_access_token(gcloud_dir, datetime(2000, 1, 1))
+        provider = CredentialProvider(str(gcloud_dir))
+        expiry = time.time() + 3600
+
+        with (
+            patch.object(provider, "load_account_credentials", return_value=Mock()),
+            patch.object(provider, "refresh", return_value=("ya29.fresh", expiry)),
+        ):
+            session = provider.get_session(min_expiry=time.time())
+
+        assert session["access_token"] == "ya29.fresh"
+
+    def test_no_session_without_credentials(self, gcloud_dir):
+        """Test None is returned when nothing can be resolved in-process."""
+        assert CredentialProvider(str(gcloud_dir)).get_session() is None
+
+    def test_missing_config_dir_is_unavailable(self, tmp_path):
+        """Test a provider without a gcloud directory defers to gcloud."""
+        provider = CredentialProvider(str(tmp_path / "missing"))
+
+        assert provider.available is False
+        assert provider.get_session() is None
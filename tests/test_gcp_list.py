@@ -0,0 +1,147 @@
+"""Tests for streaming GCP instance listing."""
+
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from click.testing import CliRunner
+from google.cloud import compute_v1
+
+from easydeploy.cli.main import main
+from easydeploy.cloud.gcp.compute import GCPManager, label_filter
+
+
+def fake_instance(name, zone="us-central1-a", status="RUNNING"):
+    """Build a Compute Instance as aggregatedList returns it."""
+    return compute_v1.Instance(
+        name=name,
+        zone=f"https://www.googleapis.com/compute/v1/projects/robo-sim/zones/{zone}",
+        status=status,
+        machine_type=f"zones/{zone}/machineTypes/n1-standard-4",
+        labels={"easydeploy": "true", "deployment": name},
+        network_interfaces=[
+            compute_v1.NetworkInterface(
+                network_i_p="10.0.0.2",
+                access_configs=[compute_v1.AccessConfig(nat_i_p="34.1.2.3")],
+            )
+        ],
+    )
+
+
+class FakePager:
+    """aggregatedList pager that records how many pages have been fetched."""
+
+    def __init__(self, pages):
+        self._pages = pages
+        self.fetched = 0
+
+    @property
+    def pages(self):
+        for page in self._pages:
+            self.fetched += 1
+            yield SimpleNamespace(
+                items={
+                    f"zones/{zone}": compute_v1.InstancesScopedList(instances=instances)
+                    for zone, instances in page.items()
+                }
+            )
+
+
+def manager_with(pager):
+    manager = GCPManager("robo-sim")
+    manager._compute_client = Mock()
+    manager._compute_client.aggregated_list.return_value = pager
+    return manager
+
+
+class TestListInstances:
+    """Test cases for GCPManager.list_instances."""
+
+    def test_filters_by_labels_server_side(self):
+        """Test the aggregatedList request carries the easyDeploy label filter."""
+        manager = manager_with(FakePager([]))
+
+        assert list(manager.list_instances(labels={"fleet": "workers"}, page_size=50)) == []
+
+        request = manager._compute_client.aggregated_list.call_args.kwargs["request"]
+        assert request.project == "robo-sim"
+        assert request.max_results == 50
+        assert request.filter == '(labels.easydeploy = "true") (labels.fleet = "workers")'
+
+    def test_firewalls_filtered_by_prefix_server_side(self):
+        """Test list_firewalls asks Compute for the prefix instead of listing every rule."""
+        manager = GCPManager("robo-sim")
+        manager._firewalls_client = Mock()
+        manager._firewalls_client.list.return_value = [
+            compute_v1.Firewall(name="lr-sweep-ssh", target_tags=["lr-sweep"])
+        ]
+
+        rules = list(manager.list_firewalls(prefix="lr-sweep"))
+
+        request = manager._firewalls_client.list.call_args.kwargs["request"]
+        assert (request.project, request.filter) == ("robo-sim", 'name eq "lr-sweep.*"')
+        assert [rule["name"] for rule in rules] == ["lr-sweep-ssh"]
+        list(manager.list_firewalls())
+        assert manager._firewalls_client.list.call_args.kwargs["request"].filter == ""
+
+    def test_yields_page_by_page(self):
+        """Test instances stream lazily, across zones, one page at a time."""
+        pager = FakePager(
+            [
+                {"us-central1-a": [fake_instance("w-001")], "europe-west4-b": []},
+                {"europe-west4-b": [fake_instance("w-002", zone="europe-west4-b")]},
+            ]
+        )
+        instances = manager_with(pager).list_instances()
+
+        first = next(instances)
+        assert pager.fetched == 1
+        assert first == {
+            "name": "w-001",
+            "zone": "us-central1-a",
+            "status": "RUNNING",
+            "machine_type": "n1-standard-4",
+            "gpu_enabled": False,
+            "gpu_type": None,
+            "gpu_count": 0,
+            "labels": {"easydeploy": "true", "deployment": "w-001"},
+            "label_fingerprint": "",
+            "tags": [],
+            "internal_ip": "10.0.0.2",
+            "external_ip": "34.1.2.3",
+            "created_at": "",
+        }
+
+        rest = list(instances)
+        assert pager.fetched == 2
+        assert [(i["name"], i["zone"]) for i in rest] == [("w-002", "europe-west4-b")]
+
+    def test_label_filter_is_stable(self):
+        """Test filter terms are sorted so equal selectors give equal filters."""
+        assert label_filter({"b": "2", "a": "1"}) == '(labels.a = "1") (labels.b = "2")'
+
+
+class TestListLiveCommand:
+    """Test cases for `easydeploy list --live`."""
+
+    def test_streams_rows(self):
+        """Test rows are printed from the generator with fleet/status filters applied."""
+        manager = Mock(project_id="robo-sim")
+        manager.list_instances.return_value = iter(
+            [
+                {"name": "w-001", "zone": "us-central1-a", "machine_type": "n1-standard-4",
+                 "status": "RUNNING", "external_ip": "34.1.2.3"},
+                {"name": "w-002", "zone": "us-central1-a", "machine_type": "n1-standard-4",
+                 "status": "STOPPING", "external_ip": ""},
+            ]
+        )  # fmt: skip
+
+        with patch("easydeploy.cli.main._gcp_manager", return_value=manager):
+            result = CliRunner().invoke(
+                main, ["list", "--live", "--fleet", "w", "--status", "running"]
+            )
+
+        assert result.exit_code == 0
+        assert "w-001" in result.output
+        assert "34.1.2.3" in result.output
+        assert "w-002" not in result.output
+        manager.list_instances.assert_called_once_with(labels={"fleet": "w"})
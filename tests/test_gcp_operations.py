@@ -0,0 +1,124 @@
+"""Tests for Compute operation tracking."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from easydeploy.cloud.gcp import operations
+from easydeploy.cloud.gcp.operations import OperationTracker
+from easydeploy.deploy.fleet import FleetDeployer
+
+
+def fake_operation(status, errors=()):
+    """Build a fake Compute Operation."""
+    return SimpleNamespace(
+        status=SimpleNamespace(name=status), error=SimpleNamespace(errors=list(errors))
+    )
+
+
+class FakeOperationsClient:
+    """Fake ZoneOperationsClient whose wait() long-polls for a fixed time."""
+
+    def __init__(self, delay=0.2, responses=None):
+        self.delay = delay
+        self.responses = responses or {}
+        self.calls = []
+
+    def wait(self, project, zone, operation):
+        self.calls.append(operation)
+        time.sleep(self.delay)
+        queue = self.responses.get(operation)
+        return queue.pop(0) if queue else fake_operation("DONE")
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    """Shrink the polling backoff so retries are quick."""
+    monkeypatch.setattr(operations, "POLL_INITIAL_DELAY", 0.01)
+
+
+class TestOperationTracker:
+    """Test cases for OperationTracker."""
+
+    def test_waits_on_many_operations_concurrently(self):
+        """Test 20 operations finish in about the time of one."""
+        tracker = OperationTracker(FakeOperationsClient(delay=0.2))
+
+        start = time.perf_counter()
+        futures = [tracker.track("p", "us-central1-a", f"op-{i}") for i in range(20)]
+        results = [future.result() for future in futures]
+
+        assert time.perf_counter() - start < 1.0
+        assert {r["status"] for r in results} == {"DONE"}
+        tracker.shutdown()
+
+    def test_retries_until_done_and_reports_errors(self):
+        """Test unfinished or failing waits are retried, and errors are surfaced."""
+        error = SimpleNamespace(code="QUOTA_EXCEEDED", message="GPUS_ALL_REGIONS")
+        client = FakeOperationsClient(
+            delay=0,
+            responses={"op-1": [fake_operation("RUNNING"), fake_operation("DONE", [error])]},
+        )
+        client.wait = Mock(side_effect=[RuntimeError("503"), *client.responses["op-1"]])
+        tracker = OperationTracker(client)
+
+        result = tracker.track("p", "z", "op-1").result()
+
+        assert result["status"] == "FAILED"
+        assert "QUOTA_EXCEEDED" in result["error"]
+        assert client.wait.call_count == 3
+
+    def test_tracking_is_deduplicated(self):
+        """Test the same operation maps to one future while it is in flight."""
+        tracker = OperationTracker(FakeOperationsClient(delay=0.2))
+
+        assert tracker.track("p", "z", "op") is tracker.track("p", "z", "op")
+
+    def test_finished_operations_forgotten(self):
+        """Test a long-lived tracker keeps no futures of finished operations."""
+        tracker = OperationTracker(FakeOperationsClient(delay=0))
+
+        futures = [tracker.track("p", "z", f"op-{i}") for i in range(50)]
+        assert {future.result()["status"] for future in futures} == {"DONE"}
+        assert tracker.track("p", "z", "op-0").result()["status"] == "DONE"
+        # Joins the workers, which drop each future once it has resolved
+        tracker.shutdown()
+
+        assert tracker._futures == {}
+
+    def test_wait_async(self):
+        """Test operations can be awaited from asyncio."""
+        tracker = OperationTracker(FakeOperationsClient(delay=0.1))
+
+        async def wait_all():
+            return await asyncio.gather(
+                tracker.wait_async("p", "z", "a"), tracker.wait_async("p", "z", "b")
+            )
+
+        assert [r["operation"] for r in asyncio.run(wait_all())] == ["a", "b"]
+
+    def test_timeout(self):
+        """Test an operation that never finishes is reported as timed out."""
+        client = Mock()
+        client.wait.return_value = fake_operation("RUNNING")
+        tracker = OperationTracker(client, timeout=0.1)
+
+        assert tracker.track("p", "z", "op").result()["status"] == "TIMEOUT"
+
+    def test_fleet_wait_shares_bulk_operation(self):
+        """Test members of one bulkInsert wait on a single operation."""
+        tracker = OperationTracker(FakeOperationsClient(delay=0))
+        manager = Mock()
+        manager.track.side_effect = lambda r: tracker.track("p", r["zone"], r["operation"])
+        results = [
+            {"name": f"w-{i}", "status": "creating", "zone": "z", "operation": "bulk"}
+            for i in range(5)
+        ]
+
+        FleetDeployer(manager).wait(results)
+
+        assert manager.track.call_count == 1
+        assert {r["status"] for r in results} == {"running"}
@@ -0,0 +1,86 @@
+"""Tests for the local GCP project catalog."""
+
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from easydeploy.cloud.gcp.projects import ProjectCatalog
+
+PROJECTS = [
+    ("robotics-sim", "Robotics Simulation"),
+    ("ml-robo-train", "Training"),
+    ("r-o-b-o-legacy", "Legacy"),
+    ("billing", "Billing"),
+]
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    """Create a catalog populated from a fake gcloud listing."""
+    catalog = ProjectCatalog(str(tmp_path / "gcp-projects.tsv"))
+    with patch(
+        "easydeploy.cloud.gcp.projects._stream_gcloud_projects", return_value=iter(PROJECTS)
+    ):
+        assert catalog.refresh() == len(PROJECTS)
+    return catalog
+
+
+class TestProjectCatalog:
+    """Test cases for ProjectCatalog."""
+
+    def test_search_ranks_prefix_substring_fuzzy(self, catalog):
+        """Test prefix matches come first, then substring, then fuzzy."""
+        ids = [p["project_id"] for p in catalog.search("robo")]
+
+        assert ids == ["robotics-sim", "ml-robo-train", "r-o-b-o-legacy"]
+
+    def test_search_limit(self, catalog):
+        """Test limit keeps only the best matches."""
+        assert [p["project_id"] for p in catalog.search("robo", limit=1)] == ["robotics-sim"]
+        assert len(catalog.search(limit=2)) == 2
+
+    def test_failed_refresh_keeps_existing_catalog(self, catalog):
+        """Test a failing gcloud leaves the previous catalog in place."""
+        with patch(
+            "easydeploy.cloud.gcp.projects._stream_gcloud_projects",
+            side_effect=FileNotFoundError,
+        ):
+            assert catalog.refresh() == -1
+
+        assert len(catalog.search()) == len(PROJECTS)
+
+    def test_stale_catalog_is_served_while_revalidating(self, catalog):
+        """Test a stale catalog answers immediately and refreshes in the background."""
+        old = time.time() - catalog.ttl - 1
+        os.utime(catalog.path, (old, old))
+
+        with (
+            patch.object(catalog, "refresh") as mock_refresh,
+            patch.object(catalog, "refresh_in_background") as mock_background,
+        ):
+            results = catalog.lookup("billing")
+
+        assert [p["project_id"] for p in results] == ["billing"]
+        mock_refresh.assert_not_called()
+        mock_background.assert_called_once()
+
+    def test_missing_catalog_refreshes_synchronously(self, tmp_path):
+        """Test the first lookup fetches the catalog before answering."""
+        catalog = ProjectCatalog(str(tmp_path / "gcp-projects.tsv"))
+
+        with patch(
+            "easydeploy.cloud.gcp.projects._stream_gcloud_projects", return_value=iter(PROJECTS)
+        ):
+            results = catalog.lookup("bill")
+
+        assert [p["project_id"] for p in results] == ["billing"]
+
+    def test_background_refresh_is_single_flight(self, catalog):
+        """Test a second background refresh is skipped while one holds the lock."""
+        with patch("subprocess.Popen") as mock_popen:
+            assert catalog.refresh_in_background() is True
+            assert catalog.refresh_in_background() is False
+
+        mock_popen.assert_called_once()
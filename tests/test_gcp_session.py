@@ -0,0 +1,117 @@
+"""Tests for the cached GCP authentication session."""
+
+import json
+import subprocess
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from easydeploy.cloud.gcp import auth
+
+
+@pytest.fixture(autouse=True)
+def isolated_home(tmp_path, monkeypatch):
+    """Point the token cache at a temporary home directory."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv("CLOUDSDK_CONFIG", raising=False)
+    monkeypatch.delenv("GOOGLE_APPLICATION_CREDENTIALS", raising=False)
+    monkeypatch.setattr(auth, "_session_memo", None)
+    return tmp_path
+
+
+def config_helper_output(expiry="2099-01-01T00:00:00Z", token="ya29.token"):
+    """Build a fake `gcloud config config-helper --format=json` result."""
+    return Mock(
+        stdout=json.dumps(
+            {
+                "configuration": {
+                    "properties": {"core": {"account": "dev@example.com", "project": "robo-1"}}
+                },
+                "credential": {"access_token": token, "token_expiry": expiry},
+            }
+        )
+    )
+
+
+class TestSessionCache:
+    """Test cases for the on-disk session cache."""
+
+    @patch("subprocess.run")
+    def test_is_authenticated_populates_cache(self, mock_run):
+        """Test the first check forks gcloud once and caches the session."""
+        mock_run.return_value = config_helper_output()
+
+        assert auth.is_authenticated() is True
+        assert auth.is_authenticated() is True
+
+        mock_run.assert_called_once()
+        session = auth.load_session()
+        assert session["access_token"] == "ya29.token"
+        assert session["account"] == "dev@example.com"
+
+    @patch("subprocess.run")
+    def test_expired_session_is_refetched(self, mock_run):
+        """Test a session inside the expiry skew is treated as missing."""
+        auth.save_session("old", time.time() + 5, "dev@example.com")
+        mock_run.return_value = config_helper_output()
+
+        assert auth.is_authenticated() is True
+        mock_run.assert_called_once()
+
+    @patch("subprocess.run")
+    def test_is_authenticated_false_without_credentials(self, mock_run):
+        """Test no session is cached when gcloud fails."""
+        mock_run.side_effect = subprocess.CalledProcessError(1, "gcloud")
+
+        assert auth.is_authenticated() is False
+        assert auth.load_session() is None
+
+    @patch("subprocess.run")
+    def test_get_current_project_uses_cache(self, mock_run):
+        """Test the cached project avoids a gcloud call."""
+        auth.save_session("token", time.time() + 3600, "dev@example.com", "robo-1")
+
+        assert auth.get_current_project() == "robo-1"
+        mock_run.assert_not_called()
+
+    @patch("subprocess.run")
+    def test_gcloud_config_project_wins_over_cache(self, mock_run, isolated_home):
+        """Test a project set with gcloud since the session was cached is used."""
+        auth.save_session("token", time.time() + 3600, "dev@example.com", "robo-1")
+        config = isolated_home / ".config" / "gcloud" / "configurations"
+        config.mkdir(parents=True)
+        (config / "config_default").write_text("[core]\nproject = robo-2\n")
+
+        assert auth.get_current_project() == "robo-2"
+        mock_run.assert_not_called()
+
+    @patch("subprocess.run")
+    def test_async_check_refetches_rejected_token(self, mock_run, monkeypatch):
+        """Test the async check, like the sync one, forces a refresh past a rejected token."""
+        from easydeploy.cloud.gcp import credentials
+
+        monkeypatch.setattr(credentials, "_rejected_tokens", {"ya29.revoked"})
+        mock_run.side_effect = [
+            config_helper_output(token="ya29.revoked"),
+            config_helper_output(token="ya29.fresh"),
+        ]
+
+        assert auth.run_concurrently(auth.is_authenticated_async()) == [True]
+
+        assert "--force-auth-refresh" in mock_run.call_args.args[0]
+        assert auth.load_session()["access_token"] == "ya29.fresh"
+
+    @patch("subprocess.run")
+    def test_set_project_invalidates_cache(self, mock_run):
+        """Test changing project drops the cached session."""
+        auth.save_session("token", time.time() + 3600, "dev@example.com", "robo-1")
+        mock_run.return_value = Mock()
+
+        assert auth.set_project("robo-2") is True
+        assert auth.load_session() is None
+
+    def test_invalidate_session_without_cache(self):
+        """Test invalidating when nothing is cached is a no-op."""
+        auth.invalidate_session()
+        assert auth.load_session() is None
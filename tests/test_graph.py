@@ -0,0 +1,95 @@
+"""Tests for the resource-graph executor."""
+
+import threading
+import time
+
+import pytest
+
+from easydeploy.deploy.graph import ResourceGraph
+
+
+class TestResourceGraph:
+    """Test cases for ResourceGraph."""
+
+    def test_independent_nodes_run_in_parallel(self):
+        """Test 50 firewall rules and 50 disks are created at the same time."""
+        barrier = threading.Barrier(100, timeout=5)
+        graph = ResourceGraph()
+        for index in range(50):
+            graph.add(f"disk:{index}", barrier.wait)
+            graph.add(f"firewall:{index}", barrier.wait)
+
+        results = graph.run(max_workers=100)
+
+        assert {result["status"] for result in results.values()} == {"done"}
+
+    def test_dependencies_run_first(self):
+        """Test a node starts only after its dependencies have finished."""
+        order = []
+        graph = ResourceGraph()
+        graph.add("disk", lambda: (time.sleep(0.05), order.append("disk")))
+        graph.add("firewall", lambda: order.append("firewall"))
+        graph.add("instance", lambda: order.append("instance"), deps=["disk"])
+
+        graph.run(max_workers=4)
+
+        assert order.index("instance") > order.index("disk")
+        assert order[0] == "firewall"
+
+    def test_failure_cancels_dependents(self):
+        """Test dependents of a failed node never run while unrelated nodes do."""
+        ran = []
+
+        def fail():
+            raise RuntimeError("quota exceeded")
+
+        graph = ResourceGraph()
+        graph.add("disk", fail)
+        graph.add("instance", lambda: ran.append("instance"), deps=["disk"])
+        graph.add("ssh", lambda: ran.append("ssh"), deps=["instance"])
+        graph.add("firewall", lambda: ran.append("firewall"))
+
+        results = graph.run()
+
+        assert ran == ["firewall"]
+        assert results["disk"] == {
+            "status": "failed",
+            "result": None,
+            "error": "quota exceeded",
+            "elapsed": None,
+        }
+        assert results["instance"]["status"] == "cancelled"
+        assert results["ssh"]["status"] == "cancelled"
+        assert results["firewall"]["status"] == "done"
+
+    def test_workers_are_bounded(self):
+        """Test no more than max_workers nodes run at once."""
+        lock = threading.Lock()
+        active = peak = 0
+
+        def work():
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+
+        graph = ResourceGraph()
+        for index in range(20):
+            graph.add(str(index), work)
+
+        graph.run(max_workers=3)
+
+        assert peak <= 3
+
+    def test_dependencies_must_exist(self):
+        """Test nodes must be added after their dependencies."""
+        graph = ResourceGraph()
+        graph.add("disk", lambda: None)
+
+        with pytest.raises(ValueError, match="unknown node"):
+            graph.add("instance", lambda: None, deps=["nic"])
+        with pytest.raises(ValueError, match="Duplicate"):
+            graph.add("disk", lambda: None)
@@ -0,0 +1,249 @@
+"""Tests for golden image building and selection."""
+
+from concurrent.futures import Future
+from unittest.mock import patch
+
+import pytest
+
+from easydeploy.cloud.gcp.compute import build_instance
+from easydeploy.config.settings import Settings
+from easydeploy.deploy.images import ImageBuilder, image_key, image_labels
+from easydeploy.remote.readiness import READY_MARKER
+
+BUNDLE = {"sha256": "ab" * 32, "url": "gs://bucket/bundle-ab.tar.gz"}
+BASE_PARAMS = {
+    "project_id": "robo-sim",
+    "zone": "us-central1-a",
+    "machine_type": "n1-standard-4",
+    "ssh_port": 22,
+    "deploy_user": "robot",
+}
+
+
+def done(**extra):
+    future = Future()
+    future.set_result({"status": "DONE", "error": None, **extra})
+    return future
+
+
+class FakeManager:
+    """GCPManager stand-in recording the calls an image build makes."""
+
+    def __init__(self, images=()):
+        self.images = list(images)
+        self.calls = []
+
+    def list_images(self, labels=None):
+        return [
+            image
+            for image in self.images
+            if all(image["labels"].get(k) == v for k, v in (labels or {}).items())
+        ]
+
+    def create_instance(self, name, **kwargs):
+        self.calls.append(("create", name))
+        self.spec = kwargs["spec"]
+        return {"name": name, "zone": kwargs["zone"], "operation": "op-create"}
+
+    def track(self, result):
+        return done()
+
+    def instance_address(self, name, zone=None):
+        return "10.0.0.2"
+
+    def host_keys(self, name, zone=None):
+        return []
+
+    def stop_instance(self, name, zone=None):
+        self.calls.append(("stop", name))
+        return {"name": name, "zone": zone, "operation": "op-stop"}
+
+    def destroy_instance(self, name, zone=None):
+        self.calls.append(("destroy", name))
+        return {"name": name, "zone": zone, "operation": "op-delete"}
+
+    def create_image(self, name, source_disk, family=None, labels=None):
+        self.calls.append(("image", name, source_disk, family))
+        image = {"name": name, "labels": labels, "status": "READY", "created_at": "9",
+                 "self_link": f"projects/robo-sim/global/images/{name}"}  # fmt: skip
+        self.images.append(image)
+        return image
+
+    def delete_image(self, name):
+        self.calls.append(("delete-image", name))
+
+
+class FakeWaiter:
+    status = "ready"
+
+    def __init__(self, **kwargs):
+        pass
+
+    def track(self, name, host, host_keys=None):
+        return done(status=self.status, stage="marker", error="timed out", host=host())
+
+    def shutdown(self, wait=True):
+        pass
+
+
+class FakePool:
+    """SSHPool stand-in recording the commands run on the builder."""
+
+    def __init__(self, manager, exit_code=0):
+        self.manager = manager
+        self.exit_code = exit_code
+
+    def __call__(self, **kwargs):
+        return self
+
+    def run(self, address, command, host_keys=None):
+        self.manager.calls.append(("scrub", address, command))
+        return self.exit_code
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+@pytest.fixture
+def settings(tmp_path):
+    return Settings(config_path=tmp_path / "config.yaml", project_config_path=tmp_path / "p.yaml")
+
+
+def golden(name, key, variant="cpu", created_at="1"):
+    return {"name": name, "status": "READY", "created_at": created_at,
+            "labels": {"easydeploy-image": "true", "easydeploy-key": key, "variant": variant},
+            "self_link": f"projects/robo-sim/global/images/{name}"}  # fmt: skip
+
+
+class TestImageKey:
+    """Test cases for golden image keys."""
+
+    def test_key_tracks_software_stack(self, settings):
+        """Test the key changes with software versions, the bundle and the variant only."""
+        key = image_key("bundle-1", False, settings)
+
+        assert image_key("bundle-1", False, settings) == key
+        assert image_key("bundle-2", False, settings) != key
+        assert image_key("bundle-1", True, settings) != key
+        settings.override("software.ros_version", "jazzy")
+        assert image_key("bundle-1", False, settings) != key
+
+    def test_labels_are_valid(self, settings):
+        """Test version labels are sanitized for GCP (no dots)."""
+        labels = image_labels("k", True, settings)
+
+        assert labels["cuda"] == "12_0"
+        assert labels["python"] == "3_11"
+        assert labels["ros"] == "humble"
+        assert labels["variant"] == "gpu"
+
+
+class TestImageBuilder:
+    """Test cases for ImageBuilder."""
+
+    def test_reuses_matching_image(self, settings):
+        """Test no builder instance is created when the key already has an image."""
+        key = image_key(BUNDLE["sha256"], False, settings)
+        manager = FakeManager([golden("easydeploy-cached", key)])
+
+        result = ImageBuilder(manager, settings).build(BUNDLE, BASE_PARAMS)
+
+        assert result["cached"] is True
+        assert result["name"] == "easydeploy-cached"
+        assert manager.calls == []
+
+    def test_build_steps(self, settings):
+        """Test a build provisions, stops, images and deletes the builder, in order."""
+        manager = FakeManager()
+        with (
+            patch("easydeploy.remote.readiness.ReadinessWaiter", FakeWaiter),
+            patch("easydeploy.remote.ssh.SSHPool", FakePool(manager)),
+        ):
+            result = ImageBuilder(manager, settings).build(BUNDLE, BASE_PARAMS, gpu=True)
+
+        builder = f"easydeploy-build-{result['key'][:12]}"
+        assert [call[0] for call in manager.calls] == [
+            "create",
+            "scrub",
+            "stop",
+            "image",
+            "destroy",
+        ]
+        assert manager.calls[3] == (
+            "image",
+            f"easydeploy-{result['key']}",
+            f"zones/us-central1-a/disks/{builder}",
+            "easydeploy-golden-gpu",
+        )
+        assert result["cached"] is False
+        # Neither the ready marker nor the builder's host keys end up in the image
+        _, address, command = manager.calls[1]
+        assert address == "10.0.0.2"
+        assert READY_MARKER in command and "/etc/ssh/ssh_host_*" in command
+        # The builder boots the stock image and runs the bundle
+        assert "image" not in manager.spec["instance"]["boot_disk"]
+        assert BUNDLE["url"] in manager.spec["instance"]["metadata"]["startup-script"]
+
+    def test_builder_deleted_on_failure(self, settings):
+        """Test a provisioning timeout still deletes the builder instance."""
+        manager = FakeManager()
+
+        class TimedOut(FakeWaiter):
+            status = "timeout"
+
+        with patch("easydeploy.remote.readiness.ReadinessWaiter", TimedOut):
+            with pytest.raises(RuntimeError, match="never finished provisioning"):
+                ImageBuilder(manager, settings).build(BUNDLE, BASE_PARAMS)
+
+        assert [call[0] for call in manager.calls] == ["create", "destroy"]
+
+    def test_not_imaged_if_cleanup_fails(self, settings):
+        """Test a builder whose marker and host keys could not be removed is never imaged."""
+        manager = FakeManager()
+
+        with (
+            patch("easydeploy.remote.readiness.ReadinessWaiter", FakeWaiter),
+            patch("easydeploy.remote.ssh.SSHPool", FakePool(manager, exit_code=1)),
+        ):
+            with pytest.raises(RuntimeError, match="Cleaning up the builder failed"):
+                ImageBuilder(manager, settings).build(BUNDLE, BASE_PARAMS)
+
+        assert [call[0] for call in manager.calls] == ["create", "scrub", "destroy"]
+
+    def test_gc_keeps_newest_per_variant(self, settings):
+        """Test superseded images are deleted, newest kept per CPU/GPU variant."""
+        manager = FakeManager(
+            [
+                golden("cpu-old", "a", created_at="1"),
+                golden("cpu-mid", "b", created_at="2"),
+                golden("cpu-new", "c", created_at="3"),
+                golden("gpu-only", "d", variant="gpu", created_at="1"),
+            ]
+        )
+        builder = ImageBuilder(manager, settings)
+
+        assert builder.gc(keep=2, dry_run=True) == ["cpu-old"]
+        assert manager.calls == []
+        assert builder.gc(keep=1) == ["cpu-mid", "cpu-old"]
+        assert manager.calls == [("delete-image", "cpu-mid"), ("delete-image", "cpu-old")]
+
+
+def test_instance_boots_golden_image():
+    """Test a spec naming an image boots from it instead of the Ubuntu family."""
+    spec = {
+        "instance": {
+            "name": "w-001",
+            "zone": "us-central1-a",
+            "machine_type": "n1-standard-4",
+            "boot_disk": {"image": "projects/robo-sim/global/images/easydeploy-abc"},
+        }
+    }
+
+    instance = build_instance(spec)
+
+    assert instance.disks[0].initialize_params.source_image == (
+        "projects/robo-sim/global/images/easydeploy-abc"
+    )
@@ -0,0 +1,135 @@
+"""Tests for queue-based logging, the NDJSON sink and per-host rate limiting."""
+
+import json
+import logging
+import threading
+import time
+
+import pytest
+
+from easydeploy.utils.logging import (
+    HostRateLimitHandler,
+    setup_logging,
+    shutdown_logging,
+)
+
+
+class ListHandler(logging.Handler):
+    """Collects the messages it handles."""
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def record(message, host=None, level=logging.INFO):
+    """A log record, optionally for a host."""
+    extra = {"host": host} if host else {}
+    return logging.makeLogRecord({"msg": message, "levelno": level, **extra})
+
+
+@pytest.fixture
+def configured():
+    """Stop the logging listener after the test."""
+    yield
+    shutdown_logging()
+
+
+class TestHostRateLimitHandler:
+    """Test cases for per-host console summaries."""
+
+    def test_flood_is_summarized(self):
+        """Test records over the burst are replaced by one summary per host."""
+        target = ListHandler()
+        handler = HostRateLimitHandler(target, burst=2, interval=60)
+
+        for i in range(5):
+            handler.handle(record(f"w-001 step {i}", host="w-001"))
+        handler.handle(record("w-002 step 0", host="w-002"))
+        handler.handle(record("w-001 broke", host="w-001", level=logging.WARNING))
+        handler.handle(record("Listing GCP instances"))
+        handler.flush()
+
+        assert target.messages == [
+            "w-001 step 0",
+            "w-001 step 1",
+            "w-002 step 0",
+            "w-001 broke",
+            "Listing GCP instances",
+            "w-001: 3 more messages suppressed (last: w-001 step 4)",
+        ]
+
+    def test_new_window_allows_burst_again(self):
+        """Test a host may log again once its interval has passed."""
+        target = ListHandler()
+        handler = HostRateLimitHandler(target, burst=1, interval=0)
+
+        for i in range(3):
+            handler.handle(record(f"step {i}", host="w-001"))
+
+        assert target.messages == ["step 0", "step 1", "step 2"]
+
+
+def test_json_sink(configured, tmp_path):
+    """Test every easyDeploy record, with its extra fields, lands in the NDJSON file."""
+    path = tmp_path / "logs" / "run.ndjson"
+    setup_logging(json_path=path)
+
+    logger = logging.getLogger("easydeploy.deploy.fleet")
+    for i in range(20):
+        logger.debug(f"Creating w-001 attempt {i}", extra={"host": "w-001"})
+    logger.info("Listing GCP instances")
+    shutdown_logging()
+
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(entries) == 21
+    assert entries[0]["level"] == "DEBUG"
+    assert entries[0]["host"] == "w-001"
+    assert entries[0]["logger"] == "easydeploy.deploy.fleet"
+    assert entries[-1]["message"] == "Listing GCP instances"
+
+
+def test_json_sink_keeps_exceptions(configured, tmp_path):
+    """Test a logged exception reaches the NDJSON file as its own field."""
+    path = tmp_path / "run.ndjson"
+    setup_logging(json_path=path)
+
+    try:
+        raise ValueError("quota exceeded")
+    except ValueError:
+        logging.getLogger("easydeploy").exception("Creating %s failed", "w-001")
+    shutdown_logging()
+
+    [entry] = [json.loads(line) for line in path.read_text().splitlines()]
+    assert entry["message"] == "Creating w-001 failed"
+    assert entry["exception"].startswith("Traceback")
+    assert "ValueError: quota exceeded" in entry["exception"]
+
+
+def test_logging_does_not_wait_for_console(configured, monkeypatch):
+    """Test a slow console does not block the thread that logs."""
+    from rich.logging import RichHandler
+
+    release = threading.Event()
+    monkeypatch.setattr(RichHandler, "emit", lambda self, record: release.wait(5))
+    setup_logging()
+
+    started = time.perf_counter()
+    logging.getLogger("easydeploy").info("rendered later")
+    elapsed = time.perf_counter() - started
+    release.set()
+
+    assert elapsed < 1
+
+
+def test_setup_is_kept_unless_forced(configured, tmp_path):
+    """Test a second setup leaves the first alone unless forced."""
+    setup_logging()
+    setup_logging(json_path=tmp_path / "ignored.ndjson")
+    assert not (tmp_path / "ignored.ndjson").exists()
+
+    setup_logging(json_path=tmp_path / "run.ndjson", force=True)
+    assert (tmp_path / "run.ndjson").exists()
@@ -0,0 +1,315 @@
+"""Tests for the plan/apply engine."""
+
+from concurrent.futures import Future
+
+import pytest
+
+from easydeploy.deploy.plan import apply, diff, plan
+
+BASE_PARAMS = {
+    "project_id": "robo-sim",
+    "zone": "us-central1-a",
+    "machine_type": "n1-standard-4",
+    "ssh_port": 22,
+    "deploy_user": "robot",
+    "ssh_public_key": "",
+    "allowed_ip_ranges": ["0.0.0.0/0"],
+}
+MANIFEST = {"name": "w", "count": 3}
+
+
+def existing(name, machine_type="n1-standard-4", zone="us-central1-a", status="RUNNING"):
+    """Instance as list_instances returns it for a member of fleet "w"."""
+    return {
+        "name": name,
+        "zone": zone,
+        "status": status,
+        "machine_type": machine_type,
+        "gpu_enabled": False,
+        "gpu_type": None,
+        "gpu_count": 0,
+        "labels": {"easydeploy": "true", "deployment": "w", "fleet": "w"},
+        "label_fingerprint": "fp",
+    }
+
+
+def ssh_rule(name="w"):
+    """The SSH rule a deployment's members share."""
+    return {
+        "name": f"{name}-ssh",
+        "direction": "INGRESS",
+        "priority": 1000,
+        "source_ranges": ["0.0.0.0/0"],
+        "target_tags": [name],
+        "allowed": [{"ip_protocol": "tcp", "ports": ["22"]}],
+    }
+
+
+class FakeManager:
+    """GCPManager stand-in with a fixed actual state that records mutations."""
+
+    def __init__(self, instances=(), firewalls=()):
+        self.instances = list(instances)
+        self.firewalls = list(firewalls)
+        self.calls = []
+
+    def list_instances(self, labels=None):
+        return iter(
+            instance
+            for instance in self.instances
+            if all(instance["labels"].get(k) == v for k, v in (labels or {}).items())
+        )
+
+    def list_firewalls(self, prefix=None):
+        return iter(rule for rule in self.firewalls if rule["name"].startswith(prefix or ""))
+
+    def track(self, result):
+        future = Future()
+        future.set_result({"status": "DONE", "error": None})
+        return future
+
+    def __getattr__(self, method):
+        def call(*args, **kwargs):
+            self.calls.append((method, args[0] if args else kwargs))
+            return {"operation": f"op-{method}"}
+
+        return call
+
+
+def converged():
+    names = ["w-001", "w-002", "w-003"]
+    return FakeManager([existing(name) for name in names], [ssh_rule()])
+
+
+class TestPlan:
+    """Test cases for plan."""
+
+    def test_converged_deployment_has_no_actions(self):
+        """Test redeploying an unchanged fleet plans nothing."""
+        actions, _ = plan(converged(), MANIFEST, BASE_PARAMS)
+
+        assert actions == []
+
+    def test_machine_type_change_is_one_update(self):
+        """Test changing one member's machine type touches only that member."""
+        manifest = {**MANIFEST, "members": [None, {"machine_type": "n1-standard-8"}]}
+
+        actions, _ = plan(converged(), manifest, BASE_PARAMS)
+
+        assert len(actions) == 1
+        assert actions[0]["action"] == "update"
+        assert actions[0]["name"] == "w-002"
+        assert actions[0]["changes"] == {"machine_type": ("n1-standard-4", "n1-standard-8")}
+
+    def test_scaling(self):
+        """Test growing a fleet creates members and shrinking it deletes them."""
+        grow, _ = plan(converged(), {**MANIFEST, "count": 4}, BASE_PARAMS)
+        shrink, _ = plan(converged(), {**MANIFEST, "count": 2}, BASE_PARAMS)
+
+        # Members share the fleet's firewall rule, which scaling leaves alone
+        assert [(a["action"], a["kind"], a["name"]) for a in grow] == [
+            ("create", "instance", "w-004")
+        ]
+        assert [(a["action"], a["kind"], a["name"]) for a in shrink] == [
+            ("delete", "instance", "w-003")
+        ]
+
+    def test_zone_change_replaces(self):
+        """Test a zone change recreates the instance instead of updating it."""
+        actions, _ = plan(converged(), {**MANIFEST, "zone": "europe-west4-b"}, BASE_PARAMS)
+
+        assert {action["action"] for action in actions} == {"replace"}
+        assert len(actions) == 3
+
+    def test_unrelated_resources_ignored(self):
+        """Test resources of other deployments sharing the name prefix are left alone."""
+        manager = converged()
+        manager.firewalls.append(ssh_rule("w-other"))
+
+        actions, _ = plan(manager, MANIFEST, BASE_PARAMS)
+
+        assert actions == []
+
+    def test_firewall_drift_is_updated(self):
+        """Test a firewall rule that drifted from the template is patched."""
+        manager = converged()
+        manager.firewalls[0]["source_ranges"] = ["10.0.0.0/8"]
+
+        actions, _ = plan(manager, MANIFEST, BASE_PARAMS)
+
+        assert [(a["action"], a["kind"], a["name"]) for a in actions] == [
+            ("update", "firewall", "w-ssh")
+        ]
+
+
+class TestApply:
+    """Test cases for apply."""
+
+    def test_update_machine_type_of_running_instance(self):
+        """Test a running instance is stopped, resized and started again, nothing else."""
+        manager = converged()
+        manifest = {**MANIFEST, "members": [None, {"machine_type": "n1-standard-8"}]}
+        actions, desired = plan(manager, manifest, BASE_PARAMS)
+
+        results = apply(manager, actions, desired)
+
+        assert [result["status"] for result in results] == ["done"]
+        assert [call[0] for call in manager.calls] == [
+            "stop_instance",
+            "set_machine_type",
+            "start_instance",
+        ]
+
+    def test_disk_before_instance(self):
+        """Test a new member's boot disk is created before the instance that boots it."""
+        manager = converged()
+        actions, desired = plan(manager, {**MANIFEST, "count": 4}, BASE_PARAMS)
+
+        results = apply(manager, actions, desired)
+
+        assert {result["status"] for result in results} == {"done"}
+        calls = [call[0] for call in manager.calls]
+        assert sorted(calls) == ["create_disk", "create_instance"]
+        assert calls.index("create_disk") < calls.index("create_instance")
+        disk_spec = manager.calls[calls.index("create_disk")][1]
+        assert disk_spec["instance"]["boot_disk"]["source"] == "w-004"
+
+    def test_failures_are_reported(self):
+        """Test a failing action is reported without stopping the others."""
+        manager = converged()
+        manager.firewalls.clear()
+        actions, desired = plan(manager, {**MANIFEST, "count": 5}, BASE_PARAMS)
+
+        def track(result):
+            future = Future()
+            if result["operation"] == "op-create_firewall":
+                future.set_exception(RuntimeError("quota exceeded"))
+            else:
+                future.set_result({"status": "DONE", "error": None})
+            return future
+
+        manager.track = track
+        results = apply(manager, actions, desired, concurrency=2)
+
+        statuses = {(r["kind"], r["name"]): (r["status"], r["error"]) for r in results}
+        assert statuses[("instance", "w-004")] == ("done", None)
+        assert statuses[("firewall", "w-ssh")] == ("failed", "quota exceeded")
+
+
+def test_label_changes_merge_with_existing():
+    """Test label updates keep labels set outside easyDeploy."""
+    desired = {
+        "instances": {
+            "w": {
+                "name": "w",
+                "zone": "z",
+                "machine_type": "m",
+                "gpu_type": None,
+                "gpu_count": 0,
+                "labels": {"team": "nav"},
+            }
+        },
+        "firewalls": {},
+    }
+    actual = {
+        "instances": {
+            "w": {**existing("w", machine_type="m", zone="z"), "labels": {"owner": "ops"}}
+        },
+        "firewalls": {},
+    }
+
+    [action] = diff(desired, actual)
+
+    assert action["action"] == "update"
+    assert action["changes"]["labels"][1] == {"owner": "ops", "team": "nav"}
+
+
+@pytest.mark.parametrize("count", [1, 2])
+def test_plan_command(count, monkeypatch):
+    """Test `easydeploy plan` prints the actions without applying them."""
+    from click.testing import CliRunner
+
+    from easydeploy.cli.main import main
+
+    manager = FakeManager()
+    manager.project_id = "robo-sim"
+    monkeypatch.setattr("easydeploy.cli.main._gcp_manager", lambda: manager)
+    monkeypatch.setattr(
+        "easydeploy.cli.main._gcp_base_params",
+        lambda manager, manifest, publish=True: BASE_PARAMS,
+    )
+
+    result = CliRunner().invoke(main, ["plan", "w", "--count", str(count)])
+
+    assert result.exit_code == 0, result.output
+    # One instance per member and the deployment's firewall rule
+    assert f"{count + 1} to create" in result.output
+    assert manager.calls == []
+
+
+def bulk_created(manifest):
+    """Instances as list_instances returns what FleetDeployer's bulkInsert creates."""
+    from unittest.mock import Mock
+
+    from easydeploy.cloud.gcp.compute import _compute_v1, build_instance_properties, instance_info
+    from easydeploy.deploy.fleet import FleetDeployer
+
+    bulk = Mock()
+    bulk.bulk_insert_instances.return_value = {"operation": "op-bulk"}
+    results = FleetDeployer(bulk).deploy(manifest, {**BASE_PARAMS, "gpu_enabled": False})
+    spec, _, _ = bulk.bulk_insert_instances.call_args.args
+    properties = build_instance_properties(spec)
+    compute_v1 = _compute_v1()
+    return [
+        instance_info(
+            compute_v1.Instance(
+                name=result["name"],
+                status="RUNNING",
+                machine_type=properties.machine_type,
+                labels=properties.labels,
+                tags=properties.tags,
+            ),
+            f"zones/{result['zone']}",
+        )
+        for result in results
+    ]
+
+
+def test_deployed_fleet_plans_clean():
+    """Test a bulk-deployed fleet and the rule deploy creates for it plan clean."""
+    from easydeploy.cli.main import _create_firewalls
+
+    instances = bulk_created(MANIFEST)
+    manager = FakeManager(instances)
+
+    created = _create_firewalls(manager, MANIFEST, BASE_PARAMS)
+
+    assert sorted(created) == ["w-ssh"]
+    [rule] = [rule for method, rule in manager.calls if method == "create_firewall"]
+    # The rule reaches every member
+    assert all(set(rule["target_tags"]) <= set(instance["tags"]) for instance in instances)
+    manager.firewalls.append(rule)
+    assert plan(manager, MANIFEST, BASE_PARAMS)[0] == []
+
+
+def test_plan_publishes_nothing(tmp_path, monkeypatch):
+    """Test the bundle plan renders into instances is located but not uploaded."""
+    from easydeploy.cli.main import _gcp_base_params
+    from easydeploy.config import settings as settings_module
+
+    monkeypatch.setattr(settings_module, "_settings", None)
+    monkeypatch.setattr("easydeploy.deploy.bundle.get_bundle_dir", lambda: tmp_path / "built")
+    monkeypatch.setattr("easydeploy.cli.main._golden_image", lambda *args: {})
+    settings_module.get_settings().set("provisioning.bundle_store", str(tmp_path / "store"))
+    manager = FakeManager()
+    manager.project_id = "robo-sim"
+
+    planned = _gcp_base_params(manager, MANIFEST, publish=False)
+
+    assert not (tmp_path / "store").exists() and not (tmp_path / "built").exists()
+    deployed = _gcp_base_params(manager, MANIFEST)
+    assert (planned["bundle_url"], planned["bundle_sha256"]) == (
+        deployed["bundle_url"],
+        deployed["bundle_sha256"],
+    )
+    assert list((tmp_path / "store").iterdir())
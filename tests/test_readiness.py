@@ -0,0 +1,155 @@
+"""Tests for SSH readiness probing against an in-process paramiko server."""
+
+import itertools
+import socket
+import threading
+import time
+
+import pytest
+
+from easydeploy.remote import readiness
+from easydeploy.remote.readiness import ReadinessWaiter
+from tests.sshd import CLIENT_KEY, PUBLISHED_HOST_KEY, USERNAME, FakeSSHD, pin_host_key
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(readiness, "POLL_INITIAL_DELAY", 0.05)
+    monkeypatch.setattr(readiness, "POLL_MAX_DELAY", 0.1)
+
+
+@pytest.fixture
+def known_hosts(tmp_path, monkeypatch):
+    path = tmp_path / "known_hosts"
+    monkeypatch.setattr("easydeploy.remote.ssh.get_known_hosts_path", lambda: path)
+    return path
+
+
+@pytest.fixture
+def sshds(known_hosts):
+    servers = []
+
+    def start(pinned=True):
+        server = FakeSSHD()
+        servers.append(server)
+        if pinned:
+            pin_host_key(known_hosts, server.port)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+@pytest.fixture
+def marker(tmp_path):
+    return tmp_path / "ready"
+
+
+def make_waiter(port, marker, **kwargs):
+    return ReadinessWaiter(
+        username=USERNAME, port=port, pkey=CLIENT_KEY, marker=str(marker), **kwargs
+    )
+
+
+class TestReadinessWaiter:
+    """Test cases for ReadinessWaiter."""
+
+    def test_ready_host(self, sshds, marker):
+        """Test a provisioned host is reported ready on the first attempt."""
+        sshd = sshds()
+        marker.touch()
+        waiter = make_waiter(sshd.port, marker, timeout=5)
+
+        result = waiter.track("w-001", "127.0.0.1").result()
+
+        assert result["status"] == "ready"
+        assert result["host"] == "127.0.0.1"
+        assert result["stage"] == "marker"
+
+    def test_waits_for_marker_on_one_connection(self, sshds, marker):
+        """Test the marker is polled over the same login until provisioning finishes."""
+        sshd = sshds()
+        threading.Timer(0.3, marker.touch).start()
+        waiter = make_waiter(sshd.port, marker, timeout=5)
+
+        result = waiter.track("w-001", "127.0.0.1").result()
+
+        assert result["status"] == "ready"
+        assert result["elapsed"] >= 0.3
+        assert sshd.logins == 1
+
+    def test_host_key_published_late(self, sshds, marker, known_hosts):
+        """Test a new host is probed until its published host key matches, then pinned."""
+        sshd = sshds(pinned=False)
+        marker.touch()
+        # Not yet published, then a forged key, then the real one from then on
+        published = itertools.chain(
+            [[], ["ssh-ed25519 AAAAother"]], itertools.repeat([PUBLISHED_HOST_KEY])
+        )
+        waiter = make_waiter(sshd.port, marker, timeout=5)
+
+        result = waiter.track("w-001", "127.0.0.1", lambda: next(published)).result()
+
+        assert result["status"] == "ready", result
+        assert sshd.logins == 1
+        assert f"[127.0.0.1]:{sshd.port}" in known_hosts.read_text()
+
+    def test_timeout_reports_stage(self, marker):
+        """Test a host that never accepts connections times out at the tcp stage."""
+        with socket.socket() as unused:
+            unused.bind(("127.0.0.1", 0))
+            port = unused.getsockname()[1]
+        waiter = make_waiter(port, marker, timeout=0.3)
+
+        result = waiter.track("w-001", "127.0.0.1").result()
+
+        assert result["status"] == "timeout"
+        assert result["stage"] == "tcp"
+        assert result["error"]
+
+    def test_resolves_address_lazily(self, sshds, marker):
+        """Test a host callable is retried until the instance has an address."""
+        sshd = sshds()
+        marker.touch()
+        addresses = iter(["", "", "127.0.0.1"])
+        waiter = make_waiter(sshd.port, marker, timeout=5)
+
+        result = waiter.track("w-001", lambda: next(addresses)).result()
+
+        assert result["status"] == "ready"
+        assert result["host"] == "127.0.0.1"
+
+    def test_hosts_probed_concurrently(self, sshds, marker, tmp_path):
+        """Test each host is reported as soon as it is ready, independently of the others."""
+        fast, slow = sshds(), sshds()
+        slow_marker = tmp_path / "slow-ready"
+        marker.touch()
+        threading.Timer(0.5, slow_marker.touch).start()
+        # Both servers listen on 127.0.0.1; give each host its own port via separate waiters
+        fast_waiter = make_waiter(fast.port, marker)
+        slow_waiter = make_waiter(slow.port, slow_marker)
+
+        started = time.monotonic()
+        slow_future = slow_waiter.track("slow", "127.0.0.1")
+        fast_result = fast_waiter.track("fast", "127.0.0.1").result()
+        fast_elapsed = time.monotonic() - started
+
+        assert fast_result["status"] == "ready"
+        assert fast_elapsed < 0.5
+        assert slow_future.result()["status"] == "ready"
+
+    def test_wait_all(self, sshds, marker):
+        """Test wait_all reports every host through the progress callback."""
+        sshd = sshds()
+        marker.touch()
+        waiter = make_waiter(sshd.port, marker, timeout=5)
+        seen = []
+
+        results = waiter.wait_all(
+            {f"w-00{i}": "127.0.0.1" for i in range(1, 5)}, progress=seen.append
+        )
+
+        assert sorted(r["name"] for r in results) == ["w-001", "w-002", "w-003", "w-004"]
+        assert all(r["status"] == "ready" for r in results)
+        assert seen == results
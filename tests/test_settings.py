@@ -0,0 +1,110 @@
+"""Tests for layered configuration settings."""
+
+import os
+
+import pytest
+
+from easydeploy.config import settings as settings_module
+from easydeploy.config.settings import Settings
+
+
+@pytest.fixture
+def paths(tmp_path, monkeypatch):
+    """Return user and project config paths with a clean EASYDEPLOY_* environment."""
+    for name in list(os.environ):
+        if name.startswith("EASYDEPLOY_"):
+            monkeypatch.delenv(name)
+    return tmp_path / "config.yaml", tmp_path / "easydeploy.yaml"
+
+
+class TestSettings:
+    """Test cases for Settings."""
+
+    def test_defaults_merged_under_partial_user_file(self, paths):
+        """Test a partial user file keeps the remaining defaults."""
+        user, project = paths
+        user.write_text("cloud:\n  gcp:\n    zone: europe-west4-a\n")
+
+        settings = Settings(user, project)
+
+        assert settings.get("cloud.gcp.zone") == "europe-west4-a"
+        assert settings.get("cloud.gcp.region") == "us-central1"
+        assert settings.get("software.ros_version") == "humble"
+        assert settings.get("cloud.gcp")["zone"] == "europe-west4-a"
+
+    def test_layer_precedence(self, paths, monkeypatch):
+        """Test project file > user file, env > project, overrides > env."""
+        user, project = paths
+        user.write_text("software:\n  ros_version: foxy\n  cuda_version: '11.8'\n")
+        project.write_text("software:\n  ros_version: iron\n")
+        monkeypatch.setenv("EASYDEPLOY_SOFTWARE__CUDA_VERSION", "12.10")
+        monkeypatch.setenv("EASYDEPLOY_CLOUD__GCP__ZONE", "us-east1-b")
+
+        settings = Settings(user, project, overrides={"cloud.gcp.zone": "asia-east1-a"})
+
+        assert settings.get("software.ros_version") == "iron"
+        assert settings.get("software.cuda_version") == "12.10"
+        assert settings.get("cloud.gcp.zone") == "asia-east1-a"
+
+    def test_env_values_typed_by_default(self, paths, monkeypatch):
+        """Test env values are converted only for keys with bool or numeric defaults."""
+        defaults = Settings._default_config
+        monkeypatch.setattr(
+            Settings,
+            "_default_config",
+            lambda self: {**defaults(self), "limits": {"workers": 4, "ratio": 0.5, "on": False}},
+        )
+        for key, value in (
+            ("LIMITS__WORKERS", "16"),
+            ("LIMITS__RATIO", "0.75"),
+            ("LIMITS__ON", "true"),
+            ("SOFTWARE__ROS_VERSION", "2"),
+            ("CLOUD__GCP__PROJECT_ID", "1234"),
+        ):
+            monkeypatch.setenv(f"EASYDEPLOY_{key}", value)
+
+        settings = Settings(*paths)
+
+        assert settings.get("limits") == {"workers": 16, "ratio": 0.75, "on": True}
+        assert settings.get("software.ros_version") == "2"
+        assert settings.get("cloud.gcp.project_id") == "1234"
+
+    def test_missing_key_returns_default(self, paths):
+        """Test unknown keys fall back to the provided default."""
+        settings = Settings(*paths)
+
+        assert settings.get("cloud.gcp.nope", "fallback") == "fallback"
+        assert settings.get("cloud.gcp.zone.deeper") is None
+
+    def test_reload_on_mtime_change(self, paths, monkeypatch):
+        """Test files are re-read only after their mtime changes."""
+        user, project = paths
+        user.write_text("software:\n  ros_version: foxy\n")
+        settings = Settings(user, project)
+        monkeypatch.setattr(settings_module, "RELOAD_CHECK_INTERVAL", 0)
+
+        reads = []
+        original = settings_module._read_yaml
+        monkeypatch.setattr(
+            settings_module, "_read_yaml", lambda path: reads.append(path) or original(path)
+        )
+
+        assert settings.get("software.ros_version") == "foxy"
+        assert reads == []
+
+        user.write_text("software:\n  ros_version: jazzy\n")
+        os.utime(user, (1, 1))
+        assert settings.get("software.ros_version") == "jazzy"
+        assert reads == [user]
+
+    def test_set_and_save_persist_user_layer(self, paths):
+        """Test set() values are saved without the built-in defaults."""
+        user, project = paths
+        settings = Settings(user, project)
+
+        settings.set("cloud.gcp.project_id", "robo-sim")
+        settings.save()
+
+        assert settings.get("cloud.gcp.project_id") == "robo-sim"
+        assert Settings(user, project).get("cloud.gcp.project_id") == "robo-sim"
+        assert "region" not in user.read_text()
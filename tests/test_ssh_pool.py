@@ -0,0 +1,197 @@
+"""Tests for the pooled SSH layer and `easydeploy exec`."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+from click.testing import CliRunner
+
+from easydeploy.cli.main import main
+from easydeploy.deploy.state import StateStore
+from easydeploy.remote.ssh import SSHPool, parse_host_keys
+from tests.sshd import CLIENT_KEY, PUBLISHED_HOST_KEY, USERNAME, FakeSSHD, pin_host_key
+
+
+@pytest.fixture
+def known_hosts(tmp_path, monkeypatch):
+    path = tmp_path / "known_hosts"
+    monkeypatch.setattr("easydeploy.remote.ssh.get_known_hosts_path", lambda: path)
+    return path
+
+
+@pytest.fixture
+def sshd():
+    server = FakeSSHD()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def pinned(sshd, known_hosts):
+    pin_host_key(known_hosts, sshd.port)
+
+
+@pytest.fixture
+def pool(sshd, pinned):
+    with SSHPool(username=USERNAME, port=sshd.port, pkey=CLIENT_KEY, channels_per_host=4) as pool:
+        yield pool
+
+
+class TestSSHPool:
+    """Test cases for SSHPool."""
+
+    def test_run_streams_output_and_exit_code(self, pool):
+        """Test stdout and stderr lines arrive through the callback with the exit code."""
+        lines = []
+
+        exit_code = pool.run(
+            "127.0.0.1",
+            "echo one; echo two; echo oops >&2; printf partial; exit 3",
+            on_output=lambda *line: lines.append(line),
+            name="w-001",
+        )
+
+        assert exit_code == 3
+        assert [line for line in lines if line[1] == "stdout"] == [
+            ("w-001", "stdout", "one"),
+            ("w-001", "stdout", "two"),
+            ("w-001", "stdout", "partial"),
+        ]
+        assert ("w-001", "stderr", "oops") in lines
+
+    def test_commands_share_one_transport(self, pool, sshd):
+        """Test many commands to one host reuse a single login."""
+        results = pool.run_many({f"w-{i}": "127.0.0.1" for i in range(10)}, "true")
+
+        assert [result["exit_code"] for result in results] == [0] * 10
+        assert sshd.logins == 1
+        assert len(sshd.commands) == 10
+
+    def test_reconnects_dead_transport(self, pool, sshd):
+        """Test a dropped connection is replaced on the next command."""
+        pool.run("127.0.0.1", "true")
+        pool.transport("127.0.0.1").close()
+
+        assert pool.run("127.0.0.1", "true") == 0
+        assert sshd.logins == 2
+
+    def test_run_many_reports_failures_per_host(self, pool):
+        """Test unreachable hosts are reported without failing the others."""
+        results = {
+            result["name"]: result
+            for result in pool.run_many({"up": "127.0.0.1", "down": lambda: ""}, "exit 0")
+        }
+
+        assert results["up"]["exit_code"] == 0
+        assert results["down"]["exit_code"] is None
+        assert "no address" in results["down"]["error"]
+
+
+class TestHostKeys:
+    """Test cases for host key verification."""
+
+    def test_unknown_host_key_rejected(self, sshd, known_hosts):
+        """Test a host whose key is neither known nor published is never logged in to."""
+        with SSHPool(username=USERNAME, port=sshd.port, pkey=CLIENT_KEY) as pool:
+            [unverified] = pool.run_many({"w": "127.0.0.1"}, "true")
+            [forged] = pool.run_many(
+                {"w": "127.0.0.1"}, "true", host_keys={"w": lambda: ["ssh-ed25519 AAAAother"]}
+            )
+
+        assert "not known" in unverified["error"]
+        assert "not one the instance published" in forged["error"]
+        assert sshd.logins == 0
+        assert not known_hosts.exists()
+
+    def test_published_host_key_pinned(self, sshd, known_hosts):
+        """Test a published host key is accepted once, then trusted without a lookup."""
+        lookups = []
+
+        def host_keys():
+            lookups.append(1)
+            return [PUBLISHED_HOST_KEY]
+
+        for _ in range(2):
+            with SSHPool(username=USERNAME, port=sshd.port, pkey=CLIENT_KEY) as pool:
+                assert pool.run("127.0.0.1", "true", host_keys=host_keys) == 0
+
+        assert len(lookups) == 1
+
+    def test_parse_console_host_keys(self):
+        """Test the key block cloud-init prints to the serial console is parsed."""
+        output = (
+            "[  12.3] cloud-init[812]: -----BEGIN SSH HOST KEY KEYS-----\n"
+            "[  12.3] cloud-init[812]: ecdsa-sha2-nistp256 AAAAE2V root@w-001\n"
+            "[  12.3] cloud-init[812]: ssh-ed25519 AAAAC3Nz root@w-001\n"
+            "[  12.3] cloud-init[812]: -----END SSH HOST KEY KEYS-----\n"
+        )
+
+        assert parse_host_keys(output) == ["ecdsa-sha2-nistp256 AAAAE2V", "ssh-ed25519 AAAAC3Nz"]
+        assert parse_host_keys("no keys yet") == []
+
+
+class TestExecCommand:
+    """Test cases for `easydeploy exec`."""
+
+    def test_exec_on_fleet(self, tmp_path, sshd, pinned):
+        """Test a fleet selector runs the command on every member with prefixed output."""
+        store = StateStore(tmp_path / "deployments.db")
+        store.upsert_many(
+            {"name": f"w-00{i}", "platform": "gcp", "status": "ready", "fleet": "w",
+             "host": "127.0.0.1"}
+            for i in (1, 2)
+        )  # fmt: skip
+
+        with (
+            patch("easydeploy.deploy.state.StateStore", return_value=store),
+            patch(
+                "easydeploy.remote.ssh.SSHPool",
+                lambda username: SSHPool(username=USERNAME, port=sshd.port, pkey=CLIENT_KEY),
+            ),
+        ):
+            result = CliRunner().invoke(main, ["exec", "w", "--", "echo", "hi;", "exit", "3"])
+
+        assert result.exit_code == 0, result.output
+        assert "w-001 | hi; exit 3" in result.output
+        assert "w-002 | hi; exit 3" in result.output
+        assert "2/2 hosts succeeded" in result.output
+
+    def test_exec_reaches_gcp_instance_in_its_project(self, tmp_path, sshd, known_hosts):
+        """Test an instance without a recorded address is looked up in its own project."""
+        store = StateStore(tmp_path / "deployments.db")
+        store.upsert(
+            {
+                "name": "w",
+                "platform": "gcp",
+                "project": "other-proj",
+                "zone": "us-east1-b",
+                "status": "running",
+            }
+        )
+        manager = Mock()
+        manager.instance_address.return_value = "127.0.0.1"
+        manager.host_keys.return_value = [PUBLISHED_HOST_KEY]
+
+        with (
+            patch("easydeploy.deploy.state.StateStore", return_value=store),
+            patch("easydeploy.cli.main._gcp_manager", return_value=manager) as gcp_manager,
+            patch(
+                "easydeploy.remote.ssh.SSHPool",
+                lambda username: SSHPool(username=USERNAME, port=sshd.port, pkey=CLIENT_KEY),
+            ),
+        ):
+            result = CliRunner().invoke(main, ["exec", "w", "--", "true"])
+
+        assert result.exit_code == 0, result.output
+        gcp_manager.assert_called_once_with("other-proj")
+        manager.host_keys.assert_called_once_with("w", "us-east1-b")
+
+    def test_exec_unknown_selector(self, tmp_path):
+        """Test an unmatched selector fails without connecting anywhere."""
+        with patch(
+            "easydeploy.deploy.state.StateStore",
+            return_value=StateStore(tmp_path / "deployments.db"),
+        ):
+            result = CliRunner().invoke(main, ["exec", "role=sim", "--", "true"])
+
+        assert result.exit_code == 1
+        assert "No deployments match role=sim" in result.output
@@ -0,0 +1,162 @@
+"""Tests for the local deployment state store."""
+
+import multiprocessing
+import sqlite3
+from unittest.mock import Mock
+
+import pytest
+from click.testing import CliRunner
+
+from easydeploy.cli.main import main
+from easydeploy.config import settings as settings_module
+from easydeploy.deploy.fleet import default_instance_params
+from easydeploy.deploy.state import StateStore
+
+
+def record(name, **kwargs):
+    """Build a deployment record with sensible defaults."""
+    return {
+        "name": name,
+        "platform": "gcp",
+        "project": "robo-sim",
+        "zone": "us-central1-a",
+        "machine_type": "n1-standard-4",
+        "status": "running",
+        **kwargs,
+    }
+
+
+def write_records(path, prefix):
+    """Write records from a separate process."""
+    store = StateStore(path)
+    for i in range(20):
+        store.upsert(record(f"{prefix}-{i}"))
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create an empty state store."""
+    return StateStore(tmp_path / "deployments.db")
+
+
+class TestStateStore:
+    """Test cases for StateStore."""
+
+    def test_missing_store_queries_empty_without_creating(self, store):
+        """Test read-only commands do not create the database."""
+        assert store.query() == []
+        assert not store.path.exists()
+
+    def test_upsert_and_query_filters(self, store):
+        """Test indexed filters, including labels, and upserts by name."""
+        store.upsert_many(
+            [
+                record("a", fleet="sweep", labels={"team": "rl", "run": "1"}),
+                record("b", fleet="sweep", labels={"team": "rl", "run": "2"}),
+                record("c", platform="azure", project="sub-1", status="creating"),
+            ]
+        )
+        store.upsert(record("a", fleet="sweep", status="stopped", operation="op-1"))
+
+        assert [r["name"] for r in store.query(fleet="sweep")] == ["a", "b"]
+        assert [r["name"] for r in store.query(labels={"team": "rl", "run": "2"})] == ["b"]
+        assert [r["name"] for r in store.query(platform="azure")] == ["c"]
+        a = store.get("a")
+        assert a["status"] == "stopped"
+        assert a["operation"] == "op-1"
+        assert a["labels"] == {"team": "rl", "run": "1"}
+
+    def test_query_by_age(self, store):
+        """Test created_before selects deployments older than a cutoff."""
+        store.upsert(record("a"))
+        created = store.get("a")["created_at"]
+
+        assert [r["name"] for r in store.query(created_before=created + 1)] == ["a"]
+        assert store.query(created_before=created) == []
+
+    def test_update_status_and_delete(self, store):
+        """Test status updates and deletes, with labels removed too."""
+        store.upsert_many([record("a", labels={"k": "v"}), record("b")])
+
+        assert store.update_status(["a", "b"], "destroying") == 2
+        assert {r["status"] for r in store.query()} == {"destroying"}
+        assert store.delete(["a"]) == 1
+        assert store.query(labels={"k": "v"}) == []
+
+    def test_same_name_in_two_projects(self, store):
+        """Test records are keyed on platform, project and name."""
+        store.upsert_many(
+            [record("a", labels={"k": "1"}), record("a", project="other", labels={"k": "2"})]
+        )
+
+        assert store.get("a", project="other")["labels"] == {"k": "2"}
+        assert store.delete(["a"], platform="gcp", project="other") == 1
+        assert [(r["project"], r["labels"]) for r in store.query()] == [("robo-sim", {"k": "1"})]
+
+    def test_failed_transaction_rolls_back(self, store):
+        """Test a failing batch leaves no partial writes."""
+        with pytest.raises(sqlite3.IntegrityError):
+            store.upsert_many([record("a"), {"name": "b"}])
+
+        assert store.query() == []
+
+    def test_concurrent_processes(self, store):
+        """Test writers in several processes do not lose or corrupt records."""
+        store.upsert(record("seed"))
+        processes = [
+            multiprocessing.Process(target=write_records, args=(store.path, f"p{i}"))
+            for i in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        assert len(store.query()) == 81
+
+
+class TestStateCLI:
+    """Test cases for commands backed by the state store."""
+
+    def test_list_and_destroy_unknown(self, tmp_path, monkeypatch):
+        """Test list reads the store and destroy rejects unknown names."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(settings_module, "_settings", None)
+        StateStore(tmp_path / "state" / "deployments.db").upsert(record("worker-001"))
+        runner = CliRunner()
+
+        result = runner.invoke(main, ["list", "--platform", "gcp"])
+        assert result.exit_code == 0
+        assert "worker-001" in result.output
+
+        result = runner.invoke(main, ["destroy", "nope"])
+        assert result.exit_code == 1
+        assert "No deployment named nope" in result.output
+
+    def test_failed_redeploy_keeps_live_record(self, tmp_path, monkeypatch):
+        """Test redeploying a live name that already exists keeps its record."""
+        from google.api_core.exceptions import Conflict
+
+        monkeypatch.setattr(settings_module, "_settings", None)
+        monkeypatch.setattr(settings_module.get_settings(), "state_dir", tmp_path / "state")
+        store = StateStore(tmp_path / "state" / "deployments.db")
+        store.upsert(record("worker", labels={"team": "rl"}, host="10.0.0.5"))
+        manager = Mock(project_id="robo-sim", platform="gcp")
+        manager.create_instance.side_effect = Conflict("worker already exists")
+        monkeypatch.setattr("easydeploy.cli.main._gcp_manager", lambda: manager)
+        monkeypatch.setattr("easydeploy.cli.main._plan_zones", lambda m, manifest: [])
+        monkeypatch.setattr(
+            "easydeploy.cli.main._gcp_base_params",
+            lambda m, manifest: {**default_instance_params(), "project_id": "robo-sim"},
+        )
+
+        result = CliRunner().invoke(main, ["deploy", "worker", "--no-wait-ready"])
+
+        assert result.exit_code == 1
+        assert "already exists" in result.output
+        kept = store.get("worker")
+        assert (kept["status"], kept["host"], kept["labels"]) == (
+            "running",
+            "10.0.0.5",
+            {"team": "rl"},
+        )
@@ -0,0 +1,208 @@
+"""Tests for bulk teardown and destroy by selector."""
+
+from concurrent.futures import Future
+from unittest.mock import patch
+
+from click.testing import CliRunner
+from google.api_core.exceptions import NotFound
+
+from easydeploy.cli import main as main_module
+from easydeploy.cli.main import main
+from easydeploy.config import settings as settings_module
+from easydeploy.deploy.state import StateStore
+from easydeploy.deploy.teardown import teardown
+
+
+class FakeManager:
+    """GCPManager stand-in recording deletions, some of which fail."""
+
+    def __init__(self, firewalls=(), missing=(), failing=(), instances=()):
+        self.firewalls = [{"name": name} for name in firewalls]
+        self.instances = list(instances)
+        self.missing = set(missing)
+        self.failing = set(failing)
+        self.deleted = []
+
+    def list_firewalls(self, prefix=None):
+        return iter(self.firewalls)
+
+    def list_instances(self, labels=None):
+        return iter(
+            instance
+            for instance in self.instances
+            if all(instance["labels"].get(k) == v for k, v in (labels or {}).items())
+        )
+
+    def _delete(self, name):
+        if name in self.missing:
+            raise NotFound(f"{name} not found")
+        self.deleted.append(name)
+        return {"name": name, "operation": f"op-{name}"}
+
+    def destroy_instance(self, name, zone=None):
+        return self._delete(name)
+
+    def delete_firewall(self, name):
+        return self._delete(name)
+
+    def track(self, result):
+        future = Future()
+        if result["name"] in self.failing:
+            future.set_result({"status": "FAILED", "error": "quota exceeded"})
+        else:
+            future.set_result({"status": "DONE", "error": None})
+        return future
+
+
+def record(name, **kwargs):
+    """A state store record of a GCP deployment."""
+    return {
+        "name": name,
+        "platform": "gcp",
+        "project": "robo-sim",
+        "zone": "us-central1-a",
+        "status": "running",
+        **kwargs,
+    }
+
+
+class TestTeardown:
+    """Test cases for teardown."""
+
+    def test_instances_and_existing_firewalls_deleted(self):
+        """Test each deployment's instance and -ssh rule are deleted, skipping absent rules."""
+        manager = FakeManager(firewalls=["w-001-ssh", "other-ssh"], missing=["w-002"])
+
+        results = teardown(manager, [record("w-001"), record("w-002")])
+
+        assert sorted(manager.deleted) == ["w-001", "w-001-ssh"]
+        assert sorted((r["kind"], r["name"], r["status"]) for r in results) == [
+            ("firewall", "w-001-ssh", "done"),
+            ("instance", "w-001", "done"),
+            ("instance", "w-002", "done"),
+        ]
+
+    def test_partial_failure_reported(self):
+        """Test a failed deletion is reported without stopping the others."""
+        manager = FakeManager(firewalls=["w-001-ssh", "w-002-ssh"], failing=["w-001"])
+
+        results = teardown(manager, [record("w-001"), record("w-002")], concurrency=2)
+
+        failed = [result for result in results if result["status"] == "failed"]
+        assert [(r["name"], r["deployment"], r["error"]) for r in failed] == [
+            ("w-001", "w-001", "quota exceeded")
+        ]
+        assert len(results) == 4
+
+    def test_fleet_rule_deleted_with_last_member(self):
+        """Test a fleet's shared rule outlives its members until the last one goes."""
+        members = [{"name": name, "labels": {"fleet": "w"}} for name in ("w-001", "w-002")]
+        manager = FakeManager(firewalls=["w-ssh"], instances=members)
+
+        teardown(manager, [record("w-001", fleet="w")])
+        assert manager.deleted == ["w-001"]
+
+        teardown(manager, [record("w-001", fleet="w"), record("w-002", fleet="w")])
+        assert sorted(manager.deleted) == ["w-001", "w-001", "w-002", "w-ssh"]
+
+
+class TestDestroyCLI:
+    """Test cases for destroy --selector / --all-matching."""
+
+    def setup_store(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(settings_module, "_settings", None)
+        store = StateStore(tmp_path / "state" / "deployments.db")
+        store.upsert_many(
+            [
+                record("lr-001", labels={"sweep": "lr"}),
+                record("lr-002", labels={"sweep": "lr"}),
+                record("keep", labels={"sweep": "bs"}),
+            ]
+        )
+        return store
+
+    def test_all_matching_label(self, tmp_path, monkeypatch):
+        """Test every matching deployment is destroyed and dropped from the store."""
+        store = self.setup_store(tmp_path, monkeypatch)
+        manager = FakeManager(firewalls=["lr-001-ssh", "lr-002-ssh", "keep-ssh"])
+
+        with patch("easydeploy.cloud.gcp.compute.GCPManager", return_value=manager):
+            result = CliRunner().invoke(
+                main,
+                ["destroy", "--all-matching", "--label", "sweep=lr", "--older-than", "0s", "-y"],
+            )
+
+        assert result.exit_code == 0, result.output
+        assert sorted(manager.deleted) == ["lr-001", "lr-001-ssh", "lr-002", "lr-002-ssh"]
+        assert [r["name"] for r in store.query()] == ["keep"]
+        assert "2/2 deployments destroyed" in result.output
+
+    def test_selector_partial_failure(self, tmp_path, monkeypatch):
+        """Test failed deletions are listed, keep their records and fail the command."""
+        store = self.setup_store(tmp_path, monkeypatch)
+        manager = FakeManager(failing=["lr-002"])
+
+        with patch("easydeploy.cloud.gcp.compute.GCPManager", return_value=manager):
+            result = CliRunner().invoke(main, ["destroy", "--selector", "sweep=lr"], input="y\n")
+
+        assert result.exit_code == 1
+        assert "✗ instance lr-002: quota exceeded" in result.output
+        # The surviving deployment is not left stuck as "destroying"
+        assert [(r["name"], r["status"]) for r in store.query(labels={"sweep": "lr"})] == [
+            ("lr-002", "running")
+        ]
+
+    def test_unreachable_project_restores_status(self, tmp_path, monkeypatch):
+        """Test deployments keep their status when their manager cannot be built."""
+        store = self.setup_store(tmp_path, monkeypatch)
+
+        with patch.object(main_module, "_cloud_manager", side_effect=RuntimeError("no creds")):
+            result = CliRunner().invoke(main, ["destroy", "--selector", "sweep=lr", "-y"])
+
+        assert result.exit_code == 1
+        assert "✗ robo-sim: no creds" in result.output
+        assert {r["status"] for r in store.query()} == {"running"}
+
+    def test_positional_selector_confirms(self, tmp_path, monkeypatch):
+        """Test a positional label selector or fleet name asks before destroying many."""
+        store = self.setup_store(tmp_path, monkeypatch)
+        manager = FakeManager()
+
+        with patch("easydeploy.cloud.gcp.compute.GCPManager", return_value=manager):
+            result = CliRunner().invoke(main, ["destroy", "sweep=lr"], input="n\n")
+            assert "Destroy 2 deployments?" in result.output
+            assert manager.deleted == [] and len(store.query()) == 3
+
+            # An exact deployment name is destroyed without a prompt
+            result = CliRunner().invoke(main, ["destroy", "keep"])
+
+        assert result.exit_code == 0, result.output
+        assert manager.deleted == ["keep"]
+
+    def test_reuses_warm_manager(self, tmp_path, monkeypatch):
+        """Test destroy reaches recorded deployments through the daemon's warm manager."""
+        store = self.setup_store(tmp_path, monkeypatch)
+        settings = settings_module.get_settings()
+        region, zone = settings.get("cloud.gcp.region"), settings.get("cloud.gcp.zone")
+        manager = FakeManager()
+        monkeypatch.setitem(
+            main_module._warm_managers, ("robo-sim", region, zone or f"{region}-a"), manager
+        )
+
+        with patch("easydeploy.cloud.gcp.compute.GCPManager") as manager_class:
+            result = CliRunner().invoke(main, ["destroy", "--selector", "sweep=lr", "-y"])
+
+        assert result.exit_code == 0, result.output
+        manager_class.assert_not_called()
+        assert sorted(manager.deleted) == ["lr-001", "lr-002"]
+        assert [r["name"] for r in store.query()] == ["keep"]
+
+    def test_requires_one_target(self, tmp_path, monkeypatch):
+        """Test a name and --all-matching cannot be combined."""
+        self.setup_store(tmp_path, monkeypatch)
+
+        result = CliRunner().invoke(main, ["destroy", "keep", "--all-matching"])
+
+        assert result.exit_code == 2
+        assert "exactly one of" in result.output
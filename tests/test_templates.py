@@ -0,0 +1,69 @@
+"""Tests for the template engine."""
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+from easydeploy.deploy.templates import TemplateEngine
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
+
+PARAMS = {
+    "deployment_name": "worker-001",
+    "project_id": "robo-sim",
+    "zone": "us-central1-a",
+    "machine_type": "n1-standard-4",
+    "gpu_enabled": True,
+    "ssh_port": 22,
+    "allowed_ip_ranges": ["10.0.0.0/8", "192.168.0.0/16"],
+}
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Create an engine over the repository templates with a temporary bytecode cache."""
+    return TemplateEngine(TEMPLATES_DIR, cache_dir=tmp_path / "cache")
+
+
+class TestTemplateEngine:
+    """Test cases for TemplateEngine."""
+
+    def test_render_yaml_matches_text_render(self, engine):
+        """Test streaming YAML parsing matches parsing the rendered text."""
+        parsed = engine.render_yaml("gcp-instance.yaml.j2", **PARAMS)
+
+        assert parsed == yaml.safe_load(engine.render("gcp-instance.yaml.j2", **PARAMS))
+        assert parsed["instance"]["name"] == "worker-001"
+        assert parsed["firewall_rules"][0]["source_ranges"] == ["10.0.0.0/8", "192.168.0.0/16"]
+
+    def test_compiled_template_is_cached(self, engine, tmp_path):
+        """Test templates compile once and their bytecode is written to disk."""
+        first = engine.get_template("gcp-instance.yaml.j2")
+
+        assert engine.get_template("gcp-instance.yaml.j2") is first
+        assert list((tmp_path / "cache").iterdir())
+
+    def test_bytecode_reused_by_new_engine(self, engine, tmp_path, monkeypatch):
+        """Test a fresh engine loads bytecode instead of compiling the source."""
+        engine.get_template("gcp-instance.yaml.j2")
+        fresh = TemplateEngine(TEMPLATES_DIR, cache_dir=tmp_path / "cache")
+
+        def fail_compile(*args, **kwargs):
+            raise AssertionError("template was recompiled")
+
+        monkeypatch.setattr(fresh.environment, "compile", fail_compile)
+        assert fresh.render("gcp-instance.yaml.j2", **PARAMS)
+
+    def test_render_many(self, engine):
+        """Test batch rendering yields one result per parameter set, in order."""
+        param_sets = [{**PARAMS, "deployment_name": f"worker-{i:03d}"} for i in range(1, 51)]
+
+        names = [
+            spec["instance"]["name"]
+            for spec in engine.render_many("gcp-instance.yaml.j2", param_sets, parse=True)
+        ]
+        texts = list(engine.render_many("gcp-instance.yaml.j2", param_sets[:2]))
+
+        assert names == [p["deployment_name"] for p in param_sets]
+        assert 'name: "worker-002"' in texts[1]
@@ -0,0 +1,156 @@
+"""Tests for the shared single-flight access token manager."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from easydeploy.cloud.gcp.tokens import TokenManager
+
+
+class CountingFetch:
+    """Token source that counts fetches and takes a while to answer."""
+
+    def __init__(self, lifetime=3600, delay=0.2):
+        self.lifetime = lifetime
+        self.delay = delay
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, min_expiry):
+        with self.lock:
+            self.calls += 1
+            calls = self.calls
+        time.sleep(self.delay)
+        return f"ya29.token-{calls}", time.time() + self.lifetime
+
+
+class TestTokenManager:
+    """Test cases for TokenManager."""
+
+    def test_concurrent_callers_share_one_refresh(self):
+        """Test many threads asking for a token at once trigger a single fetch."""
+        fetch = CountingFetch()
+        tokens = TokenManager(fetch)
+
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            results = list(pool.map(lambda _: tokens.token(), range(64)))
+
+        assert fetch.calls == 1
+        assert set(results) == {"ya29.token-1"}
+
+    def test_refreshes_ahead_of_expiry_without_blocking(self):
+        """Test a token close to expiry is still served while a refresh runs."""
+        fetch = CountingFetch(lifetime=120)
+        tokens = TokenManager(fetch, refresh_margin=300)
+        tokens.token()
+        fetch.lifetime = 3600
+
+        started = time.perf_counter()
+        assert [tokens.token() for _ in range(10)] == ["ya29.token-1"] * 10
+        assert time.perf_counter() - started < fetch.delay
+
+        tokens.refresh().result()
+        assert tokens.token() == "ya29.token-2"
+        assert fetch.calls == 2
+
+    def test_asyncio_callers_share_one_refresh(self):
+        """Test coroutines await the same refresh without blocking the loop."""
+        fetch = CountingFetch()
+        tokens = TokenManager(fetch)
+
+        async def gather():
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while fetch.calls == 0 or tokens.expiry == 0:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            *results, _ = await asyncio.gather(*(tokens.token_async() for _ in range(20)), tick())
+            return results, ticks
+
+        results, ticks = asyncio.run(gather())
+        assert set(results) == {"ya29.token-1"}
+        assert fetch.calls == 1
+        assert ticks > 1
+
+    def test_no_credentials(self):
+        """Test a failed fetch raises, and is retried on the next call."""
+        tokens = TokenManager(lambda min_expiry: None)
+
+        with pytest.raises(RuntimeError, match="easydeploy gcp login"):
+            tokens.token()
+        with pytest.raises(RuntimeError):
+            tokens.token()
+
+
+def test_credentials_send_shared_token():
+    """Test google-auth requests carry the manager's token."""
+    tokens = TokenManager(CountingFetch(delay=0))
+    headers = {}
+
+    tokens.credentials().before_request(None, "GET", "https://compute.googleapis.com", headers)
+
+    assert headers["authorization"] == "Bearer ya29.token-1"
+    assert tokens.credentials().valid
+
+
+def test_gcp_manager_clients_share_token_manager():
+    """Test every client of every GCPManager authenticates with the process-wide token."""
+    from easydeploy.cloud.gcp.compute import GCPManager
+    from easydeploy.cloud.gcp.tokens import get_token_manager
+
+    with patch("easydeploy.cloud.gcp.compute._client") as client:
+        GCPManager("robo-sim").compute_client
+        GCPManager("other", zone="us-east1-b").disks_client
+
+    shared = get_token_manager().credentials()
+    assert [call.kwargs["credentials"] for call in client.call_args_list] == [shared, shared]
+
+
+def test_rejected_token_not_reused(tmp_path, monkeypatch):
+    """Test a token the API rejects before its expiry is replaced, not reloaded from disk."""
+    import requests
+    from google.auth.transport.requests import AuthorizedSession
+
+    from easydeploy.cloud.gcp import auth
+    from easydeploy.cloud.gcp.tokens import fetch_access_token
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(auth, "_session_memo", None)
+    auth.save_session("ya29.revoked", time.time() + 3600, "dev@example.com")
+    monkeypatch.setattr(
+        auth,
+        "_fetch_native_session",
+        lambda: auth.save_session("ya29.fresh", time.time() + 3600, "dev@example.com"),
+    )
+
+    class Api(requests.adapters.BaseAdapter):
+        """Compute API that has revoked one token."""
+
+        def __init__(self):
+            super().__init__()
+            self.seen = []
+
+        def send(self, request, **kwargs):
+            self.seen.append(request.headers["authorization"])
+            response = requests.Response()
+            response.status_code = 401 if "revoked" in self.seen[-1] else 200
+            response.request = request
+            return response
+
+        def close(self):
+            pass
+
+    api = Api()
+    session = AuthorizedSession(TokenManager(fetch_access_token).credentials())
+    session.mount("https://", api)
+
+    assert session.get("https://compute.googleapis.com/").status_code == 200
+    assert api.seen == ["Bearer ya29.revoked", "Bearer ya29.fresh"]
+    assert auth.load_session()["access_token"] == "ya29.fresh"
@@ -0,0 +1,117 @@
+"""Tests for --profile tracing."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+from click.testing import CliRunner
+
+from easydeploy.utils import trace
+
+
+@pytest.fixture
+def tracer(monkeypatch, tmp_path):
+    """A fresh process-wide tracer, disabled again after the test."""
+    fresh = trace.Tracer()
+    fresh.path = tmp_path / "trace.json"
+    monkeypatch.setattr(trace, "_tracer", fresh)
+    yield fresh
+    trace.finish()
+
+
+class TestTracer:
+    """Test cases for spans and trace export."""
+
+    def test_spans_only_recorded_when_enabled(self, tracer):
+        """Test span is a no-op until tracing is enabled."""
+        with trace.span("idle", "api"):
+            pass
+        assert tracer.events == []
+
+        tracer.enabled = True
+        with pytest.raises(ValueError):
+            with trace.span("boom", "api", zone="us-central1-a"):
+                raise ValueError
+
+        [event] = tracer.events
+        assert event["name"] == "boom"
+        assert event["ph"] == "X"
+        assert event["args"] == {"zone": "us-central1-a", "error": "ValueError"}
+
+    def test_write_chrome_trace(self, tracer, tmp_path):
+        """Test the trace file is Chrome trace-event JSON with thread names."""
+        tracer.enabled = True
+        with trace.span("render gcp-instance.yaml.j2", "template"):
+            pass
+
+        path = tracer.write(tmp_path / "trace.json")
+
+        events = json.loads(path.read_text())["traceEvents"]
+        assert {event["ph"] for event in events} == {"M", "X"}
+        assert events[-1]["cat"] == "template"
+        assert events[-1]["dur"] >= 0
+
+    def test_traced_client_and_subprocess(self, tracer):
+        """Test API client calls and subprocesses become spans named after them."""
+        client = Mock()
+        assert trace.traced_client(client, "InstancesClient") is client
+
+        tracer.enabled = True
+        trace.traced_client(client, "InstancesClient").insert(project="p")
+        with patch("subprocess.run", return_value=subprocess.CompletedProcess([], 0)) as run:
+            trace.run(["gcloud", "auth", "list", "--format=json"], capture_output=True)
+
+        run.assert_called_once_with(
+            ["gcloud", "auth", "list", "--format=json"], capture_output=True
+        )
+        client.insert.assert_called_once_with(project="p")
+        assert [(e["name"], e["cat"]) for e in tracer.events] == [
+            ("InstancesClient.insert", "api"),
+            ("gcloud auth list", "subprocess"),
+        ]
+
+    def test_imports_are_timed(self, tracer, monkeypatch):
+        """Test modules imported while tracing show up as import spans."""
+        monkeypatch.setattr(trace, "IMPORT_THRESHOLD_US", 0)
+        monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+
+        trace.enable(tracer.path)
+        import colorsys  # noqa: F401
+
+        assert "import colorsys" in [event["name"] for event in tracer.events]
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [("", None), ("0", None), ("1", "default"), ("/tmp/run.json", "/tmp/run.json")],
+    )
+    def test_env(self, value, expected, monkeypatch):
+        """Test EASYDEPLOY_TRACE turns tracing on and optionally names the file."""
+        monkeypatch.setenv("EASYDEPLOY_TRACE", value)
+
+        path = trace.trace_path_from_env()
+
+        if expected == "default":
+            assert path.parent.name == "traces"
+        else:
+            assert path == (Path(expected) if expected else None)
+
+
+def test_profile_command(tracer, tmp_path, monkeypatch, caplog):
+    """Test a profiled run writes the trace and logs the slowest operations."""
+    from easydeploy.cli.main import main
+
+    monkeypatch.setenv("EASYDEPLOY_TRACE", str(tmp_path / "run.json"))
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+    with caplog.at_level("INFO", logger="easydeploy.trace"):
+        result = CliRunner().invoke(main, ["list"])
+
+    assert result.exit_code == 0, result.output
+    events = json.loads((tmp_path / "run.json").read_text())["traceEvents"]
+    assert "easydeploy list" in [event["name"] for event in events]
+    assert "import easydeploy.cli" in [event["name"] for event in events]
+    assert "Slowest" in caplog.text
+    assert not tracer.enabled
@@ -0,0 +1,68 @@
+"""Startup-time regression tests for the easydeploy CLI."""
+
+import subprocess
+import sys
+
+import pytest
+
+# Modules that must not be imported just to start the CLI
+HEAVY_MODULES = ["rich", "yaml", "google", "jinja2", "paramiko", "azure", "easydeploy.cli.gcp"]
+
+# Generous ceiling for the cumulative import time of easydeploy.cli.main
+IMPORT_BUDGET_US = 250_000
+
+
+def import_times(*args: str) -> dict[str, int]:
+    """Run the CLI under `python -X importtime` and return cumulative times per module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["-c", "import easydeploy.cli.main"],
+        ["-c", "from easydeploy.cli.main import main; main(['--version'])"],
+    ],
+)
+def test_cli_startup_skips_heavy_imports(args):
+    """Test that starting the CLI does not import heavy dependencies."""
+    times = import_times(*args)
+
+    loaded = [
+        name
+        for name in times
+        if any(name == heavy or name.startswith(f"{heavy}.") for heavy in HEAVY_MODULES)
+    ]
+    assert loaded == []
+
+
+def test_cli_import_time_budget():
+    """Test that importing the CLI stays within the startup budget."""
+    times = import_times("-c", "import easydeploy.cli.main")
+
+    assert times["easydeploy.cli.main"] < IMPORT_BUDGET_US
+
+
+def test_lazy_subcommand_resolves_on_invoke():
+    """Test that the gcp group is still reachable through the lazy group."""
+    from click.testing import CliRunner
+
+    from easydeploy.cli.main import main
+
+    runner = CliRunner()
+    result = runner.invoke(main, ["gcp", "--help"])
+
+    assert result.exit_code == 0
+    assert "list-projects" in result.output